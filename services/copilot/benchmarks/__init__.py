@@ -0,0 +1,2 @@
+# services/copilot/benchmarks
+# Micro-benchmarks for copilot alert evaluation (synthetic alerts, no Redis)
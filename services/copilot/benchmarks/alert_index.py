@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# services/copilot/benchmarks/alert_index.py
+
+"""
+Fast-loop cost per tick: full scan (await every non-AI evaluator) versus
+the sorted-threshold index (intel/alert_index.py) at 10k / 100k alerts.
+
+Alerts are an even mix of price (above/below/at around spot), debit
+(above/below on --strategies strategies) and profit_target alerts, all
+once_only. Each tick walks spot by a normal step of --step points and
+moves every strategy debit by ~1%. Triggered alerts are disabled, as
+AlertEngine does, so both paths see the same live set.
+
+Usage:
+    python services/copilot/benchmarks/alert_index.py
+    python services/copilot/benchmarks/alert_index.py --sizes 10000,100000 --ticks 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.copilot.intel.alert_engine import Alert, AlertEngine, AlertEngineConfig
+from services.copilot.intel.alert_evaluators import (
+    DebitEvaluator,
+    PriceEvaluator,
+    ProfitTargetEvaluator,
+)
+
+
+class QuietLogger:
+    """Logger stand-in: AlertEngine prints when it has no logger."""
+
+    def _drop(self, *args, **kwargs) -> None:
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+def _alerts(n: int, spot: float, strategies: List[str], rng: random.Random) -> List[Alert]:
+    out = []
+    for i in range(n):
+        kind = i % 3
+        common = dict(
+            user_id=i % 500, intent_class="informational", behavior="once_only",
+            priority="medium", source_type="symbol", source_id="SPX", enabled=True,
+            triggered=False, triggered_at=None, trigger_count=0, created_at="",
+            updated_at="", color="#ffffff",
+        )
+        if kind == 0:
+            cond = rng.choice(["above", "below", "at"])
+            offset = rng.uniform(5, 150) * (1 if cond == "above" else -1 if cond == "below" else rng.choice([1, -1]))
+            out.append(Alert(id=f"a{i}", type="price", condition=cond, target_value=round(spot + offset, 1), **common))
+        elif kind == 1:
+            cond = rng.choice(["above", "below"])
+            target = 3.0 * (1 + rng.uniform(0.05, 0.5) * (1 if cond == "above" else -1))
+            out.append(Alert(id=f"a{i}", type="debit", condition=cond, target_value=round(target, 2),
+                             strategy_id=rng.choice(strategies), **common))
+        else:
+            out.append(Alert(id=f"a{i}", type="profit_target", condition="above",
+                             target_value=round(rng.uniform(0.1, 0.6), 2),
+                             strategy_id=rng.choice(strategies), entry_debit=3.0, **common))
+    return out
+
+
+def _markets(ticks: int, spot: float, strategies: List[str], step: float, rng: random.Random) -> List[dict]:
+    debits = {s: 3.0 for s in strategies}
+    out = []
+    for _ in range(ticks):
+        spot += rng.gauss(0, step)
+        for s in strategies:
+            debits[s] *= 1 + rng.gauss(0, 0.01)
+        out.append({
+            "spot_price": round(spot, 2),
+            "strategies": {s: {"current_debit": round(d, 4)} for s, d in debits.items()},
+        })
+    return out
+
+
+def _engine(alerts: List[Alert], threshold_index: bool) -> AlertEngine:
+    engine = AlertEngine(AlertEngineConfig(threshold_index=threshold_index), logger=QuietLogger())
+    for evaluator in (PriceEvaluator(), DebitEvaluator(), ProfitTargetEvaluator()):
+        engine.register_evaluator(evaluator)
+    for alert in alerts:
+        engine._alerts[alert.id] = alert
+    engine._rebuild_index()
+    return engine
+
+
+async def _tick(engine: AlertEngine, data: dict, threshold_index: bool) -> int:
+    """One fast-loop pass (evaluate + disable triggered); returns evaluations."""
+    engine._market_data = data
+    if threshold_index:
+        ids = list(engine._threshold_candidates())
+    else:
+        ids = list(engine._scan_inputs)
+    evaluated = 0
+    for alert_id in ids:
+        alert = engine._alerts[alert_id]
+        if not alert.enabled:
+            continue
+        evaluation = await engine.get_evaluator(alert.type).evaluate(alert, data)
+        evaluated += 1
+        if evaluation.should_trigger:
+            alert.enabled = False
+            engine._unindex_alert(alert_id)
+    return evaluated
+
+
+async def _run(n: int, args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    strategies = [f"s{i}" for i in range(args.strategies)]
+    markets = _markets(args.ticks, args.spot, strategies, args.step, random.Random(args.seed + 1))
+    results = {}
+    for label, indexed in (("scan", False), ("index", True)):
+        alerts = _alerts(n, args.spot, strategies, random.Random(args.seed))
+        t0 = time.perf_counter()
+        engine = _engine(alerts, indexed)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        times, evals = [], []
+        for data in markets:
+            t0 = time.perf_counter()
+            evals.append(await _tick(engine, data, indexed))
+            times.append((time.perf_counter() - t0) * 1000)
+        live = sum(1 for a in engine._alerts.values() if a.enabled)
+        results[label] = {
+            "build_ms": build_ms,
+            "median_ms": statistics.median(times[1:]),
+            "p95_ms": sorted(times[1:])[int(0.95 * (len(times) - 1))],
+            "evals_per_tick": statistics.mean(evals[1:]),
+            "live": live,
+        }
+    return results
+
+
+async def main() -> int:
+    ap = argparse.ArgumentParser(description="AlertEngine fast loop: full scan vs threshold index")
+    ap.add_argument("--sizes", default="10000,100000")
+    ap.add_argument("--ticks", type=int, default=100)
+    ap.add_argument("--strategies", type=int, default=200)
+    ap.add_argument("--spot", type=float, default=5900.0)
+    ap.add_argument("--step", type=float, default=0.5, help="spot stdev per tick (points)")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    print(f"{'alerts':>8} {'path':<6}{'build':>10}{'median':>10}{'p95':>10}{'evals/tick':>12}{'live':>9}")
+    for n in (int(s) for s in args.sizes.split(",") if s.strip()):
+        results = await _run(n, args)
+        for label, r in results.items():
+            print(f"{n:>8} {label:<6}{r['build_ms']:>8.1f}ms{r['median_ms']:>8.2f}ms{r['p95_ms']:>8.2f}ms"
+                  f"{r['evals_per_tick']:>12.1f}{r['live']:>9}")
+        assert results["scan"]["live"] == results["index"]["live"], "paths disagree on triggers"
+        print(f"{'':>8} speedup {results['scan']['median_ms'] / results['index']['median_ms']:.0f}x (median)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
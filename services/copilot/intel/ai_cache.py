@@ -0,0 +1,140 @@
+# services/copilot/intel/ai_cache.py
+"""
+AI Cache - Market-state-keyed result cache for AI alert evaluations.
+
+AI alert evaluators re-send near-identical prompts every slow-loop cycle
+while the market has not materially moved. AIProviderManager.generate
+takes an optional cache_key = (owner, state):
+
+    owner   (evaluator alert type, alert id) - one cached answer per owner
+    state   quantized market features: spot bucket, VIX bucket, position
+            P&L bucket, plus any exact values the evaluator's prompt uses
+            (GEX regime, bias, DTE, ...)
+
+A lookup hits while the owner's stored state is unchanged and its TTL has
+not expired. When any quantized input crosses a bucket the state differs,
+the stored answer is dropped (an invalidation) and the provider is called.
+Owners are evicted least-recently-used beyond max_entries.
+
+Each evaluator declares a CacheRule (bucket sizes + TTL); alert_cache_key()
+builds the key from it.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+CacheKey = Tuple[Hashable, Hashable]
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """Per-evaluator quantization and TTL. A step of None leaves the feature out."""
+    ttl_sec: float = 60.0
+    spot_step: Optional[float] = 5.0      # index points
+    vix_step: Optional[float] = 1.0       # VIX points
+    pnl_step: Optional[float] = None      # fraction of entry debit
+
+
+def _bucket(value: Any, step: Optional[float]) -> Optional[int]:
+    if step is None or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return math.floor(value / step)
+
+
+def _vix(market_data: dict) -> Any:
+    vix = market_data.get("vix")
+    if vix is None:
+        vix = (market_data.get("vix_regime") or {}).get("vix")
+    return vix
+
+
+def _pnl_pct(alert: Any, market_data: dict) -> Optional[float]:
+    strategy = market_data.get("strategies", {}).get(getattr(alert, "strategy_id", None), {})
+    current_debit = strategy.get("current_debit") or strategy.get("debit")
+    entry_debit = getattr(alert, "entry_debit", None) or strategy.get("entry_debit")
+    if not isinstance(current_debit, (int, float)) or not isinstance(entry_debit, (int, float)):
+        return None
+    if entry_debit == 0:
+        return None
+    return (entry_debit - current_debit) / entry_debit
+
+
+def alert_cache_key(evaluator: str, alert: Any, market_data: dict, rule: CacheRule, *extra: Hashable) -> CacheKey:
+    """(owner, quantized market state) for one alert evaluation."""
+    spot = market_data.get("spot_price") or market_data.get("spot")
+    state = (
+        _bucket(spot, rule.spot_step),
+        _bucket(_vix(market_data), rule.vix_step),
+        _bucket(_pnl_pct(alert, market_data), rule.pnl_step),
+        # Edited alerts (threshold, zone, ...) must not reuse an old answer
+        getattr(alert, "updated_at", None),
+        *extra,
+    )
+    return (evaluator, alert.id), state
+
+
+class AIResultCache:
+    """TTL + LRU cache of AI responses, one entry per owner."""
+
+    def __init__(self, max_entries: int = 2048, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        # owner -> (state, response, expires_at)
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, Any, float]]" = OrderedDict()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "expirations": 0,
+            "evictions": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        owner, state = key
+        entry = self._entries.get(owner)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        cached_state, response, expires_at = entry
+        if cached_state != state:
+            # A quantized input crossed a bucket
+            del self._entries[owner]
+            self._stats["invalidations"] += 1
+            self._stats["misses"] += 1
+            return None
+        if self._clock() >= expires_at:
+            del self._entries[owner]
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(owner)
+        self._stats["hits"] += 1
+        return response
+
+    def put(self, key: CacheKey, response: Any, ttl_sec: float) -> None:
+        owner, state = key
+        self._entries[owner] = (state, response, self._clock() + ttl_sec)
+        self._entries.move_to_end(owner)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, owner: Hashable) -> None:
+        if self._entries.pop(owner, None) is not None:
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
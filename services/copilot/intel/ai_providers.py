@@ -8,14 +8,22 @@ Supports:
 - Local/custom providers
 
 This abstraction allows switching between providers via configuration.
+
+All managers share one ProviderPool (provider_pool): long-lived SDK
+clients per credential, a concurrency + token/s governor per provider,
+and single-flight coalescing of identical in-flight requests.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, AsyncIterator
-from dataclasses import dataclass
+from contextlib import aclosing
+from typing import Optional, Dict, Any, List, AsyncIterator, Callable, Hashable, Tuple
+from dataclasses import dataclass, replace
 from enum import Enum
 import logging
 import asyncio
+import time
+
+from .ai_cache import AIResultCache, CacheKey
 
 
 class AIProvider(str, Enum):
@@ -43,6 +51,7 @@ class AIResponse:
     tokens_used: Optional[int] = None
     finish_reason: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    cached: bool = False  # Served from AIResultCache, no provider call
 
 
 @dataclass
@@ -58,6 +67,170 @@ class AIProviderConfig:
     extra: Optional[Dict[str, Any]] = None
 
 
+# ========== Shared Pool ==========
+
+class ProviderGovernor:
+    """
+    Concurrency cap and token/s budget for one provider.
+
+    The budget is a bucket holding one second of tokens_per_sec. A request
+    reserves its estimated tokens (prompt + max_tokens) up front and settles
+    to the reported usage when it completes; oversized requests may run the
+    bucket into debt, which later requests wait out. tokens_per_sec=0
+    disables the budget.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        tokens_per_sec: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_sec = tokens_per_sec
+        self._clock = clock
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._bucket_lock = asyncio.Lock()  # FIFO over bucket waits
+        self._tokens = tokens_per_sec
+        self._refilled_at = clock()
+        self._stats = {"requests": 0, "active": 0, "throttled": 0, "wait_ms": 0.0, "tokens": 0}
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.tokens_per_sec, self._tokens + (now - self._refilled_at) * self.tokens_per_sec)
+        self._refilled_at = now
+
+    async def acquire(self, estimate: int) -> None:
+        start = self._clock()
+        await self._slots.acquire()
+        try:
+            if self.tokens_per_sec > 0:
+                async with self._bucket_lock:
+                    self._refill()
+                    need = min(estimate, self.tokens_per_sec)
+                    if self._tokens < need:
+                        await asyncio.sleep((need - self._tokens) / self.tokens_per_sec)
+                        self._refill()
+                    self._tokens -= estimate
+        except BaseException:
+            self._slots.release()
+            raise
+
+        waited_ms = (self._clock() - start) * 1000
+        self._stats["requests"] += 1
+        self._stats["active"] += 1
+        if waited_ms >= 1:
+            self._stats["throttled"] += 1
+            self._stats["wait_ms"] += waited_ms
+
+    def release(self, estimate: int, actual: Optional[int] = None) -> None:
+        used = estimate if actual is None else actual
+        if self.tokens_per_sec > 0:
+            self._tokens += estimate - used
+        self._stats["tokens"] += used
+        self._stats["active"] -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "wait_ms": round(self._stats["wait_ms"], 1),
+            "max_concurrency": self.max_concurrency,
+            "tokens_per_sec": self.tokens_per_sec,
+        }
+
+
+class ProviderPool:
+    """
+    Process-wide state shared by every AIProviderManager.
+
+    - clients: one SDK client per (sdk, api_key, base_url), reused across
+      providers, managers and subsystems (alerts, prompts, commentary)
+    - governors: one ProviderGovernor per provider name
+    - inflight: request key -> task, so identical concurrent requests make
+      a single provider call
+    """
+
+    def __init__(self, max_concurrency: int = 8, tokens_per_sec: float = 0.0):
+        self._limits: Dict[Optional[str], Tuple[int, float]] = {None: (max_concurrency, tokens_per_sec)}
+        self._clients: Dict[Tuple, Any] = {}
+        self._governors: Dict[str, ProviderGovernor] = {}
+        self.inflight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    def configure(self, max_concurrency: int = 8, tokens_per_sec: float = 0.0,
+                  provider: Optional[str] = None) -> None:
+        """Set limits for one provider, or the default for all (provider=None)."""
+        self._limits[provider] = (max_concurrency, tokens_per_sec)
+        for name in list(self._governors):
+            if provider is None or name == provider:
+                del self._governors[name]
+
+    def client(self, key: Tuple, factory: Callable[[], Any]) -> Any:
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = factory()
+        return client
+
+    def governor(self, provider: str) -> ProviderGovernor:
+        governor = self._governors.get(provider)
+        if governor is None:
+            max_concurrency, tokens_per_sec = self._limits.get(provider, self._limits[None])
+            governor = self._governors[provider] = ProviderGovernor(max_concurrency, tokens_per_sec)
+        return governor
+
+    async def close(self) -> None:
+        """Close pooled SDK clients (their HTTP connection pools)."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            close = getattr(client, "close", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self._clients),
+            "inflight": len(self.inflight),
+            "coalesced": self.coalesced,
+            "providers": {name: g.stats() for name, g in self._governors.items()},
+        }
+
+
+provider_pool = ProviderPool()
+
+
+def _openai_client(config: AIProviderConfig) -> Any:
+    """Pooled AsyncOpenAI client (OpenAI and OpenAI-compatible APIs)."""
+    def factory():
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            raise RuntimeError("openai package not installed. Run: pip install openai")
+        return AsyncOpenAI(api_key=config.api_key, base_url=config.api_base)
+
+    return provider_pool.client(("openai", config.api_key, config.api_base), factory)
+
+
+async def _openai_stream(client: Any, **request) -> AsyncIterator[str]:
+    """Yield content deltas from a streamed Chat Completions request."""
+    stream = await client.chat.completions.create(stream=True, **request)
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _chat_messages(messages: List[AIMessage], system_prompt: Optional[str]) -> List[Dict[str, str]]:
+    api_messages = []
+    if system_prompt:
+        api_messages.append({"role": "system", "content": system_prompt})
+    for msg in messages:
+        api_messages.append({"role": msg.role, "content": msg.content})
+    return api_messages
+
+
 class BaseAIProvider(ABC):
     """
     Abstract base class for AI providers.
@@ -140,16 +313,9 @@ class OpenAIProvider(BaseAIProvider):
         self._client = None
 
     def _get_client(self):
-        """Lazy-load OpenAI client."""
+        """Lazy-load the pooled OpenAI client."""
         if self._client is None:
-            try:
-                from openai import AsyncOpenAI
-                self._client = AsyncOpenAI(
-                    api_key=self.config.api_key,
-                    base_url=self.config.api_base,
-                )
-            except ImportError:
-                raise RuntimeError("openai package not installed. Run: pip install openai")
+            self._client = _openai_client(self.config)
         return self._client
 
     async def generate(
@@ -191,6 +357,26 @@ class OpenAIProvider(BaseAIProvider):
             finish_reason=choice.finish_reason,
         )
 
+    async def generate_stream(
+        self,
+        messages: List[AIMessage],
+        system_prompt: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """Stream content deltas from OpenAI Chat Completions."""
+        max_tokens = kwargs.pop("max_tokens", self.config.max_tokens)
+        temperature = kwargs.pop("temperature", self.config.temperature)
+
+        async for delta in _openai_stream(
+            self._get_client(),
+            model=self.config.model or "gpt-4-turbo-preview",
+            messages=_chat_messages(messages, system_prompt),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs,
+        ):
+            yield delta
+
     async def generate_with_assistant(
         self,
         messages: List[AIMessage],
@@ -270,16 +456,9 @@ class GrokProvider(BaseAIProvider):
         self._client = None
 
     def _get_client(self):
-        """Lazy-load OpenAI-compatible client for Grok."""
+        """Lazy-load the pooled OpenAI-compatible client for Grok."""
         if self._client is None:
-            try:
-                from openai import AsyncOpenAI
-                self._client = AsyncOpenAI(
-                    api_key=self.config.api_key,
-                    base_url=self.config.api_base,
-                )
-            except ImportError:
-                raise RuntimeError("openai package not installed. Run: pip install openai")
+            self._client = _openai_client(self.config)
         return self._client
 
     async def generate(
@@ -321,6 +500,27 @@ class GrokProvider(BaseAIProvider):
         )
 
 
+    async def generate_stream(
+        self,
+        messages: List[AIMessage],
+        system_prompt: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """Stream content deltas from the Grok API."""
+        max_tokens = kwargs.pop("max_tokens", self.config.max_tokens)
+        temperature = kwargs.pop("temperature", self.config.temperature)
+
+        async for delta in _openai_stream(
+            self._get_client(),
+            model=self.config.model or "grok-beta",
+            messages=_chat_messages(messages, system_prompt),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs,
+        ):
+            yield delta
+
+
 class AnthropicProvider(BaseAIProvider):
     """
     Anthropic Claude API provider.
@@ -335,13 +535,16 @@ class AnthropicProvider(BaseAIProvider):
         self._client = None
 
     def _get_client(self):
-        """Lazy-load Anthropic client."""
+        """Lazy-load the pooled Anthropic client."""
         if self._client is None:
-            try:
-                from anthropic import AsyncAnthropic
-                self._client = AsyncAnthropic(api_key=self.config.api_key)
-            except ImportError:
-                raise RuntimeError("anthropic package not installed. Run: pip install anthropic")
+            def factory():
+                try:
+                    from anthropic import AsyncAnthropic
+                except ImportError:
+                    raise RuntimeError("anthropic package not installed. Run: pip install anthropic")
+                return AsyncAnthropic(api_key=self.config.api_key)
+
+            self._client = provider_pool.client(("anthropic", self.config.api_key), factory)
         return self._client
 
     async def generate(
@@ -379,6 +582,26 @@ class AnthropicProvider(BaseAIProvider):
         )
 
 
+    async def generate_stream(
+        self,
+        messages: List[AIMessage],
+        system_prompt: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the Anthropic Messages API."""
+        max_tokens = kwargs.pop("max_tokens", self.config.max_tokens)
+
+        async with self._get_client().messages.stream(
+            model=self.config.model or "claude-sonnet-4-20250514",
+            messages=[{"role": msg.role, "content": msg.content} for msg in messages],
+            system=system_prompt or "",
+            max_tokens=max_tokens,
+            **kwargs,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+
 # ========== Provider Factory ==========
 
 def create_provider(config: AIProviderConfig, logger: Optional[logging.Logger] = None) -> BaseAIProvider:
@@ -409,7 +632,10 @@ class AIProviderManager:
     """
     Manages multiple AI providers and handles failover.
 
-    Allows configuring a primary and fallback providers.
+    Allows configuring a primary and fallback providers, and an optional
+    AIResultCache consulted when a caller passes a cache_key. Provider
+    calls go through the shared ProviderPool: identical concurrent
+    requests are coalesced and each provider's governor is respected.
     """
 
     def __init__(
@@ -417,32 +643,188 @@ class AIProviderManager:
         primary: BaseAIProvider,
         fallback: Optional[BaseAIProvider] = None,
         logger: Optional[logging.Logger] = None,
+        cache: Optional[AIResultCache] = None,
+        pool: Optional[ProviderPool] = None,
     ):
         self.primary = primary
         self.fallback = fallback
         self.logger = logger or logging.getLogger("AIProviderManager")
+        self.cache = cache
+        self.pool = pool or provider_pool
 
     async def generate(
         self,
         messages: List[AIMessage],
         system_prompt: Optional[str] = None,
         use_fallback_on_error: bool = True,
+        cache_key: Optional[CacheKey] = None,
+        cache_ttl: float = 60.0,
         **kwargs,
     ) -> AIResponse:
         """
         Generate using primary provider, falling back if needed.
+
+        With a cache configured and a cache_key (see ai_cache.alert_cache_key),
+        a response for the same quantized market state is reused for cache_ttl
+        seconds and returned with cached=True.
         """
+        if self.cache is not None and cache_key is not None:
+            hit = self.cache.get(cache_key)
+            if hit is not None:
+                return replace(hit, cached=True)
+
+        key = self._flight_key(messages, system_prompt, use_fallback_on_error, kwargs)
+        flight = self.pool.inflight.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(
+                self._generate(messages, system_prompt, use_fallback_on_error, **kwargs))
+            self.pool.inflight[key] = flight
+            flight.add_done_callback(lambda task: self._land(key, task))
+        else:
+            self.pool.coalesced += 1
+
+        # Shielded: one caller giving up does not cancel the others' request
+        response = await asyncio.shield(flight)
+
+        if self.cache is not None and cache_key is not None:
+            self.cache.put(cache_key, response, cache_ttl)
+        return response
+
+    async def generate_stream(
+        self,
+        messages: List[AIMessage],
+        system_prompt: Optional[str] = None,
+        use_fallback_on_error: bool = True,
+        on_complete: Optional[Callable[[AIResponse], None]] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream content deltas from the primary provider.
+
+        Falls back only if the primary fails before its first delta; a
+        failure mid-stream is raised to the caller. When the stream finishes,
+        on_complete gets an AIResponse naming the provider that answered,
+        with the full text and the governor's token estimate.
+
+        Close the stream with contextlib.aclosing: the provider's
+        concurrency slot is released when it closes, and an abandoned
+        generator is otherwise only closed when garbage-collected.
+        """
+        started = False
         try:
-            return await self.primary.generate(messages, system_prompt, **kwargs)
+            async with aclosing(self._governed_stream(
+                    self.primary, messages, system_prompt, on_complete, **kwargs)) as stream:
+                async for delta in stream:
+                    started = True
+                    yield delta
+        except Exception as e:
+            if started or not (use_fallback_on_error and self.fallback):
+                raise
+            self.logger.error(f"Primary provider stream failed: {e}")
+            self.logger.info(f"Trying fallback provider: {self.fallback.provider_name}")
+            async with aclosing(self._governed_stream(
+                    self.fallback, messages, system_prompt, on_complete, **kwargs)) as stream:
+                async for delta in stream:
+                    yield delta
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.pool.stats(),
+            **({"cache": self.cache.stats()} if self.cache is not None else {}),
+        }
+
+    async def _generate(
+        self,
+        messages: List[AIMessage],
+        system_prompt: Optional[str],
+        use_fallback_on_error: bool,
+        **kwargs,
+    ) -> AIResponse:
+        try:
+            return await self._governed(self.primary, messages, system_prompt, **kwargs)
         except Exception as e:
             self.logger.error(f"Primary provider failed: {e}")
 
             if use_fallback_on_error and self.fallback:
                 self.logger.info(f"Trying fallback provider: {self.fallback.provider_name}")
-                return await self.fallback.generate(messages, system_prompt, **kwargs)
+                return await self._governed(self.fallback, messages, system_prompt, **kwargs)
 
             raise
 
+    async def _governed(
+        self,
+        provider: BaseAIProvider,
+        messages: List[AIMessage],
+        system_prompt: Optional[str],
+        **kwargs,
+    ) -> AIResponse:
+        governor = self.pool.governor(provider.provider_name.value)
+        estimate = self._estimate_tokens(provider, messages, system_prompt, kwargs)
+        await governor.acquire(estimate)
+        actual = None
+        try:
+            response = await provider.generate(messages, system_prompt, **kwargs)
+            actual = response.tokens_used
+            return response
+        finally:
+            governor.release(estimate, actual)
+
+    async def _governed_stream(
+        self,
+        provider: BaseAIProvider,
+        messages: List[AIMessage],
+        system_prompt: Optional[str],
+        on_complete: Optional[Callable[[AIResponse], None]],
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        governor = self.pool.governor(provider.provider_name.value)
+        estimate = self._estimate_tokens(provider, messages, system_prompt, kwargs)
+        prompt_tokens = estimate - kwargs.get("max_tokens", provider.config.max_tokens)
+        await governor.acquire(estimate)
+        chunks: List[str] = []
+        streamed = 0
+        try:
+            async with aclosing(provider.generate_stream(messages, system_prompt, **kwargs)) as stream:
+                async for delta in stream:
+                    chunks.append(delta)
+                    streamed += len(delta)
+                    yield delta
+        finally:
+            governor.release(estimate, prompt_tokens + streamed // 4)
+
+        if on_complete is not None:
+            on_complete(AIResponse(
+                content="".join(chunks),
+                provider=provider.provider_name,
+                model=provider.config.model,
+                tokens_used=prompt_tokens + streamed // 4,
+                metadata={"streamed": True, "tokens_estimated": True},
+            ))
+
+    @staticmethod
+    def _estimate_tokens(provider: BaseAIProvider, messages: List[AIMessage],
+                         system_prompt: Optional[str], kwargs: Dict[str, Any]) -> int:
+        """Prompt (~4 chars/token) plus the completion budget."""
+        chars = len(system_prompt or "") + sum(len(m.content) for m in messages)
+        return chars // 4 + kwargs.get("max_tokens", provider.config.max_tokens)
+
+    def _flight_key(self, messages: List[AIMessage], system_prompt: Optional[str],
+                    use_fallback_on_error: bool, kwargs: Dict[str, Any]) -> Hashable:
+        return (
+            self.primary.provider_name,
+            self.primary.config.model,
+            self.fallback.provider_name if use_fallback_on_error and self.fallback else None,
+            system_prompt,
+            tuple((m.role, m.content) for m in messages),
+            tuple(sorted((k, repr(v)) for k, v in kwargs.items())),
+        )
+
+    def _land(self, key: Hashable, task: asyncio.Task) -> None:
+        if self.pool.inflight.get(key) is task:
+            del self.pool.inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here if every caller gave up
+
     async def health_check(self) -> Dict[str, bool]:
         """Check health of all configured providers."""
         results = {}
@@ -1,11 +1,13 @@
 # services/copilot/intel/alert_engine.py
 """
-Alert Engine - Queue-based alert evaluation system.
+Alert Engine - Change-driven alert evaluation system.
 
 Evaluates alerts against real-time market data using pluggable evaluators.
 Supports both simple (price, debit) and AI-powered (theta/gamma) alerts.
+Simple alerts are evaluated when the market fields they read change
+(BaseEvaluator.inputs), with a periodic safety sweep.
 
-Pattern follows Commentary subsystem (queue-based processing with subscribers).
+Pattern follows Commentary subsystem (processing loops with subscribers).
 """
 
 import asyncio
@@ -14,18 +16,34 @@ import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
-from typing import Any, Callable, Dict, List, Optional
+from collections import deque
+from functools import partial
+from typing import Any, Awaitable, Callable, Deque, Dict, FrozenSet, List, Optional, Set
 
 import aiohttp
 from redis.asyncio import Redis
 
+from .ai_cache import AIResultCache
+from .alert_index import IndexKey, ThresholdIndex, index_entry, key_value
+
+_MISSING = object()
+
+# Alert.priority order for slow-loop scheduling
+_PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
 
 @dataclass
 class AlertEngineConfig:
     """Configuration for the alert engine."""
     enabled: bool = True
     fast_loop_interval_ms: int = 1000   # 1 second for price/debit alerts
+    threshold_index: bool = True        # bisect price/debit/profit alerts (alert_index.py)
+    change_driven: bool = True          # fast loop wakes on market data changes
+    safety_sweep_interval_ms: int = 10000  # full fast pass even without changes
     slow_loop_interval_ms: int = 5000   # 5 seconds for AI alerts
+    slow_loop_budget_ms: int = 4000     # max wait per slow cycle; the rest carries over
+    ai_max_concurrency: int = 8         # AI/prompt evaluations in flight
+    ai_provider_concurrency: int = 4    # ... per AI provider
     max_queue_size: int = 1000
     # Redis keys - should be set from Truth config
     redis_key_prefix: str = "copilot:alerts"
@@ -258,6 +276,21 @@ class BaseEvaluator(ABC):
         """Whether this evaluator uses AI (slow loop)."""
         return False
 
+    @property
+    def ai_provider(self) -> Optional[str]:
+        """AI provider evaluate() calls (slow-loop per-provider cap); None without one."""
+        manager = getattr(self, "_ai_manager", None)
+        return manager.primary.provider_name.value if manager else None
+
+    @property
+    def inputs(self) -> Optional[FrozenSet[str]]:
+        """
+        Top-level market_data fields evaluate() reads. The fast loop
+        re-evaluates an alert only when one of them changes (plus safety
+        sweeps); None means undeclared: re-evaluate on any change.
+        """
+        return None
+
     @abstractmethod
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         """
@@ -278,7 +311,7 @@ class AlertEngine:
     Main alert evaluation engine.
 
     Manages alerts, evaluators, and evaluation loops.
-    Uses queue-based processing pattern from Commentary subsystem.
+    update_market_data wakes the fast loop with the fields that changed.
     """
 
     def __init__(
@@ -287,11 +320,13 @@ class AlertEngine:
         redis: Optional[Redis] = None,
         intel_redis: Optional[Redis] = None,
         logger=None,
+        ai_cache: Optional[AIResultCache] = None,
     ):
         self._config = config
         self._redis = redis
         self._intel_redis = intel_redis  # For analytics publishing
         self._logger = logger
+        self._ai_cache = ai_cache  # Shared with AIProviderManager
 
         # Evaluator registry
         self._evaluators: Dict[str, BaseEvaluator] = {}
@@ -307,11 +342,24 @@ class AlertEngine:
 
         # Market data cache
         self._market_data: dict = {}
-
-        # Pending evaluations queue
-        self._pending_queue: asyncio.Queue = asyncio.Queue(
-            maxsize=config.max_queue_size
-        )
+        self._market_fields: dict = {}              # top-level snapshot for change detection
+        self._changed_fields: Set[str] = set()      # changed since the last fast pass
+        self._market_changed_at: Optional[float] = None
+        self._market_event = asyncio.Event()
+
+        # Fast-loop scheduling: threshold alerts live in the index and are
+        # evaluated only when crossed; the rest are scanned when a field
+        # their evaluator reads changes (dependency map: field -> alert ids)
+        self._threshold_index = ThresholdIndex()
+        self._index_values: Dict[IndexKey, float] = {}
+        self._scan_inputs: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._dependents: Dict[Optional[str], Set[str]] = {}
+        self._pending_ids: Set[str] = set()         # placed, not yet evaluated
+        self._trigger_latencies: Deque[float] = deque(maxlen=500)
+
+        # Slow loop: AI/prompt evaluations in flight (job key -> (provider, task))
+        self._ai_inflight: Dict[str, tuple] = {}
+        self._ai_completed = 0
 
         # Subscriber callbacks
         self._subscribers: List[Callable[[AlertEvaluation], None]] = []
@@ -332,6 +380,11 @@ class AlertEngine:
             "sync_messages": 0,
             "errors": 0,
             "last_evaluation_ms": 0,
+            "last_index_candidates": 0,
+            "last_trigger_latency_ms": None,
+            "safety_sweeps": 0,
+            "ai_deferred": 0,
+            "ai_carried_over": 0,
             "last_trigger_ts": None,
             "started_at": None,
         }
@@ -370,10 +423,26 @@ class AlertEngine:
         return {
             **self._analytics,
             "alerts_active": len(self._alerts),
+            **self._threshold_index.stats(),
+            "alerts_scanned": len(self._scan_inputs),
+            **self._trigger_latency_stats(),
+            "ai_inflight": len(self._ai_inflight),
+            **self._ai_cache_stats(),
+            **self._algo_pass_stats(),
             "evaluators_registered": len(self._evaluators),
             "running": self._running,
         }
 
+    def _algo_pass_stats(self) -> dict:
+        evaluator = self._evaluators.get("algo_alert")
+        stats = getattr(evaluator, "last_pass_stats", None) or {}
+        return {f"algo_last_{k}": v for k, v in stats.items()}
+
+    def _ai_cache_stats(self) -> dict:
+        if self._ai_cache is None:
+            return {}
+        return {f"ai_cache_{k}": v for k, v in self._ai_cache.stats().items()}
+
     async def get_analytics_from_redis(self) -> dict:
         """Get analytics from intel-redis (includes historical data)."""
         redis = self._intel_redis or self._redis
@@ -384,6 +453,7 @@ class AlertEngine:
             return {
                 **{k: int(v) if v.isdigit() else v for k, v in data.items()},
                 "alerts_active": len(self._alerts),
+                **self._ai_cache_stats(),
                 "evaluators_registered": len(self._evaluators),
                 "running": self._running,
             }
@@ -435,6 +505,7 @@ class AlertEngine:
                                     self._alerts[alert.id] = alert
                                 except Exception as e:
                                     self._log(f"Error parsing alert: {e}", level="warn")
+                            self._rebuild_index()
                             self._log(f"Loaded {len(self._alerts)} alerts from Journal DB", emoji="")
                             await self._record_analytics(alerts_loaded=len(self._alerts))
                     else:
@@ -472,6 +543,7 @@ class AlertEngine:
                 if cursor == 0:
                     break
 
+            self._rebuild_index()
             self._log(f"Loaded {len(self._alerts)} alerts from Redis", emoji="")
         except Exception as e:
             self._log(f"Error loading alerts from Redis: {e}", level="error", emoji="")
@@ -486,8 +558,10 @@ class AlertEngine:
 
     async def delete_alert(self, alert_id: str) -> None:
         """Delete an alert from Redis and cache."""
-        if alert_id in self._alerts:
-            del self._alerts[alert_id]
+        alert = self._alerts.pop(alert_id, None)
+        self._unindex_alert(alert_id)
+        if alert and self._ai_cache is not None:
+            self._ai_cache.invalidate((alert.type, alert_id))
 
         if self._redis:
             key = f"{self._config.redis_key_prefix}:{alert_id}"
@@ -496,6 +570,7 @@ class AlertEngine:
     async def add_alert(self, alert: Alert) -> None:
         """Add or update an alert."""
         self._alerts[alert.id] = alert
+        self._index_alert(alert)
         await self.save_alert(alert)
         await self._publish_event("alert_added", {"alert": alert.to_dict()})
 
@@ -516,6 +591,7 @@ class AlertEngine:
 
         alert.updated_at = time.time()
         self._alerts[alert_id] = alert
+        self._index_alert(alert)
         await self.save_alert(alert)
         await self._publish_event("alert_updated", {"alertId": alert_id, "updates": updates})
         return alert
@@ -542,18 +618,141 @@ class AlertEngine:
     async def update_market_data(self, data: dict) -> None:
         """
         Update market data cache.
-        Called by orchestrator when market data updates.
+        Called by orchestrator when market data updates. Records which
+        top-level fields changed and wakes the fast loop for the alerts
+        that depend on them.
         """
+        changed = set()
+        for k in self._market_fields.keys() | data.keys():
+            old, new = self._market_fields.get(k, _MISSING), data.get(k, _MISSING)
+            if old is not new and old != new:
+                changed.add(k)
         self._market_data = data
+        # Shallow copy: the orchestrator adds fields (greeks) to the dict it hands over
+        self._market_fields = dict(data)
 
-        # Queue enabled alerts for evaluation
+        if changed:
+            self._changed_fields |= changed
+            if self._market_changed_at is None:
+                self._market_changed_at = time.time()
+            self._market_event.set()
+
+    def _fast_alert_entry(self, alert: Alert):
+        """
+        Fast-loop placement for an alert: None (not evaluated by the fast
+        loop), False (scanned when its inputs change) or its (key, op,
+        threshold) index entry.
+        """
+        if not alert.enabled or alert.triggered:
+            return None
+        evaluator = self.get_evaluator(alert.type)
+        if not evaluator or evaluator.is_ai_powered:
+            return None
+        if not self._config.threshold_index:
+            return False
+        return index_entry(alert) or False
+
+    def _add_scan(self, alert: Alert) -> None:
+        inputs = self.get_evaluator(alert.type).inputs
+        self._scan_inputs[alert.id] = inputs
+        for input_field in inputs if inputs is not None else (None,):
+            self._dependents.setdefault(input_field, set()).add(alert.id)
+
+    def _index_alert(self, alert: Alert) -> None:
+        """(Re)place an added or updated alert; it gets one direct evaluation."""
+        self._unindex_alert(alert.id)
+        entry = self._fast_alert_entry(alert)
+        if entry is None:
+            return
+        if entry:
+            self._threshold_index.add(alert.id, *entry)
+        else:
+            self._add_scan(alert)
+        self._pending_ids.add(alert.id)
+        self._market_event.set()
+
+    def _unindex_alert(self, alert_id: str) -> None:
+        self._threshold_index.remove(alert_id)
+        self._pending_ids.discard(alert_id)
+        if alert_id in self._scan_inputs:
+            inputs = self._scan_inputs.pop(alert_id)
+            for input_field in inputs if inputs is not None else (None,):
+                self._dependents[input_field].discard(alert_id)
+
+    def _rebuild_index(self) -> None:
+        """
+        Re-place every alert after a reload. Alerts placed as before keep
+        change-driven evaluation; new or changed ones are evaluated once.
+        """
+        previous_index, previous_scan = self._threshold_index, self._scan_inputs
+        entries = []
+        pending = set()
+        self._scan_inputs = {}
+        self._dependents = {}
         for alert in self._alerts.values():
-            if alert.enabled and not alert.triggered:
-                try:
-                    self._pending_queue.put_nowait(alert.id)
-                except asyncio.QueueFull:
-                    self._log("Evaluation queue full, dropping alert", level="warn")
-                    break
+            entry = self._fast_alert_entry(alert)
+            if entry:
+                entries.append((alert.id, *entry))
+                if previous_index.entry(alert.id) != entry:
+                    pending.add(alert.id)
+            elif entry is False:
+                self._add_scan(alert)
+                if alert.id not in previous_scan:
+                    pending.add(alert.id)
+
+        self._threshold_index = ThresholdIndex()
+        self._threshold_index.rebuild(entries)
+        self._pending_ids = {
+            a for a in self._pending_ids
+            if a in self._scan_inputs or a in self._threshold_index
+        } | pending
+        if self._pending_ids:
+            self._market_event.set()
+
+    def _threshold_candidates(self) -> Set[str]:
+        """Indexed alerts crossed since the previous pass."""
+        candidates: Set[str] = set()
+        values: Dict[IndexKey, float] = {}
+        for key in self._threshold_index.keys():
+            value = key_value(key, self._market_data)
+            if value is None:
+                continue
+            values[key] = value
+            old = self._index_values.get(key)
+            if old != value:
+                candidates.update(self._threshold_index.crossed(key, old, value))
+        self._index_values = values
+        return candidates
+
+    def _scan_candidates(self, fields: Set[str], sweep: bool) -> Set[str]:
+        """
+        Scanned alerts whose evaluator reads a changed field. A sweep returns
+        every fast-loop alert, indexed ones included, so an alert the index
+        missed (e.g. placed wrongly after an edit) is still caught.
+        """
+        if sweep:
+            return set(self._scan_inputs).union(self._threshold_index.ids())
+        if not fields:
+            return set()
+        ids = set(self._dependents.get(None, ()))
+        for changed_field in fields:
+            ids |= self._dependents.get(changed_field, set())
+        return ids
+
+    def _record_trigger_latency(self, latency_ms: float) -> None:
+        self._trigger_latencies.append(latency_ms)
+        self._analytics["last_trigger_latency_ms"] = round(latency_ms, 1)
+
+    def _trigger_latency_stats(self) -> dict:
+        """p50/p95/max over the recent market-change → trigger latencies."""
+        if not self._trigger_latencies:
+            return {}
+        ordered = sorted(self._trigger_latencies)
+        return {
+            "trigger_latency_p50_ms": round(ordered[len(ordered) // 2], 1),
+            "trigger_latency_p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 1),
+            "trigger_latency_max_ms": round(ordered[-1], 1),
+        }
 
     async def _publish_event(self, event_type: str, data: dict) -> None:
         """Publish an event to Redis pub/sub."""
@@ -661,6 +860,7 @@ class AlertEngine:
                 await self.delete_alert(alert.id)
             elif alert.behavior == "once_only":
                 alert.enabled = False
+                self._unindex_alert(alert.id)
                 await self.save_alert(alert)
             else:
                 # repeat - reset for next trigger
@@ -732,113 +932,222 @@ class AlertEngine:
 
     async def _fast_loop(self) -> None:
         """
-        Fast evaluation loop for simple alerts (price, debit, profit_target, trailing_stop).
-        Runs every 1 second.
+        Fast evaluation loop for simple alerts (price, debit, profit_target,
+        trailing_stop, ...).
+
+        Change-driven: wakes as soon as update_market_data reports changed
+        fields (or an alert is added) and evaluates only the alerts that
+        depend on them, with a full safety sweep every
+        safety_sweep_interval_ms. With change_driven off, every pass is a
+        full pass, every fast_loop_interval_ms.
         """
-        interval_sec = self._config.fast_loop_interval_ms / 1000
+        change_driven = self._config.change_driven
+        if change_driven:
+            interval_sec = self._config.safety_sweep_interval_ms / 1000
+        else:
+            interval_sec = self._config.fast_loop_interval_ms / 1000
+        next_sweep = time.monotonic()
 
         while self._running:
-            evaluated_count = 0
-            try:
-                # Evaluate all non-AI alerts
-                for alert in self._alerts.values():
-                    if not alert.enabled or alert.triggered:
-                        continue
+            sweep = not change_driven or time.monotonic() >= next_sweep
+            if sweep:
+                next_sweep = time.monotonic() + interval_sec
+            await self._fast_pass(sweep)
 
-                    evaluator = self.get_evaluator(alert.type)
-                    if evaluator and not evaluator.is_ai_powered:
-                        evaluation = await self._evaluate_alert(alert)
-                        evaluated_count += 1
-                        if evaluation:
-                            await self._handle_evaluation(alert, evaluation)
-
-                # Evaluate algo alerts (structured filters — fast, deterministic)
-                algo_evaluator = self.get_evaluator("algo_alert")
-                if algo_evaluator and self._algo_alerts:
-                    for algo_alert in self._algo_alerts.values():
-                        if algo_alert.get("status") not in ("active", "frozen"):
-                            continue
-                        try:
-                            result = await algo_evaluator.evaluate_algo_alert(
-                                algo_alert, self._market_data
-                            )
-                            evaluated_count += 1
-                            if result:
-                                await self._handle_algo_evaluation(result, algo_alert)
-                        except Exception as e:
-                            self._log(f"Algo alert eval error: {e}", level="warn")
-
-                await self._record_analytics(
-                    incr_fast_loop_runs=1,
-                    incr_alerts_evaluated=evaluated_count
-                )
-            except Exception as e:
-                self._log(f"Fast loop error: {e}", level="error")
-                await self._record_analytics(incr_errors=1)
+            if change_driven:
+                try:
+                    await asyncio.wait_for(
+                        self._market_event.wait(),
+                        timeout=max(0.0, next_sweep - time.monotonic()),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(interval_sec)
+
+    async def _fast_pass(self, sweep: bool) -> int:
+        """One fast-loop pass; returns the number of evaluations."""
+        self._market_event.clear()
+        fields, self._changed_fields = self._changed_fields, set()
+        changed_at, self._market_changed_at = self._market_changed_at, None
+
+        evaluated_count = 0
+        latency_ms = None
+        try:
+            # Non-AI alerts: new ones, threshold alerts the index says were
+            # crossed, and scanned alerts whose inputs changed
+            pending, self._pending_ids = self._pending_ids, set()
+            candidates = pending | self._threshold_candidates()
+            self._analytics["last_index_candidates"] = len(candidates)
+            for alert_id in candidates | self._scan_candidates(fields, sweep):
+                alert = self._alerts.get(alert_id)
+                if not alert or not alert.enabled or alert.triggered:
+                    continue
+
+                evaluator = self.get_evaluator(alert.type)
+                if evaluator and not evaluator.is_ai_powered:
+                    evaluation = await self._evaluate_alert(alert)
+                    evaluated_count += 1
+                    if evaluation:
+                        if evaluation.should_trigger and changed_at is not None:
+                            latency_ms = (evaluation.timestamp - changed_at) * 1000
+                            self._record_trigger_latency(latency_ms)
+                        await self._handle_evaluation(alert, evaluation)
+                    elif alert_id in candidates:
+                        # Evaluator error: retry next pass
+                        self._pending_ids.add(alert_id)
+
+            # Evaluate algo alerts (structured filters — fast, deterministic)
+            # in one pass: data sources resolved once, shared conditions memoized
+            algo_evaluator = self.get_evaluator("algo_alert")
+            if algo_evaluator and self._algo_alerts and (sweep or fields):
+                live = [
+                    a for a in self._algo_alerts.values()
+                    if a.get("status") in ("active", "frozen")
+                ]
+                for algo_alert, result in await algo_evaluator.evaluate_algo_alerts(
+                    live, self._market_data
+                ):
+                    evaluated_count += 1
+                    if not result:
+                        continue
+                    try:
+                        await self._handle_algo_evaluation(result, algo_alert)
+                    except Exception as e:
+                        self._log(f"Algo alert eval error: {e}", level="warn")
 
-            await asyncio.sleep(interval_sec)
+            metrics = {
+                "incr_fast_loop_runs": 1,
+                "incr_alerts_evaluated": evaluated_count,
+            }
+            if sweep:
+                metrics["incr_safety_sweeps"] = 1
+            if latency_ms is not None:
+                metrics["last_trigger_latency_ms"] = round(latency_ms, 1)
+            await self._record_analytics(**metrics)
+        except Exception as e:
+            self._log(f"Fast loop error: {e}", level="error")
+            await self._record_analytics(incr_errors=1)
+        return evaluated_count
 
     async def _slow_loop(self) -> None:
         """
         Slow evaluation loop for AI-powered alerts and prompt alerts.
-        Runs every 5 seconds.
+        Runs every 5 seconds; each cycle starts evaluations concurrently and
+        waits at most slow_loop_budget_ms for them (see _slow_cycle).
         """
         interval_sec = self._config.slow_loop_interval_ms / 1000
 
         while self._running:
-            evaluated_count = 0
+            started = time.monotonic()
             try:
-                # Evaluate all AI alerts
-                for alert in self._alerts.values():
-                    if not alert.enabled or alert.triggered:
-                        continue
-
-                    evaluator = self.get_evaluator(alert.type)
-                    if evaluator and evaluator.is_ai_powered:
-                        evaluation = await self._evaluate_alert(alert)
-                        evaluated_count += 1
-                        if evaluation:
-                            await self._handle_evaluation(alert, evaluation)
-
-                # Evaluate prompt alerts
-                prompt_evaluator = self.get_evaluator("prompt_driven")
-                if prompt_evaluator:
-                    for prompt_alert in self._prompt_alerts.values():
-                        if prompt_alert.get("lifecycleState") != "active":
-                            continue
-
-                        try:
-                            # Build market data with reference state
-                            market_data_with_ref = {
-                                **self._market_data,
-                                "reference_states": {
-                                    prompt_alert["id"]: prompt_alert.get("referenceState", {})
-                                },
-                                "strategies": self._market_data.get("strategies", {}),
-                            }
-
-                            evaluation = await prompt_evaluator.evaluate(
-                                prompt_alert,
-                                market_data_with_ref
-                            )
-                            evaluated_count += 1
-
-                            # Handle prompt alert stage transitions
-                            if evaluation.should_trigger:
-                                await self._handle_prompt_evaluation(prompt_alert, evaluation)
-
-                        except Exception as e:
-                            self._log(f"Prompt alert evaluation error: {e}", level="warn")
-
-                await self._record_analytics(
-                    incr_slow_loop_runs=1,
-                    incr_alerts_evaluated=evaluated_count
-                )
+                await self._slow_cycle()
             except Exception as e:
                 self._log(f"Slow loop error: {e}", level="error")
                 await self._record_analytics(incr_errors=1)
 
-            await asyncio.sleep(interval_sec)
+            await asyncio.sleep(max(0.0, interval_sec - (time.monotonic() - started)))
+
+    def _ai_jobs(self) -> List[tuple]:
+        """
+        AI and prompt alerts due for evaluation, not already in flight, as
+        (priority key, job key, provider, coroutine factory), most urgent
+        first: highest last confidence (closest to trigger), then alert
+        priority, then least recently evaluated.
+        """
+        jobs = []
+        for alert in list(self._alerts.values()):
+            if not alert.enabled or alert.triggered or alert.id in self._ai_inflight:
+                continue
+            evaluator = self.get_evaluator(alert.type)
+            if evaluator and evaluator.is_ai_powered:
+                rank = (
+                    -(alert.ai_confidence or 0.0),
+                    -_PRIORITY_RANK.get(alert.priority, 1),
+                    alert.last_ai_update or 0.0,
+                )
+                jobs.append((rank, alert.id, evaluator.ai_provider or alert.type,
+                             partial(self._run_ai_alert, alert)))
+
+        prompt_evaluator = self.get_evaluator("prompt_driven")
+        if prompt_evaluator:
+            for prompt_alert in list(self._prompt_alerts.values()):
+                key = f"prompt:{prompt_alert['id']}"
+                if prompt_alert.get("lifecycleState") != "active" or key in self._ai_inflight:
+                    continue
+                rank = (-(prompt_alert.get("lastAiConfidence") or 0.0), -1, 0.0)
+                jobs.append((rank, key, prompt_evaluator.ai_provider or "prompt_driven",
+                             partial(self._run_prompt_alert, prompt_evaluator, prompt_alert)))
+
+        jobs.sort(key=lambda job: job[0])
+        return jobs
+
+    async def _slow_cycle(self) -> None:
+        """
+        Start due AI/prompt evaluations (most urgent first) within the global
+        and per-provider concurrency caps, then wait up to the cycle budget.
+        Evaluations still running carry over: they keep their slot and are
+        not restarted until they finish.
+        """
+        per_provider: Dict[str, int] = {}
+        for provider, _ in self._ai_inflight.values():
+            per_provider[provider] = per_provider.get(provider, 0) + 1
+
+        deferred = 0
+        for _, key, provider, job in self._ai_jobs():
+            if (len(self._ai_inflight) >= self._config.ai_max_concurrency
+                    or per_provider.get(provider, 0) >= self._config.ai_provider_concurrency):
+                deferred += 1
+                continue
+            per_provider[provider] = per_provider.get(provider, 0) + 1
+            task = asyncio.create_task(self._run_ai_job(key, job), name=f"alert-ai-{key}")
+            self._ai_inflight[key] = (provider, task)
+
+        if self._ai_inflight:
+            await asyncio.wait(
+                [task for _, task in self._ai_inflight.values()],
+                timeout=self._config.slow_loop_budget_ms / 1000,
+            )
+
+        evaluated_count, self._ai_completed = self._ai_completed, 0
+        self._analytics["ai_deferred"] = deferred
+        self._analytics["ai_carried_over"] = len(self._ai_inflight)
+        await self._record_analytics(
+            incr_slow_loop_runs=1,
+            incr_alerts_evaluated=evaluated_count,
+        )
+
+    async def _run_ai_job(self, key: str, job: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await job()
+            self._ai_completed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._log(f"AI evaluation error ({key}): {e}", level="warn")
+        finally:
+            self._ai_inflight.pop(key, None)
+
+    async def _run_ai_alert(self, alert: Alert) -> None:
+        evaluation = await self._evaluate_alert(alert)
+        if evaluation:
+            await self._handle_evaluation(alert, evaluation)
+
+    async def _run_prompt_alert(self, prompt_evaluator: BaseEvaluator, prompt_alert: dict) -> None:
+        # Build market data with reference state
+        market_data_with_ref = {
+            **self._market_data,
+            "reference_states": {
+                prompt_alert["id"]: prompt_alert.get("referenceState", {})
+            },
+            "strategies": self._market_data.get("strategies", {}),
+        }
+
+        evaluation = await prompt_evaluator.evaluate(prompt_alert, market_data_with_ref)
+
+        # Handle prompt alert stage transitions
+        if evaluation.should_trigger:
+            await self._handle_prompt_evaluation(prompt_alert, evaluation)
 
     async def _handle_prompt_evaluation(self, prompt_alert: dict, evaluation) -> None:
         """Handle a prompt alert evaluation result."""
@@ -1019,6 +1328,9 @@ class AlertEngine:
                                     self._algo_alerts[alert_dict["id"]] = alert_dict
                                 except Exception as e:
                                     self._log(f"Error loading algo alert: {e}", level="warn")
+                            algo_evaluator = self.get_evaluator("algo_alert")
+                            if algo_evaluator:
+                                algo_evaluator.sync_alerts(self._algo_alerts.values())
                             self._log(f"Loaded {len(self._algo_alerts)} algo alerts from Journal DB", emoji="")
                     else:
                         self._log(f"Failed to load algo alerts: HTTP {resp.status}", level="warn")
@@ -1103,6 +1415,9 @@ class AlertEngine:
             except asyncio.CancelledError:
                 pass
 
+        for _, task in list(self._ai_inflight.values()):
+            task.cancel()
+
         # Save all alerts to Redis cache
         for alert in self._alerts.values():
             await self.save_alert(alert)
@@ -10,12 +10,23 @@ Contains evaluators for each alert type:
 - AIThetaGammaEvaluator: AI-powered dynamic risk zone evaluation
 """
 
+import asyncio
 import json
 import time
 from typing import Optional
 
 from .alert_engine import Alert, AlertEvaluation, BaseEvaluator
+from .ai_cache import CacheRule, alert_cache_key
 from .ai_providers import AIProviderManager, AIMessage
+from .order_book import BookOrder, OrderBook
+
+# Market data fields read by the fast evaluators (BaseEvaluator.inputs)
+SPOT_INPUTS = frozenset({"spot_price", "spot"})
+STRATEGY_INPUTS = frozenset({"strategies"})
+BUTTERFLY_ENTRY_INPUTS = SPOT_INPUTS | {
+    "market_mode", "bias_lfi", "gamma_levels", "zero_gamma", "gamma_magnet",
+    "volume_profile", "price_history",
+}
 
 
 class PriceEvaluator(BaseEvaluator):
@@ -32,6 +43,10 @@ class PriceEvaluator(BaseEvaluator):
     def is_ai_powered(self) -> bool:
         return False
 
+    @property
+    def inputs(self) -> frozenset:
+        return SPOT_INPUTS
+
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         spot = market_data.get("spot_price") or market_data.get("spot")
         if spot is None:
@@ -83,6 +98,10 @@ class DebitEvaluator(BaseEvaluator):
     def is_ai_powered(self) -> bool:
         return False
 
+    @property
+    def inputs(self) -> frozenset:
+        return STRATEGY_INPUTS
+
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         # Get strategy debit from market data
         strategies = market_data.get("strategies", {})
@@ -132,6 +151,10 @@ class ProfitTargetEvaluator(BaseEvaluator):
     def is_ai_powered(self) -> bool:
         return False
 
+    @property
+    def inputs(self) -> frozenset:
+        return STRATEGY_INPUTS
+
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         # Get strategy data
         strategies = market_data.get("strategies", {})
@@ -178,6 +201,10 @@ class TrailingStopEvaluator(BaseEvaluator):
     def is_ai_powered(self) -> bool:
         return False
 
+    @property
+    def inputs(self) -> frozenset:
+        return STRATEGY_INPUTS
+
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         # Get strategy data
         strategies = market_data.get("strategies", {})
@@ -225,6 +252,9 @@ class AIThetaGammaEvaluator(BaseEvaluator):
     to determine safe profit zone boundaries.
     """
 
+    # Re-ask when spot moves 5 pts, VIX 1 pt or profit 5% of entry debit
+    CACHE_RULE = CacheRule(ttl_sec=60.0, spot_step=5.0, vix_step=1.0, pnl_step=0.05)
+
     def __init__(self, ai_manager: Optional[AIProviderManager] = None):
         self._ai_manager = ai_manager
 
@@ -250,11 +280,17 @@ class AIThetaGammaEvaluator(BaseEvaluator):
 
         try:
             start_time = time.time()
+            strategy = market_data.get("strategies", {}).get(alert.strategy_id, {})
             response = await self._ai_manager.generate(
                 messages=[AIMessage(role="user", content=prompt)],
                 system_prompt=self._get_system_prompt(),
                 max_tokens=512,
                 temperature=0.3,
+                cache_key=alert_cache_key(
+                    self.alert_type, alert, market_data, self.CACHE_RULE,
+                    market_data.get("gex_regime"), strategy.get("dte"),
+                ),
+                cache_ttl=self.CACHE_RULE.ttl_sec,
             )
             latency_ms = (time.time() - start_time) * 1000
 
@@ -386,6 +422,8 @@ class AISentimentEvaluator(BaseEvaluator):
     Analyzes market conditions to determine overall sentiment.
     """
 
+    CACHE_RULE = CacheRule(ttl_sec=120.0, spot_step=10.0, vix_step=1.0)
+
     def __init__(self, ai_manager: Optional[AIProviderManager] = None):
         self._ai_manager = ai_manager
 
@@ -409,12 +447,19 @@ class AISentimentEvaluator(BaseEvaluator):
         # Build sentiment analysis prompt
         prompt = self._build_prompt(alert, market_data)
 
+        bias_lfi = market_data.get("bias_lfi") or {}
+
         try:
             response = await self._ai_manager.generate(
                 messages=[AIMessage(role="user", content=prompt)],
                 system_prompt=self._get_system_prompt(),
                 max_tokens=256,
                 temperature=0.3,
+                cache_key=alert_cache_key(
+                    self.alert_type, alert, market_data, self.CACHE_RULE,
+                    market_data.get("gex_regime"), bias_lfi.get("bias"), bias_lfi.get("flow"),
+                ),
+                cache_ttl=self.CACHE_RULE.ttl_sec,
             )
 
             return self._parse_response(alert, response.content)
@@ -509,6 +554,10 @@ class ButterflyEntryEvaluator(BaseEvaluator):
     def is_ai_powered(self) -> bool:
         return False
 
+    @property
+    def inputs(self) -> frozenset:
+        return BUTTERFLY_ENTRY_INPUTS
+
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         # Step 1: Check market mode (prefer compression)
         market_mode = market_data.get('market_mode', {}).get('score', 50)
@@ -651,6 +700,8 @@ class ButterflyProfitMgmtEvaluator(BaseEvaluator):
     Slow loop (5s) with AI analysis.
     """
 
+    CACHE_RULE = CacheRule(ttl_sec=60.0, spot_step=5.0, vix_step=1.0, pnl_step=0.05)
+
     def __init__(self, ai_manager: Optional[AIProviderManager] = None):
         self._ai_manager = ai_manager
 
@@ -804,6 +855,11 @@ class ButterflyProfitMgmtEvaluator(BaseEvaluator):
                 system_prompt=self._get_system_prompt(),
                 max_tokens=256,
                 temperature=0.3,
+                cache_key=alert_cache_key(
+                    self.alert_type, alert, market_data, self.CACHE_RULE,
+                    recommendation, int(risk_score // 10), strategy.get("dte"),
+                ),
+                cache_ttl=self.CACHE_RULE.ttl_sec,
             )
             return self._parse_ai_response(response.content)
         except Exception:
@@ -860,6 +916,10 @@ class AIRiskZoneEvaluator(BaseEvaluator):
     Identifies support/resistance/pivot zones.
     """
 
+    # Zones are re-checked against live spot on every parse, so only a
+    # larger move or a new gamma structure needs a fresh answer
+    CACHE_RULE = CacheRule(ttl_sec=120.0, spot_step=10.0, vix_step=None)
+
     def __init__(self, ai_manager: Optional[AIProviderManager] = None):
         self._ai_manager = ai_manager
 
@@ -888,6 +948,12 @@ class AIRiskZoneEvaluator(BaseEvaluator):
                 system_prompt=self._get_system_prompt(),
                 max_tokens=256,
                 temperature=0.3,
+                cache_key=alert_cache_key(
+                    self.alert_type, alert, market_data, self.CACHE_RULE,
+                    market_data.get("zero_gamma"), market_data.get("gamma_magnet"),
+                    getattr(alert, "zone_type", "pivot"),
+                ),
+                cache_ttl=self.CACHE_RULE.ttl_sec,
             )
 
             return self._parse_response(alert, market_data, response.content)
@@ -973,11 +1039,107 @@ class OrderQueueEvaluator:
     Evaluator for the order queue in simulated trading.
     Monitors pending orders against current prices and fills them when conditions are met.
     Also handles order expiration and auto-close of open trades at market close.
+
+    Pending orders live in an OrderBook: loaded from the DB, kept in sync by
+    orders:sync events (apply_sync), expired from a heap. A price update
+    bisects out the fillable orders; the DB is only touched (in a worker
+    thread) to load, to confirm and record fills, and when orders expire.
+
+    The book is reloaded every reload_interval seconds, after a failed fill
+    and whenever the orders:sync subscription (re)connects, so a missed
+    event cannot leave it out of step with the DB for long. Given a redis
+    client, the evaluator runs its own orders:sync listener.
     """
 
-    def __init__(self, db=None, logger=None):
+    SYNC_CHANNEL = "orders:sync"
+    RELOAD_INTERVAL = 300.0
+
+    def __init__(self, db=None, logger=None, redis=None, reload_interval: float = RELOAD_INTERVAL):
         self._db = db
         self._logger = logger
+        self._redis = redis
+        self._reload_interval = reload_interval
+        self._book = OrderBook()
+        self._stale = True
+        self._loaded_at = 0.0
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def book(self) -> OrderBook:
+        return self._book
+
+    async def load(self) -> None:
+        """(Re)load pending orders from the DB into the book."""
+        # Cleared before reading: a resync requested meanwhile still holds
+        self._stale = False
+        await asyncio.to_thread(self._db.expire_orders)
+        orders = await asyncio.to_thread(self._db.list_pending_orders)
+        self._book.load(BookOrder.from_order(o) for o in orders)
+        self._loaded_at = time.monotonic()
+        if self._logger:
+            self._logger.info(f"Order book loaded: {len(self._book)} pending orders", emoji="📋")
+
+    def _needs_load(self) -> bool:
+        return self._stale or time.monotonic() - self._loaded_at >= self._reload_interval
+
+    def apply_sync(self, data: dict) -> None:
+        """
+        Apply a journal orders:sync event:
+        {"action": "create", "order": {...}} or
+        {"action": "cancel" | "filled" | "expired", "order_id": id} or
+        {"action": "resync"} (reload on the next evaluation).
+        """
+        action = data.get("action")
+        if action == "create" and data.get("order"):
+            self._book.add(BookOrder.from_order(data["order"]))
+        elif action in ("cancel", "filled", "expired") and data.get("order_id") is not None:
+            self._book.remove(int(data["order_id"]))
+        elif action == "resync":
+            self._stale = True
+
+    def start(self) -> None:
+        """Start the orders:sync listener (no-op without redis or if running)."""
+        if self._redis is None or (self._listener and not self._listener.done()):
+            return
+        self._listener = asyncio.create_task(self.listen(self._redis), name="orders-sync")
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def listen(self, redis) -> None:
+        """Apply orders:sync events from redis until cancelled, resubscribing on errors."""
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(self.SYNC_CHANNEL)
+                # Events published while unsubscribed are lost: reload
+                self._stale = True
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "message":
+                        try:
+                            self.apply_sync(json.loads(message["data"]))
+                        except Exception as e:
+                            if self._logger:
+                                self._logger.warn(f"Bad {self.SYNC_CHANNEL} message: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stale = True
+                if self._logger:
+                    self._logger.warn(f"{self.SYNC_CHANNEL} subscription error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.unsubscribe(self.SYNC_CHANNEL)
+                except Exception:
+                    pass
 
     async def evaluate_orders(self, market_data: dict) -> dict:
         """
@@ -999,17 +1161,21 @@ class OrderQueueEvaluator:
             'auto_closed': []
         }
 
-        # First, expire any orders past their expiration time
-        expired_count = self._db.expire_orders()
-        if expired_count > 0 and self._logger:
-            self._logger.info(f"Expired {expired_count} orders", emoji="⏰")
+        self.start()
+        if self._needs_load():
+            await self.load()
 
-        # Get all pending orders
-        pending_orders = self._db.list_pending_orders()
+        # First, expire any orders past their expiration time
+        expired = self._book.expire(time.time())
+        if expired:
+            results['expired'] = [o.id for o in expired]
+            await asyncio.to_thread(self._db.expire_orders)
+            if self._logger:
+                self._logger.info(f"Expired {len(expired)} orders", emoji="⏰")
 
-        for order in pending_orders:
+        for symbol in self._book.symbols():
             # Get current price for the symbol
-            symbol_data = market_data.get(order.symbol, {})
+            symbol_data = market_data.get(symbol, {})
             spot = symbol_data.get('spot_price') or symbol_data.get('spot') or market_data.get('spot_price') or market_data.get('spot')
 
             if spot is None:
@@ -1019,35 +1185,19 @@ class OrderQueueEvaluator:
             bid = symbol_data.get('bid') or spot * 0.9999
             ask = symbol_data.get('ask') or spot * 1.0001
 
-            filled = False
-            fill_price = None
-
-            if order.order_type == 'entry':
-                # Entry order fill logic
-                if order.direction == 'long':
-                    # Long entry: fill at ask when spot reaches limit price
-                    if spot <= order.limit_price:
-                        filled = True
-                        fill_price = ask  # Buy at ask
-                else:  # short
-                    # Short entry: fill at bid when spot reaches limit price
-                    if spot >= order.limit_price:
-                        filled = True
-                        fill_price = bid  # Sell at bid
-            else:  # exit order
-                if order.direction == 'long':
-                    # Long exit (take profit): fill at bid when spot reaches limit
-                    if spot >= order.limit_price:
-                        filled = True
-                        fill_price = bid  # Sell at bid
-                else:  # short
-                    # Short exit (take profit): fill at ask when spot reaches limit
-                    if spot <= order.limit_price:
-                        filled = True
-                        fill_price = ask  # Buy at ask
-
-            if filled:
-                await self._fill_order(order, fill_price, market_data, results)
+            for order in self._book.fillable(symbol, spot):
+                # Buy at ask (long entry, short exit), sell at bid (short entry, long exit)
+                fill_price = ask if order.op == 'le' else bid
+                self._book.remove(order.id)
+                try:
+                    await self._fill_order(order, fill_price, market_data, results)
+                except Exception as e:
+                    # Keep it pending (retried on the next evaluation) and
+                    # check the whole book against the DB before then
+                    self._book.add(order)
+                    self._stale = True
+                    if self._logger:
+                        self._logger.error(f"Fill of order #{order.id} failed: {e}")
 
         return results
 
@@ -1056,15 +1206,21 @@ class OrderQueueEvaluator:
 
         When an entry order is filled, the resulting trade becomes immutable (core fields locked).
         This preserves the time-anchored truth of the position for learning and bias detection.
+
+        The order is re-read first: one cancelled or filled elsewhere since the
+        book last heard about it is dropped, not filled.
         """
-        from datetime import datetime
+        if not await asyncio.to_thread(self._is_pending, order.id):
+            if self._logger:
+                self._logger.info(f"Order #{order.id} is no longer pending, dropped from book", emoji="📋")
+            return
 
         if order.order_type == 'entry':
             # Create a new trade from the entry order
             # Note: This would require log_id which isn't stored in order
             # For now, we mark the order as filled and let the UI handle trade creation
             # The UI should call lock_simulated_trade after creating the trade
-            self._db.update_order_status(order.id, 'filled', fill_price)
+            await asyncio.to_thread(self._db.update_order_status, order.id, 'filled', fill_price)
             results['filled_entries'].append({
                 'order_id': order.id,
                 'symbol': order.symbol,
@@ -1081,20 +1237,8 @@ class OrderQueueEvaluator:
                     emoji="✅"
                 )
         else:  # exit order
-            # Close the associated trade
-            if order.trade_id:
-                trade = self._db.get_trade(order.trade_id)
-                if trade and trade.status == 'open':
-                    # Close the trade at fill price
-                    fill_price_cents = int(fill_price * 100)
-                    self._db.close_trade(
-                        trade_id=order.trade_id,
-                        exit_price=fill_price_cents,
-                        exit_spot=market_data.get('spot_price') or market_data.get('spot'),
-                        exit_time=datetime.utcnow().isoformat()
-                    )
-
-            self._db.update_order_status(order.id, 'filled', fill_price)
+            exit_spot = market_data.get('spot_price') or market_data.get('spot')
+            await asyncio.to_thread(self._fill_exit_sync, order, fill_price, exit_spot)
             results['filled_exits'].append({
                 'order_id': order.id,
                 'trade_id': order.trade_id,
@@ -1109,6 +1253,28 @@ class OrderQueueEvaluator:
                     emoji="✅"
                 )
 
+    def _is_pending(self, order_id: int) -> bool:
+        current = self._db.get_order(order_id)
+        return current is not None and current.status == 'pending'
+
+    def _fill_exit_sync(self, order, fill_price: float, exit_spot) -> None:
+        """Close the associated trade and mark the order filled (worker thread)."""
+        from datetime import datetime
+
+        if order.trade_id:
+            trade = self._db.get_trade(order.trade_id)
+            if trade and trade.status == 'open':
+                # Close the trade at fill price
+                fill_price_cents = int(fill_price * 100)
+                self._db.close_trade(
+                    trade_id=order.trade_id,
+                    exit_price=fill_price_cents,
+                    exit_spot=exit_spot,
+                    exit_time=datetime.utcnow().isoformat()
+                )
+
+        self._db.update_order_status(order.id, 'filled', fill_price)
+
     async def auto_close_at_market_close(self, market_data: dict) -> list:
         """
         Auto-close all open simulated trades at market close (4:00 PM ET).
@@ -1163,6 +1329,10 @@ class PortfolioPnLEvaluator(BaseEvaluator):
     def is_ai_powered(self) -> bool:
         return False
 
+    @property
+    def inputs(self) -> frozenset:
+        return STRATEGY_INPUTS
+
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         strategies = market_data.get("strategies", {})
         if not strategies:
@@ -1212,6 +1382,10 @@ class PortfolioTrailingEvaluator(BaseEvaluator):
     def is_ai_powered(self) -> bool:
         return False
 
+    @property
+    def inputs(self) -> frozenset:
+        return STRATEGY_INPUTS
+
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         strategies = market_data.get("strategies", {})
         if not strategies:
@@ -1263,6 +1437,10 @@ class GreeksThresholdEvaluator(BaseEvaluator):
     def is_ai_powered(self) -> bool:
         return False
 
+    @property
+    def inputs(self) -> frozenset:
+        return frozenset({"greeks"})
+
     async def evaluate(self, alert: Alert, market_data: dict) -> AlertEvaluation:
         greeks = market_data.get("greeks", {})
         if not greeks:
@@ -0,0 +1,194 @@
+# services/copilot/intel/alert_index.py
+"""
+Alert Index - Sorted-threshold index for threshold alerts.
+
+Price, debit and profit-target alerts are plain comparisons of one market
+value against a fixed threshold. Instead of awaiting every evaluator every
+fast-loop tick, AlertEngine keeps them in a ThresholdIndex:
+
+    key        the market value an alert watches
+               ("spot",)                     spot price
+               ("debit", strategy_id)        strategy current debit
+               ("profit", strategy_id, entry) profit % vs the alert's entry debit
+    op         comparison the evaluator makes ("gt", "lt", "ge", "at")
+    threshold  right-hand side of that comparison
+
+Each (key, op) holds its thresholds in a sorted array. When a value moves
+from A to B, crossed() bisects out exactly the alerts whose comparison was
+false at A and is true at B ("at" alerts: those within the 0.1% band at B).
+Only those candidates are handed to their evaluators, so a tick costs
+O(log n + crossed) instead of O(alerts).
+
+key_value() mirrors how the evaluators read market data, and the ops use
+the evaluators' own comparisons, so a candidate set is never smaller than
+the set of alerts the evaluators would trigger. Alerts index_entry() cannot
+express (other types, entry debit taken from the strategy, non-positive
+"at" targets) stay on the per-tick scan.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .alert_engine import Alert
+
+IndexKey = Tuple[Hashable, ...]
+
+# PriceEvaluator / DebitEvaluator "at": abs(value - target) / target < 0.001
+AT_TOLERANCE = 0.001
+
+_CONDITION_OPS = {"above": "gt", "below": "lt", "at": "at"}
+
+
+def index_entry(alert: "Alert") -> Optional[Tuple[IndexKey, str, float]]:
+    """(key, op, threshold) for an indexable alert, None for the per-tick scan."""
+    if alert.type in ("price", "debit"):
+        op = _CONDITION_OPS.get(alert.condition)
+        if op is None or (op == "at" and alert.target_value <= 0):
+            return None
+        if alert.type == "price":
+            return ("spot",), op, alert.target_value
+        return ("debit", alert.strategy_id), op, alert.target_value
+
+    if alert.type == "profit_target" and alert.entry_debit:
+        # ProfitTargetEvaluator: (entry - current) / entry >= target
+        return ("profit", alert.strategy_id, alert.entry_debit), "ge", alert.target_value
+
+    return None
+
+
+def key_value(key: IndexKey, market_data: dict) -> Optional[float]:
+    """Current value of an index key, read the way the evaluators read it."""
+    kind = key[0]
+    if kind == "spot":
+        return market_data.get("spot_price") or market_data.get("spot")
+
+    strategy = market_data.get("strategies", {}).get(key[1], {})
+    current_debit = strategy.get("current_debit") or strategy.get("debit")
+    if current_debit is None:
+        return None
+    if kind == "debit":
+        return current_debit
+    entry_debit = key[2]
+    return (entry_debit - current_debit) / entry_debit
+
+
+class _Book:
+    """Thresholds for one (key, op), sorted, with their alert ids alongside."""
+
+    __slots__ = ("thresholds", "ids")
+
+    def __init__(self) -> None:
+        self.thresholds: List[float] = []
+        self.ids: List[str] = []
+
+    def add(self, threshold: float, alert_id: str) -> None:
+        i = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(i, threshold)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, threshold: float, alert_id: str) -> None:
+        i = bisect_left(self.thresholds, threshold)
+        while i < len(self.ids) and self.thresholds[i] == threshold:
+            if self.ids[i] == alert_id:
+                del self.thresholds[i]
+                del self.ids[i]
+                return
+            i += 1
+
+    def between(self, lo: int, hi: int) -> List[str]:
+        return self.ids[lo:hi] if hi > lo else []
+
+
+class ThresholdIndex:
+    """
+    Sorted threshold arrays per (key, op).
+
+    crossed(key, old, new) returns the alert ids whose comparison is false
+    at old and true at new; old=None (first value seen) returns every alert
+    whose comparison is true at new.
+    """
+
+    def __init__(self) -> None:
+        self._books: Dict[IndexKey, Dict[str, _Book]] = {}
+        self._entries: Dict[str, Tuple[IndexKey, str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, alert_id: str) -> bool:
+        return alert_id in self._entries
+
+    def entry(self, alert_id: str) -> Optional[Tuple[IndexKey, str, float]]:
+        return self._entries.get(alert_id)
+
+    def ids(self) -> List[str]:
+        return list(self._entries)
+
+    def keys(self) -> List[IndexKey]:
+        return list(self._books)
+
+    def add(self, alert_id: str, key: IndexKey, op: str, threshold: float) -> None:
+        self.remove(alert_id)
+        self._books.setdefault(key, {}).setdefault(op, _Book()).add(threshold, alert_id)
+        self._entries[alert_id] = (key, op, threshold)
+
+    def remove(self, alert_id: str) -> None:
+        entry = self._entries.pop(alert_id, None)
+        if entry is None:
+            return
+        key, op, threshold = entry
+        books = self._books[key]
+        books[op].remove(threshold, alert_id)
+        if not books[op].ids:
+            del books[op]
+        if not books:
+            del self._books[key]
+
+    def rebuild(self, entries: List[Tuple[str, IndexKey, str, float]]) -> None:
+        """Replace the whole index (bulk load: one sort per book)."""
+        grouped: Dict[IndexKey, Dict[str, List[Tuple[float, str]]]] = {}
+        self._entries = {}
+        for alert_id, key, op, threshold in entries:
+            grouped.setdefault(key, {}).setdefault(op, []).append((threshold, alert_id))
+            self._entries[alert_id] = (key, op, threshold)
+
+        self._books = {}
+        for key, ops in grouped.items():
+            for op, pairs in ops.items():
+                pairs.sort()
+                book = _Book()
+                book.thresholds = [t for t, _ in pairs]
+                book.ids = [a for _, a in pairs]
+                self._books.setdefault(key, {})[op] = book
+
+    def crossed(self, key: IndexKey, old: Optional[float], new: float) -> List[str]:
+        books = self._books.get(key)
+        if not books:
+            return []
+
+        out: List[str] = []
+        for op, book in books.items():
+            t = book.thresholds
+            if op == "gt":      # new > threshold, not old > threshold: [old, new)
+                lo = 0 if old is None else bisect_left(t, old)
+                out += book.between(lo, bisect_left(t, new))
+            elif op == "ge":    # new >= threshold, not old >= threshold: (old, new]
+                lo = 0 if old is None else bisect_right(t, old)
+                out += book.between(lo, bisect_right(t, new))
+            elif op == "lt":    # new < threshold, not old < threshold: (new, old]
+                hi = len(t) if old is None else bisect_right(t, old)
+                out += book.between(bisect_right(t, new), hi)
+            elif op == "at" and new > 0:
+                # |new - t| < tol * t  <=>  new / (1 + tol) < t < new / (1 - tol);
+                # level-triggered, widened slightly so rounding never drops one
+                lo = bisect_left(t, new / (1 + AT_TOLERANCE) * (1 - 1e-9))
+                hi = bisect_right(t, new / (1 - AT_TOLERANCE) * (1 + 1e-9))
+                out += book.between(lo, hi)
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "alerts_indexed": len(self._entries),
+            "index_keys": len(self._books),
+        }
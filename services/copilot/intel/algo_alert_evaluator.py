@@ -19,7 +19,7 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, UTC, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from .alert_engine import AlertEvaluation, BaseEvaluator
 
@@ -77,6 +77,15 @@ class ManagementRecommendation:
     risk_score: float  # 0-100
 
 
+@dataclass
+class CompiledAlgoAlert:
+    """An algo alert's filters and entry constraints, parsed once per load/update."""
+    filters_raw: Any
+    constraints_raw: Any
+    filters: List["CompiledFilter"]
+    constraints: Optional[dict]
+
+
 @dataclass
 class AlgoAlertState:
     """Internal tracking state for an algo alert across evaluation cycles."""
@@ -94,12 +103,114 @@ class AlgoAlertState:
 
 # ==================== Filter Engine ====================
 
+def _never(current: Any) -> bool:
+    return False
+
+
+def _compile_predicate(operator: str, target: Any) -> Callable[[Any], bool]:
+    """
+    Predicate for one operator with its target converted once.
+
+    Same semantics as comparing at evaluation time: numeric operators
+    compare as floats, string eq / in / not_in compare lower-cased, and a
+    target that cannot be converted never passes. Predicates may raise
+    ValueError/TypeError on an unconvertible current value (= not passed).
+    """
+    try:
+        if operator == "gt":
+            t = float(target)
+            return lambda current: float(current) > t
+        if operator == "lt":
+            t = float(target)
+            return lambda current: float(current) < t
+        if operator == "gte":
+            t = float(target)
+            return lambda current: float(current) >= t
+        if operator == "lte":
+            t = float(target)
+            return lambda current: float(current) <= t
+        if operator == "eq":
+            if isinstance(target, str):
+                t = target.lower()
+                return lambda current: str(current).lower() == t
+            t = float(target)
+            return lambda current: float(current) == t
+        if operator == "between":
+            if isinstance(target, (list, tuple)) and len(target) == 2:
+                lo, hi = float(target[0]), float(target[1])
+                return lambda current: lo <= float(current) <= hi
+            return _never
+        if operator in ("in", "not_in"):
+            targets = target if isinstance(target, (list, tuple)) else [target]
+            allowed = frozenset(str(t).lower() for t in targets)
+            if operator == "in":
+                return lambda current: str(current).lower() in allowed
+            return lambda current: str(current).lower() not in allowed
+    except (ValueError, TypeError):
+        return _never
+    return _never
+
+
+@dataclass(frozen=True)
+class CompiledFilter:
+    """A FilterCondition compiled for repeated evaluation."""
+    condition: FilterCondition
+    source: Optional[Tuple[str, str]]   # (data_source, field); None = unknown data source
+    key: Tuple                          # shared by identical conditions across alerts
+    predicate: Callable[[Any], bool]
+
+
+class FilterContext:
+    """
+    One tick's view of market data, shared by every algo alert.
+
+    Each (data_source, field) is resolved once, and each distinct
+    condition (source, field, operator, value) is evaluated once; alerts
+    sharing a condition reuse the outcome.
+    """
+
+    def __init__(self, market_data: dict):
+        self.market_data = market_data
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self._outcomes: Dict[Tuple, Tuple[Any, bool]] = {}
+        self.memo_hits = 0
+
+    def value(self, source: Tuple[str, str]) -> Any:
+        if source not in self._values:
+            self._values[source] = FilterEngine.resolve(source[0], source[1], self.market_data)
+        return self._values[source]
+
+    def outcome(self, cf: CompiledFilter) -> Tuple[Any, bool]:
+        """(current value, operator passed) — current is None when unavailable."""
+        hit = self._outcomes.get(cf.key)
+        if hit is not None:
+            self.memo_hits += 1
+            return hit
+
+        current = self.value(cf.source)
+        passed = False
+        if current is not None:
+            try:
+                passed = cf.predicate(current)
+            except (ValueError, TypeError):
+                passed = False
+        self._outcomes[cf.key] = (current, passed)
+        return current, passed
+
+    @property
+    def resolved(self) -> int:
+        return len(self._values)
+
+
 class FilterEngine:
     """
     Evaluates structured filter conditions against live market data.
 
     Fail-closed: if required=True and data is missing, filter fails.
     This is a permission gate, not a trigger.
+
+    Conditions are compiled once (compile) and evaluated per tick against
+    a shared FilterContext (evaluate_compiled).
     """
 
     # Map data_source to market_data keys
@@ -115,6 +226,34 @@ class FilterEngine:
         "position": "position",
     }
 
+    @classmethod
+    def resolve(cls, data_source: str, field: str, market_data: dict) -> Any:
+        """Current value for (data_source, field); None when unavailable."""
+        # Special handling for flat fields (price → spot_price, dte → dte value)
+        if data_source == "price" and field == "spot":
+            return market_data.get("spot_price") or market_data.get("spot")
+        if data_source == "dte" and field == "dte":
+            return market_data.get("dte")
+
+        source_data = market_data.get(cls.SOURCE_KEY_MAP[data_source])
+        if isinstance(source_data, dict):
+            return source_data.get(field)
+        return source_data
+
+    def compile(self, filters: List[FilterCondition]) -> List[CompiledFilter]:
+        compiled = []
+        for f in filters:
+            if f.data_source not in self.SOURCE_KEY_MAP:
+                compiled.append(CompiledFilter(f, None, (), _never))
+                continue
+            compiled.append(CompiledFilter(
+                condition=f,
+                source=(f.data_source, f.field),
+                key=(f.data_source, f.field, f.operator, repr(f.value)),
+                predicate=_compile_predicate(f.operator, f.value),
+            ))
+        return compiled
+
     def evaluate(
         self,
         filters: List[FilterCondition],
@@ -126,116 +265,41 @@ class FilterEngine:
         Returns (all_passed, results).
         All filters must pass for all_passed=True.
         """
+        return self.evaluate_compiled(self.compile(filters), FilterContext(market_data))
+
+    def evaluate_compiled(
+        self,
+        compiled: List[CompiledFilter],
+        ctx: FilterContext,
+    ) -> Tuple[bool, List[FilterEvaluationResult]]:
         results = []
         all_passed = True
 
-        for f in filters:
-            result = self._evaluate_single(f, market_data)
-            results.append(result)
-            if not result.passed:
-                all_passed = False
-
-        return all_passed, results
-
-    def _evaluate_single(
-        self, f: FilterCondition, market_data: dict
-    ) -> FilterEvaluationResult:
-        """Evaluate a single filter condition."""
-        source_key = self.SOURCE_KEY_MAP.get(f.data_source)
-        if not source_key:
-            return FilterEvaluationResult(
-                filter_id=f.id,
-                data_source=f.data_source,
-                field=f.field,
-                passed=False,
-                current_value=None,
-                target_value=f.value,
-                data_available=False,
-            )
-
-        # Extract the data source dict from market_data
-        source_data = market_data.get(source_key)
+        for cf in compiled:
+            f = cf.condition
+            if cf.source is None:
+                # Unknown data source: never passes
+                current, available, passed = None, False, False
+            else:
+                current, passed = ctx.outcome(cf)
+                available = current is not None
+                if not available:
+                    # Fail-closed: missing data + required = fail
+                    passed = not f.required
 
-        # Special handling for flat fields (price → spot_price, dte → dte value)
-        if f.data_source == "price" and f.field == "spot":
-            current_value = market_data.get("spot_price") or market_data.get("spot")
-            data_available = current_value is not None
-        elif f.data_source == "dte" and f.field == "dte":
-            current_value = market_data.get("dte")
-            data_available = current_value is not None
-        elif source_data is None:
-            # Fail-closed on missing data source
-            return FilterEvaluationResult(
-                filter_id=f.id,
-                data_source=f.data_source,
-                field=f.field,
-                passed=not f.required,  # Only pass if not required
-                current_value=None,
-                target_value=f.value,
-                data_available=False,
-            )
-        elif isinstance(source_data, dict):
-            current_value = source_data.get(f.field)
-            data_available = current_value is not None
-        else:
-            current_value = source_data
-            data_available = current_value is not None
-
-        # Fail-closed: missing data + required = fail
-        if not data_available:
-            return FilterEvaluationResult(
+            results.append(FilterEvaluationResult(
                 filter_id=f.id,
                 data_source=f.data_source,
                 field=f.field,
-                passed=not f.required,
-                current_value=None,
+                passed=passed,
+                current_value=current,
                 target_value=f.value,
-                data_available=False,
-            )
-
-        # Apply operator
-        passed = self._apply_operator(f.operator, current_value, f.value)
-
-        return FilterEvaluationResult(
-            filter_id=f.id,
-            data_source=f.data_source,
-            field=f.field,
-            passed=passed,
-            current_value=current_value,
-            target_value=f.value,
-            data_available=True,
-        )
+                data_available=available,
+            ))
+            if not passed:
+                all_passed = False
 
-    def _apply_operator(self, operator: str, current: Any, target: Any) -> bool:
-        """Apply a comparison operator."""
-        try:
-            if operator == "gt":
-                return float(current) > float(target)
-            elif operator == "lt":
-                return float(current) < float(target)
-            elif operator == "eq":
-                if isinstance(target, str):
-                    return str(current).lower() == target.lower()
-                return float(current) == float(target)
-            elif operator == "gte":
-                return float(current) >= float(target)
-            elif operator == "lte":
-                return float(current) <= float(target)
-            elif operator == "between":
-                if isinstance(target, (list, tuple)) and len(target) == 2:
-                    return float(target[0]) <= float(current) <= float(target[1])
-                return False
-            elif operator == "in":
-                if isinstance(target, (list, tuple)):
-                    return str(current).lower() in [str(t).lower() for t in target]
-                return str(current).lower() == str(target).lower()
-            elif operator == "not_in":
-                if isinstance(target, (list, tuple)):
-                    return str(current).lower() not in [str(t).lower() for t in target]
-                return str(current).lower() != str(target).lower()
-        except (ValueError, TypeError):
-            return False
-        return False
+        return all_passed, results
 
 
 # ==================== Convexity Gate ====================
@@ -469,6 +533,10 @@ class AlgoAlertEvaluator(BaseEvaluator):
     Follows BaseEvaluator pattern. Runs in the fast loop (structured filters
     are deterministic and cheap — no AI required).
 
+    Filters are compiled when an alert is first seen or its definition
+    changes (sync_alerts on load); evaluate_algo_alerts runs every alert
+    against one shared FilterContext per tick.
+
     Evaluation flow:
     1. Run FilterEngine against market data
     2. Check for regime conflict (oscillation detection)
@@ -488,6 +556,12 @@ class AlgoAlertEvaluator(BaseEvaluator):
         # Per-alert evaluation state tracking
         self._alert_states: Dict[str, AlgoAlertState] = {}
 
+        # Compiled definitions (alert id -> filters/constraints)
+        self._compiled: Dict[str, CompiledAlgoAlert] = {}
+
+        # Last evaluate_algo_alerts pass
+        self.last_pass_stats: Dict[str, int] = {}
+
         # Default proposal TTL: 5 minutes
         self.proposal_ttl_seconds = 300
 
@@ -547,10 +621,103 @@ class AlgoAlertEvaluator(BaseEvaluator):
         recent = state.recent_pass_results[-AlgoAlertState.STABLE_RESUME_THRESHOLD:]
         return len(set(recent)) == 1  # All same value
 
+    def _compile_alert(self, algo_alert: dict) -> CompiledAlgoAlert:
+        filters_raw = algo_alert.get("filters")
+        constraints_raw = algo_alert.get("entry_constraints") or algo_alert.get("entryConstraints")
+
+        # Parse filters from JSON
+        parsed = filters_raw or []
+        if isinstance(parsed, str):
+            try:
+                parsed = json.loads(parsed)
+            except json.JSONDecodeError:
+                parsed = []
+
+        filters = []
+        for f in parsed:
+            filters.append(FilterCondition(
+                id=f.get("id", str(uuid.uuid4())),
+                data_source=f.get("dataSource", f.get("data_source", "")),
+                field=f.get("field", ""),
+                operator=f.get("operator", "gt"),
+                value=f.get("value", 0),
+                required=f.get("required", True),
+            ))
+
+        constraints = constraints_raw
+        if isinstance(constraints, str):
+            try:
+                constraints = json.loads(constraints)
+            except json.JSONDecodeError:
+                constraints = None
+
+        return CompiledAlgoAlert(
+            filters_raw=filters_raw,
+            constraints_raw=constraints_raw,
+            filters=self._filter_engine.compile(filters),
+            constraints=constraints,
+        )
+
+    def _compiled_alert(self, algo_alert: dict) -> CompiledAlgoAlert:
+        """Compiled definition, recompiled when filters/constraints are replaced."""
+        alert_id = algo_alert.get("id", "")
+        compiled = self._compiled.get(alert_id)
+        if (
+            compiled is None
+            or compiled.filters_raw is not algo_alert.get("filters")
+            or compiled.constraints_raw is not (
+                algo_alert.get("entry_constraints") or algo_alert.get("entryConstraints"))
+        ):
+            compiled = self._compiled[alert_id] = self._compile_alert(algo_alert)
+        return compiled
+
+    def sync_alerts(self, algo_alerts: Iterable[dict]) -> None:
+        """Compile loaded/updated alerts and forget alerts that are gone."""
+        live = set()
+        for algo_alert in algo_alerts:
+            alert_id = algo_alert.get("id", "")
+            live.add(alert_id)
+            self._compiled_alert(algo_alert)
+        for alert_id in [a for a in self._compiled if a not in live]:
+            del self._compiled[alert_id]
+            self._alert_states.pop(alert_id, None)
+
+    async def evaluate_algo_alerts(
+        self,
+        algo_alerts: List[dict],
+        market_data: dict,
+    ) -> List[Tuple[dict, Optional[dict]]]:
+        """
+        Evaluate many algo alerts in one pass over a shared FilterContext.
+
+        Returns (algo_alert, result) pairs; an alert whose evaluation fails
+        is logged and skipped.
+        """
+        ctx = FilterContext(market_data)
+        out = []
+        filters = 0
+        for algo_alert in algo_alerts:
+            try:
+                result = await self.evaluate_algo_alert(algo_alert, market_data, ctx)
+            except Exception as e:
+                self._log(f"Algo alert eval error ({algo_alert.get('id', '')}): {e}", level="warn")
+                continue
+            filters += len(self._compiled[algo_alert.get("id", "")].filters)
+            out.append((algo_alert, result))
+
+        self.last_pass_stats = {
+            "alerts": len(out),
+            "filters": filters,
+            "sources_resolved": ctx.resolved,
+            "memo_hits": ctx.memo_hits,
+        }
+        return out
+
     async def evaluate_algo_alert(
         self,
         algo_alert: dict,
         market_data: dict,
+        ctx: Optional[FilterContext] = None,
     ) -> Optional[dict]:
         """
         Evaluate a single algo alert against market data.
@@ -558,6 +725,7 @@ class AlgoAlertEvaluator(BaseEvaluator):
         Args:
             algo_alert: Dict with alert definition from database
             market_data: Current market data snapshot
+            ctx: Shared per-tick FilterContext (evaluate_algo_alerts)
 
         Returns:
             Dict with evaluation result and any proposal, or None on error
@@ -566,28 +734,13 @@ class AlgoAlertEvaluator(BaseEvaluator):
         mode = algo_alert.get("mode", "entry")
         status = algo_alert.get("status", "active")
         state = self._get_state(alert_id)
-
-        # Parse filters from JSON
-        filters_raw = algo_alert.get("filters", [])
-        if isinstance(filters_raw, str):
-            try:
-                filters_raw = json.loads(filters_raw)
-            except json.JSONDecodeError:
-                filters_raw = []
-
-        filters = []
-        for f in filters_raw:
-            filters.append(FilterCondition(
-                id=f.get("id", str(uuid.uuid4())),
-                data_source=f.get("dataSource", f.get("data_source", "")),
-                field=f.get("field", ""),
-                operator=f.get("operator", "gt"),
-                value=f.get("value", 0),
-                required=f.get("required", True),
-            ))
+        compiled = self._compiled_alert(algo_alert)
+        filters = compiled.filters
 
         # Step 1: Run FilterEngine
-        all_passed, filter_results = self._filter_engine.evaluate(filters, market_data)
+        all_passed, filter_results = self._filter_engine.evaluate_compiled(
+            filters, ctx or FilterContext(market_data)
+        )
 
         # Step 2: Oscillation detection
         is_oscillating = self._detect_oscillation(state, all_passed)
@@ -647,12 +800,7 @@ class AlgoAlertEvaluator(BaseEvaluator):
                 return result
 
             # ConvexityGate
-            constraints_raw = algo_alert.get("entry_constraints") or algo_alert.get("entryConstraints")
-            if isinstance(constraints_raw, str):
-                try:
-                    constraints_raw = json.loads(constraints_raw)
-                except json.JSONDecodeError:
-                    constraints_raw = None
+            constraints_raw = compiled.constraints
 
             gate_result = self._convexity_gate.check(market_data, constraints_raw)
             if not gate_result.feasible:
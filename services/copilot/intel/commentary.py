@@ -7,6 +7,7 @@ The AI observes and comments, users do not interact.
 
 import asyncio
 import logging
+from contextlib import aclosing
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta
 from collections import deque
@@ -26,7 +27,7 @@ from .commentary_prompts import (
     get_category_for_trigger,
 )
 from .mel_models import MELSnapshot
-from .ai_providers import AIProviderManager, AIProviderConfig, AIMessage, create_provider
+from .ai_providers import AIProviderManager, AIProviderConfig, AIMessage, AIResponse, create_provider
 
 
 class CommentaryOrchestrator:
@@ -78,6 +79,7 @@ class CommentaryOrchestrator:
 
         # Subscribers
         self._subscribers: List[Callable[[CommentaryMessage], None]] = []
+        self._stream_subscribers: List[Callable[[str, CommentaryCategory, str], None]] = []
 
         # State
         self._running = False
@@ -132,6 +134,15 @@ class CommentaryOrchestrator:
         if callback in self._subscribers:
             self._subscribers.remove(callback)
 
+    def subscribe_stream(self, callback: Callable[[str, CommentaryCategory, str], None]) -> None:
+        """
+        Subscribe to streamed deltas: callback(message_id, category, delta).
+
+        The complete message still arrives through subscribe() with the
+        same id once generation finishes.
+        """
+        self._stream_subscribers.append(callback)
+
     def update_mel_snapshot(self, snapshot: MELSnapshot) -> None:
         """
         Update current MEL snapshot and check for triggers.
@@ -254,15 +265,21 @@ class CommentaryOrchestrator:
 
             # Generate via AI
             messages = [AIMessage(role="user", content=prompt)]
+            message_id = CommentaryMessage.new_id()
+            category = get_category_for_trigger(trigger.type)
 
-            response = await self.ai_manager.generate(
-                messages=messages,
-                system_prompt=system,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-            )
-
-            if not response.content:
+            if self.config.stream:
+                response = await self._stream_commentary(message_id, category, messages, system)
+            else:
+                response = await self.ai_manager.generate(
+                    messages=messages,
+                    system_prompt=system,
+                    max_tokens=self.config.max_tokens,
+                    temperature=self.config.temperature,
+                )
+            text = response.content if response else None
+
+            if not text:
                 self.logger.warning("Empty response from AI provider")
                 return None
 
@@ -271,13 +288,12 @@ class CommentaryOrchestrator:
             self._generation_count_minute += 1
 
             # Create message
-            category = get_category_for_trigger(trigger.type)
-
             message = CommentaryMessage.create(
                 category=category,
-                text=response.content,
+                text=text,
                 trigger=trigger,
                 mel_context=self._current_mel.to_dict() if self._current_mel else None,
+                message_id=message_id,
                 provider=response.provider,
                 model=response.model,
                 tokens_used=response.tokens_used,
@@ -290,6 +306,36 @@ class CommentaryOrchestrator:
             self.logger.error(f"Generation error: {e}")
             return None
 
+    async def _stream_commentary(
+        self,
+        message_id: str,
+        category: CommentaryCategory,
+        messages: List[AIMessage],
+        system: str,
+    ) -> Optional[AIResponse]:
+        """
+        Stream a generation, pushing each delta to stream subscribers.
+
+        Returns the manager's completed response (the provider that actually
+        answered). The stream is closed explicitly so a cancelled task frees
+        its provider slot right away.
+        """
+        completed: List[AIResponse] = []
+        async with aclosing(self.ai_manager.generate_stream(
+            messages=messages,
+            system_prompt=system,
+            on_complete=completed.append,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+        )) as stream:
+            async for delta in stream:
+                for callback in self._stream_subscribers:
+                    try:
+                        callback(message_id, category, delta)
+                    except Exception as e:
+                        self.logger.error(f"Stream subscriber callback error: {e}")
+        return completed[0] if completed else None
+
     def _notify_subscribers(self, message: CommentaryMessage) -> None:
         """Notify all subscribers of new message."""
         for callback in self._subscribers:
@@ -344,6 +390,10 @@ class CommentaryService:
         """Unsubscribe from commentary messages."""
         self.orchestrator.unsubscribe(callback)
 
+    def subscribe_stream(self, callback: Callable[[str, CommentaryCategory, str], None]) -> None:
+        """Subscribe to streamed commentary deltas."""
+        self.orchestrator.subscribe_stream(callback)
+
     def update_mel(self, snapshot: MELSnapshot) -> None:
         """Update MEL snapshot."""
         self.orchestrator.update_mel_snapshot(snapshot)
@@ -10,11 +10,12 @@ Provides endpoints for:
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any, Set
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any, Set
 from datetime import datetime
 
 from .commentary import CommentaryService
-from .commentary_models import CommentaryMessage, CommentaryConfig
+from .commentary_models import CommentaryCategory, CommentaryMessage, CommentaryConfig
 
 
 class CommentaryAPIHandler:
@@ -25,7 +26,7 @@ class CommentaryAPIHandler:
     - GET /api/commentary - Get recent messages
     - GET /api/commentary/config - Get current config
     - PUT /api/commentary/config - Update config
-    - WS /ws/commentary - Stream messages
+    - WS /ws/commentary - Stream messages (commentary_delta while generating)
     """
 
     def __init__(
@@ -39,26 +40,48 @@ class CommentaryAPIHandler:
         # WebSocket connections
         self._ws_connections: Set[Any] = set()
 
-        # Subscribe to messages for WebSocket broadcast
+        # Outgoing payloads, sent in order by one task (deltas must not overtake)
+        self._outbox: Deque[Dict[str, Any]] = deque()
+        self._sender: Optional[asyncio.Task] = None
+
+        # Subscribe to messages (and streamed deltas) for WebSocket broadcast
         self.service.subscribe(self._on_message)
+        self.service.subscribe_stream(self._on_delta)
 
     def _on_message(self, message: CommentaryMessage) -> None:
         """Handle new message - broadcast to WebSocket clients."""
-        asyncio.create_task(self._broadcast_message(message))
+        self._enqueue({
+            "type": "commentary",
+            "data": message.to_dict(),
+        })
 
-    async def _broadcast_message(self, message: CommentaryMessage) -> None:
-        """Broadcast message to all WebSocket clients."""
+    def _on_delta(self, message_id: str, category: CommentaryCategory, delta: str) -> None:
+        """Handle a streamed delta - clients append it to message_id until
+        the complete "commentary" message with the same id replaces it."""
+        if not self._ws_connections:
+            return
+        self._enqueue({
+            "type": "commentary_delta",
+            "data": {"id": message_id, "category": category.value, "delta": delta},
+        })
+
+    def _enqueue(self, payload: Dict[str, Any]) -> None:
+        self._outbox.append(payload)
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.create_task(self._drain_outbox())
+
+    async def _drain_outbox(self) -> None:
+        while self._outbox:
+            await self._broadcast(self._outbox.popleft())
+
+    async def _broadcast(self, payload: Dict[str, Any]) -> None:
+        """Broadcast a payload to all WebSocket clients."""
         if not self._ws_connections:
             return
-
-        payload = {
-            "type": "commentary",
-            "data": message.to_dict(),
-        }
 
         # Send to all connections
         dead_connections = []
-        for ws in self._ws_connections:
+        for ws in list(self._ws_connections):
             try:
                 # Handle both aiohttp and raw websockets
                 if hasattr(ws, 'send_json'):
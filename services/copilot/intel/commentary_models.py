@@ -74,6 +74,10 @@ class CommentaryMessage:
             "metadata": self.metadata,
         }
 
+    @staticmethod
+    def new_id() -> str:
+        return f"cmt_{uuid.uuid4().hex[:12]}"
+
     @classmethod
     def create(
         cls,
@@ -81,10 +85,11 @@ class CommentaryMessage:
         text: str,
         trigger: Optional[CommentaryTrigger] = None,
         mel_context: Optional[Dict[str, Any]] = None,
+        message_id: Optional[str] = None,
         **metadata,
     ) -> "CommentaryMessage":
         return cls(
-            id=f"cmt_{uuid.uuid4().hex[:12]}",
+            id=message_id or cls.new_id(),
             category=category,
             text=text,
             timestamp=datetime.utcnow(),
@@ -105,6 +110,7 @@ class CommentaryConfig:
     model: Optional[str] = None
     max_tokens: int = 256
     temperature: float = 0.7
+    stream: bool = True  # Push deltas to subscribers as tokens arrive
 
     # Rate limiting
     rate_limit_per_minute: int = 10
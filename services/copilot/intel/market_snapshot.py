@@ -0,0 +1,358 @@
+"""
+Market Snapshot - Single-round-trip, change-aware loader for massive market data.
+
+CopilotOrchestrator.poll_market_data used to issue ~10 sequential awaits per
+poll (spot, bars/trail, heatmap, VP, bias/LFI, market mode, VIX regime,
+trade selector, GEX calls/puts) and re-parse every payload each time.
+
+MarketSnapshotLoader.load():
+- one pipelined round trip: MGET of the JSON models + ZRANGE bars/trail +
+  HGETALL of the $1 volume-profile pyramid level + HGETALL heatmap slice
+  versions
+- a second round trip only for heatmap slices whose version moved (the full
+  heatmap model, when slices are not published, rides in the first one)
+- re-parses a model only when its payload changed since the last load (the
+  models' version/ts live inside the JSON, so an unchanged payload is an
+  unchanged version), and re-derives the per-expiration gamma levels only
+  when the GEX models changed
+
+MarketPushListener (optional) wakes the poller when massive writes one of
+these keys, so updates arrive as they are published instead of up to one
+poll interval late. It listens to keyspace notifications for the keys
+above, which market-redis only emits with notify-keyspace-events including
+"K", "$" (strings) and "h" (hashes), e.g. "Kh$". The messages are a few
+bytes each, unlike massive:heatmap:diff:*, which carries tile payloads.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from redis.asyncio import Redis
+
+from shared.heatmap_slices import SliceCache, select, slice_field, slice_key, versions_key
+
+SYMBOL = "I:SPX"
+
+JSON_KEYS: Dict[str, str] = {
+    "spot": "massive:model:spot:I:SPX",
+    "bias_lfi": "massive:bias_lfi:model:latest",
+    "market_mode": "massive:market_mode:model:latest",
+    "vix_regime": "massive:vix_regime:model:latest",
+    "trade_selector": "massive:trade_selector:SPX:latest",
+    "gex_calls": "massive:gex:model:I:SPX:calls",
+    "gex_puts": "massive:gex:model:I:SPX:puts",
+}
+BARS_KEY = "massive:model:spot:I:SPX:bars:1s"
+TRAIL_KEY = "massive:model:spot:I:SPX:trail"
+VOLUME_PROFILE_KEY = "massive:volume_profile:spx"
+# $1 level of massive's volume-profile pyramid (vp_pyramid): same cents
+# fields, a tenth as many as the $0.10 base hash, which is read only when
+# the level has not been built
+VOLUME_PROFILE_LEVEL_KEY = "massive:volume_profile:spx:pyramid:100"
+HEATMAP_KEY = "massive:heatmap:model:I:SPX:latest"
+
+
+def expiration_dte(exp_date: str) -> Optional[int]:
+    """
+    Calendar DTE of a YYYY-MM-DD expiration, computed as massive's Builder
+    does for heatmap tiles (_compute_dte: date.today(), floored at 0).
+    """
+    try:
+        return max(0, (date.fromisoformat(exp_date[:10]) - date.today()).days)
+    except (TypeError, ValueError):
+        return None
+
+
+def push_channels(db: int = 0) -> List[str]:
+    """Keyspace channels for every key the loader reads, plus chain geometry events."""
+    keys = list(JSON_KEYS.values()) + [BARS_KEY, VOLUME_PROFILE_LEVEL_KEY, versions_key(SYMBOL)]
+    return [f"__keyspace@{db}__:{key}" for key in keys] + ["massive:chain:geometry_updated"]
+
+
+def gamma_by_expiration(calls_data: dict, puts_data: dict) -> List[Dict[str, Any]]:
+    """
+    Per-expiration net gamma levels, zero-gamma and gamma magnet from the
+    massive GEX calls/puts models, sorted by expiration date.
+    """
+    calls_exp = calls_data.get("expirations", {})
+    puts_exp = puts_data.get("expirations", {})
+    if not calls_exp or not puts_exp:
+        return []
+
+    out = []
+    for exp_date in sorted(set(calls_exp.keys()) & set(puts_exp.keys())):
+        calls = calls_exp.get(exp_date, {})
+        puts = puts_exp.get(exp_date, {})
+
+        # Calculate net gamma at each strike
+        net_gamma = {}
+        max_abs_gamma = 0
+        max_gamma_strike = None
+        for strike in set(calls.keys()) | set(puts.keys()):
+            call_g = float(calls.get(strike, 0))
+            put_g = float(puts.get(strike, 0))
+            net_gamma[int(float(strike))] = call_g - put_g
+
+            # Track max gamma for magnet
+            total = call_g + put_g
+            if total > max_abs_gamma:
+                max_abs_gamma = total
+                max_gamma_strike = int(float(strike))
+
+        sorted_strikes = sorted(net_gamma.keys())
+
+        # Find zero gamma (where net gamma crosses zero)
+        zero_gamma = None
+        prev_strike = None
+        prev_net = None
+        for strike in sorted_strikes:
+            net = net_gamma[strike]
+            if prev_net is not None:
+                if (prev_net < 0 and net > 0) or (prev_net > 0 and net < 0):
+                    zero_gamma = (prev_strike + strike) / 2
+                    break
+            prev_strike = strike
+            prev_net = net
+
+        out.append({
+            "expiration": exp_date,
+            "gamma_levels": [{"strike": s, "net_gamma": net_gamma[s]} for s in sorted_strikes],
+            "zero_gamma": zero_gamma,
+            "gamma_magnet": max_gamma_strike,
+        })
+    return out
+
+
+def _parse_bars(bars_raw: List[str]) -> List[Dict[str, Any]]:
+    """Compact 1s OHLC bars ("t,o,h,l,c") → price history points."""
+    history = []
+    for member in bars_raw:
+        try:
+            t, o, h, l, c = member.split(",")
+            history.append({
+                "price": float(c),
+                "open": float(o),
+                "high": float(h),
+                "low": float(l),
+                "close": float(c),
+                "ts": float(t),
+            })
+        except Exception:
+            pass
+    return history
+
+
+def _parse_trail(trail_raw: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+    """Legacy JSON spot trail → price history points."""
+    history = []
+    for member, score in trail_raw:
+        try:
+            history.append({"price": json.loads(member).get("value"), "ts": score})
+        except Exception:
+            pass
+    return history
+
+
+class MarketSnapshotLoader:
+    """
+    Loads the shared massive inputs for copilot in as few round trips as
+    possible, keeping the parsed form of anything that did not change.
+    """
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger("MarketSnapshot")
+        self._raw: Dict[str, Optional[str]] = {}
+        self._parsed: Dict[str, Any] = {}
+        self._bars_raw: Optional[List[str]] = None
+        self._trail_raw: Optional[list] = None
+        self._vp_raw: Optional[Dict[str, str]] = None
+
+        self.heatmap_slices = SliceCache()
+        self.heatmap_versions: Dict[str, str] = {}
+        self.heatmap_full: Optional[dict] = None
+        self._heatmap_raw: Optional[str] = None
+
+        self.price_history: List[Dict[str, Any]] = []
+        self.volume_profile: Optional[Dict[int, int]] = None
+        self.expirations: List[Dict[str, Any]] = []
+
+        self.stats = {"loads": 0, "round_trips": 0, "parsed": 0, "reused": 0}
+
+    def get(self, name: str) -> Any:
+        """Parsed JSON model by JSON_KEYS name (None if missing/invalid)."""
+        return self._parsed.get(name)
+
+    @property
+    def spot_price(self) -> Optional[float]:
+        spot = self._parsed.get("spot")
+        return spot.get("value") if isinstance(spot, dict) else None
+
+    async def load(self, r: Redis) -> Set[str]:
+        """Refresh from market-redis. Returns the names of inputs that changed."""
+        names = list(JSON_KEYS)
+        pipe = r.pipeline(transaction=False)
+        pipe.mget([JSON_KEYS[n] for n in names])
+        pipe.zrange(BARS_KEY, -100, -1)
+        pipe.zrange(TRAIL_KEY, -100, -1, withscores=True)
+        pipe.hgetall(VOLUME_PROFILE_LEVEL_KEY)
+        pipe.hgetall(versions_key(SYMBOL))
+        # No slices last time: the full heatmap rides along in the same trip
+        prefetch = not self.heatmap_versions
+        if prefetch:
+            pipe.get(HEATMAP_KEY)
+        results = await pipe.execute()
+        raws, bars_raw, trail_raw, vp_raw, heatmap_versions = results[:5]
+        heatmap_raw = results[5] if prefetch else None
+        self.stats["loads"] += 1
+        self.stats["round_trips"] += 1
+
+        changed: Set[str] = set()
+
+        # JSON models: parse only payloads that changed
+        for name, raw in zip(names, raws):
+            if name in self._raw and self._raw[name] == raw:
+                self.stats["reused"] += 1
+                continue
+            self._raw[name] = raw
+            parsed = None
+            if raw:
+                try:
+                    parsed = json.loads(raw)
+                except Exception:
+                    pass
+            self._parsed[name] = parsed
+            self.stats["parsed"] += 1
+            changed.add(name)
+
+        if "gex_calls" in changed or "gex_puts" in changed:
+            calls, puts = self._parsed.get("gex_calls"), self._parsed.get("gex_puts")
+            try:
+                self.expirations = gamma_by_expiration(calls, puts) if calls and puts else []
+            except Exception as e:
+                self.logger.warning(f"GEX transform error: {e}")
+                self.expirations = []
+            changed.add("gex")
+
+        # Price history: compact bars, falling back to the JSON trail
+        if bars_raw != self._bars_raw or (not bars_raw and trail_raw != self._trail_raw):
+            self._bars_raw, self._trail_raw = bars_raw, trail_raw
+            self.price_history = _parse_bars(bars_raw) or _parse_trail(trail_raw)
+            changed.add("price_history")
+
+        if not vp_raw:
+            vp_raw = await r.hgetall(VOLUME_PROFILE_KEY)
+            self.stats["round_trips"] += 1
+        if vp_raw != self._vp_raw:
+            self._vp_raw = vp_raw
+            try:
+                self.volume_profile = {int(k): int(v) for k, v in vp_raw.items()} if vp_raw else None
+            except Exception:
+                self.volume_profile = None
+            changed.add("volume_profile")
+
+        if await self._load_heatmap(r, heatmap_versions, heatmap_raw, prefetch):
+            changed.add("heatmap")
+        return changed
+
+    async def _load_heatmap(
+        self, r: Redis, versions: Dict[str, str], raw: Optional[str], prefetched: bool
+    ) -> bool:
+        """Per-DTE slices whose version moved (second round trip), else the full model."""
+        if versions:
+            moved = versions != self.heatmap_versions
+            self.heatmap_versions = versions
+            self._heatmap_raw = None
+            if moved:
+                # Full model is re-merged from the slices on demand
+                self.heatmap_full = None
+            stale = self.heatmap_slices.stale(SYMBOL, versions, select(versions))
+            if not stale:
+                return moved
+            pipe = r.pipeline(transaction=False)
+            for field in stale:
+                pipe.get(slice_key(SYMBOL, field))
+            results = await pipe.execute()
+            self.stats["round_trips"] += 1
+            for field, raw in zip(stale, results):
+                try:
+                    payload = json.loads(raw) if raw else None
+                except Exception:
+                    payload = None
+                self.heatmap_slices.put(SYMBOL, field, versions[field], payload)
+            self.heatmap_full = None
+            return True
+
+        self.heatmap_versions = {}
+        if not prefetched:
+            raw = await r.get(HEATMAP_KEY)
+            self.stats["round_trips"] += 1
+        if raw == self._heatmap_raw:
+            return False
+        self._heatmap_raw = raw
+        previous = self.heatmap_full
+        try:
+            self.heatmap_full = json.loads(raw) if raw else None
+        except Exception:
+            self.heatmap_full = None
+        return self.heatmap_full != previous
+
+    def heatmap_for_expiration(self, exp_date: str) -> Optional[dict]:
+        """
+        Heatmap slice for one expiration (calendar DTE), or the full model
+        when there is no slice for it (unparseable date, or a DTE massive
+        does not publish, e.g. across a date change between the hosts).
+        """
+        if not self.heatmap_versions:
+            return self.heatmap_full
+        dte = expiration_dte(exp_date)
+        if dte is not None:
+            payload = self.heatmap_slices.get(SYMBOL, slice_field(dte))
+            if payload is not None:
+                return payload
+        if self.heatmap_full is None:
+            self.heatmap_full = self.heatmap_slices.merged(SYMBOL, select(self.heatmap_versions))
+        return self.heatmap_full
+
+
+class MarketPushListener:
+    """
+    Subscribes to push_channels() and calls on_update() for each message, so
+    the poller reloads as soon as massive writes.
+    """
+
+    def __init__(
+        self,
+        r: Redis,
+        on_update: Callable[[], None],
+        channels: Optional[List[str]] = None,
+        logger=None,
+    ):
+        self.logger = logger or logging.getLogger("MarketPushListener")
+        self.r = r
+        self.on_update = on_update
+        db = r.connection_pool.connection_kwargs.get("db", 0)
+        self.channels = tuple(channels or push_channels(db))
+        self.messages = 0
+
+    async def run(self) -> None:
+        while True:
+            pubsub = self.r.pubsub()
+            try:
+                await pubsub.subscribe(*self.channels)
+                async for msg in pubsub.listen():
+                    if msg.get("type") == "message":
+                        self.messages += 1
+                        self.on_update()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"market push listener error: {e}; resubscribing")
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
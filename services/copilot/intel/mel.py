@@ -14,7 +14,6 @@ Based on TraderDH's MEL specification.
 import logging
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta
-from collections import deque
 import asyncio
 
 from .mel_models import (
@@ -35,6 +34,8 @@ from .mel_liquidity import LiquidityEffectivenessCalculator
 from .mel_volatility import VolatilityEffectivenessCalculator
 from .mel_session import SessionEffectivenessCalculator
 from .mel_coherence import CoherenceCalculator, get_coherence_multiplier
+from .mel_window import PriceWindow
+from .mel_history import MELHistory
 
 
 class MELOrchestrator:
@@ -60,10 +61,13 @@ class MELOrchestrator:
         # Calculators - will be registered
         self._calculators: Dict[str, MELCalculator] = {}
 
-        # Snapshot history
-        self._history: deque = deque(maxlen=1000)
+        # Snapshot history (score columns + JSON, serialized once)
+        self._history = MELHistory(capacity=1000)
         self._last_snapshot: Optional[MELSnapshot] = None
 
+        # Price history shared by the calculators, updated per snapshot
+        self._price_window = PriceWindow()
+
         # Coherence calculator
         self._coherence_calc = CoherenceCalculator(config=self.config, logger=self.logger)
 
@@ -169,6 +173,8 @@ class MELOrchestrator:
         market_data = {}
         if self.market_data_provider:
             market_data = self.market_data_provider()
+        self._price_window.sync(market_data.get("price_history"))
+        market_data = {**market_data, "price_window": self._price_window}
 
         # Calculate individual model scores
         gamma = self._calculators["gamma"].calculate_score(market_data)
@@ -359,18 +365,18 @@ class MELOrchestrator:
         """Get most recent snapshot."""
         return self._last_snapshot
 
+    @property
+    def history(self) -> MELHistory:
+        """Snapshot history ring, for serving history without building snapshots."""
+        return self._history
+
     def get_history(
         self,
         since: Optional[datetime] = None,
         limit: int = 100,
     ) -> List[MELSnapshot]:
         """Get snapshot history."""
-        snapshots = list(self._history)
-
-        if since:
-            snapshots = [s for s in snapshots if s.timestamp_utc >= since]
-
-        return snapshots[-limit:]
+        return self._history.snapshots(since=since, limit=limit)
 
     def get_model_state(self, model_name: str) -> Optional[ModelState]:
         """Get current state for a specific model."""
@@ -8,14 +8,21 @@ Endpoints:
 - GET /api/mel/liquidity - Liquidity detail
 - GET /api/mel/volatility - Volatility detail
 - GET /api/mel/session - Session detail
-- GET /api/mel/history - Historical snapshots
+- GET /api/mel/history - Historical snapshots (?format=columns for score columns)
 - GET /api/mel/state - Compact state summary
-- WS /ws/mel - Real-time MEL updates
+- WS /ws/mel - Real-time MEL updates (?delta=1 for mel_delta messages)
+
+Each snapshot is serialized once and the same text is sent to every
+client. Delta clients get a full mel_snapshot on connect and then
+mel_delta messages: the snapshot's top-level fields plus only the model
+scores that changed, with base_id naming the snapshot they apply to.
 """
 
 import asyncio
+import json
 import logging
-from typing import Optional, List
+from collections import deque
+from typing import Any, Deque, Dict, Optional, List, Set
 from datetime import datetime
 
 from aiohttp import web
@@ -23,6 +30,16 @@ from aiohttp import web
 from .mel import MELOrchestrator
 from .mel_models import MELSnapshot
 
+MODEL_KEYS = ("gamma", "volume_profile", "liquidity", "volatility", "session_structure")
+
+
+def snapshot_delta(previous: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    """mel_delta data: data's top-level fields plus the model scores that differ from previous."""
+    delta = {k: v for k, v in data.items() if k not in MODEL_KEYS}
+    delta["base_id"] = previous["snapshot_id"]
+    delta["models"] = {k: data[k] for k in MODEL_KEYS if data[k] != previous.get(k)}
+    return delta
+
 
 class MELAPIHandler:
     """
@@ -40,8 +57,14 @@ class MELAPIHandler:
         self.mel = orchestrator
         self.logger = logger or logging.getLogger("MEL-API")
         self.ws_clients: List[web.WebSocketResponse] = []
+        self.delta_clients: Set[web.WebSocketResponse] = set()
         self.copilot = copilot_orchestrator  # For DTE control
 
+        # Snapshots to broadcast, sent in order by one task (deltas build on the previous one)
+        self._outbox: Deque[MELSnapshot] = deque()
+        self._sender: Optional[asyncio.Task] = None
+        self._last_sent: Optional[Dict[str, Any]] = None
+
     def register_routes(self, app: web.Application) -> None:
         """Register all MEL routes on the application."""
         app.router.add_get("/api/mel/snapshot", self.get_snapshot)
@@ -60,28 +83,51 @@ class MELAPIHandler:
 
     def _on_mel_update(self, snapshot: MELSnapshot) -> None:
         """Handle MEL snapshot update - broadcast to WebSocket clients."""
-        if self.ws_clients:
-            asyncio.create_task(self._broadcast(snapshot))
+        if not self.ws_clients:
+            self._last_sent = None
+            return
+        self._outbox.append(snapshot)
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.create_task(self._drain_outbox())
+
+    async def _drain_outbox(self) -> None:
+        while self._outbox:
+            await self._broadcast(self._outbox.popleft())
 
     async def _broadcast(self, snapshot: MELSnapshot) -> None:
-        """Broadcast snapshot to all connected WebSocket clients."""
+        """Broadcast snapshot to all connected WebSocket clients (serialized once)."""
         data = snapshot.to_dict()
 
         # Include active DTE in broadcast
         if self.copilot:
             data["dte"] = self.copilot._active_dte
 
-        for ws in list(self.ws_clients):
-            try:
-                await ws.send_json({"type": "mel_snapshot", "data": data})
-            except Exception:
-                self.ws_clients.remove(ws)
+        full = json.dumps({"type": "mel_snapshot", "data": data})
+        delta = full
+        if self._last_sent is not None:
+            delta = json.dumps({"type": "mel_delta", "data": snapshot_delta(self._last_sent, data)})
+        self._last_sent = data
+
+        clients = list(self.ws_clients)
+        results = await asyncio.gather(
+            *(ws.send_str(delta if ws in self.delta_clients else full) for ws in clients),
+            return_exceptions=True,
+        )
+        for ws, result in zip(clients, results):
+            if isinstance(result, Exception):
+                self._drop_client(ws)
+
+    def _drop_client(self, ws: web.WebSocketResponse) -> None:
+        if ws in self.ws_clients:
+            self.ws_clients.remove(ws)
+        self.delta_clients.discard(ws)
 
     async def close_all(self) -> None:
         """Close all WebSocket connections."""
         for ws in self.ws_clients:
             await ws.close()
         self.ws_clients.clear()
+        self.delta_clients.clear()
 
     # ========== HTTP Handlers ==========
 
@@ -148,7 +194,7 @@ class MELAPIHandler:
         })
 
     async def get_history(self, request: web.Request) -> web.Response:
-        """GET /api/mel/history - Historical snapshots."""
+        """GET /api/mel/history - Historical snapshots (stored JSON, or ?format=columns)."""
         limit = int(request.query.get("limit", "100"))
         since = request.query.get("since")
 
@@ -159,12 +205,14 @@ class MELAPIHandler:
             except ValueError:
                 return web.json_response({"error": "Invalid since format"}, status=400)
 
-        history = self.mel.get_history(since=since_dt, limit=limit)
+        if request.query.get("format") == "columns":
+            return web.json_response(self.mel.history.columns(since=since_dt, limit=limit))
 
-        return web.json_response({
-            "count": len(history),
-            "snapshots": [s.to_dict() for s in history],
-        })
+        snapshots = self.mel.history.json_range(since=since_dt, limit=limit)
+        return web.Response(
+            text=f'{{"count": {len(snapshots)}, "snapshots": [{", ".join(snapshots)}]}}',
+            content_type="application/json",
+        )
 
     async def get_state(self, request: web.Request) -> web.Response:
         """GET /api/mel/state - Compact state summary."""
@@ -190,7 +238,7 @@ class MELAPIHandler:
     # ========== WebSocket Handler ==========
 
     async def ws_handler(self, request: web.Request) -> web.WebSocketResponse:
-        """WS /ws/mel - Real-time MEL updates. Accepts ?dte=N query param."""
+        """WS /ws/mel - Real-time MEL updates. Accepts ?dte=N and ?delta=1 query params."""
         ws = web.WebSocketResponse()
         await ws.prepare(request)
 
@@ -202,20 +250,25 @@ class MELAPIHandler:
             self.copilot.set_active_dte(dte)
 
         self.ws_clients.append(ws)
+        if request.query.get("delta") in ("1", "true"):
+            self.delta_clients.add(ws)
         self.logger.info(f"MEL WebSocket client connected (DTE={dte}, {len(self.ws_clients)} total)")
 
-        # Send current snapshot immediately
-        snapshot = self.mel.get_current_snapshot()
-        if snapshot:
-            data = snapshot.to_dict()
-            data["dte"] = dte  # Include DTE in response
-            await ws.send_json({"type": "mel_snapshot", "data": data})
+        # Send current snapshot immediately (delta clients: the one the next delta builds on)
+        if ws in self.delta_clients and self._last_sent is not None:
+            await ws.send_json({"type": "mel_snapshot", "data": self._last_sent})
+        else:
+            snapshot = self.mel.get_current_snapshot()
+            if snapshot:
+                data = snapshot.to_dict()
+                data["dte"] = dte  # Include DTE in response
+                await ws.send_json({"type": "mel_snapshot", "data": data})
 
         try:
             async for msg in ws:
                 pass  # One-way stream, clients don't send
         finally:
-            self.ws_clients.remove(ws)
+            self._drop_client(ws)
             self.logger.info(f"MEL WebSocket client disconnected ({len(self.ws_clients)} remaining)")
 
         return ws
@@ -18,6 +18,7 @@ from .mel_models import (
     Confidence,
     MELConfig,
 )
+from .mel_window import PriceWindow
 
 
 class MELCalculator(ABC):
@@ -49,6 +50,9 @@ class MELCalculator(ABC):
         self._cache_timestamp: Optional[datetime] = None
         self._cache_ttl_seconds: int = 5
 
+        # Used when market_data carries no shared price window
+        self._own_window: Optional[PriceWindow] = None
+
     @property
     @abstractmethod
     def model_name(self) -> str:
@@ -182,6 +186,19 @@ class MELCalculator(ABC):
 
     # ========== Utility Methods for Subclasses ==========
 
+    def price_window(self, market_data: Dict[str, Any]) -> PriceWindow:
+        """
+        The snapshot's shared PriceWindow (market_data["price_window"]), or a
+        private one synced from market_data["price_history"].
+        """
+        window = market_data.get("price_window")
+        if window is None:
+            if self._own_window is None:
+                self._own_window = PriceWindow()
+            window = self._own_window
+            window.sync(market_data.get("price_history"))
+        return window
+
     def normalize_score(self, value: float, min_val: float = 0, max_val: float = 100) -> float:
         """Normalize a value to 0-100 range."""
         return max(min_val, min(max_val, value))
@@ -22,8 +22,17 @@ from typing import Dict, Any, Tuple, List, Optional
 from datetime import datetime, timedelta
 import logging
 
+import numpy as np
+
 from .mel_calculator import MELCalculator
 from .mel_models import MELConfig, Confidence
+from .mel_window import PriceWindow, RollingColumn, WindowColumns, count_within
+
+
+def _level_prices(gamma_levels: List[Dict]) -> np.ndarray:
+    """Sorted gamma level prices (strike, else price)."""
+    levels = [lvl.get("strike") or lvl.get("price") for lvl in gamma_levels if lvl]
+    return np.sort(np.array([lvl for lvl in levels if lvl is not None], dtype=np.float64))
 
 
 class GammaEffectivenessCalculator(MELCalculator):
@@ -31,8 +40,30 @@ class GammaEffectivenessCalculator(MELCalculator):
     Calculator for Gamma/Dealer Structure effectiveness.
 
     Measures how well dealer gamma positioning is controlling price action.
+
+    Price-history metrics are kept as per-bar columns over the PriceWindow
+    and only computed for bars added since the previous snapshot.
     """
 
+    def __init__(self, config: MELConfig, logger: Optional[logging.Logger] = None, history_window: int = 20):
+        super().__init__(config, logger, history_window)
+        self._respect = WindowColumns(
+            tests=RollingColumn(),
+            respects=RollingColumn(lookahead=3),
+        )
+        self._reversion = WindowColumns(
+            event=RollingColumn(np.int8),
+            state=RollingColumn(np.int8),
+            excursions=RollingColumn(),
+            reversions=RollingColumn(),
+        )
+        self._first_event: Optional[int] = None
+        self._pin = WindowColumns(near=RollingColumn())
+        self._violations = WindowColumns(
+            count=RollingColumn(),
+            magnitude=RollingColumn(np.float64),
+        )
+
     @property
     def model_name(self) -> str:
         return "gamma"
@@ -71,24 +102,26 @@ class GammaEffectivenessCalculator(MELCalculator):
         if not gamma_levels or not price_history:
             return 65.0, {"note": "Insufficient data for gamma effectiveness"}
 
+        prices = self.price_window(market_data)
+
         # 1. Level Respect Rate (25%)
         detail["level_respect_rate"] = self._calculate_level_respect_rate(
-            price_history, gamma_levels
+            prices, gamma_levels
         )
 
         # 2. Mean Reversion Success (25%)
         detail["mean_reversion_success"] = self._calculate_mean_reversion_success(
-            price_history, gamma_magnet, zero_gamma
+            prices, gamma_magnet, zero_gamma
         )
 
         # 3. Pin Duration (15%)
         detail["pin_duration"] = self._calculate_pin_duration(
-            price_history, gamma_magnet
+            prices, gamma_magnet
         )
         detail["pin_duration_score"] = self._score_pin_duration(detail["pin_duration"])
 
         # 4. Violation Frequency (15%)
-        violations = self._analyze_violations(price_history, gamma_levels)
+        violations = self._analyze_violations(prices, gamma_levels)
         detail["violation_frequency"] = violations["frequency"]
         detail["violation_magnitude"] = violations["magnitude"]
         detail["violation_score"] = 100 - self._score_violation_frequency(violations["frequency"])
@@ -123,7 +156,7 @@ class GammaEffectivenessCalculator(MELCalculator):
 
     def _calculate_level_respect_rate(
         self,
-        price_history: List[Dict],
+        prices: PriceWindow,
         gamma_levels: List[Dict],
     ) -> float:
         """
@@ -131,59 +164,56 @@ class GammaEffectivenessCalculator(MELCalculator):
 
         A "test" is when price approaches a gamma level.
         A "respect" is when price reverses or consolidates at that level.
+
+        Per bar: tests = levels within tolerance of this price but not of the
+        previous one (two searchsorted interval counts); respects = those
+        tests where the move two bars on reverses the approach. A respect is
+        only counted once three more bars exist.
         """
-        if not price_history or not gamma_levels:
+        if not len(prices) or not gamma_levels:
             return 65.0  # Neutral
 
         # Extract level prices
-        levels = [lvl.get("strike") or lvl.get("price") for lvl in gamma_levels if lvl]
-        if not levels:
+        levels = _level_prices(gamma_levels)
+        if not len(levels):
             return 65.0
 
-        tests = 0
-        respects = 0
-
-        # Simple implementation - look for price approaching levels
         tolerance = 5.0  # Points tolerance for "approaching"
-
-        for i in range(1, len(price_history)):
-            prev_price = price_history[i - 1].get("price") or price_history[i - 1].get("close")
-            curr_price = price_history[i].get("price") or price_history[i].get("close")
-
-            if prev_price is None or curr_price is None:
-                continue
-
-            for level in levels:
-                # Did price approach this level?
-                prev_dist = abs(prev_price - level)
-                curr_dist = abs(curr_price - level)
-
-                if prev_dist > tolerance and curr_dist <= tolerance:
-                    # Price approached the level
-                    tests += 1
-
-                    # Check if it reversed (next few bars)
-                    if i + 3 < len(price_history):
-                        future_prices = [
-                            p.get("price") or p.get("close")
-                            for p in price_history[i:i+3]
-                        ]
-                        future_prices = [p for p in future_prices if p is not None]
-
-                        if future_prices:
-                            # Did price move away from the level direction it came from?
-                            approach_dir = 1 if curr_price > prev_price else -1
-                            future_dir = 1 if future_prices[-1] > curr_price else -1
-
-                            if approach_dir != future_dir:
-                                # Reversed at level
-                                respects += 1
-
-        return self.calculate_rate(respects, tests, 65.0)
+        cols = self._respect
+        cols.follow(prices, tuple(levels.tolist()))
+
+        tests = cols["tests"]
+        start, stop = cols.pending(tests, prices)
+        if stop > start:
+            prev = prices.shifted("price", start, stop, -1)
+            curr = prices.view("price", start, stop)
+            approached = (
+                count_within(levels, curr - tolerance, curr + tolerance)
+                - count_within(levels, np.maximum(prev, curr) - tolerance, np.minimum(prev, curr) + tolerance)
+            )
+            tests.extend(np.where(np.isnan(prev) | np.isnan(curr), 0, approached))
+
+        respects = cols["respects"]
+        start, stop = cols.pending(respects, prices)
+        if stop > start:
+            prev = prices.shifted("price", start, stop, -1)
+            curr = prices.view("price", start, stop)
+            # Last available of the next two bars
+            future = prices.shifted("price", start, stop, 2)
+            future = np.where(np.isnan(future), prices.shifted("price", start, stop, 1), future)
+            future = np.where(np.isnan(future), curr, future)
+            approach_dir = np.where(curr > prev, 1, -1)
+            future_dir = np.where(future > curr, 1, -1)
+            respects.extend(tests.values(start, stop) * (approach_dir != future_dir))
+
+        # The window's first bar has no previous bar to approach from
+        test_count = tests.total - tests.first()
+        respect_count = respects.total - respects.first()
+        return self.calculate_rate(respect_count, test_count, 65.0)
 
     def _calculate_mean_reversion_success(
         self,
-        price_history: List[Dict],
+        prices: PriceWindow,
         gamma_magnet: Optional[float],
         zero_gamma: Optional[float],
     ) -> float:
@@ -192,40 +222,51 @@ class GammaEffectivenessCalculator(MELCalculator):
 
         An excursion is when price moves away from gamma magnet.
         Success is when it returns within a session.
+
+        Bars beyond the threshold (event +1) start an excursion unless one is
+        open; bars within half of it (event -1) end one. The open/closed
+        state after each bar is carried across snapshots, and the window's
+        first event is re-scored from a closed state.
         """
-        if not price_history or not gamma_magnet:
+        if not len(prices) or not gamma_magnet:
             return 65.0
 
-        excursions = 0
-        reversions = 0
         threshold = 10.0  # Points to consider an excursion
-
-        in_excursion = False
-        excursion_start_idx = 0
-
-        for i, bar in enumerate(price_history):
-            price = bar.get("price") or bar.get("close")
-            if price is None:
-                continue
-
-            dist = abs(price - gamma_magnet)
-
-            if not in_excursion and dist > threshold:
-                # Starting an excursion
-                in_excursion = True
-                excursion_start_idx = i
-                excursions += 1
-
-            elif in_excursion and dist <= threshold / 2:
-                # Reverted to magnet
-                in_excursion = False
-                reversions += 1
-
-        return self.calculate_rate(reversions, excursions, 65.0)
+        cols = self._reversion
+        if cols.follow(prices, float(gamma_magnet)):
+            self._first_event = None
+
+        event, state = cols["event"], cols["state"]
+        start, stop = cols.pending(event, prices)
+        if stop > start:
+            dist = np.abs(prices.view("price", start, stop) - gamma_magnet)
+            ev = np.where(dist > threshold, 1, np.where(dist <= threshold / 2, -1, 0))
+            carry = int(state.last()) if len(state) else 0
+            # Open/closed after each bar: set by the last event so far
+            last = np.maximum.accumulate(np.where(ev != 0, np.arange(len(ev)), -1))
+            after = np.where(last >= 0, ev[np.maximum(last, 0)] == 1, carry).astype(np.int8)
+            before = np.concatenate(([carry], after[:-1]))
+            event.extend(ev)
+            state.extend(after)
+            cols["excursions"].extend((ev == 1) & (before == 0))
+            cols["reversions"].extend((ev == -1) & (before == 1))
+            if self._first_event is not None and self._first_event >= start:
+                self._first_event = None
+
+        if self._first_event is None or self._first_event < prices.lo:
+            hits = np.flatnonzero(event.values())
+            self._first_event = prices.lo + int(hits[0]) if len(hits) else None
+            if self._first_event is None:
+                return self.calculate_rate(0, 0, 65.0)
+
+        first = self._first_event
+        excursions = cols["excursions"].total - cols["excursions"].at(first) + (event.at(first) == 1)
+        reversions = cols["reversions"].total - cols["reversions"].at(first)
+        return self.calculate_rate(int(reversions), int(excursions), 65.0)
 
     def _calculate_pin_duration(
         self,
-        price_history: List[Dict],
+        prices: PriceWindow,
         gamma_magnet: Optional[float],
     ) -> str:
         """
@@ -233,18 +274,20 @@ class GammaEffectivenessCalculator(MELCalculator):
 
         Returns: 'Strong', 'Medium', 'Weak'
         """
-        if not price_history or not gamma_magnet:
+        if not len(prices) or not gamma_magnet:
             return "Medium"
 
-        near_magnet = 0
         tolerance = 5.0
+        cols = self._pin
+        cols.follow(prices, float(gamma_magnet))
 
-        for bar in price_history:
-            price = bar.get("price") or bar.get("close")
-            if price and abs(price - gamma_magnet) <= tolerance:
-                near_magnet += 1
+        near = cols["near"]
+        start, stop = cols.pending(near, prices)
+        if stop > start:
+            price = prices.view("price", start, stop)
+            near.extend((price != 0) & (np.abs(price - gamma_magnet) <= tolerance))
 
-        pct = near_magnet / len(price_history) * 100 if price_history else 0
+        pct = near.total / len(prices) * 100
 
         if pct >= 50:
             return "Strong"
@@ -263,37 +306,48 @@ class GammaEffectivenessCalculator(MELCalculator):
 
     def _analyze_violations(
         self,
-        price_history: List[Dict],
+        prices: PriceWindow,
         gamma_levels: List[Dict],
     ) -> Dict[str, str]:
         """
         Analyze gamma level violations.
 
         Returns frequency (Low/Medium/High) and magnitude (Contained/Extended).
+
+        A violation is a level strictly inside a bar's low-high range; its
+        magnitude is the larger side. Per bar the count comes from
+        searchsorted and the magnitude sum from level prefix sums (levels up
+        to the bar's midpoint measure from the high, the rest from the low).
         """
-        if not price_history or not gamma_levels:
+        if not len(prices) or not gamma_levels:
             return {"frequency": "Medium", "magnitude": "Contained"}
 
-        levels = [lvl.get("strike") or lvl.get("price") for lvl in gamma_levels if lvl]
-        if not levels:
+        levels = _level_prices(gamma_levels)
+        if not len(levels):
             return {"frequency": "Medium", "magnitude": "Contained"}
 
-        violations = []
-
-        for bar in price_history:
-            high = bar.get("high")
-            low = bar.get("low")
-            if high is None or low is None:
-                continue
-
-            for level in levels:
-                # Did price move through this level?
-                if low < level < high:
-                    # Calculate magnitude of the violation
-                    magnitude = max(high - level, level - low)
-                    violations.append(magnitude)
-
-        violation_rate = len(violations) / len(price_history) * 100 if price_history else 0
+        cols = self._violations
+        cols.follow(prices, tuple(levels.tolist()))
+
+        count = cols["count"]
+        start, stop = cols.pending(count, prices)
+        if stop > start:
+            high = prices.view("high", start, stop)
+            low = prices.view("low", start, stop)
+            valid = ~(np.isnan(high) | np.isnan(low))
+            high, low = np.where(valid, high, 0.0), np.where(valid, low, 0.0)
+            first = np.searchsorted(levels, low, side="right")
+            end = np.maximum(np.searchsorted(levels, high, side="left"), first)
+            mid = np.clip(np.searchsorted(levels, (high + low) / 2, side="right"), first, end)
+            cum = np.concatenate(([0.0], np.cumsum(levels)))
+            magnitude = (
+                (mid - first) * high - (cum[mid] - cum[first])
+                + (cum[end] - cum[mid]) - (end - mid) * low
+            )
+            count.extend(end - first)
+            cols["magnitude"].extend(np.where(valid, magnitude, 0.0))
+
+        violation_rate = count.total / len(prices) * 100
 
         if violation_rate < 10:
             frequency = "Low"
@@ -302,7 +356,7 @@ class GammaEffectivenessCalculator(MELCalculator):
         else:
             frequency = "High"
 
-        avg_magnitude = sum(violations) / len(violations) if violations else 0
+        avg_magnitude = cols["magnitude"].total / count.total if count.total else 0
 
         if avg_magnitude < 5:
             magnitude = "Contained"
@@ -0,0 +1,134 @@
+"""
+MEL History - Bounded ring of MEL snapshots: compact score columns plus
+each snapshot's JSON, serialized once.
+
+MELOrchestrator used to keep the last 1000 MELSnapshot objects in a deque,
+and GET /api/mel/history re-serialized every one it returned. MELHistory
+keeps, per snapshot:
+
+- a row of NumPy columns: timestamp (epoch seconds), the five model
+  effectiveness scores, coherence and global integrity, plus int8 model
+  and coherence states;
+- the snapshot's to_dict() JSON, produced once at append().
+
+since/limit queries are a searchsorted on the timestamp column. Results
+are served either as the stored JSON strings (json_range) or as score
+columns (columns), without building MELSnapshot objects.
+snapshots() still materializes objects for callers that want them.
+
+Storage is 2x capacity; when the write position reaches the end, the live
+rows move to the front, so every range is one contiguous slice.
+"""
+
+import json
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .mel_models import CoherenceState, MELSnapshot, ModelState
+
+MODELS = ("gamma", "volume_profile", "liquidity", "volatility", "session")
+SCORES = MODELS + ("coherence", "global_integrity")
+
+STATES = np.array([s.value for s in ModelState])
+COHERENCE_STATES = np.array([s.value for s in CoherenceState])
+_STATE_CODES = {s: i for i, s in enumerate(ModelState)}
+_COHERENCE_CODES = {s: i for i, s in enumerate(CoherenceState)}
+
+
+def _epoch(ts: datetime) -> float:
+    """Snapshot timestamps are naive UTC."""
+    return (ts if ts.tzinfo else ts.replace(tzinfo=UTC)).timestamp()
+
+
+def _model_scores(snapshot: MELSnapshot) -> Tuple:
+    return (
+        snapshot.gamma,
+        snapshot.volume_profile,
+        snapshot.liquidity,
+        snapshot.volatility,
+        snapshot.session_structure,
+    )
+
+
+class MELHistory:
+    """The last `capacity` MEL snapshots, oldest first."""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        size = 2 * capacity
+        self._ts = np.zeros(size)
+        self._scores = np.zeros((size, len(SCORES)))
+        self._states = np.zeros((size, len(MODELS) + 1), dtype=np.int8)
+        self._json: List[Optional[str]] = [None] * size
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, snapshot: MELSnapshot) -> str:
+        """Record a snapshot; returns its JSON."""
+        if self._end == len(self._ts):
+            self._compact()
+
+        i = self._end
+        scores = _model_scores(snapshot)
+        self._ts[i] = _epoch(snapshot.timestamp_utc)
+        self._scores[i] = [s.effectiveness for s in scores] + [
+            snapshot.cross_model_coherence,
+            snapshot.global_structure_integrity,
+        ]
+        self._states[i] = [_STATE_CODES[s.state] for s in scores] + [_COHERENCE_CODES[snapshot.coherence_state]]
+        self._json[i] = json.dumps(snapshot.to_dict())
+        self._end += 1
+
+        if len(self) > self.capacity:
+            self._json[self._start] = None
+            self._start += 1
+        return self._json[i]
+
+    def _compact(self) -> None:
+        n = len(self)
+        live = slice(self._start, self._end)
+        self._ts[:n] = self._ts[live]
+        self._scores[:n] = self._scores[live]
+        self._states[:n] = self._states[live]
+        self._json[:n] = self._json[live]
+        self._json[n:] = [None] * (len(self._json) - n)
+        self._start, self._end = 0, n
+
+    def latest_json(self) -> Optional[str]:
+        return self._json[self._end - 1] if len(self) else None
+
+    def query(self, since: Optional[datetime] = None, limit: int = 100) -> Tuple[int, int]:
+        """Storage slice [start, stop) of the last `limit` snapshots at or after since."""
+        start, stop = self._start, self._end
+        if since is not None:
+            start += int(np.searchsorted(self._ts[start:stop], _epoch(since), side="left"))
+        if limit > 0:
+            start = max(start, stop - limit)
+        return start, stop
+
+    def json_range(self, since: Optional[datetime] = None, limit: int = 100) -> List[str]:
+        start, stop = self.query(since, limit)
+        return self._json[start:stop]
+
+    def snapshots(self, since: Optional[datetime] = None, limit: int = 100) -> List[MELSnapshot]:
+        return [MELSnapshot.from_dict(json.loads(s)) for s in self.json_range(since, limit)]
+
+    def columns(self, since: Optional[datetime] = None, limit: int = 100) -> Dict[str, Any]:
+        """Score and state columns for the query range."""
+        start, stop = self.query(since, limit)
+        scores = self._scores[start:stop]
+        states = self._states[start:stop]
+        return {
+            "count": stop - start,
+            "timestamp": self._ts[start:stop].tolist(),
+            "effectiveness": {name: scores[:, i].tolist() for i, name in enumerate(MODELS)},
+            "state": {name: STATES[states[:, i]].tolist() for i, name in enumerate(MODELS)},
+            "cross_model_coherence": scores[:, len(MODELS)].tolist(),
+            "coherence_state": COHERENCE_STATES[states[:, len(MODELS)]].tolist(),
+            "global_structure_integrity": scores[:, len(MODELS) + 1].tolist(),
+        }
@@ -20,6 +20,8 @@ from typing import Dict, Any, Tuple, List, Optional
 from datetime import datetime, time, timedelta
 import logging
 
+import numpy as np
+
 from .mel_calculator import MELCalculator
 from .mel_models import MELConfig, Confidence
 
@@ -382,28 +384,17 @@ class SessionEffectivenessCalculator(MELCalculator):
         })
 
     def _count_direction_changes(self, bars: List[Dict]) -> int:
-        """Count number of direction changes in price."""
+        """Count number of direction changes in price (sign changes of bar-to-bar moves)."""
         if len(bars) < 2:
             return 0
 
-        changes = 0
-        prev_direction = None
-
-        for i in range(1, len(bars)):
-            prev_close = bars[i - 1].get("close") or bars[i - 1].get("price")
-            curr_close = bars[i].get("close") or bars[i].get("price")
-
-            if prev_close is None or curr_close is None:
-                continue
-
-            direction = 1 if curr_close > prev_close else -1
-
-            if prev_direction is not None and direction != prev_direction:
-                changes += 1
-
-            prev_direction = direction
-
-        return changes
+        closes = np.array(
+            [b.get("close") or b.get("price") for b in bars], dtype=np.float64
+        )
+        moves = np.diff(closes)
+        # Pairs with a missing close are skipped; flat counts as down
+        directions = np.where(moves > 0, 1, -1)[~np.isnan(moves)]
+        return int(np.count_nonzero(directions[1:] != directions[:-1]))
 
     def _check_stress_indicators(self, detail: Dict[str, Any]) -> Dict[str, bool]:
         """Check for session stress indicators."""
@@ -28,8 +28,11 @@ from datetime import datetime, timedelta
 from enum import Enum
 import logging
 
+import numpy as np
+
 from .mel_calculator import MELCalculator
 from .mel_models import MELConfig, Confidence
+from .mel_window import PriceWindow, RollingColumn, WindowColumns
 
 
 class AuctionState(str, Enum):
@@ -46,8 +49,23 @@ class VolumeProfileEffectivenessCalculator(MELCalculator):
     Calculator for Volume Profile/Auction Structure effectiveness.
 
     Measures how well auction theory is organizing price behavior.
+
+    Node acceptance/rejection and balance duration are kept as per-bar
+    columns over the PriceWindow and only computed for new bars.
     """
 
+    def __init__(self, config: MELConfig, logger: Optional[logging.Logger] = None, history_window: int = 20):
+        super().__init__(config, logger, history_window)
+        self._hvn = WindowColumns(
+            tests=RollingColumn(lookahead=3),
+            accepts=RollingColumn(lookahead=3),
+        )
+        self._lvn = WindowColumns(
+            tests=RollingColumn(lookahead=2),
+            rejects=RollingColumn(lookahead=2),
+        )
+        self._balance = WindowColumns(in_value=RollingColumn())
+
     @property
     def model_name(self) -> str:
         return "volume_profile"
@@ -92,14 +110,16 @@ class VolumeProfileEffectivenessCalculator(MELCalculator):
         if poc and poc not in all_hvns:
             all_hvns.append(poc)
 
+        prices = self.price_window(market_data)
+
         # 1. HVN Acceptance Rate (25%)
         detail["hvn_acceptance"] = self._calculate_hvn_acceptance_rate(
-            price_history, all_hvns
+            prices, all_hvns
         )
 
         # 2. LVN Rejection Rate (25%)
         detail["lvn_rejection"] = self._calculate_lvn_rejection_rate(
-            price_history, lvns
+            prices, lvns
         )
 
         # 3. Rotation Completion (20%)
@@ -110,7 +130,7 @@ class VolumeProfileEffectivenessCalculator(MELCalculator):
 
         # 4. Balance Duration (15%)
         detail["balance_duration"] = self._analyze_balance_duration(
-            price_history, vah, val
+            prices, vah, val
         )
         detail["balance_score"] = self._score_balance(detail["balance_duration"])
 
@@ -146,55 +166,62 @@ class VolumeProfileEffectivenessCalculator(MELCalculator):
 
         return self.normalize_score(effectiveness), detail
 
+    @staticmethod
+    def _first_node(price: np.ndarray, nodes: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Per bar: is a node within tolerance, and the first such node in list order."""
+        near = np.abs(price[:, None] - nodes[None, :]) <= tolerance
+        return near.any(axis=1), nodes[near.argmax(axis=1)]
+
+    def _hvn_tests(self, prices: PriceWindow, hvns: np.ndarray, start: int, stop: int, tolerance: float):
+        """(tests, accepts) for bars [start, stop): at an HVN, then dwelling near it for 2 of the next 3 bars."""
+        hit, node = self._first_node(prices.view("price", start, stop), hvns, tolerance)
+        dwell = sum(
+            (future != 0) & (np.abs(future - node) <= tolerance * 1.5)
+            for future in (prices.shifted("price", start, stop, k) for k in (1, 2, 3))
+        )
+        return hit, hit & (dwell >= 2)
+
     def _calculate_hvn_acceptance_rate(
         self,
-        price_history: List[Dict],
+        prices: PriceWindow,
         hvns: List[float],
     ) -> float:
         """
         Calculate percentage of times price accepts at high volume nodes.
 
         Acceptance = price approaches HVN and consolidates/dwells there.
+
+        Bars with all three dwell bars are final; the bar three from the end
+        (only two dwell bars so far) is scored provisionally each snapshot.
         """
-        if not price_history or not hvns:
+        if not len(prices) or not hvns:
             return 65.0
 
-        tests = 0
-        accepts = 0
         tolerance = 3.0  # Points tolerance for "at" HVN
-
-        for i in range(1, len(price_history) - 2):
-            curr_bar = price_history[i]
-            curr_price = curr_bar.get("close") or curr_bar.get("price")
-
-            if curr_price is None:
-                continue
-
-            for hvn in hvns:
-                dist = abs(curr_price - hvn)
-
-                if dist <= tolerance:
-                    # Price is at HVN - this is a test
-                    tests += 1
-
-                    # Check if price dwells (stays near HVN for next few bars)
-                    dwell_count = 0
-                    for j in range(i + 1, min(i + 4, len(price_history))):
-                        future_bar = price_history[j]
-                        future_price = future_bar.get("close") or future_bar.get("price")
-                        if future_price and abs(future_price - hvn) <= tolerance * 1.5:
-                            dwell_count += 1
-
-                    if dwell_count >= 2:
-                        # Price accepted at HVN (dwelled)
-                        accepts += 1
-                    break  # Only count once per bar
-
-        return self.calculate_rate(accepts, tests, 65.0)
+        nodes = np.array(hvns, dtype=np.float64)
+        cols = self._hvn
+        cols.follow(prices, tuple(hvns))
+
+        tests, accepts = cols["tests"], cols["accepts"]
+        start, stop = cols.pending(tests, prices)
+        if stop > start:
+            hit, accepted = self._hvn_tests(prices, nodes, start, stop, tolerance)
+            tests.extend(hit)
+            accepts.extend(accepted)
+
+        # Bars 1 .. n-3 of the window
+        test_count = tests.total - tests.first()
+        accept_count = accepts.total - accepts.first()
+        if len(prices) >= 4:
+            hit, accepted = self._hvn_tests(prices, nodes, prices.hi - 3, prices.hi - 2, tolerance)
+            test_count += int(hit[0])
+            accept_count += int(accepted[0])
+
+        return self.calculate_rate(accept_count, test_count, 65.0)
 
     def _calculate_lvn_rejection_rate(
         self,
-        price_history: List[Dict],
+        prices: PriceWindow,
         lvns: List[float],
     ) -> float:
         """
@@ -202,38 +229,25 @@ class VolumeProfileEffectivenessCalculator(MELCalculator):
 
         Rejection = price approaches LVN and quickly moves away.
         """
-        if not price_history or not lvns:
+        if not len(prices) or not lvns:
             return 65.0
 
-        tests = 0
-        rejects = 0
         tolerance = 2.0  # Points tolerance - LVNs should see fast moves
-
-        for i in range(1, len(price_history) - 2):
-            curr_bar = price_history[i]
-            curr_price = curr_bar.get("close") or curr_bar.get("price")
-
-            if curr_price is None:
-                continue
-
-            for lvn in lvns:
-                dist = abs(curr_price - lvn)
-
-                if dist <= tolerance:
-                    # Price is at LVN - this is a test
-                    tests += 1
-
-                    # Check if price quickly moves away
-                    if i + 2 < len(price_history):
-                        future_bar = price_history[i + 2]
-                        future_price = future_bar.get("close") or future_bar.get("price")
-
-                        if future_price and abs(future_price - lvn) > tolerance * 2:
-                            # Price moved away quickly - rejection
-                            rejects += 1
-                    break
-
-        return self.calculate_rate(rejects, tests, 65.0)
+        nodes = np.array(lvns, dtype=np.float64)
+        cols = self._lvn
+        cols.follow(prices, tuple(lvns))
+
+        tests, rejects = cols["tests"], cols["rejects"]
+        start, stop = cols.pending(tests, prices)
+        if stop > start:
+            hit, node = self._first_node(prices.view("price", start, stop), nodes, tolerance)
+            # Price two bars on has moved away - rejection
+            future = prices.shifted("price", start, stop, 2)
+            tests.extend(hit)
+            rejects.extend(hit & (future != 0) & (np.abs(future - node) > tolerance * 2))
+
+        # Bars 1 .. n-3 of the window
+        return self.calculate_rate(rejects.total - rejects.first(), tests.total - tests.first(), 65.0)
 
     def _analyze_rotation_completion(
         self,
@@ -312,7 +326,7 @@ class VolumeProfileEffectivenessCalculator(MELCalculator):
 
     def _analyze_balance_duration(
         self,
-        price_history: List[Dict],
+        prices: PriceWindow,
         vah: Optional[float],
         val: Optional[float],
     ) -> str:
@@ -323,18 +337,19 @@ class VolumeProfileEffectivenessCalculator(MELCalculator):
 
         Returns: 'Normal', 'Shortened', 'Extended'
         """
-        if not price_history or vah is None or val is None:
+        if not len(prices) or vah is None or val is None:
             return "Normal"
 
-        in_balance_count = 0
-        total_bars = len(price_history)
+        cols = self._balance
+        cols.follow(prices, (vah, val))
 
-        for bar in price_history:
-            price = bar.get("close") or bar.get("price")
-            if price and val <= price <= vah:
-                in_balance_count += 1
+        in_value = cols["in_value"]
+        start, stop = cols.pending(in_value, prices)
+        if stop > start:
+            price = prices.view("price", start, stop)
+            in_value.extend((price != 0) & (val <= price) & (price <= vah))
 
-        balance_pct = in_balance_count / total_bars * 100 if total_bars > 0 else 0
+        balance_pct = in_value.total / len(prices) * 100
 
         # Expected: ~70% of time in balance for normal day
         if 60 <= balance_pct <= 80:
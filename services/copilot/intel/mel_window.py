@@ -0,0 +1,298 @@
+"""
+MEL Price Window - Rolling NumPy mirror of price_history for MEL calculators.
+
+The copilot loader hands MEL the trailing price history as a list of bar
+dicts, rebuilt on every poll. PriceWindow mirrors that list in NumPy
+columns (ts, price, high, low; NaN where a bar lacks a field) and updates
+incrementally: bars are matched on "ts", new bars are appended, bars that
+left the input are evicted from the front, and a revised last bar (the one
+still forming) is replaced. Every bar gets a sequence number, so
+state derived from the window can be keyed on it.
+
+Calculators keep per-bar contributions (level tests, violations, ...) in
+WindowColumns. Each snapshot, follow() truncates values the window revised,
+trims evicted bars and resets on a changed key (levels, magnet, ...). The
+calculator then computes values only for bars it has not seen, vectorized,
+and reads window totals from the running sums. Snapshot cost follows the
+number of new bars, not the length of the history.
+
+The orchestrator syncs one shared window per snapshot and passes it to the
+calculators as market_data["price_window"]; a calculator used on its own
+syncs a private one from market_data["price_history"].
+"""
+
+import math
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+FIELDS = ("ts", "price", "high", "low")
+
+
+def _num(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) else math.nan
+
+
+def bar_row(bar: Dict[str, Any]) -> tuple:
+    """(ts, price, high, low) for one bar; price falls back to close."""
+    return (
+        _num(bar.get("ts")),
+        _num(bar.get("price") or bar.get("close")),
+        _num(bar.get("high")),
+        _num(bar.get("low")),
+    )
+
+
+def same_row(a: tuple, b: tuple) -> bool:
+    """Row equality with NaN == NaN."""
+    return all(x == y or (x != x and y != y) for x, y in zip(a, b))
+
+
+def count_within(levels: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Number of sorted levels in [lo, hi], elementwise (0 where hi < lo or NaN)."""
+    counts = np.searchsorted(levels, hi, side="right") - np.searchsorted(levels, lo, side="left")
+    return np.where(np.isnan(lo) | np.isnan(hi), 0, np.maximum(counts, 0))
+
+
+class RollingColumn:
+    """
+    Per-bar values for sequence numbers [lo, hi) with a running total.
+
+    lookahead: how many later bars a value depends on. Values exist only
+    for bars at least that far from the window's end, and are dropped
+    again when one of those later bars is revised.
+    """
+
+    __slots__ = ("_data", "_start", "_end", "lo", "total", "lookahead", "_totals")
+
+    def __init__(self, dtype=np.int64, lookahead: int = 0, totals: bool = True, capacity: int = 256):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._start = 0
+        self._end = 0
+        self.lo = 0
+        self.total = 0
+        self.lookahead = lookahead
+        self._totals = totals
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def hi(self) -> int:
+        return self.lo + self._end - self._start
+
+    def values(self, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """View of the values for seqs [start, stop)."""
+        a = self._start + (0 if start is None else start - self.lo)
+        b = self._end if stop is None else self._start + stop - self.lo
+        return self._data[a:b]
+
+    def at(self, seq: int):
+        return self._data[self._start + seq - self.lo]
+
+    def first(self):
+        return self._data[self._start] if self._end > self._start else 0
+
+    def last(self):
+        return self._data[self._end - 1] if self._end > self._start else None
+
+    def reset(self, seq: int) -> None:
+        self._start = self._end = 0
+        self.lo = seq
+        self.total = 0
+
+    def trim(self, lo: int) -> None:
+        """Drop values before seq lo."""
+        if lo >= self.hi:
+            self.reset(lo)
+            return
+        k = lo - self.lo
+        if k > 0:
+            if self._totals:
+                self.total -= self._data[self._start:self._start + k].sum().item()
+            self._start += k
+            self.lo = lo
+
+    def truncate(self, hi: int) -> None:
+        """Drop values from seq hi on."""
+        k = self.hi - max(hi, self.lo)
+        if k > 0:
+            if self._totals:
+                self.total -= self._data[self._end - k:self._end].sum().item()
+            self._end -= k
+
+    def extend(self, values) -> None:
+        values = np.asarray(values, dtype=self._data.dtype)
+        n = len(values)
+        if not n:
+            return
+        if self._end + n > len(self._data):
+            live = self._data[self._start:self._end]
+            size = len(self._data)
+            while len(live) + n > size // 2:
+                size *= 2
+            data = np.zeros(size, dtype=self._data.dtype)
+            data[:len(live)] = live
+            self._data, self._start, self._end = data, 0, len(live)
+            if self._totals:
+                # Re-sum on compaction so float totals do not drift
+                self.total = live.sum().item()
+        self._data[self._end:self._end + n] = values
+        self._end += n
+        if self._totals:
+            self.total += values.sum().item()
+
+
+class PriceWindow:
+    """NumPy columns mirroring the latest price_history list, updated incrementally."""
+
+    def __init__(self):
+        self._cols = {name: RollingColumn(np.float64, totals=False) for name in FIELDS}
+        self.version = 0
+        self.changed_from = 0
+        self.stats = {"syncs": 0, "appended": 0, "evicted": 0, "rebuilds": 0}
+
+    def __len__(self) -> int:
+        return len(self._cols["ts"])
+
+    @property
+    def lo(self) -> int:
+        return self._cols["ts"].lo
+
+    @property
+    def hi(self) -> int:
+        return self._cols["ts"].hi
+
+    def view(self, name: str, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """Column view for seqs [start, stop) (default: the whole window)."""
+        return self._cols[name].values(start, stop)
+
+    @property
+    def price(self) -> np.ndarray:
+        return self.view("price")
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.view("high")
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.view("low")
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self.view("ts")
+
+    def shifted(self, name: str, start: int, stop: int, offset: int) -> np.ndarray:
+        """Values of seqs [start + offset, stop + offset), NaN outside the window."""
+        a, b = start + offset, stop + offset
+        out = np.full(stop - start, np.nan)
+        ca, cb = max(a, self.lo), min(b, self.hi)
+        if cb > ca:
+            out[ca - a:cb - a] = self.view(name, ca, cb)
+        return out
+
+    def sync(self, price_history: Optional[List[Dict[str, Any]]]) -> int:
+        """
+        Mirror price_history. Returns (and sets) changed_from: the first seq
+        whose bar is new or revised; values derived from earlier bars still hold.
+        """
+        bars = price_history or []
+        self.version += 1
+        self.stats["syncs"] += 1
+        hi = self.hi
+
+        k = self._match_last(bars)
+        if k is None:
+            return self._rebuild(bars)
+
+        if not same_row(bar_row(bars[k]), tuple(self._cols[f].last() for f in FIELDS)):
+            # Last bar still forming: replace it
+            self._truncate(hi - 1)
+            self.changed_from = hi - 1
+            self._append(bars[k:])
+        else:
+            self.changed_from = hi
+            self._append(bars[k + 1:])
+
+        drop = len(self) - len(bars)
+        if drop < 0 or self._cols["ts"].at(self.lo + drop) != bar_row(bars[0])[0]:
+            return self._rebuild(bars)
+        lo = self.lo + drop
+        for col in self._cols.values():
+            col.trim(lo)
+        self.stats["evicted"] += drop
+        return self.changed_from
+
+    def _match_last(self, bars: List[Dict[str, Any]]) -> Optional[int]:
+        """Index in bars of the window's last bar, scanning back over new bars."""
+        if not len(self) or not bars:
+            return None
+        last_ts = self._cols["ts"].last()
+        if math.isnan(last_ts):
+            return None
+        for i in range(len(bars) - 1, -1, -1):
+            ts = bars[i].get("ts")
+            if not isinstance(ts, (int, float)) or ts < last_ts:
+                return None
+            if ts == last_ts:
+                return i
+        return None
+
+    def _rebuild(self, bars: List[Dict[str, Any]]) -> int:
+        lo = self.hi
+        for col in self._cols.values():
+            col.reset(lo)
+        self._append(bars)
+        self.changed_from = lo
+        self.stats["rebuilds"] += 1
+        return lo
+
+    def _truncate(self, hi: int) -> None:
+        for col in self._cols.values():
+            col.truncate(hi)
+
+    def _append(self, bars: List[Dict[str, Any]]) -> None:
+        if not bars:
+            return
+        rows = np.array([bar_row(b) for b in bars], dtype=np.float64)
+        for i, name in enumerate(FIELDS):
+            self._cols[name].extend(rows[:, i])
+        self.stats["appended"] += len(bars)
+
+
+class WindowColumns:
+    """
+    A group of RollingColumns derived from one PriceWindow and one key
+    (the levels, magnet, ... the values were computed against).
+    """
+
+    def __init__(self, **columns: RollingColumn):
+        self._cols = columns
+        self._window: Optional[PriceWindow] = None
+        self._version: Optional[int] = None
+        self._key: Hashable = None
+
+    def __getitem__(self, name: str) -> RollingColumn:
+        return self._cols[name]
+
+    def follow(self, window: PriceWindow, key: Hashable = None) -> bool:
+        """Align with the window's current bars. Resets (returns True) if anything was missed."""
+        continuous = (
+            window is self._window
+            and key == self._key
+            and self._version in (window.version, window.version - 1)
+        )
+        for col in self._cols.values():
+            if not continuous:
+                col.reset(window.lo)
+            elif self._version != window.version:
+                col.truncate(window.changed_from - col.lookahead)
+            col.trim(window.lo)
+        self._window, self._key, self._version = window, key, window.version
+        return not continuous
+
+    @staticmethod
+    def pending(col: RollingColumn, window: PriceWindow) -> tuple:
+        """Seqs [start, stop) that col can now compute."""
+        return col.hi, max(col.hi, window.hi - col.lookahead)
@@ -23,9 +23,11 @@ from .adi_api import ADIAPIHandler
 from .commentary import CommentaryService
 from .commentary_models import CommentaryConfig
 from .commentary_api import CommentaryAPIHandler
-from .ai_providers import AIProviderConfig, AIProviderManager, create_provider
+from .ai_cache import AIResultCache
+from .ai_providers import AIProviderConfig, AIProviderManager, create_provider, provider_pool
 from .alert_engine import AlertEngine, AlertEngineConfig
 from .alert_evaluators import create_all_evaluators
+from .market_snapshot import MarketPushListener, MarketSnapshotLoader
 
 # CDIS Phase 1 — Distribution Health Thresholds
 #
@@ -78,6 +80,18 @@ class CopilotOrchestrator:
         # Key is DTE (0, 1, 2, etc.), value is market data dict
         self._market_data_by_dte: Dict[int, dict] = {}
         self._available_dtes: list = []
+
+        # Shared massive inputs, loaded in one round trip per poll
+        self._market = MarketSnapshotLoader(logger)
+        self.market_push = config.get("COPILOT_MARKET_PUSH", "false") == "true"
+        self.market_push_min_ms = int(config.get("COPILOT_MARKET_PUSH_MIN_MS", "250"))
+
+        # Shared AI clients: per-provider concurrency and token/s governor
+        # across alerts, prompt alerts and commentary (0 tokens/s = unlimited)
+        provider_pool.configure(
+            max_concurrency=int(config.get("COPILOT_AI_PROVIDER_CONCURRENCY", "8")),
+            tokens_per_sec=float(config.get("COPILOT_AI_TOKENS_PER_SEC", "0")),
+        )
         self._active_dte: int = 0  # Currently selected DTE for MEL calculation
 
         # Subsystems
@@ -167,188 +181,74 @@ class CopilotOrchestrator:
         """
         Poll Redis for market data and update _market_data_by_dte cache.
         Transforms massive data format into MEL-compatible format for each DTE.
-        Runs every 5 seconds.
+        Runs every 5 seconds, and also as soon as massive writes when push is
+        enabled (COPILOT_MARKET_PUSH). One pipelined round trip per poll;
+        unchanged inputs are not re-parsed (see market_snapshot.py).
         """
-        import json
-        from datetime import datetime as dt
         poll_interval = 5  # seconds
+        push_coalesce = self.market_push_min_ms / 1000.0
 
-        while True:
-            try:
-                if self.market_redis:
-                    # Fetch spot price (shared across all DTEs)
-                    spot_raw = await self.market_redis.get("massive:model:spot:I:SPX")
-                    spot_price = None
-                    if spot_raw:
-                        try:
-                            spot_data = json.loads(spot_raw)
-                            spot_price = spot_data.get("value")
-                        except Exception:
-                            pass
-
-                    # Fetch price history from trail (shared across all DTEs)
-                    price_history = []
-                    try:
-                        trail_raw = await self.market_redis.zrange(
-                            "massive:model:spot:I:SPX:trail", -100, -1, withscores=True
-                        )
-                        for member, score in trail_raw:
-                            try:
-                                data = json.loads(member)
-                                price_history.append({
-                                    "price": data.get("value"),
-                                    "ts": score,
-                                })
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
-
-                    # Fetch heatmap (shared)
-                    heatmap_raw = await self.market_redis.get("massive:heatmap:model:I:SPX:latest")
-                    heatmap_data = None
-                    if heatmap_raw:
-                        try:
-                            heatmap_data = json.loads(heatmap_raw)
-                        except Exception:
-                            pass
-
-                    # Fetch volume profile (shared)
-                    vp_raw = await self.market_redis.hgetall("massive:volume_profile:spx")
-                    volume_profile = None
-                    if vp_raw:
-                        try:
-                            volume_profile = {
-                                int(k): int(v) for k, v in vp_raw.items()
-                            }
-                        except Exception:
-                            pass
-
-                    # Fetch bias/LFI data (published by massive)
-                    bias_lfi_data = None
-                    bias_lfi_raw = await self.market_redis.get("massive:bias_lfi:model:latest")
-                    if bias_lfi_raw:
-                        try:
-                            bias_lfi_data = json.loads(bias_lfi_raw)
-                        except Exception:
-                            pass
-
-                    # Fetch market mode data (published by massive)
-                    market_mode_data = None
-                    market_mode_raw = await self.market_redis.get("massive:market_mode:model:latest")
-                    if market_mode_raw:
-                        try:
-                            market_mode_data = json.loads(market_mode_raw)
-                        except Exception:
-                            pass
-
-                    # Fetch VIX regime data (published by massive)
-                    vix_regime_data = None
-                    vix_regime_raw = await self.market_redis.get("massive:vix_regime:model:latest")
-                    if vix_regime_raw:
-                        try:
-                            vix_regime_data = json.loads(vix_regime_raw)
-                        except Exception:
-                            pass
-
-                    # Fetch trade selector data (published by massive)
-                    trade_selector_data = None
-                    trade_selector_raw = await self.market_redis.get("massive:trade_selector:SPX:latest")
-                    if trade_selector_raw:
-                        try:
-                            trade_selector_data = json.loads(trade_selector_raw)
-                        except Exception:
-                            pass
-
-                    # Fetch GEX data - process ALL expirations
-                    gex_calls_raw = await self.market_redis.get("massive:gex:model:I:SPX:calls")
-                    gex_puts_raw = await self.market_redis.get("massive:gex:model:I:SPX:puts")
-
-                    if gex_calls_raw and gex_puts_raw:
-                        try:
-                            calls_data = json.loads(gex_calls_raw)
-                            puts_data = json.loads(gex_puts_raw)
-
-                            calls_exp = calls_data.get("expirations", {})
-                            puts_exp = puts_data.get("expirations", {})
-
-                            if calls_exp and puts_exp:
-                                # Get sorted expiration dates
-                                all_exps = sorted(set(calls_exp.keys()) & set(puts_exp.keys()))
-                                self._available_dtes = list(range(len(all_exps)))
-
-                                # Process each expiration as a DTE index
-                                for dte_index, exp_date in enumerate(all_exps):
-                                    calls = calls_exp.get(exp_date, {})
-                                    puts = puts_exp.get(exp_date, {})
-
-                                    # Calculate net gamma at each strike
-                                    all_strikes = set(calls.keys()) | set(puts.keys())
-                                    net_gamma = {}
-                                    max_abs_gamma = 0
-                                    max_gamma_strike = None
-
-                                    for strike in all_strikes:
-                                        call_g = float(calls.get(strike, 0))
-                                        put_g = float(puts.get(strike, 0))
-                                        net = call_g - put_g
-                                        net_gamma[int(float(strike))] = net
-
-                                        # Track max gamma for magnet
-                                        total = call_g + put_g
-                                        if total > max_abs_gamma:
-                                            max_abs_gamma = total
-                                            max_gamma_strike = int(float(strike))
-
-                                    # Sort strikes and build gamma level dicts
-                                    sorted_strikes = sorted(net_gamma.keys())
-                                    gamma_levels = [
-                                        {"strike": s, "net_gamma": net_gamma[s]}
-                                        for s in sorted_strikes
-                                    ]
-                                    gamma_magnet = max_gamma_strike
-
-                                    # Find zero gamma (where net gamma crosses zero)
-                                    zero_gamma = None
-                                    prev_strike = None
-                                    prev_net = None
-                                    for strike in sorted_strikes:
-                                        net = net_gamma[strike]
-                                        if prev_net is not None:
-                                            if (prev_net < 0 and net > 0) or (prev_net > 0 and net < 0):
-                                                zero_gamma = (prev_strike + strike) / 2
-                                                break
-                                        prev_strike = strike
-                                        prev_net = net
-
-                                    # Store market data for this DTE
-                                    self._market_data_by_dte[dte_index] = {
-                                        "dte": dte_index,
-                                        "expiration": exp_date,
-                                        "spot_price": spot_price,
-                                        "gamma_levels": gamma_levels,
-                                        "zero_gamma": zero_gamma,
-                                        "gamma_magnet": gamma_magnet,
-                                        "price_history": price_history,
-                                        "volume_profile": volume_profile,
-                                        "heatmap": heatmap_data,
-                                        "bias_lfi": bias_lfi_data,
-                                        "market_mode": market_mode_data,
-                                        "vix_regime": vix_regime_data,
-                                        "trade_selector": trade_selector_data,
-                                        "timestamp": datetime.utcnow(),
-                                    }
-
-                        except Exception as e:
-                            self.logger.warn(f"GEX transform error: {e}", emoji="⚠️")
-
-                    # Notify alert engine of market data update
-                    self._on_market_data_update()
+        wake = asyncio.Event()
+        push_task = None
+        if self.market_push and self.market_redis:
+            listener = MarketPushListener(self.market_redis, wake.set, logger=self.logger)
+            push_task = asyncio.create_task(listener.run(), name="market-data-push")
 
-            except Exception as e:
-                self.logger.warn(f"market data poll error: {e}", emoji="⚠️")
+        pushed = False
+        try:
+            while True:
+                try:
+                    if self.market_redis:
+                        changed = await self._market.load(self.market_redis)
+                        # Scheduled polls always refresh; pushed ones only on change
+                        if changed or not pushed:
+                            self._apply_market_snapshot()
+                            # Notify alert engine of market data update
+                            self._on_market_data_update()
+
+                except Exception as e:
+                    self.logger.warn(f"market data poll error: {e}", emoji="⚠️")
+
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=poll_interval)
+                    pushed = True
+                    # Coalesce bursts (massive writes several keys per cycle)
+                    await asyncio.sleep(push_coalesce)
+                except asyncio.TimeoutError:
+                    pushed = False
+                wake.clear()
+        finally:
+            if push_task:
+                push_task.cancel()
 
-            await asyncio.sleep(poll_interval)
+    def _apply_market_snapshot(self) -> None:
+        """Rebuild _market_data_by_dte from the loader's (cached) inputs."""
+        m = self._market
+        if not m.expirations:
+            return
+
+        self._available_dtes = list(range(len(m.expirations)))
+        spot_price = m.spot_price
+        now = datetime.utcnow()
+
+        # Process each expiration as a DTE index
+        for dte_index, exp in enumerate(m.expirations):
+            self._market_data_by_dte[dte_index] = {
+                "dte": dte_index,
+                "expiration": exp["expiration"],
+                "spot_price": spot_price,
+                "gamma_levels": exp["gamma_levels"],
+                "zero_gamma": exp["zero_gamma"],
+                "gamma_magnet": exp["gamma_magnet"],
+                "price_history": m.price_history,
+                "volume_profile": m.volume_profile,
+                "heatmap": m.heatmap_for_expiration(exp["expiration"]),
+                "bias_lfi": m.get("bias_lfi"),
+                "market_mode": m.get("market_mode"),
+                "vix_regime": m.get("vix_regime"),
+                "trade_selector": m.get("trade_selector"),
+                "timestamp": now,
+            }
 
     async def setup_mel(self):
         """Initialize MEL subsystem."""
@@ -421,6 +321,7 @@ class CopilotOrchestrator:
         commentary_config = CommentaryConfig(
             enabled=True,
             rate_limit_per_minute=commentary_settings.get("rateLimitPerMinute", 10),
+            stream=commentary_settings.get("stream", True),
         )
 
         self.commentary = CommentaryService(
@@ -478,12 +379,18 @@ class CopilotOrchestrator:
             model=alerts_settings.get("model"),
         )
 
+        # AI results keyed by quantized market state (per alert + evaluator)
+        ai_cache = None
+        if alerts_settings.get("aiCacheEnabled", True):
+            ai_cache = AIResultCache(max_entries=int(alerts_settings.get("aiCacheMaxEntries", 2048)))
+
         try:
             primary_provider = create_provider(ai_config, self.logger)
             self.ai_manager = AIProviderManager(
                 primary=primary_provider,
                 fallback=None,
                 logger=self.logger,
+                cache=ai_cache,
             )
             self.logger.info(f"AI provider configured: {ai_provider} (requested: {configured_provider})", emoji="🤖")
         except Exception as e:
@@ -501,6 +408,15 @@ class CopilotOrchestrator:
                 "COPILOT_ALERTS_SLOW_LOOP_MS",
                 alerts_settings.get("slowLoopIntervalMs", 5000)
             )),
+            threshold_index=self.config.get("COPILOT_ALERTS_THRESHOLD_INDEX", "true") == "true",
+            change_driven=self.config.get("COPILOT_ALERTS_CHANGE_DRIVEN", "true") == "true",
+            safety_sweep_interval_ms=int(self.config.get(
+                "COPILOT_ALERTS_SWEEP_MS",
+                alerts_settings.get("safetySweepIntervalMs", 10000)
+            )),
+            slow_loop_budget_ms=int(alerts_settings.get("slowLoopBudgetMs", 4000)),
+            ai_max_concurrency=int(alerts_settings.get("aiMaxConcurrency", 8)),
+            ai_provider_concurrency=int(alerts_settings.get("aiProviderConcurrency", 4)),
             # Redis keys from Truth config
             redis_key_prefix=keys_config.get("alertPrefix", "copilot:alerts"),
             publish_channel=keys_config.get("events", "copilot:alerts:events"),
@@ -515,6 +431,7 @@ class CopilotOrchestrator:
         self.logger.info(
             f"Alert config: fast={alert_config.fast_loop_interval_ms}ms, "
             f"slow={alert_config.slow_loop_interval_ms}ms, "
+            f"sweep={alert_config.safety_sweep_interval_ms}ms, "
             f"channel={alert_config.publish_channel}",
             emoji="⚙️"
         )
@@ -525,6 +442,7 @@ class CopilotOrchestrator:
             redis=self.market_redis,
             intel_redis=self.intel_redis,
             logger=self.logger,
+            ai_cache=ai_cache,
         )
 
         # Register all evaluators
@@ -599,6 +517,7 @@ class CopilotOrchestrator:
             "gamma_levels_summary": gamma_summary,
             "price_history_count": len(data.get("price_history", [])),
             "expiration": data.get("expiration"),
+            "loader": self._market.stats,
         })
 
     async def get_analytics(self, request: web.Request) -> web.Response:
@@ -619,6 +538,7 @@ class CopilotOrchestrator:
                 "running": getattr(self, 'commentary', None) is not None,
             },
             "alerts": await self._get_alert_analytics() if getattr(self, 'alert_engine', None) else {},
+            "ai": provider_pool.stats(),
         }
         return web.json_response(analytics)
 
@@ -855,6 +775,7 @@ class CopilotOrchestrator:
             await self.mel.stop()
         if self.mel_api:
             await self.mel_api.close_all()
+        await provider_pool.close()
         if self.runner:
             await self.runner.cleanup()
         if self.market_redis:
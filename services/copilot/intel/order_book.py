@@ -0,0 +1,200 @@
+# services/copilot/intel/order_book.py
+"""
+Order Book - In-memory pending-order book for simulated trading.
+
+OrderQueueEvaluator loads pending orders into an OrderBook, keeps it
+current from journal orders:sync events (with a periodic full reload), and
+answers each price update by bisection instead of listing and scanning
+every order from the DB:
+
+    side          fills when       fillable limits (sorted per symbol)
+    entry long    spot <= limit    [bisect_left(spot):]     buy at ask
+    exit short    spot <= limit    [bisect_left(spot):]     buy at ask
+    entry short   spot >= limit    [:bisect_right(spot)]    sell at bid
+    exit long     spot >= limit    [:bisect_right(spot)]    sell at bid
+
+Expiry is a min-heap on expires_at with lazy deletion: orders removed by a
+fill or cancel are skipped when they surface.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (order_type, direction) -> "le" (fills at spot <= limit) / "ge" (spot >= limit)
+SIDE_OPS = {
+    ("entry", "long"): "le",
+    ("exit", "short"): "le",
+    ("entry", "short"): "ge",
+    ("exit", "long"): "ge",
+}
+
+
+def _epoch(value: Any) -> Optional[float]:
+    """expires_at (naive UTC datetime / ISO string / epoch) -> epoch seconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+@dataclass
+class BookOrder:
+    """The fields of a journal Order the book and fills need."""
+    id: int
+    user_id: int
+    order_type: str
+    symbol: str
+    direction: str
+    limit_price: float
+    quantity: int = 1
+    trade_id: Optional[str] = None
+    expires_at: Optional[float] = None  # epoch seconds
+
+    @property
+    def op(self) -> str:
+        # As the per-order scan did: anything but "entry" is an exit and
+        # anything but "long" (e.g. "sell", "") is short
+        return SIDE_OPS[(
+            "entry" if self.order_type == "entry" else "exit",
+            "long" if self.direction == "long" else "short",
+        )]
+
+    @classmethod
+    def from_order(cls, order: Any) -> "BookOrder":
+        """From a journal Order (DB row) or its dict (orders:sync event)."""
+        get = order.get if isinstance(order, dict) else (lambda k, d=None: getattr(order, k, d))
+        return cls(
+            id=int(get("id")),
+            user_id=get("user_id"),
+            order_type=get("order_type"),
+            symbol=get("symbol"),
+            direction=get("direction"),
+            limit_price=float(get("limit_price")),
+            quantity=get("quantity", 1),
+            trade_id=get("trade_id"),
+            expires_at=_epoch(get("expires_at")),
+        )
+
+
+class _Side:
+    """Limit prices for one (symbol, op), sorted, with order ids alongside."""
+
+    __slots__ = ("limits", "ids")
+
+    def __init__(self) -> None:
+        self.limits: List[float] = []
+        self.ids: List[int] = []
+
+    def add(self, limit: float, order_id: int) -> None:
+        i = bisect_right(self.limits, limit)
+        self.limits.insert(i, limit)
+        self.ids.insert(i, order_id)
+
+    def remove(self, limit: float, order_id: int) -> None:
+        i = bisect_left(self.limits, limit)
+        while i < len(self.ids) and self.limits[i] == limit:
+            if self.ids[i] == order_id:
+                del self.limits[i]
+                del self.ids[i]
+                return
+            i += 1
+
+
+class OrderBook:
+    """Pending orders by symbol and side, plus an expiry heap."""
+
+    def __init__(self) -> None:
+        self._orders: Dict[int, BookOrder] = {}
+        self._sides: Dict[str, Dict[str, _Side]] = {}
+        self._expiry: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self._orders
+
+    def get(self, order_id: int) -> Optional[BookOrder]:
+        return self._orders.get(order_id)
+
+    def symbols(self) -> List[str]:
+        return list(self._sides)
+
+    def load(self, orders: Iterable[BookOrder]) -> None:
+        """Replace the book (bulk load: one sort per side)."""
+        grouped: Dict[str, Dict[str, List[Tuple[float, int]]]] = {}
+        self._orders = {}
+        self._expiry = []
+        for order in orders:
+            self._orders[order.id] = order
+            grouped.setdefault(order.symbol, {}).setdefault(order.op, []).append((order.limit_price, order.id))
+            if order.expires_at is not None:
+                self._expiry.append((order.expires_at, order.id))
+        heapq.heapify(self._expiry)
+
+        self._sides = {}
+        for symbol, ops in grouped.items():
+            for op, pairs in ops.items():
+                pairs.sort()
+                side = _Side()
+                side.limits = [p for p, _ in pairs]
+                side.ids = [i for _, i in pairs]
+                self._sides.setdefault(symbol, {})[op] = side
+
+    def add(self, order: BookOrder) -> None:
+        self.remove(order.id)
+        self._orders[order.id] = order
+        self._sides.setdefault(order.symbol, {}).setdefault(order.op, _Side()).add(order.limit_price, order.id)
+        if order.expires_at is not None:
+            heapq.heappush(self._expiry, (order.expires_at, order.id))
+
+    def remove(self, order_id: int) -> Optional[BookOrder]:
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return None
+        sides = self._sides[order.symbol]
+        sides[order.op].remove(order.limit_price, order.id)
+        if not sides[order.op].ids:
+            del sides[order.op]
+        if not sides:
+            del self._sides[order.symbol]
+        return order
+
+    def fillable(self, symbol: str, spot: float) -> List[BookOrder]:
+        """Orders on symbol whose limit is reached at spot, oldest id first."""
+        sides = self._sides.get(symbol)
+        if not sides:
+            return []
+        ids: List[int] = []
+        le = sides.get("le")
+        if le:
+            ids += le.ids[bisect_left(le.limits, spot):]
+        ge = sides.get("ge")
+        if ge:
+            ids += ge.ids[:bisect_right(ge.limits, spot)]
+        return [self._orders[i] for i in sorted(ids)]
+
+    def expire(self, now: float) -> List[BookOrder]:
+        """Remove and return orders whose expires_at is before now."""
+        expired = []
+        while self._expiry and self._expiry[0][0] < now:
+            expires_at, order_id = heapq.heappop(self._expiry)
+            order = self._orders.get(order_id)
+            if order is not None and order.expires_at == expires_at:
+                expired.append(self.remove(order_id))
+        return expired
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "orders_pending": len(self._orders),
+            "order_symbols": len(self._sides),
+            "expiry_heap": len(self._expiry),
+        }
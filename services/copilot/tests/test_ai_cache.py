@@ -0,0 +1,118 @@
+"""
+AI Cache Tests - market-state-keyed caching in front of AIProviderManager.generate.
+"""
+
+import asyncio
+import json
+
+from ..intel.ai_cache import AIResultCache, CacheRule, alert_cache_key
+from ..intel.ai_providers import (
+    AIProvider,
+    AIProviderConfig,
+    AIProviderManager,
+    AIResponse,
+    BaseAIProvider,
+)
+from ..intel.alert_engine import AlertEngine, AlertEngineConfig
+from ..intel.alert_evaluators import AIRiskZoneEvaluator, AIThetaGammaEvaluator
+from .test_alert_index import make_alert
+
+
+class CountingProvider(BaseAIProvider):
+    """Provider stand-in returning a fixed JSON body and counting calls."""
+
+    provider_name = AIProvider.OPENAI
+
+    def __init__(self, content):
+        super().__init__(AIProviderConfig(provider=AIProvider.OPENAI))
+        self.content = content
+        self.calls = 0
+
+    async def generate(self, messages, system_prompt=None, **kwargs):
+        self.calls += 1
+        return AIResponse(content=json.dumps(self.content), provider=AIProvider.OPENAI, model="test")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def market(spot=5900.0, vix=15.2, debit=2.0, **kw):
+    return {"spot_price": spot, "vix": vix, "strategies": {"s1": {"current_debit": debit}}, **kw}
+
+
+class TestAIResultCache:
+    """Bucket crossings, TTL and LRU."""
+
+    def test_quantized_key(self):
+        rule = CacheRule(spot_step=5.0, vix_step=1.0, pnl_step=0.1)
+        alert = make_alert("a", type="ai_theta_gamma", strategy_id="s1", entry_debit=4.0)
+        key = alert_cache_key("ai_theta_gamma", alert, market(), rule)
+        assert key[0] == ("ai_theta_gamma", "a")
+        assert alert_cache_key("ai_theta_gamma", alert, market(spot=5904.9, vix=15.9, debit=1.9), rule) == key
+        assert alert_cache_key("ai_theta_gamma", alert, market(spot=5905.0), rule) != key
+        assert alert_cache_key("ai_theta_gamma", alert, market(vix=16.0), rule) != key
+        assert alert_cache_key("ai_theta_gamma", alert, market(debit=1.5), rule) != key
+        assert alert_cache_key("ai_theta_gamma", alert, market(), rule, "negative") != key
+
+    def test_ttl_invalidation_and_lru(self):
+        clock = FakeClock()
+        cache = AIResultCache(max_entries=2, clock=clock)
+        cache.put(("e", "a"), "ra", 10)
+        assert cache.get(("e", "a")) == "ra"
+        assert cache.get(("e", "other")) is None            # bucket crossed: dropped
+        assert cache.get(("e", "a")) is None
+
+        cache.put((("e", "a"), 1), "ra", 10)
+        clock.now = 10
+        assert cache.get((("e", "a"), 1)) is None           # expired
+
+        for owner in ("x", "y", "z"):
+            cache.put((owner, 0), owner, 10)
+        cache.get(("y", 0))
+        cache.put(("w", 0), "w", 10)
+        assert cache.get(("z", 0)) is None and cache.get(("y", 0)) == "y"
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["invalidations"], stats["expirations"], stats["evictions"]) == (3, 1, 1, 2)
+
+
+class TestCachedEvaluators:
+    """Evaluators reuse answers until their quantized inputs change."""
+
+    def test_theta_gamma_reuses_until_bucket_crossed(self):
+        provider = CountingProvider({"should_trigger": False, "confidence": 0.4, "reasoning": "ok"})
+        cache = AIResultCache()
+        evaluator = AIThetaGammaEvaluator(AIProviderManager(provider, cache=cache))
+        engine = AlertEngine(AlertEngineConfig(), logger=None, ai_cache=cache)
+        alert = make_alert("tg", type="ai_theta_gamma", strategy_id="s1", entry_debit=3.0)
+        engine._alerts[alert.id] = alert
+
+        async def run():
+            for data in (market(), market(spot=5901.0), market(vix=15.9), market(spot=5911.0)):
+                await evaluator.evaluate(alert, data)
+            await engine.delete_alert(alert.id)
+
+        asyncio.run(run())
+        assert provider.calls == 2
+        analytics = engine.get_analytics()
+        assert analytics["ai_cache_hits"] == 2 and analytics["ai_cache_misses"] == 2
+        assert analytics["ai_cache_invalidations"] == 2 and analytics["ai_cache_entries"] == 0
+
+    def test_risk_zone_reparses_against_live_spot(self):
+        provider = CountingProvider({"zone_low": 5895, "zone_high": 5905, "confidence": 0.8, "reasoning": ""})
+        evaluator = AIRiskZoneEvaluator(AIProviderManager(provider, cache=AIResultCache()))
+        alert = make_alert("rz", type="ai_risk_zone", condition="outside_zone")
+
+        async def run():
+            inside = await evaluator.evaluate(alert, market(spot=5901.0))
+            outside = await evaluator.evaluate(alert, market(spot=5906.0, vix=30.0))
+            return inside, outside
+
+        inside, outside = asyncio.run(run())
+        assert provider.calls == 1
+        assert not inside.should_trigger and outside.should_trigger
@@ -0,0 +1,206 @@
+"""
+AI Provider Tests - shared pool: single-flight, governor, streaming.
+"""
+
+import asyncio
+import time
+from contextlib import aclosing
+
+from ..intel.ai_providers import (
+    AIMessage,
+    AIProvider,
+    AIProviderConfig,
+    AIProviderManager,
+    AIResponse,
+    BaseAIProvider,
+    ProviderGovernor,
+    ProviderPool,
+)
+from ..intel.commentary import CommentaryOrchestrator
+from ..intel.commentary_models import CommentaryConfig, CommentaryTrigger, TriggerType
+
+
+class FakeProvider(BaseAIProvider):
+    """Provider stand-in: fixed latency, streams its reply in words."""
+
+    def __init__(self, name=AIProvider.OPENAI, latency=0.05, reply="range holds above the magnet",
+                 fail=False, tokens=None, stream_delay=0.0):
+        super().__init__(AIProviderConfig(provider=name, model=f"{name.value}-model", max_tokens=100))
+        self._name, self.latency, self.reply, self.fail, self.tokens = name, latency, reply, fail, tokens
+        self.stream_delay = stream_delay
+        self.calls = self.active = self.peak = 0
+
+    @property
+    def provider_name(self):
+        return self._name
+
+    async def generate(self, messages, system_prompt=None, **kwargs):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.fail:
+                raise RuntimeError("provider down")
+            return AIResponse(content=self.reply, provider=self._name, model="fake", tokens_used=self.tokens)
+        finally:
+            self.active -= 1
+
+    async def generate_stream(self, messages, system_prompt=None, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("provider down")
+        for word in self.reply.split(" "):
+            await asyncio.sleep(self.stream_delay)
+            yield word + " "
+
+
+def ask(content):
+    return [AIMessage(role="user", content=content)]
+
+
+class TestSingleFlight:
+    """Identical concurrent requests share one provider call."""
+
+    def test_identical_requests_coalesce(self):
+        provider = FakeProvider()
+        pool = ProviderPool()
+        alerts, prompts = AIProviderManager(provider, pool=pool), AIProviderManager(provider, pool=pool)
+
+        async def run():
+            same = [m.generate(ask("spot 5900"), "sys", max_tokens=50) for m in (alerts, prompts) for _ in range(5)]
+            other = alerts.generate(ask("spot 5900"), "sys", max_tokens=60)
+            return await asyncio.gather(*same, other)
+
+        responses = asyncio.run(run())
+        assert provider.calls == 2
+        assert pool.coalesced == 9 and not pool.inflight
+        assert all(r.content == provider.reply for r in responses)
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        provider = FakeProvider(latency=0.05)
+        manager = AIProviderManager(provider, pool=ProviderPool())
+
+        async def run():
+            first = asyncio.create_task(manager.generate(ask("x")))
+            second = asyncio.create_task(manager.generate(ask("x")))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(run()).content == provider.reply
+        assert provider.calls == 1
+
+    def test_errors_reach_every_waiter_then_clear(self):
+        provider = FakeProvider(fail=True, latency=0.01)
+        pool = ProviderPool()
+        manager = AIProviderManager(provider, pool=pool)
+
+        async def run():
+            return await asyncio.gather(*(manager.generate(ask("x")) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in asyncio.run(run()))
+        assert provider.calls == 1 and not pool.inflight
+
+
+class TestGovernor:
+    """Per-provider concurrency cap and token/s budget."""
+
+    def test_concurrency_cap_is_per_provider(self):
+        pool = ProviderPool(max_concurrency=2)
+        openai, anthropic = FakeProvider(), FakeProvider(AIProvider.ANTHROPIC)
+        managers = [AIProviderManager(openai, pool=pool), AIProviderManager(anthropic, pool=pool)]
+
+        async def run():
+            await asyncio.gather(*(m.generate(ask(f"q{i}")) for m in managers for i in range(6)))
+
+        asyncio.run(run())
+        assert openai.peak == 2 and anthropic.peak == 2
+        assert pool.stats()["providers"]["openai"]["requests"] == 6
+
+    def test_token_budget_throttles_and_settles(self):
+        governor = ProviderGovernor(max_concurrency=8, tokens_per_sec=1000)
+
+        async def run():
+            t0 = time.monotonic()
+            for _ in range(3):
+                await governor.acquire(500)
+                governor.release(500, actual=500)
+            return time.monotonic() - t0
+
+        elapsed = asyncio.run(run())
+        # 1000-token bucket: two requests pass, the third waits ~0.5s
+        assert 0.4 < elapsed < 0.8
+        assert governor.stats()["throttled"] == 1 and governor.stats()["tokens"] == 1500
+
+
+class TestStreaming:
+    """Streaming through the manager and into commentary."""
+
+    def test_falls_back_before_first_delta(self):
+        manager = AIProviderManager(FakeProvider(fail=True), FakeProvider(AIProvider.ANTHROPIC, reply="b"),
+                                    pool=ProviderPool())
+
+        async def run():
+            return [d async for d in manager.generate_stream(ask("x"))]
+
+        assert asyncio.run(run()) == ["b "]
+
+    def test_commentary_streams_deltas_then_message(self):
+        provider = FakeProvider(reply="gamma flip overhead")
+        orchestrator = CommentaryOrchestrator(
+            CommentaryConfig(stream=True), AIProviderManager(provider, pool=ProviderPool()))
+        deltas, messages = [], []
+        orchestrator.subscribe_stream(lambda message_id, category, delta: deltas.append((message_id, delta)))
+        orchestrator.subscribe(messages.append)
+
+        trigger = CommentaryTrigger(type=TriggerType.PERIODIC, timestamp=None)
+        message = asyncio.run(orchestrator._generate_commentary(trigger))
+
+        assert [d for _, d in deltas] == ["gamma ", "flip ", "overhead "]
+        assert {i for i, _ in deltas} == {message.id}
+        assert message.text == "gamma flip overhead "
+
+    def test_commentary_reports_the_answering_provider(self):
+        primary, fallback = FakeProvider(fail=True), FakeProvider(AIProvider.ANTHROPIC, reply="pin at 5900")
+        orchestrator = CommentaryOrchestrator(
+            CommentaryConfig(stream=True), AIProviderManager(primary, fallback, pool=ProviderPool()))
+
+        trigger = CommentaryTrigger(type=TriggerType.PERIODIC, timestamp=None)
+        message = asyncio.run(orchestrator._generate_commentary(trigger))
+
+        assert message.text == "pin at 5900 "
+        assert message.metadata["provider"] == AIProvider.ANTHROPIC
+        assert message.metadata["model"] == "anthropic-model" and message.metadata["tokens_used"] > 0
+
+    def test_cancelled_stream_releases_slot(self):
+        pool = ProviderPool(max_concurrency=1)
+        provider = FakeProvider(reply="a b c d e f", stream_delay=0.05)
+        orchestrator = CommentaryOrchestrator(CommentaryConfig(stream=True), AIProviderManager(provider, pool=pool))
+        started = asyncio.Event()
+        orchestrator.subscribe_stream(lambda *_: started.set())
+
+        async def run():
+            task = asyncio.create_task(orchestrator._stream_commentary("m1", None, ask("x"), "sys"))
+            await started.wait()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            governor = pool.governor("openai")
+            # Slot is back at once, not when the generator is collected
+            assert governor.stats()["active"] == 0
+            await asyncio.wait_for(governor.acquire(1), 0.1)
+            governor.release(1)
+
+        asyncio.run(run())
+
+    def test_closed_stream_releases_slot(self):
+        pool = ProviderPool(max_concurrency=1)
+        manager = AIProviderManager(FakeProvider(reply="a b c"), pool=pool)
+
+        async def run():
+            async with aclosing(manager.generate_stream(ask("x"))) as stream:
+                async for _ in stream:
+                    break
+            return pool.governor("openai").stats()["active"]
+
+        assert asyncio.run(run()) == 0
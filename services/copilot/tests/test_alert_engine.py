@@ -0,0 +1,94 @@
+"""
+Alert Engine Tests - slow-loop scheduling of AI-powered and prompt alerts.
+"""
+
+import asyncio
+import time
+
+from ..intel.alert_engine import AlertEngine, AlertEngineConfig, AlertEvaluation, BaseEvaluator
+from .test_alert_index import make_alert
+
+
+class SlowAIEvaluator(BaseEvaluator):
+    """Stand-in AI evaluator: fixed latency, records start order and concurrency."""
+
+    def __init__(self, alert_type, provider, latency, log):
+        self._type, self._provider, self._latency = alert_type, provider, latency
+        self.log = log
+
+    @property
+    def alert_type(self):
+        return self._type
+
+    @property
+    def is_ai_powered(self):
+        return True
+
+    @property
+    def ai_provider(self):
+        return self._provider
+
+    async def evaluate(self, alert, market_data):
+        self.log["started"].append(alert.id)
+        self.log["active"][self._provider] += 1
+        self.log["peak"][self._provider] = max(
+            self.log["peak"][self._provider], self.log["active"][self._provider])
+        try:
+            await asyncio.sleep(self._latency)
+        finally:
+            self.log["active"][self._provider] -= 1
+        return AlertEvaluation(alert_id=alert.id, should_trigger=False, confidence=0.1, reasoning="")
+
+
+def make_engine(latency, **config):
+    log = {"started": [], "active": {"openai": 0, "anthropic": 0}, "peak": {"openai": 0, "anthropic": 0}}
+    engine = AlertEngine(AlertEngineConfig(**config), logger=None)
+    engine.register_evaluator(SlowAIEvaluator("ai_theta_gamma", "openai", latency, log))
+    engine.register_evaluator(SlowAIEvaluator("ai_sentiment", "anthropic", latency, log))
+    return engine, log
+
+
+class TestSlowCycle:
+    """Bounded, budgeted, prioritized AI evaluation."""
+
+    def test_caps_budget_and_carry_over(self):
+        engine, log = make_engine(
+            0.2, slow_loop_budget_ms=50, ai_max_concurrency=6, ai_provider_concurrency=4)
+        for i in range(20):
+            engine._alerts[f"o{i}"] = make_alert(f"o{i}", type="ai_theta_gamma")
+            engine._alerts[f"a{i}"] = make_alert(f"a{i}", type="ai_sentiment")
+
+        async def run():
+            t0 = time.monotonic()
+            await engine._slow_cycle()
+            first = time.monotonic() - t0
+            inflight_after_first = set(engine._ai_inflight)
+            await engine._slow_cycle()          # nothing finished: nothing restarted
+            restarted = len(log["started"])
+            await asyncio.sleep(0.25)
+            await engine._slow_cycle()
+            await asyncio.sleep(0.25)
+            return first, inflight_after_first, restarted
+
+        first, inflight, restarted = asyncio.run(run())
+        assert first < 0.15
+        assert len(inflight) == 6 and restarted == 6
+        assert log["peak"]["openai"] <= 4 and log["peak"]["anthropic"] <= 4
+        assert len(log["started"]) == 12
+        assert engine._analytics["ai_deferred"] == 34
+
+    def test_closest_to_trigger_first(self):
+        engine, log = make_engine(0.0, ai_max_concurrency=2, ai_provider_concurrency=2)
+        for i, confidence in enumerate([0.1, 0.9, None, 0.5]):
+            engine._alerts[f"o{i}"] = make_alert(
+                f"o{i}", type="ai_theta_gamma", ai_confidence=confidence)
+        engine._alerts["crit"] = make_alert("crit", type="ai_theta_gamma", priority="critical")
+
+        asyncio.run(engine._slow_cycle())
+        assert log["started"] == ["o1", "o3"]
+        asyncio.run(engine._slow_cycle())
+        assert log["started"][2:] == ["o1", "o3"]  # unchanged confidence: same order
+
+        engine._alerts["o0"].ai_confidence = 0.95
+        asyncio.run(engine._slow_cycle())
+        assert log["started"][4] == "o0"
@@ -0,0 +1,230 @@
+"""
+Alert Index Tests - sorted-threshold index versus the evaluators it stands in for.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from ..intel.alert_engine import Alert, AlertEngine, AlertEngineConfig
+from ..intel.alert_evaluators import (
+    DebitEvaluator,
+    PriceEvaluator,
+    ProfitTargetEvaluator,
+    TrailingStopEvaluator,
+)
+from ..intel.alert_index import ThresholdIndex, index_entry, key_value
+
+EVALUATORS = {
+    e.alert_type: e
+    for e in (PriceEvaluator(), DebitEvaluator(), ProfitTargetEvaluator(), TrailingStopEvaluator())
+}
+
+
+def make_alert(alert_id, type="price", condition="above", target=5900.0, **kw):
+    return Alert(
+        id=alert_id,
+        user_id=1,
+        type=type,
+        intent_class="informational",
+        condition=condition,
+        target_value=target,
+        behavior=kw.pop("behavior", "once_only"),
+        priority=kw.pop("priority", "medium"),
+        source_type="symbol",
+        source_id="SPX",
+        enabled=True,
+        triggered=False,
+        triggered_at=None,
+        trigger_count=0,
+        created_at="",
+        updated_at="",
+        color="#ffffff",
+        **kw,
+    )
+
+
+def random_alerts(rng, n):
+    alerts = []
+    for i in range(n):
+        kind = rng.choice(["price", "debit", "profit_target"])
+        if kind == "price":
+            alerts.append(make_alert(
+                f"p{i}", condition=rng.choice(["above", "below", "at"]),
+                target=round(rng.uniform(5850, 5950), 1),
+            ))
+        elif kind == "debit":
+            alerts.append(make_alert(
+                f"d{i}", type="debit", condition=rng.choice(["above", "below", "at"]),
+                target=round(rng.uniform(1, 5), 2), strategy_id=rng.choice(["s1", "s2"]),
+            ))
+        else:
+            alerts.append(make_alert(
+                f"t{i}", type="profit_target", target=round(rng.uniform(-0.5, 0.8), 2),
+                strategy_id=rng.choice(["s1", "s2"]), entry_debit=rng.choice([2.0, 3.5, -2.5]),
+            ))
+    return alerts
+
+
+def market(rng):
+    return {
+        "spot_price": round(rng.uniform(5850, 5950), 1),
+        "strategies": {s: {"current_debit": round(rng.uniform(0.5, 5.5), 2)} for s in ("s1", "s2")},
+    }
+
+
+def triggers(alerts, data):
+    async def run():
+        return {
+            a.id for a in alerts
+            if (await EVALUATORS[a.type].evaluate(a, data)).should_trigger
+        }
+    return asyncio.run(run())
+
+
+class TestThresholdIndex:
+    """crossed() against brute-force evaluator results."""
+
+    def test_crossed_is_exactly_false_to_true(self):
+        rng = random.Random(7)
+        alerts = [a for a in random_alerts(rng, 600) if a.condition != "at"]
+        index = ThresholdIndex()
+        index.rebuild([(a.id, *index_entry(a)) for a in alerts])
+
+        prev = market(rng)
+        before = triggers(alerts, prev)
+        for _ in range(25):
+            data = market(rng)
+            after = triggers(alerts, data)
+            crossed = set()
+            for key in index.keys():
+                old, new = key_value(key, prev), key_value(key, data)
+                if new is not None and old != new:
+                    crossed.update(index.crossed(key, old, new))
+            assert crossed == after - before
+            prev, before = data, after
+
+    def test_first_value_returns_all_true(self):
+        rng = random.Random(11)
+        alerts = random_alerts(rng, 300)
+        index = ThresholdIndex()
+        for a in alerts:
+            index.add(a.id, *index_entry(a))
+        data = market(rng)
+        found = set()
+        for key in index.keys():
+            found.update(index.crossed(key, None, key_value(key, data)))
+        assert triggers(alerts, data) <= found
+
+    def test_at_band(self):
+        index = ThresholdIndex()
+        index.add("hit", ("spot",), "at", 5900.0)
+        index.add("miss", ("spot",), "at", 5920.0)
+        assert index.crossed(("spot",), 5800.0, 5905.0) == ["hit"]
+
+    def test_remove_and_unindexable(self):
+        index = ThresholdIndex()
+        index.add("a", ("spot",), "gt", 5900.0)
+        index.add("b", ("spot",), "gt", 5900.0)
+        index.remove("a")
+        assert index.crossed(("spot",), 5800.0, 6000.0) == ["b"]
+        index.remove("b")
+        assert len(index) == 0 and index.keys() == []
+
+        assert index_entry(make_alert("x", type="trailing_stop", strategy_id="s1")) is None
+        assert index_entry(make_alert("y", type="profit_target", strategy_id="s1")) is None
+        assert index_entry(make_alert("z", condition="at", target=0.0)) is None
+
+
+class TestEngineFastLoop:
+    """AlertEngine evaluates new, crossed and input-changed alerts only."""
+
+    @pytest.fixture
+    def engine(self):
+        engine = AlertEngine(AlertEngineConfig(fast_loop_interval_ms=1), logger=None)
+        for evaluator in EVALUATORS.values():
+            engine.register_evaluator(evaluator)
+        return engine
+
+    @staticmethod
+    def tick(engine, data, sweep=False):
+        async def run():
+            await engine.update_market_data(data)
+            return await engine._fast_pass(sweep)
+        return asyncio.run(run())
+
+    def test_triggers_match_full_scan(self, engine):
+        rng = random.Random(3)
+        alerts = random_alerts(rng, 400)
+        alerts.append(make_alert("trail", type="trailing_stop", strategy_id="s1", entry_debit=3.0, target=0.5))
+        for a in alerts:
+            engine._alerts[a.id] = a
+        engine._rebuild_index()
+        assert engine.get_analytics()["alerts_scanned"] == 1
+
+        expected = {a.id: a for a in random_alerts(random.Random(3), 400)}
+        for _ in range(20):
+            data = market(rng)
+            active = [a for a in expected.values() if a.enabled]
+            for alert_id in triggers(active, data):
+                expected[alert_id].enabled = False
+            self.tick(engine, data)
+            for alert_id, a in expected.items():
+                assert engine._alerts[alert_id].enabled == a.enabled, alert_id
+
+    def test_unchanged_market_evaluates_nothing_indexed(self, engine):
+        for i in range(50):
+            engine._alerts[f"a{i}"] = make_alert(f"a{i}", target=6000.0 + i)
+        engine._rebuild_index()
+        data = {"spot_price": 5900.0}
+        self.tick(engine, data)
+        assert engine._analytics["last_index_candidates"] == 50
+        self.tick(engine, data)
+        assert engine._analytics["last_index_candidates"] == 0
+        self.tick(engine, {"spot_price": 6010.5})
+        assert engine._analytics["last_index_candidates"] == 11
+
+    def test_scanned_alerts_follow_their_inputs(self, engine):
+        engine._alerts["trail"] = make_alert(
+            "trail", type="trailing_stop", strategy_id="s1", entry_debit=3.0, target=5.0)
+        engine._rebuild_index()
+        data = {"spot_price": 5900.0, "strategies": {"s1": {"current_debit": 2.0}}}
+        assert self.tick(engine, data) == 1          # new alert: evaluated once
+        assert self.tick(engine, dict(data)) == 0    # nothing changed
+        assert self.tick(engine, dict(data, spot_price=5901.0)) == 0
+        assert self.tick(engine, dict(data, strategies={"s1": {"current_debit": 1.5}})) == 1
+        assert self.tick(engine, dict(data), sweep=True) == 1
+
+    def test_sweep_rechecks_indexed_alerts(self, engine):
+        engine._alerts["p"] = make_alert("p", target=5950.0)
+        engine._rebuild_index()
+        data = {"spot_price": 5900.0}
+        assert self.tick(engine, data) == 1                  # new alert: evaluated once
+        assert self.tick(engine, dict(data)) == 0
+
+        # Index misses the alert (stale placement after an edit): only a sweep sees it
+        engine._threshold_index.add("p", ("spot",), "gt", 7000.0)
+        assert self.tick(engine, dict(data, spot_price=5960.0)) == 0
+        assert engine._alerts["p"].enabled
+        assert self.tick(engine, dict(data, spot_price=5960.0), sweep=True) == 1
+        assert not engine._alerts["p"].enabled
+
+    def test_change_wakes_loop_and_records_latency(self, engine):
+        engine._alerts["p"] = make_alert("p", target=5950.0)
+        engine._rebuild_index()
+
+        async def run():
+            engine._running = True
+            await engine.update_market_data({"spot_price": 5900.0})
+            task = asyncio.create_task(engine._fast_loop())
+            await asyncio.sleep(0.01)
+            await engine.update_market_data({"spot_price": 5951.0})
+            await asyncio.sleep(0.01)
+            engine._running = False
+            task.cancel()
+            return engine.get_analytics()
+
+        analytics = asyncio.run(run())
+        assert not engine._alerts["p"].enabled
+        assert analytics["trigger_latency_max_ms"] < 1000
@@ -0,0 +1,122 @@
+"""
+Algo Alert Evaluator Tests - compiled filters and shared per-tick resolution.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from ..intel.algo_alert_evaluator import AlgoAlertEvaluator, FilterCondition, FilterContext, FilterEngine
+
+
+def cond(data_source, field, operator, value, required=True, id="f"):
+    return FilterCondition(id=id, data_source=data_source, field=field,
+                           operator=operator, value=value, required=required)
+
+
+MARKET = {
+    "spot_price": 5900.0,
+    "dte": 0,
+    "gex": {"regime": "Positive", "net_gex": 1.5e9},
+    "market_mode": {"mode": "compression", "score": 62},
+    "vix_regime": {"vix": 14.2},
+    "bias_lfi": None,
+    "trade_selector": 7,
+}
+
+
+def algo_alert(alert_id, filters, mode="entry", status="active"):
+    return {"id": alert_id, "mode": mode, "status": status, "filters": json.dumps(filters)}
+
+
+class TestFilterEngine:
+    """Compiled predicates keep the interpreted semantics."""
+
+    @pytest.mark.parametrize("c, passed", [
+        (cond("price", "spot", "gt", 5899), True),
+        (cond("price", "spot", "lte", "5900"), True),
+        (cond("gex", "regime", "eq", "positive"), True),
+        (cond("gex", "net_gex", "eq", 1.5e9), True),
+        (cond("market_mode", "score", "between", [60, 70]), True),
+        (cond("market_mode", "score", "between", [60]), False),
+        (cond("market_mode", "mode", "in", ["Expansion", "COMPRESSION"]), True),
+        (cond("market_mode", "mode", "not_in", "compression"), False),
+        (cond("gex", "regime", "gt", 1), False),           # unconvertible current
+        (cond("vix_regime", "vix", "lt", "high"), False),  # unconvertible target
+        (cond("trade_selector", "anything", "gte", 7), True),
+        (cond("dte", "dte", "eq", 0), True),
+        (cond("vix_regime", "vix", "approx", 14), False),
+    ])
+    def test_operators(self, c, passed):
+        all_passed, [result] = FilterEngine().evaluate([c], MARKET)
+        assert all_passed is passed and result.passed is passed and result.data_available
+
+    def test_fail_closed_and_unknown_source(self):
+        _, results = FilterEngine().evaluate([
+            cond("bias_lfi", "bias", "gt", 0),
+            cond("bias_lfi", "bias", "gt", 0, required=False),
+            cond("gex", "missing", "eq", "x", required=False),
+            cond("astrology", "moon", "eq", "full", required=False),
+        ], MARKET)
+        assert [r.passed for r in results] == [False, True, True, False]
+        assert not any(r.data_available for r in results)
+
+    def test_context_resolves_and_evaluates_each_condition_once(self):
+        engine = FilterEngine()
+        shared = [cond("price", "spot", "gt", 5800), cond("gex", "regime", "eq", "positive")]
+        ctx = FilterContext(MARKET)
+        for i in range(50):
+            compiled = engine.compile(shared + [cond("price", "spot", "lt", 5950 + i)])
+            assert engine.evaluate_compiled(compiled, ctx)[0]
+        assert ctx.resolved == 2
+        assert ctx.memo_hits == 2 * 49
+
+
+class TestAlgoAlertEvaluator:
+    """Compile once per definition, evaluate all alerts per tick."""
+
+    FILTERS = [
+        {"id": "a", "dataSource": "price", "field": "spot", "operator": "gt", "value": 5800},
+        {"dataSource": "gex", "field": "regime", "operator": "in", "value": ["positive"]},
+    ]
+
+    def test_compiled_once_and_recompiled_on_update(self):
+        evaluator = AlgoAlertEvaluator()
+        alert = algo_alert("x", self.FILTERS, mode="management")
+        evaluator.sync_alerts([alert])
+        compiled = evaluator._compiled["x"]
+
+        first = asyncio.run(evaluator.evaluate_algo_alert(alert, MARKET))
+        second = asyncio.run(evaluator.evaluate_algo_alert(alert, MARKET))
+        assert evaluator._compiled["x"] is compiled
+        assert first["filterResults"] == second["filterResults"]  # generated filter ids are stable
+
+        updated = dict(alert, filters=json.dumps(self.FILTERS[:1] + [
+            {"dataSource": "gex", "field": "regime", "operator": "eq", "value": "negative"}]))
+        evaluator.sync_alerts([updated])
+        assert not asyncio.run(evaluator.evaluate_algo_alert(updated, MARKET))["allPassed"]
+
+        evaluator.sync_alerts([])
+        assert evaluator._compiled == {} and evaluator._alert_states == {}
+
+    def test_batch_matches_single_evaluation(self):
+        alerts = [
+            algo_alert(f"m{i}", self.FILTERS + [
+                {"dataSource": "market_mode", "field": "score", "operator": "gte", "value": 55 + i}],
+                mode="management")
+            for i in range(12)
+        ]
+        batch = AlgoAlertEvaluator()
+        single = AlgoAlertEvaluator()
+
+        results = asyncio.run(batch.evaluate_algo_alerts(alerts, MARKET))
+        for alert, result in results:
+            expected = asyncio.run(single.evaluate_algo_alert(alert, MARKET))
+            assert result["allPassed"] == expected["allPassed"]
+            strip = lambda rs: [{k: v for k, v in r.items() if k != "filterId"} for r in rs]
+            assert strip(result["filterResults"]) == strip(expected["filterResults"])
+            assert (result["proposal"] is None) == (expected["proposal"] is None)
+
+        assert [r["allPassed"] for _, r in results] == [i <= 7 for i in range(12)]
+        assert batch.last_pass_stats == {"alerts": 12, "filters": 36, "sources_resolved": 3, "memo_hits": 22}
@@ -0,0 +1,128 @@
+"""
+Market Snapshot Tests - heatmap slice loading, per-expiration lookup and
+the volume-profile pyramid read.
+"""
+
+import asyncio
+import json
+from datetime import date, timedelta
+
+from shared.heatmap_slices import MODEL_FIELD, slice_field, slice_key
+
+from ..intel.market_snapshot import (
+    SYMBOL,
+    VOLUME_PROFILE_KEY,
+    VOLUME_PROFILE_LEVEL_KEY,
+    MarketSnapshotLoader,
+    expiration_dte,
+)
+
+
+class FakePipeline:
+    def __init__(self, store):
+        self.store = store
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+
+    def mget(self, keys):
+        self.keys.append(list(keys))
+
+    def zrange(self, key, start, end, withscores=False):
+        self.keys.append(None)
+
+    def hgetall(self, key):
+        self.keys.append(("hash", key))
+
+    async def execute(self):
+        out = []
+        for k in self.keys:
+            if isinstance(k, list):
+                out.append([self.store.get(x) for x in k])
+            elif isinstance(k, tuple):
+                out.append(self.store.get(k[1], {}))
+            else:
+                out.append(self.store.get(k) if k else [])
+        return out
+
+
+class FakeRedis:
+    def __init__(self, store):
+        self.store = store
+        self.hgetalls = []
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self.store)
+
+    async def hgetall(self, key):
+        self.hgetalls.append(key)
+        return self.store.get(key, {})
+
+
+def slice_payload(dte, version, tiles):
+    return {"ts": 1.0, "symbol": SYMBOL, "epoch": "current", "version": version, "dte": dte, "tiles": tiles}
+
+
+def exp(days):
+    return (date.today() + timedelta(days=days)).isoformat()
+
+
+class TestHeatmapForExpiration:
+    def setup_method(self):
+        self.store = {
+            slice_key(SYMBOL, slice_field(0)): json.dumps(slice_payload(0, 5, {"single:0:0:5900": {"dte": 0}})),
+            slice_key(SYMBOL, slice_field(2)): json.dumps(slice_payload(2, 5, {"single:2:0:5900": {"dte": 2}})),
+        }
+        self.versions = {MODEL_FIELD: "5", slice_field(0): "5", slice_field(2): "5"}
+
+    def load(self, loader, versions):
+        return asyncio.run(loader._load_heatmap(FakeRedis(self.store), versions, None, False))
+
+    def test_slice_or_full_model_fallback(self):
+        loader = MarketSnapshotLoader()
+        assert self.load(loader, self.versions)
+        assert loader.heatmap_for_expiration(exp(2))["dte"] == 2
+        assert loader.heatmap_for_expiration(exp(-1))["dte"] == 0          # past: floored like Builder
+
+        full = loader.heatmap_for_expiration(exp(1))                         # no dte:1 slice
+        assert set(full["tiles"]) == {"single:0:0:5900", "single:2:0:5900"}
+        assert full["dtes_available"] == [0, 2]
+        assert loader.heatmap_for_expiration("not-a-date") is full
+
+        # A moved slice drops the merged model
+        self.store[slice_key(SYMBOL, slice_field(2))] = json.dumps(
+            slice_payload(2, 6, {"single:2:5:5905": {"dte": 2}}))
+        assert self.load(loader, {**self.versions, MODEL_FIELD: "6", slice_field(2): "6"})
+        assert "single:2:5:5905" in loader.heatmap_for_expiration(exp(1))["tiles"]
+
+    def test_full_model_without_slices(self):
+        loader = MarketSnapshotLoader()
+        raw = json.dumps({"version": 1, "tiles": {"a": {}}})
+        assert asyncio.run(loader._load_heatmap(FakeRedis({}), {}, raw, True))
+        assert loader.heatmap_for_expiration(exp(0)) == {"version": 1, "tiles": {"a": {}}}
+
+    def test_expiration_dte(self):
+        assert expiration_dte(exp(3)) == 3
+        assert expiration_dte(exp(-2)) == 0
+        assert expiration_dte(exp(1) + "T16:00:00") == 1
+        assert expiration_dte("2026-13-01") is None and expiration_dte(None) is None
+
+
+class TestVolumeProfileLevel:
+    """The $1 pyramid level is read in the main trip; the base only when it is missing."""
+
+    def test_level_then_base_fallback(self):
+        loader = MarketSnapshotLoader()
+        r = FakeRedis({
+            VOLUME_PROFILE_LEVEL_KEY: {"590000": "12", "590100": "3"},
+            VOLUME_PROFILE_KEY: {"590010": "7"},
+        })
+        assert "volume_profile" in asyncio.run(loader.load(r))
+        assert loader.volume_profile == {590000: 12, 590100: 3}
+        assert r.hgetalls == [] and loader.stats["round_trips"] == 1
+
+        del r.store[VOLUME_PROFILE_LEVEL_KEY]
+        assert "volume_profile" in asyncio.run(loader.load(r))
+        assert loader.volume_profile == {590010: 7}
+        assert r.hgetalls == [VOLUME_PROFILE_KEY]
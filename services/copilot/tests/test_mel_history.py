@@ -0,0 +1,130 @@
+"""
+MEL History Tests - snapshot ring queries and serialize-once delta broadcast.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from ..intel.mel import MELOrchestrator
+from ..intel.mel_api import MELAPIHandler
+from ..intel.mel_history import MELHistory
+from ..intel.mel_models import (
+    CoherenceState,
+    Confidence,
+    MELModelScore,
+    MELSnapshot,
+    ModelState,
+    Session,
+    Trend,
+)
+
+T0 = datetime(2026, 3, 2, 14, 30)
+
+
+def score(effectiveness, detail=None):
+    state = ModelState.VALID if effectiveness >= 70 else ModelState.DEGRADED
+    return MELModelScore(effectiveness, Trend.STABLE, state, Confidence.HIGH, detail or {})
+
+
+def make_snapshot(i, gamma=80.0, liquidity=60.0):
+    return MELSnapshot(
+        timestamp_utc=T0 + timedelta(seconds=5 * i),
+        snapshot_id=f"s{i}",
+        session=Session.RTH,
+        event_flags=[],
+        gamma=score(gamma),
+        volume_profile=score(70.0),
+        liquidity=score(liquidity),
+        volatility=score(55.0),
+        session_structure=score(65.0),
+        cross_model_coherence=70.0,
+        coherence_state=CoherenceState.STABLE,
+        global_structure_integrity=68.0 + i,
+    )
+
+
+class FakeWS:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    async def send_str(self, text):
+        if self.fail:
+            raise ConnectionResetError()
+        self.sent.append(text)
+
+
+class TestMELHistory:
+    """Ring queries match a plain list of the last `capacity` snapshots."""
+
+    def test_bounded_queries_match_list(self):
+        history = MELHistory(capacity=50)
+        snapshots = [make_snapshot(i, gamma=60.0 + i % 30) for i in range(173)]
+        for s in snapshots:
+            history.append(s)
+        kept = snapshots[-50:]
+
+        assert len(history) == 50
+        since = T0 + timedelta(seconds=5 * 140)
+        for since_dt, limit in ((None, 100), (None, 7), (since, 100), (since, 5)):
+            expected = [s for s in kept if since_dt is None or s.timestamp_utc >= since_dt][-limit:]
+            assert [json.loads(j)["snapshot_id"] for j in history.json_range(since_dt, limit)] == [
+                s.snapshot_id for s in expected]
+            assert [s.snapshot_id for s in history.snapshots(since_dt, limit)] == [
+                s.snapshot_id for s in expected]
+
+        columns = history.columns(since, 3)
+        assert columns["count"] == 3
+        assert columns["effectiveness"]["gamma"] == [s.gamma.effectiveness for s in kept[-3:]]
+        assert columns["state"]["liquidity"] == ["DEGRADED"] * 3
+        assert columns["global_structure_integrity"] == [s.global_structure_integrity for s in kept[-3:]]
+        assert history.latest_json() == json.dumps(snapshots[-1].to_dict())
+
+    def test_orchestrator_history(self):
+        mel = MELOrchestrator()
+        for i in range(3):
+            mel.history.append(make_snapshot(i))
+        assert [s.snapshot_id for s in mel.get_history(limit=2)] == ["s1", "s2"]
+
+
+class TestMELBroadcast:
+    """One serialization per snapshot; delta clients get changed models only."""
+
+    def test_fan_out_and_deltas(self):
+        handler = MELAPIHandler(MELOrchestrator())
+        full_a, full_b, delta, broken = FakeWS(), FakeWS(), FakeWS(), FakeWS(fail=True)
+        handler.ws_clients.extend([full_a, full_b, delta, broken])
+        handler.delta_clients.add(delta)
+
+        async def run():
+            for s in (make_snapshot(0), make_snapshot(1, liquidity=40.0), make_snapshot(2, liquidity=40.0)):
+                handler._on_mel_update(s)
+            await handler._sender
+
+        asyncio.run(run())
+        assert broken not in handler.ws_clients
+        assert all(a is b for a, b in zip(full_a.sent, full_b.sent))   # same text object
+        assert [json.loads(m)["type"] for m in delta.sent] == ["mel_snapshot", "mel_delta", "mel_delta"]
+
+        first, second = (json.loads(m)["data"] for m in delta.sent[1:])
+        assert first["base_id"] == "s0" and first["snapshot_id"] == "s1"
+        assert list(first["models"]) == ["liquidity"] and first["models"]["liquidity"]["effectiveness"] == 40.0
+        assert second["models"] == {} and second["global_structure_integrity"] == 70.0
+
+    def test_history_endpoint_serves_stored_json(self):
+        mel = MELOrchestrator()
+        for i in range(4):
+            mel.history.append(make_snapshot(i))
+        handler = MELAPIHandler(mel)
+
+        async def get(query):
+            response = await handler.get_history(SimpleNamespace(query=query))
+            return json.loads(response.text)
+
+        body = asyncio.run(get({"limit": "2"}))
+        assert body["count"] == 2 and [s["snapshot_id"] for s in body["snapshots"]] == ["s2", "s3"]
+        assert body["snapshots"][0] == make_snapshot(2).to_dict()
+        columns = asyncio.run(get({"format": "columns", "since": (T0 + timedelta(seconds=10)).isoformat()}))
+        assert columns["count"] == 2 and columns["effectiveness"]["gamma"] == [80.0, 80.0]
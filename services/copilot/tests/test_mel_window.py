@@ -0,0 +1,207 @@
+"""
+MEL Window Tests - incremental NumPy calculators versus the per-bar loops they replace.
+"""
+
+import random
+
+import pytest
+
+from ..intel.mel_gamma import GammaEffectivenessCalculator
+from ..intel.mel_models import MELConfig
+from ..intel.mel_session import SessionEffectivenessCalculator
+from ..intel.mel_volume_profile import VolumeProfileEffectivenessCalculator
+from ..intel.mel_window import PriceWindow
+
+
+def px(bar):
+    return bar.get("price") or bar.get("close")
+
+
+# ---- Reference loops (previous implementations) ----
+
+def ref_respect(history, levels, tolerance=5.0):
+    tests = respects = 0
+    for i in range(1, len(history)):
+        prev_price, curr_price = px(history[i - 1]), px(history[i])
+        for level in levels:
+            if abs(prev_price - level) > tolerance and abs(curr_price - level) <= tolerance:
+                tests += 1
+                if i + 3 < len(history):
+                    future = [px(p) for p in history[i:i + 3]]
+                    approach_dir = 1 if curr_price > prev_price else -1
+                    future_dir = 1 if future[-1] > curr_price else -1
+                    if approach_dir != future_dir:
+                        respects += 1
+    return respects / tests * 100 if tests else 65.0
+
+
+def ref_reversion(history, magnet, threshold=10.0):
+    excursions = reversions = 0
+    in_excursion = False
+    for bar in history:
+        dist = abs(px(bar) - magnet)
+        if not in_excursion and dist > threshold:
+            in_excursion = True
+            excursions += 1
+        elif in_excursion and dist <= threshold / 2:
+            in_excursion = False
+            reversions += 1
+    return reversions / excursions * 100 if excursions else 65.0
+
+
+def ref_violations(history, levels):
+    violations = []
+    for bar in history:
+        for level in levels:
+            if bar["low"] < level < bar["high"]:
+                violations.append(max(bar["high"] - level, level - bar["low"]))
+    rate = len(violations) / len(history) * 100
+    frequency = "Low" if rate < 10 else "Medium" if rate < 25 else "High"
+    avg = sum(violations) / len(violations) if violations else 0
+    return {"frequency": frequency, "magnitude": "Contained" if avg < 5 else "Extended"}
+
+
+def ref_hvn(history, hvns, tolerance=3.0):
+    tests = accepts = 0
+    for i in range(1, len(history) - 2):
+        curr_price = px(history[i])
+        for hvn in hvns:
+            if abs(curr_price - hvn) <= tolerance:
+                tests += 1
+                dwell = sum(
+                    1 for j in range(i + 1, min(i + 4, len(history)))
+                    if abs(px(history[j]) - hvn) <= tolerance * 1.5
+                )
+                if dwell >= 2:
+                    accepts += 1
+                break
+    return accepts / tests * 100 if tests else 65.0
+
+
+def ref_lvn(history, lvns, tolerance=2.0):
+    tests = rejects = 0
+    for i in range(1, len(history) - 2):
+        curr_price = px(history[i])
+        for lvn in lvns:
+            if abs(curr_price - lvn) <= tolerance:
+                tests += 1
+                if abs(px(history[i + 2]) - lvn) > tolerance * 2:
+                    rejects += 1
+                break
+    return rejects / tests * 100 if tests else 65.0
+
+
+def ref_direction_changes(bars):
+    changes, prev_direction = 0, None
+    for i in range(1, len(bars)):
+        a, b = px(bars[i - 1]), px(bars[i])
+        if a is None or b is None:
+            continue
+        direction = 1 if b > a else -1
+        if prev_direction is not None and direction != prev_direction:
+            changes += 1
+        prev_direction = direction
+    return changes
+
+
+# ---- Fixtures ----
+
+def walk(rng, n, start=5900.0, t0=0):
+    bars, price = [], start
+    for i in range(n):
+        price += rng.gauss(0, 2.5)
+        high, low = price + abs(rng.gauss(0, 2)), price - abs(rng.gauss(0, 2))
+        bars.append({"price": price, "close": price, "high": high, "low": low, "ts": float(t0 + i)})
+    return bars
+
+
+def windows(rng, steps=60, size=100):
+    """Sliding trailing windows with a forming (revised) last bar and an occasional gap."""
+    series = walk(rng, size + steps * 6)
+    end = size
+    for step in range(steps):
+        end += rng.randint(0, 5)
+        history = [dict(b) for b in series[end - size:end]]
+        if rng.random() < 0.5:
+            history[-1]["price"] = history[-1]["close"] = history[-1]["price"] + rng.uniform(-1, 1)
+        if step == steps // 2:
+            history = history[-rng.randint(5, 40):]       # shorter input: rebuild
+        yield history
+
+
+class TestPriceWindow:
+    """sync() mirrors the input list through appends, evictions and revisions."""
+
+    def test_mirrors_input(self):
+        rng = random.Random(1)
+        window = PriceWindow()
+        for history in windows(rng):
+            changed_from = window.sync(history)
+            assert window.lo <= changed_from <= window.hi
+            assert window.ts.tolist() == [b["ts"] for b in history]
+            assert window.price.tolist() == [b["price"] for b in history]
+            assert window.high.tolist() == [b["high"] for b in history]
+        assert window.stats["appended"] < 100 * 60 / 4
+
+    def test_empty_and_missing_ts(self):
+        window = PriceWindow()
+        window.sync([{"price": 1.0}, {"price": 2.0}])
+        window.sync([{"price": 1.0}, {"price": 2.0}, {"price": 3.0}])
+        assert window.price.tolist() == [1.0, 2.0, 3.0] and window.stats["rebuilds"] == 2
+        window.sync([])
+        assert len(window) == 0
+
+
+class TestIncrementalCalculators:
+    """Every snapshot matches the loop over the full history."""
+
+    @pytest.fixture
+    def config(self):
+        return MELConfig()
+
+    def test_gamma(self, config):
+        rng = random.Random(2)
+        calc = GammaEffectivenessCalculator(config)
+        levels = [{"strike": s} for s in range(5860, 5945, 5)]
+        for step, history in enumerate(windows(rng)):
+            if step % 17 == 16:
+                levels = levels[1:]                         # levels changed: reset
+            magnet = 5900.0 if step < 40 else 5905.0
+            window = calc.price_window({"price_history": history})
+            strikes = [lvl["strike"] for lvl in levels]
+            assert calc._calculate_level_respect_rate(window, levels) == pytest.approx(ref_respect(history, strikes))
+            assert calc._calculate_mean_reversion_success(window, magnet, None) == pytest.approx(
+                ref_reversion(history, magnet))
+            assert calc._analyze_violations(window, levels) == ref_violations(history, strikes)
+
+    def test_volume_profile(self, config):
+        rng = random.Random(3)
+        calc = VolumeProfileEffectivenessCalculator(config)
+        hvns, lvns = [5905.0, 5890.0, 5903.0, 5920.0], [5895.0, 5897.0, 5912.0]
+        for history in windows(rng):
+            window = calc.price_window({"price_history": history})
+            assert calc._calculate_hvn_acceptance_rate(window, hvns) == pytest.approx(ref_hvn(history, hvns))
+            assert calc._calculate_lvn_rejection_rate(window, lvns) == pytest.approx(ref_lvn(history, lvns))
+
+    def test_shared_window_from_orchestrator_data(self, config):
+        rng = random.Random(4)
+        window = PriceWindow()
+        gamma = GammaEffectivenessCalculator(config)
+        levels = [{"strike": s} for s in range(5870, 5935, 10)]
+        for history in windows(rng, steps=20):
+            window.sync(history)
+            data = {"price_history": history, "price_window": window, "gamma_levels": levels,
+                    "gamma_magnet": 5900.0}
+            _, detail = gamma.calculate_effectiveness(data)
+            assert detail["level_respect_rate"] == pytest.approx(
+                ref_respect(history, [lvl["strike"] for lvl in levels]))
+        assert gamma._own_window is None
+
+    def test_direction_changes(self, config):
+        rng = random.Random(5)
+        calc = SessionEffectivenessCalculator(config)
+        bars = walk(rng, 200)
+        for bar in rng.sample(bars, 10):
+            bar["price"] = bar["close"] = None
+        bars[5]["close"] = bars[5]["price"] = bars[4]["price"]     # flat move counts as down
+        assert calc._count_direction_changes(bars) == ref_direction_changes(bars)
@@ -0,0 +1,236 @@
+"""
+Order Book Tests - bisected pending-order book versus a full order scan.
+"""
+
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+
+from ..intel.alert_evaluators import OrderQueueEvaluator
+from ..intel.order_book import BookOrder, OrderBook
+
+
+def make_order(order_id, order_type="entry", direction="long", limit=5900.0, symbol="SPX", **kw):
+    return SimpleNamespace(
+        id=order_id, user_id=1, order_type=order_type, symbol=symbol, direction=direction,
+        limit_price=limit, quantity=1, trade_id=kw.pop("trade_id", None),
+        expires_at=kw.pop("expires_at", None), status="pending", **kw,
+    )
+
+
+def scan(orders, symbol, spot):
+    """The old evaluate_orders fill conditions, order by order."""
+    hits = []
+    for o in orders:
+        if o.symbol != symbol:
+            continue
+        if o.order_type == "entry":
+            fill = spot <= o.limit_price if o.direction == "long" else spot >= o.limit_price
+        else:
+            fill = spot >= o.limit_price if o.direction == "long" else spot <= o.limit_price
+        if fill:
+            hits.append(o.id)
+    return sorted(hits)
+
+
+class FakeDB:
+    """Synchronous journal DB stand-in counting calls."""
+
+    def __init__(self, orders):
+        self.orders = {o.id: o for o in orders}
+        self.calls = {"list": 0, "expire": 0, "get": 0, "update": 0, "close": 0}
+
+    def list_pending_orders(self):
+        self.calls["list"] += 1
+        return [o for o in self.orders.values() if o.status == "pending"]
+
+    def expire_orders(self):
+        self.calls["expire"] += 1
+        return 0
+
+    def get_order(self, order_id):
+        self.calls["get"] += 1
+        return self.orders.get(order_id)
+
+    def update_order_status(self, order_id, status, filled_price=None):
+        self.calls["update"] += 1
+        if order_id in self.orders:
+            self.orders[order_id].status = status
+
+    def get_trade(self, trade_id):
+        return SimpleNamespace(status="open")
+
+    def close_trade(self, **kw):
+        self.calls["close"] += 1
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self._redis = redis
+
+    async def subscribe(self, channel):
+        self._redis.channels.append(channel)
+        self._redis.subscribed.set()
+
+    async def unsubscribe(self, channel):
+        pass
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self._redis.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class FakeRedis:
+    """Pub/sub stand-in delivering published orders:sync events."""
+
+    def __init__(self):
+        self.channels = []
+        self.queue = asyncio.Queue()
+        self.subscribed = asyncio.Event()
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    def publish(self, data):
+        self.queue.put_nowait({"type": "message", "data": json.dumps(data)})
+
+
+class TestOrderBook:
+    """fillable() and expire() against brute force."""
+
+    def test_fillable_matches_scan(self):
+        rng = random.Random(5)
+        orders = [
+            make_order(i, rng.choice(["entry", "exit"]), rng.choice(["long", "short", "sell", "", None]),
+                       round(rng.uniform(5850, 5950), 1), rng.choice(["SPX", "NDX"]))
+            for i in range(500)
+        ]
+        book = OrderBook()
+        book.load(BookOrder.from_order(o) for o in orders[:250])
+        for o in orders[250:]:
+            book.add(BookOrder.from_order(o))
+        for o in orders[::7]:
+            book.remove(o.id)
+        live = [o for o in orders if o.id in book]
+
+        for _ in range(50):
+            symbol, spot = rng.choice(["SPX", "NDX"]), round(rng.uniform(5840, 5960), 1)
+            assert [o.id for o in book.fillable(symbol, spot)] == scan(live, symbol, spot)
+
+    def test_expire_skips_removed_and_readded(self):
+        book = OrderBook()
+        book.load([
+            BookOrder.from_order(make_order(1, expires_at=100.0)),
+            BookOrder.from_order(make_order(2, expires_at="1970-01-01T00:02:00")),
+            BookOrder.from_order(make_order(3)),
+        ])
+        book.remove(1)
+        book.add(BookOrder.from_order(make_order(4, expires_at=90.0)))
+        book.add(BookOrder.from_order(make_order(4, expires_at=500.0)))   # re-added later expiry
+        assert book.expire(50.0) == []
+        assert [o.id for o in book.expire(200.0)] == [2]
+        assert sorted(o.id for o in book.expire(1000.0)) == [4]
+        assert len(book) == 1 and 3 in book
+
+
+class TestOrderQueueEvaluator:
+    """Loads once, follows sync events, writes to the DB only on fills."""
+
+    def test_fills_without_rescanning_db(self):
+        db = FakeDB([
+            make_order(1, limit=5890.0),
+            make_order(2, "entry", "short", 5910.0),
+            make_order(3, "exit", "long", 5905.0, trade_id="t1"),
+        ])
+        evaluator = OrderQueueEvaluator(db=db)
+
+        async def run():
+            quiet = await evaluator.evaluate_orders({"spot_price": 5900.0})
+            db.orders[4] = make_order(4, limit=5880.0)
+            evaluator.apply_sync({"action": "create", "order": {
+                "id": 4, "user_id": 1, "order_type": "entry", "symbol": "SPX",
+                "direction": "long", "limit_price": 5880.0, "expires_at": None,
+            }})
+            evaluator.apply_sync({"action": "cancel", "order_id": 1})
+            moved = await evaluator.evaluate_orders({"SPX": {"spot": 5906.0, "bid": 5905.5, "ask": 5906.5}})
+            dropped = await evaluator.evaluate_orders({"SPX": {"spot": 5870.0, "bid": 5869.5, "ask": 5870.5}})
+            return quiet, moved, dropped
+
+        quiet, moved, dropped = asyncio.run(run())
+        assert quiet == {"filled_entries": [], "filled_exits": [], "expired": [], "auto_closed": []}
+        assert [f["order_id"] for f in moved["filled_exits"]] == [3]
+        assert moved["filled_exits"][0]["fill_price"] == 5905.5
+        assert [f["order_id"] for f in dropped["filled_entries"]] == [4]
+        assert dropped["filled_entries"][0]["fill_price"] == 5870.5
+        assert db.calls == {"list": 1, "expire": 1, "get": 2, "update": 2, "close": 1}
+        assert [o.id for o in evaluator.book.fillable("SPX", 5920.0)] == [2]
+
+    def test_non_long_directions_fill_as_short(self):
+        """Like the per-order scan: anything but "long" is short, not skipped."""
+        db = FakeDB([
+            make_order(1, "entry", "sell", 5910.0),
+            make_order(2, "entry", "", 5920.0),
+            make_order(3, "exit", "sell", 5890.0, trade_id="t1"),
+        ])
+        evaluator = OrderQueueEvaluator(db=db)
+
+        async def run():
+            up = await evaluator.evaluate_orders({"SPX": {"spot": 5915.0, "bid": 5914.5, "ask": 5915.5}})
+            down = await evaluator.evaluate_orders({"SPX": {"spot": 5885.0, "bid": 5884.5, "ask": 5885.5}})
+            return up, down
+
+        up, down = asyncio.run(run())
+        assert [(f["order_id"], f["fill_price"]) for f in up["filled_entries"]] == [(1, 5914.5)]
+        assert [(f["order_id"], f["fill_price"]) for f in down["filled_exits"]] == [(3, 5885.5)]
+        assert [o.id for o in evaluator.book.fillable("SPX", 5925.0)] == [2]
+
+    def test_does_not_fill_orders_cancelled_in_db(self):
+        db = FakeDB([make_order(1, limit=5890.0), make_order(2, limit=5880.0)])
+        evaluator = OrderQueueEvaluator(db=db)
+
+        async def run():
+            await evaluator.evaluate_orders({"spot_price": 5900.0})
+            db.orders[1].status = "cancelled"            # sync event missed
+            return await evaluator.evaluate_orders({"spot_price": 5870.0})
+
+        results = asyncio.run(run())
+        assert [f["order_id"] for f in results["filled_entries"]] == [2]
+        assert db.orders[1].status == "cancelled" and 1 not in evaluator.book
+
+    def test_reloads_on_interval(self):
+        db = FakeDB([make_order(1, limit=5890.0)])
+        evaluator = OrderQueueEvaluator(db=db, reload_interval=0.0)
+
+        async def run():
+            await evaluator.evaluate_orders({"spot_price": 5900.0})
+            db.orders[3] = make_order(3, limit=5895.0)   # created without a sync event
+            return await evaluator.evaluate_orders({"spot_price": 5889.0})
+
+        results = asyncio.run(run())
+        assert [f["order_id"] for f in results["filled_entries"]] == [1, 3]
+        assert db.calls["list"] == 2
+
+    def test_listener_applies_sync_and_reloads_on_reconnect(self):
+        db = FakeDB([make_order(1, limit=5890.0)])
+        redis = FakeRedis()
+        evaluator = OrderQueueEvaluator(db=db, redis=redis)
+
+        async def run():
+            await evaluator.evaluate_orders({"spot_price": 5900.0})
+            await redis.subscribed.wait()
+            await evaluator.evaluate_orders({"spot_price": 5900.0})
+            assert db.calls["list"] == 2                  # reloaded once subscribed
+            redis.publish({"action": "create", "order": {
+                "id": 4, "user_id": 1, "order_type": "entry", "symbol": "SPX",
+                "direction": "long", "limit_price": 5880.0,
+            }})
+            redis.publish({"action": "cancel", "order_id": 1})
+            while 4 not in evaluator.book or 1 in evaluator.book:
+                await asyncio.sleep(0.01)
+            await evaluator.stop()
+
+        asyncio.run(run())
+        assert redis.channels == ["orders:sync"]
@@ -16,6 +16,8 @@ from openpyxl.utils import get_column_letter
 
 import redis.asyncio as redis
 
+from shared.vendor_http import POLYGON_BASE, VendorHttpClient
+
 from .db_v2 import JournalDBv2, VersionConflictError
 from .afi_engine import AFI_VERSION, compute_afi, compute_afi_v4, compute_afi_v5, trim_wss_history
 from .afi_engine.scoring_engine import MIN_CAPITAL, NEUTRAL_AFI
@@ -1075,6 +1077,7 @@ class JournalOrchestrator:
                 return self._error_response('Failed to create order', 500, request)
 
             self.logger.info(f"Created {order_type} order for {symbol} @ ${limit_price}", emoji="📋")
+            await self._publish_orders_sync('create', order.id, order.to_api_dict())
 
             return self._json_response({
                 'success': True,
@@ -1099,6 +1102,7 @@ class JournalOrchestrator:
                 return self._error_response('Order not found or already processed', 404, request)
 
             self.logger.info(f"Cancelled order {order_id}", emoji="❌")
+            await self._publish_orders_sync('cancel', order_id)
 
             return self._json_response({
                 'success': True,
@@ -1108,6 +1112,17 @@ class JournalOrchestrator:
             self.logger.error(f"cancel_order error: {e}")
             return self._error_response(str(e), 500, request)
 
+    async def _publish_orders_sync(self, action: str, order_id: int, order: dict = None):
+        """Publish sync event for the copilot order book."""
+        try:
+            r = await self._get_redis()
+            payload = {'action': action, 'order_id': order_id}
+            if order is not None:
+                payload['order'] = order
+            await r.publish('orders:sync', json.dumps(payload, default=str))
+        except Exception as e:
+            self.logger.warn(f"Failed to publish orders:sync: {e}")
+
     # ==================== Analytics Endpoints (Log-Scoped) ====================
 
     async def get_log_analytics(self, request: web.Request) -> web.Response:
@@ -4886,30 +4901,33 @@ class JournalOrchestrator:
         settled = 0
         failed = 0
         price_cache = {}  # {ticker:date -> price} avoids redundant API calls
+        # One pooled keep-alive client per sweep, paced to 4 req/sec for Polygon
+        client = VendorHttpClient(api_key, POLYGON_BASE, timeout_sec=30, rate_per_sec=4)
 
-        for trade in unsettled:
-            try:
-                result = compute_settlement(trade, api_key, price_cache)
-                if result.available:
-                    closed = self.db.close_trade(
-                        trade_id=trade.id,
-                        exit_price=result.exit_price_cents,
-                        exit_spot=result.exit_spot,
-                        exit_time=trade.expiration_date,
-                        auto_close_reason='expiration_intrinsic',
-                        settlement_source=result.source,
-                        notes='Auto-settled at intrinsic value'
-                    )
-                    if closed:
-                        settled += 1
-                else:
+        try:
+            for trade in unsettled:
+                try:
+                    result = await compute_settlement(trade, api_key, price_cache, client=client)
+                    if result.available:
+                        closed = self.db.close_trade(
+                            trade_id=trade.id,
+                            exit_price=result.exit_price_cents,
+                            exit_spot=result.exit_spot,
+                            exit_time=trade.expiration_date,
+                            auto_close_reason='expiration_intrinsic',
+                            settlement_source=result.source,
+                            notes='Auto-settled at intrinsic value'
+                        )
+                        if closed:
+                            settled += 1
+                    else:
+                        failed += 1
+                        self.logger.debug(f"Settlement unavailable for {trade.id}: {result.error}")
+                except Exception as e:
                     failed += 1
-                    self.logger.debug(f"Settlement unavailable for {trade.id}: {result.error}")
-            except Exception as e:
-                failed += 1
-                self.logger.error(f"Settlement error for {trade.id}: {e}")
-
-            await asyncio.sleep(0.25)  # rate-limit Polygon API (4 req/sec)
+                    self.logger.error(f"Settlement error for {trade.id}: {e}")
+        finally:
+            await client.close()
 
         return settled, failed
 
@@ -3,6 +3,7 @@
 
 Fetches underlying close prices from Polygon and computes intrinsic value
 at expiration. Pure computation + price fetch — no DB access, no HTTP server.
+Price fetches go through the pooled shared.vendor_http client.
 
 Daily close is used as proxy for option expiration settlement. For index options
 (SPX), official settlement price may differ (SOQ, early settlement, holiday-adjusted
@@ -10,44 +11,46 @@ dates). Acceptable for simulator realism; not authoritative for real brokerage
 reconciliation.
 """
 
-import json
 import logging
-import urllib.request
-import urllib.error
 from dataclasses import dataclass
 from typing import Optional
+from urllib.parse import quote
 
-logger = logging.getLogger(__name__)
+from shared.vendor_http import POLYGON_BASE, VendorHttpClient, VendorHttpError
 
-POLYGON_BASE = "https://api.polygon.io"
+logger = logging.getLogger(__name__)
 
 
-def fetch_underlying_close(ticker: str, date_str: str, api_key: str) -> Optional[float]:
+async def fetch_underlying_close(ticker: str, date_str: str, api_key: str,
+                                 client: Optional[VendorHttpClient] = None) -> Optional[float]:
     """Fetch daily close price from Polygon as settlement proxy.
 
     Args:
         ticker: Polygon ticker symbol (e.g. "I:SPX", "SPY")
         date_str: Date string "YYYY-MM-DD"
         api_key: Polygon API key
+        client: Optional shared VendorHttpClient (pooled across a sweep);
+            a one-off client is created and closed otherwise
 
     Returns:
         Close price in dollars, or None if unavailable.
     """
     # Polygon uses URL-encoded tickers for indices
-    encoded_ticker = urllib.request.quote(ticker, safe='')
-    url = (
-        f"{POLYGON_BASE}/v2/aggs/ticker/{encoded_ticker}/range/1/day/"
-        f"{date_str}/{date_str}?apiKey={api_key}&limit=1"
-    )
+    encoded_ticker = quote(ticker, safe='')
+    path = f"/v2/aggs/ticker/{encoded_ticker}/range/1/day/{date_str}/{date_str}"
+
+    owned = client is None
+    if owned:
+        client = VendorHttpClient(api_key, POLYGON_BASE, timeout_sec=30)
     try:
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'MarketSwarm/1.0')
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode())
-            if data.get("resultsCount", 0) > 0:
-                return data["results"][0]["c"]  # close price
-    except (urllib.error.URLError, json.JSONDecodeError, KeyError, IndexError) as e:
+        data = await client.get_json(path, {"limit": 1}, endpoint="aggs_daily")
+        if data.get("resultsCount", 0) > 0:
+            return data["results"][0]["c"]  # close price
+    except (VendorHttpError, ValueError, KeyError, IndexError) as e:
         logger.warning(f"Polygon fetch failed for {ticker} on {date_str}: {e}")
+    finally:
+        if owned:
+            await client.close()
     return None
 
 
@@ -105,13 +108,15 @@ class SettlementResult:
     error: Optional[str] = None
 
 
-def compute_settlement(trade, api_key: str, price_cache: dict = None) -> SettlementResult:
+async def compute_settlement(trade, api_key: str, price_cache: dict = None,
+                             client: Optional[VendorHttpClient] = None) -> SettlementResult:
     """Compute deterministic settlement for an expired trade.
 
     Args:
         trade: Trade object with expiration_date, underlying, strategy, side, strike, width
         api_key: Polygon API key
         price_cache: Optional dict for caching {ticker:date -> price} across calls
+        client: Optional shared VendorHttpClient for the price fetch
 
     Returns:
         SettlementResult with exit_price_cents if settlement data available.
@@ -133,7 +138,7 @@ def compute_settlement(trade, api_key: str, price_cache: dict = None) -> Settlem
     if price_cache is not None and cache_key in price_cache:
         spot = price_cache[cache_key]
     else:
-        spot = fetch_underlying_close(trade.underlying, exp_date, api_key)
+        spot = await fetch_underlying_close(trade.underlying, exp_date, api_key, client)
         if price_cache is not None:
             price_cache[cache_key] = spot
 
@@ -0,0 +1,2 @@
+# services/massive/benchmarks
+# Micro-benchmarks for massive model builders (synthetic chains, in-memory Redis)
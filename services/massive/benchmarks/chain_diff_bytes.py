@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# services/massive/benchmarks/chain_diff_bytes.py
+
+"""
+Bytes transferred per chain refresh: full GET of massive:chain:latest versus
+the massive_chain chain_delta function (services/massive/intel/utils/chain_diff.lua).
+
+Scenarios, each one refresh by a consumer holding the previous version:
+
+  unchanged     chain version did not move (most WsHydrator emits)
+  quotes        spot +1 and 20% of quotes moved
+  geometry      quotes + 2% of tickers exited / entered (strike window shift)
+
+plus a hydrator-style run: --emits refreshes per chain version (5 Hz emits,
+10 s chain interval ≈ 50) over --versions versions.
+
+With a Redis >= 7 at --redis-url the delta sizes and latencies come from
+real FCALL_RO replies (the script uses and flushes database 15 by default).
+Without one it falls back to the Python reference diff (diff_chains), which
+returns the same structure; latencies are then not reported.
+
+Usage:
+    python services/massive/benchmarks/chain_diff_bytes.py
+    python services/massive/benchmarks/chain_diff_bytes.py --redis-url redis://127.0.0.1:6379/15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from redis.asyncio import Redis
+
+from services.massive.benchmarks.synthetic_chain import ChainSpec, generate_chain, perturb
+from services.massive.intel.utils import json_codec
+from services.massive.intel.utils.chain_diff import (
+    LATEST_KEY,
+    VERSION_KEY,
+    diff_chains,
+    load_library,
+    version_key,
+)
+from services.massive.intel.workers.chain_worker import _contract_record
+
+
+def _scenarios(spec: ChainSpec) -> Dict[str, tuple]:
+    raw = generate_chain(spec)
+    base = {t: _contract_record(p) for t, p in raw.items()}
+    quotes = {t: _contract_record(p) for t, p in perturb(raw, frac=0.2, spot_move=1.0).items()}
+
+    geometry = dict(quotes)
+    tickers = sorted(geometry)
+    for t in tickers[: max(1, len(tickers) // 50)]:
+        record = geometry.pop(t)
+        moved = f"{t}_N"
+        geometry[moved] = {**record, "details": {**record["details"], "ticker": moved}}
+
+    old = {"version": 1, "ts": 0, "contracts": base}
+    return {
+        "unchanged": (old, old),
+        "quotes": (old, {"version": 2, "ts": 0, "contracts": quotes}),
+        "geometry": (old, {"version": 2, "ts": 0, "contracts": geometry}),
+    }
+
+
+async def _connect(url: str) -> Optional[Redis]:
+    r = Redis.from_url(url, decode_responses=True)
+    try:
+        info = await r.info("server")
+        if int(info["redis_version"].split(".")[0]) >= 7:
+            await r.flushdb()
+            await load_library(r)
+            return r
+    except Exception:
+        pass
+    await r.aclose()
+    return None
+
+
+async def _delta(r: Optional[Redis], old: Dict[str, Any], new: Dict[str, Any]) -> tuple[int, Optional[float]]:
+    """(reply bytes, latency ms or None) for one refresh from old to new."""
+    if r is None:
+        if new is old:
+            return len(json_codec.dumps({"version": old["version"], "unchanged": True})), None
+        return len(json_codec.dumps(diff_chains(old, new))), None
+
+    await r.set(version_key(old["version"]), json_codec.dumps(old))
+    await r.set(LATEST_KEY, json_codec.dumps(new))
+    await r.set(VERSION_KEY, new["version"])
+    t0 = time.perf_counter()
+    reply = await r.fcall_ro(
+        "chain_delta", 3,
+        VERSION_KEY, version_key(old["version"]), LATEST_KEY, str(old["version"]),
+    )
+    return len(reply), (time.perf_counter() - t0) * 1000
+
+
+async def _full(r: Optional[Redis], chain: Dict[str, Any]) -> tuple[int, Optional[float]]:
+    blob = json_codec.dumps(chain)
+    if r is None:
+        return len(blob), None
+    await r.set(LATEST_KEY, blob)
+    t0 = time.perf_counter()
+    raw = await r.get(LATEST_KEY)
+    return len(raw), (time.perf_counter() - t0) * 1000
+
+
+def _ms(v: Optional[float]) -> str:
+    return f"{v:>8.2f}ms" if v is not None else f"{'-':>10}"
+
+
+async def main() -> int:
+    ap = argparse.ArgumentParser(description="chain_delta vs full GET: bytes per refresh")
+    ap.add_argument("--redis-url", default="redis://127.0.0.1:6379/15")
+    ap.add_argument("--symbols", default="I:SPX,I:NDX")
+    ap.add_argument("--expirations", type=int, default=5)
+    ap.add_argument("--strike-range", type=float, default=0.03)
+    ap.add_argument("--emits", type=int, default=50, help="hydrator refreshes per chain version")
+    ap.add_argument("--versions", type=int, default=10)
+    args = ap.parse_args()
+
+    spec = ChainSpec(
+        symbols=[s.strip() for s in args.symbols.split(",") if s.strip()],
+        expirations=args.expirations,
+        strike_range_pct=args.strike_range,
+    )
+    scenarios = _scenarios(spec)
+    r = await _connect(args.redis_url)
+    source = f"FCALL_RO @ {args.redis_url}" if r else "reference diff (no Redis >= 7 reachable)"
+    print(f"[bench] {len(scenarios['quotes'][1]['contracts'])} contracts, deltas from {source}")
+
+    print(f"\n{'scenario':<12}{'full bytes':>12}{'delta bytes':>13}{'ratio':>9}{'full':>11}{'delta':>11}")
+    sizes = {}
+    try:
+        for name, (old, new) in scenarios.items():
+            full_bytes, full_ms = await _full(r, new)
+            delta_bytes, delta_ms = await _delta(r, old, new)
+            sizes[name] = (full_bytes, delta_bytes)
+            print(f"{name:<12}{full_bytes:>12,}{delta_bytes:>13,}{delta_bytes / full_bytes:>9.1%}"
+                  f"{_ms(full_ms)}{_ms(delta_ms)}")
+    finally:
+        if r is not None:
+            await r.flushdb()
+            await r.aclose()
+
+    # Hydrator: one changed version + (emits - 1) unchanged polls per version
+    full_total = sizes["quotes"][0] * args.emits * args.versions
+    delta_total = (sizes["quotes"][1] + sizes["unchanged"][1] * (args.emits - 1)) * args.versions
+    print(f"\nhydrator, {args.emits} emits x {args.versions} versions: "
+          f"full {full_total / 1e6:,.1f} MB vs delta {delta_total / 1e6:,.2f} MB "
+          f"({delta_total / full_total:.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+# services/massive/benchmarks/run.py
+
+"""
+Massive model-builder micro-benchmarks.
+
+Times the heaviest massive code paths on a synthetic chain, with every
+stage wired to MemoryRedis (no network, no Redis server):
+
+  builder_build_surface     Builder._build_surface (per symbol)
+  builder_diff_surfaces     Builder._diff_surfaces (spot +1, 20% of quotes moved)
+  publisher_receive_delta   ModelPublisher.receive_delta
+  gex_build_once            GexModelBuilder._build_once
+  bias_lfi_build_once       BiasLfiModelBuilder._build_once
+  trade_selector_build_once TradeSelectorModelBuilder._build_once (scoring)
+  hydrator_hydrate_batch    WsHydrator.hydrate_batch (100-entry batches)
+  chain_encode_legacy       pre-slim chain write: vendor objects → json round
+                            trip per contract → json.dumps of the full chain
+  chain_encode              ChainWorker: _contract_record → json_codec.dumps
+  heatmap_decode_json       json.loads of massive:heatmap:model:{sym}:latest
+
+Usage:
+    python services/massive/benchmarks/run.py --out bench/baseline.json
+    python services/massive/benchmarks/run.py --out bench/new.json --compare bench/baseline.json
+    python services/massive/benchmarks/run.py --only builder --expirations 10 --strike-range 0.05
+
+--compare exits 1 when any benchmark's median regresses by more than
+--threshold (default 10%).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.massive.benchmarks.synthetic_chain import (
+    SYMBOL_DEFAULTS,
+    ChainSpec,
+    by_symbol,
+    chain_blob,
+    generate_chain,
+    perturb,
+    tick_frames,
+    vendor_payload,
+)
+from services.massive.intel.replay.memory_redis import MemoryRedis
+from services.massive.intel.replay.replayer import replay_config
+from services.massive.intel.model_builders.builder import Builder
+from services.massive.intel.model_builders.model_publisher import ModelPublisher
+from services.massive.intel.model_builders.gex import GexModelBuilder
+from services.massive.intel.model_builders.bias_lfi import BiasLfiModelBuilder
+from services.massive.intel.model_builders.trade_selector import TradeSelectorModelBuilder
+from services.massive.intel.workers.ws_hydrator import WsHydrator
+from services.massive.intel.workers.chain_worker import _contract_record
+from services.massive.intel.utils import json_codec
+
+
+class QuietLogger:
+    """Logger stand-in: builders log every call, which would dominate timings."""
+
+    def _drop(self, *args, **kwargs) -> None:
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+# ============================================================
+# Timing
+# ============================================================
+
+async def _time(fn: Callable[[], Awaitable[Any]], repeat: int, warmup: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        await fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    a = np.asarray(samples)
+    return {
+        "iterations": repeat,
+        "median_ms": round(float(np.median(a)), 4),
+        "p95_ms": round(float(np.percentile(a, 95)), 4),
+        "min_ms": round(float(a.min()), 4),
+        "mean_ms": round(float(a.mean()), 4),
+    }
+
+
+def _wire(stage, redis: MemoryRedis):
+    stage._redis = redis
+    return stage
+
+
+def _as_objects(value: Any) -> Any:
+    """Vendor SDK stand-in: nested dicts as attribute objects."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _as_objects(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_as_objects(v) for v in value]
+    return value
+
+
+# ============================================================
+# Benchmarks
+# ============================================================
+
+class Suite:
+    def __init__(self, spec: ChainSpec):
+        self.spec = spec
+        self.config = replay_config(",".join(spec.symbols))
+        self.logger = QuietLogger()
+
+        self.contracts = generate_chain(spec)
+        self.next_contracts = perturb(self.contracts)
+        self.snapshots = by_symbol(self.contracts)
+        self.next_snapshots = by_symbol(self.next_contracts)
+        self.frames = tick_frames(self.contracts, spec, seconds=1.0)
+
+        self.redis = MemoryRedis()
+        self.vix = 16.0
+
+    async def _seed(self) -> None:
+        r = self.redis
+        await r.set("massive:chain:latest", chain_blob(self.contracts))
+        for sym in self.spec.symbols:
+            spot = SYMBOL_DEFAULTS[sym][1]
+            await r.set(f"massive:model:spot:{sym}", json.dumps({"symbol": sym, "value": spot}))
+        await r.set("massive:model:spot:I:VIX", json.dumps({"symbol": "I:VIX", "value": self.vix}))
+
+    def _builder(self) -> Builder:
+        return _wire(Builder(self.config, self.logger), self.redis)
+
+    async def builder_build_surface(self):
+        builder = self._builder()
+
+        async def run():
+            for sym, contracts in self.snapshots.items():
+                builder._build_surface(sym, contracts, vix=self.vix)
+        return run
+
+    async def builder_diff_surfaces(self):
+        builder = self._builder()
+        pairs = []
+        for sym in self.snapshots:
+            old, _ = builder._build_surface(sym, self.snapshots[sym], vix=self.vix)
+            new, _ = builder._build_surface(sym, self.next_snapshots[sym], vix=self.vix)
+            pairs.append((old, new))
+
+        async def run():
+            for old, new in pairs:
+                builder._diff_surfaces(old, new)
+        return run
+
+    async def publisher_receive_delta(self):
+        builder = self._builder()
+        publisher = _wire(ModelPublisher(self.config, self.logger), self.redis)
+        deltas = []
+        for sym in self.snapshots:
+            old, atm_iv = builder._build_surface(sym, self.snapshots[sym], vix=self.vix)
+            new, _ = builder._build_surface(sym, self.next_snapshots[sym], vix=self.vix)
+            full = builder._diff_surfaces({}, old) or {"changed": {}, "removed": []}
+            step = builder._diff_surfaces(old, new) or {"changed": {}, "removed": []}
+            await publisher.receive_delta(sym, {**full, "atm_iv": atm_iv})
+            deltas.append((sym, {**step, "atm_iv": atm_iv}))
+
+        async def run():
+            for sym, delta in deltas:
+                await publisher.receive_delta(sym, delta)
+        return run
+
+    async def gex_build_once(self):
+        gex = _wire(GexModelBuilder(self.config, self.logger), self.redis)
+        return gex._build_once
+
+    async def bias_lfi_build_once(self):
+        await _wire(GexModelBuilder(self.config, self.logger), self.redis)._build_once()
+        bias = _wire(BiasLfiModelBuilder(self.config, self.logger), self.redis)
+        return bias._build_once
+
+    async def trade_selector_build_once(self):
+        # Heatmap + GEX + bias models in place, as in production
+        builder = self._builder()
+        publisher = _wire(ModelPublisher(self.config, self.logger), self.redis)
+        for sym, contracts in self.snapshots.items():
+            surface, atm_iv = builder._build_surface(sym, contracts, vix=self.vix)
+            delta = builder._diff_surfaces({}, surface) or {"changed": {}, "removed": []}
+            await publisher.receive_delta(sym, {**delta, "atm_iv": atm_iv})
+        await _wire(GexModelBuilder(self.config, self.logger), self.redis)._build_once()
+        await _wire(BiasLfiModelBuilder(self.config, self.logger), self.redis)._build_once()
+
+        selector = _wire(TradeSelectorModelBuilder(self.config, self.logger), self.redis)
+        return selector._build_once
+
+    async def hydrator_hydrate_batch(self):
+        hydrator = _wire(WsHydrator(self.config, self.logger), self.redis)
+        batches = [self.frames[i:i + 100] for i in range(0, len(self.frames), 100)]
+
+        async def run():
+            for batch in batches:
+                await hydrator.hydrate_batch(batch)
+        return run
+
+    async def chain_encode_legacy(self):
+        objects = {t: _as_objects(vendor_payload(p)) for t, p in self.contracts.items()}
+
+        async def run():
+            contracts = {
+                t: json.loads(json.dumps(o, default=lambda o: o.__dict__))
+                for t, o in objects.items()
+            }
+            json.dumps({"version": 1, "ts": 0, "contracts": contracts})
+        return run
+
+    async def chain_encode(self):
+        raw = {t: vendor_payload(p) for t, p in self.contracts.items()}
+
+        async def run():
+            contracts = {t: _contract_record(p) for t, p in raw.items()}
+            json_codec.dumps({"version": 1, "ts": 0, "contracts": contracts})
+        return run
+
+    async def _published_models(self) -> List[str]:
+        builder = self._builder()
+        publisher = _wire(ModelPublisher(self.config, self.logger), self.redis)
+        for sym, contracts in self.snapshots.items():
+            surface, atm_iv = builder._build_surface(sym, contracts, vix=self.vix)
+            delta = builder._diff_surfaces({}, surface) or {"changed": {}, "removed": []}
+            await publisher.receive_delta(sym, {**delta, "atm_iv": atm_iv})
+        return list(self.snapshots)
+
+    async def heatmap_decode_json(self):
+        blobs = [await self.redis.get(f"massive:heatmap:model:{sym}:latest")
+                 for sym in await self._published_models()]
+
+        async def run():
+            for blob in blobs:
+                json.loads(blob)
+        return run
+
+    NAMES = (
+        "builder_build_surface",
+        "builder_diff_surfaces",
+        "publisher_receive_delta",
+        "gex_build_once",
+        "bias_lfi_build_once",
+        "trade_selector_build_once",
+        "hydrator_hydrate_batch",
+        "chain_encode_legacy",
+        "chain_encode",
+        "heatmap_decode_json",
+    )
+
+    async def run(self, only: List[str], repeat: int, warmup: int) -> Dict[str, Dict[str, Any]]:
+        await self._seed()
+        results: Dict[str, Dict[str, Any]] = {}
+        for name in self.NAMES:
+            if only and not any(o in name for o in only):
+                continue
+            fn = await getattr(self, name)()
+            results[name] = await _time(fn, repeat, warmup)
+            print(f"  {name:<28} median={results[name]['median_ms']:>9.3f}ms "
+                  f"p95={results[name]['p95_ms']:>9.3f}ms")
+        return results
+
+
+# ============================================================
+# Results / comparison
+# ============================================================
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return human-readable regression lines (median slower than threshold)."""
+    regressions = []
+    print(f"\n{'benchmark (median ms)':<28}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            print(f"{name:<28}{'-':>12}{cur['median_ms']:>12.3f}{'new':>10}")
+            continue
+        change = (cur["median_ms"] - base["median_ms"]) / base["median_ms"] if base["median_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  ⚠️ REGRESSION"
+            regressions.append(f"{name}: {base['median_ms']:.3f}ms → {cur['median_ms']:.3f}ms ({change:+.1%})")
+        print(f"{name:<28}{base['median_ms']:>12.3f}{cur['median_ms']:>12.3f}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Massive model-builder micro-benchmarks")
+    ap.add_argument("--symbols", default="I:SPX,I:NDX")
+    ap.add_argument("--expirations", type=int, default=5)
+    ap.add_argument("--strike-range", type=float, default=0.03, help="± fraction of spot")
+    ap.add_argument("--tick-rate", type=int, default=500, help="WS quote events per second")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--warmup", type=int, default=2)
+    ap.add_argument("--only", default="", help="Comma-separated substrings of benchmark names")
+    ap.add_argument("--out", default=None, help="Write results JSON here")
+    ap.add_argument("--compare", default=None, help="Baseline results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.10, help="Regression threshold (fraction)")
+    return ap.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+    spec = ChainSpec(
+        symbols=[s.strip() for s in args.symbols.split(",") if s.strip()],
+        expirations=args.expirations,
+        strike_range_pct=args.strike_range,
+        tick_rate=args.tick_rate,
+    )
+    only = [o.strip() for o in args.only.split(",") if o.strip()]
+
+    suite = Suite(spec)
+    print(f"[bench] {len(suite.contracts)} contracts, {len(suite.frames)} WS frames, repeat={args.repeat}")
+    results = await suite.run(only, args.repeat, args.warmup)
+
+    doc = {
+        "meta": {
+            "ts": time.time(),
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "contracts": len(suite.contracts),
+            "spec": {
+                "symbols": spec.symbols,
+                "expirations": spec.expirations,
+                "strike_range_pct": spec.strike_range_pct,
+                "tick_rate": spec.tick_rate,
+            },
+        },
+        "results": results,
+    }
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(doc, indent=2))
+        print(f"[bench] results → {args.out}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if baseline.get("meta", {}).get("spec") != doc["meta"]["spec"]:
+            print("[bench] ⚠️ baseline was run with a different chain spec")
+        regressions = compare(doc, baseline, args.threshold)
+        if regressions:
+            print(f"\n[bench] {len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
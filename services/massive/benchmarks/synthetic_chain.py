@@ -0,0 +1,223 @@
+# services/massive/benchmarks/synthetic_chain.py
+
+"""
+Synthetic OCC option chains + WS tick frames for benchmarks.
+
+Contracts use the same raw vendor payload shape ChainWorker stores in
+massive:chain:latest (details / last_quote / greeks / implied_volatility /
+open_interest / underlying_asset), priced with Black-Scholes over a skewed
+smile so quotes, greeks and OI look like a real SPX/NDX session.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+import numpy as np
+
+from services.massive.intel.model_builders.builder import _fractional_T
+from services.massive.intel.model_builders.greeks import bs_price, greeks
+
+# symbol → (OCC root, spot, strike increment)
+SYMBOL_DEFAULTS = {
+    "I:SPX": ("SPXW", 5900.0, 5),
+    "I:NDX": ("NDXP", 21000.0, 10),
+}
+
+
+@dataclass
+class ChainSpec:
+    symbols: List[str] = field(default_factory=lambda: ["I:SPX", "I:NDX"])
+    expirations: int = 5            # trading days, starting today
+    strike_range_pct: float = 0.03  # ± fraction of spot
+    base_iv: float = 0.14
+    put_skew: float = 1.5           # IV added per unit of negative moneyness
+    tick_rate: int = 500            # WS quote events per second
+    events_per_frame: int = 5       # quote events per WS frame
+    seed: int = 7
+
+
+def _expirations(n: int) -> List[date]:
+    out: List[date] = []
+    d = date.today()
+    while len(out) < n:
+        if d.weekday() < 5:
+            out.append(d)
+        d += timedelta(days=1)
+    return out
+
+
+def _ticker(root: str, exp: date, cp: str, strike: float) -> str:
+    return f"O:{root}{exp:%y%m%d}{cp}{int(round(strike * 1000)):08d}"
+
+
+def generate_chain(spec: ChainSpec) -> Dict[str, Dict[str, Any]]:
+    """{ticker: raw payload} for every symbol / expiration / strike / side."""
+    rng = np.random.default_rng(spec.seed)
+    contracts: Dict[str, Dict[str, Any]] = {}
+
+    for symbol in spec.symbols:
+        root, spot, inc = SYMBOL_DEFAULTS[symbol]
+        half = spot * spec.strike_range_pct
+        strikes = np.arange(
+            np.floor((spot - half) / inc) * inc,
+            np.ceil((spot + half) / inc) * inc + inc,
+            inc,
+            dtype=np.float64,
+        )
+
+        for exp in _expirations(spec.expirations):
+            T = _fractional_T(exp)
+            for cp in "CP":
+                is_call = cp == "C"
+                moneyness = (strikes - spot) / spot
+                iv = spec.base_iv + spec.put_skew * np.maximum(-moneyness, 0) + 0.3 * np.maximum(moneyness, 0)
+                price = bs_price(spot, strikes, T, iv, is_call)
+                g = greeks(spot, strikes, T, iv, is_call)
+                spread = np.maximum(0.05, np.round(price * 0.02 / 0.05) * 0.05)
+                bid = np.maximum(0.0, np.round((price - spread / 2) / 0.05) * 0.05)
+                ask = bid + spread
+                oi = rng.lognormal(6.0, 1.2, len(strikes)).astype(int)
+
+                for i, K in enumerate(strikes.tolist()):
+                    ticker = _ticker(root, exp, cp, K)
+                    mid = float((bid[i] + ask[i]) / 2)
+                    contracts[ticker] = {
+                        "details": {
+                            "ticker": ticker,
+                            "contract_type": "call" if is_call else "put",
+                            "exercise_style": "european",
+                            "expiration_date": exp.isoformat(),
+                            "shares_per_contract": 100,
+                            "strike_price": K,
+                        },
+                        "last_quote": {
+                            "bid": float(bid[i]),
+                            "ask": float(ask[i]),
+                            "midpoint": mid,
+                            "bid_size": int(rng.integers(1, 200)),
+                            "ask_size": int(rng.integers(1, 200)),
+                        },
+                        "greeks": {
+                            "delta": float(g["delta"][i]),
+                            "gamma": float(g["gamma"][i]),
+                            "theta": float(g["theta"][i]) / 365.0,
+                            "vega": float(g["vega"][i]) / 100.0,
+                        },
+                        "implied_volatility": float(iv[i]),
+                        "open_interest": int(oi[i]),
+                        "underlying_asset": {"ticker": symbol, "value": spot},
+                        "day": {"volume": int(rng.integers(0, 5000))},
+                    }
+
+    return contracts
+
+
+def chain_blob(contracts: Dict[str, Dict[str, Any]], version: int = 1) -> str:
+    """massive:chain:latest payload."""
+    return json.dumps({"version": version, "ts": int(time.time()), "contracts": contracts})
+
+
+def by_symbol(contracts: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Group contracts the way SnapshotWorker/WsHydrator hand them to Builder."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for ticker, payload in contracts.items():
+        sym = payload["underlying_asset"]["ticker"]
+        out.setdefault(sym, {})[ticker] = payload
+    return out
+
+
+def tick_frames(
+    contracts: Dict[str, Dict[str, Any]],
+    spec: ChainSpec,
+    seconds: float = 1.0,
+) -> List[Dict[str, str]]:
+    """
+    massive:ws:stream entries ({"ts", "payload"}) carrying Polygon-style
+    quote events (ev=Q, bp/ap) on 0DTE contracts at spec.tick_rate.
+    """
+    rng = np.random.default_rng(spec.seed + 1)
+    today = f"{date.today():%y%m%d}"
+    zero_dte = [t for t in contracts if today in t] or list(contracts)
+
+    n_events = int(spec.tick_rate * seconds)
+    picks = rng.integers(0, len(zero_dte), n_events)
+    moves = rng.choice([-0.05, 0.05], n_events)
+
+    frames: List[Dict[str, str]] = []
+    now_ms = int(time.time() * 1000)
+    for start in range(0, n_events, spec.events_per_frame):
+        events = []
+        for j in range(start, min(start + spec.events_per_frame, n_events)):
+            ticker = zero_dte[picks[j]]
+            q = contracts[ticker]["last_quote"]
+            bid = max(0.0, round(q["bid"] + moves[j], 2))
+            events.append({
+                "ev": "Q",
+                "sym": ticker,
+                "bp": bid,
+                "ap": round(bid + (q["ask"] - q["bid"]), 2),
+                "t": now_ms + j,
+            })
+        frames.append({"ts": str(now_ms / 1000), "payload": json.dumps(events)})
+    return frames
+
+
+def perturb(
+    contracts: Dict[str, Dict[str, Any]],
+    frac: float = 0.2,
+    spot_move: float = 1.0,
+    seed: int = 11,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Copy with the underlying moved by `spot_move` and `frac` of quotes
+    moved one tick (the next snapshot, for diff benchmarks).
+    """
+    rng = np.random.default_rng(seed)
+    out: Dict[str, Dict[str, Any]] = {}
+    for ticker, payload in contracts.items():
+        payload = dict(payload)
+        ua = dict(payload["underlying_asset"])
+        ua["value"] = ua["value"] + spot_move
+        payload["underlying_asset"] = ua
+        if rng.random() < frac:
+            q = dict(payload["last_quote"])
+            step = 0.05 if rng.random() < 0.5 else -0.05
+            q["bid"] = max(0.0, q["bid"] + step)
+            q["ask"] = q["ask"] + step
+            q["midpoint"] = (q["bid"] + q["ask"]) / 2
+            payload["last_quote"] = q
+        out[ticker] = payload
+    return out
+
+
+def vendor_payload(payload: Dict[str, Any], ts_ns: int | None = None) -> Dict[str, Any]:
+    """
+    Full options-snapshot result as the vendor returns it: `payload` plus
+    the day bar, fmv, break-even and exchange/timeframe fields ChainWorker
+    does not keep.
+    """
+    ts_ns = ts_ns or time.time_ns()
+    lq, ua = payload["last_quote"], payload["underlying_asset"]
+    mid = lq["midpoint"]
+    return {
+        **payload,
+        "break_even_price": payload["details"]["strike_price"] + mid,
+        "fmv": mid,
+        "day": {
+            "change": 0.35, "change_percent": 4.2, "close": mid, "high": mid * 1.2,
+            "last_updated": ts_ns, "low": mid * 0.8, "open": mid * 0.9,
+            "previous_close": mid * 0.95, "volume": payload.get("day", {}).get("volume", 0),
+            "vwap": mid * 1.01,
+        },
+        "last_quote": {**lq, "ask_exchange": 302, "bid_exchange": 302,
+                       "last_updated": ts_ns, "timeframe": "REAL-TIME"},
+        "last_trade": {"conditions": [232], "exchange": 302, "price": mid,
+                       "sip_timestamp": ts_ns, "size": 1, "timeframe": "REAL-TIME"},
+        "underlying_asset": {**ua, "change_to_break_even": 4.1, "last_updated": ts_ns,
+                             "timeframe": "REAL-TIME"},
+    }
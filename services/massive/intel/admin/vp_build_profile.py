@@ -5,7 +5,8 @@ vp_build_profile.py
 Build a synthetic SPX/NDX volume profile from 1-min ETF bars and
 store it in Redis.
 
-Input JSON (from vp_download_history.py):
+Input: a columnar bar archive (--archive-dir, see bar_archive.py) or
+JSON (--file) from vp_download_history.py:
 
 {
   "ticker": "SPY",
@@ -23,6 +24,11 @@ Output keys:
     sse:volume-profile              → published light payload:
       { "symbol": "SPX", "mode": "raw|tv", "buckets": { price: vol, ... } }
 
+  MARKET_REDIS:
+    massive:volume_profile:{synthetic}:pyramid:{step}
+                                    → $1/$5/$25 levels, re-rolled from the
+                                      live $0.10 base hash (see vp_pyramid)
+
 Usage:
 
   python vp_build_profile.py \
@@ -30,6 +36,12 @@ Usage:
     --file ./data/vp/SPY_1min_YYYY-MM-DD_to_YYYY-MM-DD.json \
     --publish raw
 
+  # From the memory-mapped archive (seconds for multi-year rebuilds):
+  python vp_build_profile.py \
+    --ticker SPY \
+    --archive-dir ./data/vp/archive \
+    --publish raw
+
   # With visualization for structural analysis:
   python vp_build_profile.py \
     --ticker SPY \
@@ -43,12 +55,33 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import sys
 import time
 from datetime import datetime, UTC, timezone
+from pathlib import Path
 from typing import Any, Dict, List
 
+import numpy as np
 import redis
 
+ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.massive.intel.volume_profile.bar_archive import (
+    BarArchive,
+    columns_from_bars,
+    histogram_raw,
+    histogram_tv,
+    merge_bins,
+)
+from services.massive.intel.volume_profile.vp_pyramid import (
+    BASE_STEP,
+    level_key,
+    levels_from_base,
+    queue_replace_levels,
+)
+
 # AI analysis integration
 try:
     from vp_ai_analysis import (
@@ -95,38 +128,36 @@ def rds_market() -> redis.Redis:
 
 def accumulate_raw(
     bins_raw: Dict[int, float],
-    price: float | None,
-    vol: float | None,
+    cols: Dict[str, np.ndarray],
     multiplier: int,
 ) -> None:
-    """RAW mode: Volume at close price."""
-    if price is None or vol is None:
-        return
-    spx = int(round(price * multiplier))
-    bins_raw[spx] = bins_raw.get(spx, 0.0) + float(vol)
+    """RAW mode: Volume at close price (vectorized over a column chunk)."""
+    merge_bins(bins_raw, histogram_raw(cols["c"], cols["v"], multiplier))
 
 
 def accumulate_tv(
     bins_tv: Dict[int, float],
-    low: float | None,
-    high: float | None,
-    vol: float | None,
+    cols: Dict[str, np.ndarray],
     multiplier: int,
     microbins: int = 30,
 ) -> None:
     """TV mode: Volume distributed across bar's high-low range using microbins."""
-    if low is None or high is None or vol is None:
-        return
-    if high <= low:
-        return
+    merge_bins(bins_tv, histogram_tv(cols["l"], cols["h"], cols["v"], multiplier, microbins))
 
-    step = (high - low) / microbins
-    vol_per = vol / microbins
 
-    for i in range(microbins):
-        spy_price = low + i * step
-        spx = int(round(spy_price * multiplier))
-        bins_tv[spx] = bins_tv.get(spx, 0.0) + vol_per
+def load_columns(path: str) -> Dict[str, np.ndarray]:
+    """Load a vp_download_history JSON file as column arrays."""
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return columns_from_bars(payload.get("bars") or [])
+
+
+def iter_source(ticker: str, path: str | None, archive_dir: str | None):
+    """Yield column chunks from a JSON file or the columnar archive."""
+    if archive_dir:
+        yield from BarArchive(Path(archive_dir)).iter_chunks(ticker)
+    else:
+        yield load_columns(path)
 
 
 def create_standardized_bins(buckets: Dict[int, float]) -> Dict[str, float]:
@@ -382,6 +413,28 @@ def publish_to_market(obj: Dict[str, Any]) -> None:
     log("redis", "📡", f"Published profile to MARKET_REDIS ({MARKET_CHANNEL})")
 
 
+def write_pyramid_levels(symbol: str) -> None:
+    """
+    Bulk rebuild the $1/$5/$25 pyramid levels on MARKET_REDIS from the $0.10
+    base hash, the one source the live worker and vp_download also feed.
+    (The bar-history bins built here are a different profile, so they do
+    not go into the pyramid.)
+    """
+    r = rds_market()
+    base = r.hgetall(level_key(symbol, BASE_STEP))
+    if not base:
+        log("pyramid", "⚠️", f"No base hash at {level_key(symbol, BASE_STEP)} — skipping pyramid rebuild")
+        return
+
+    levels = levels_from_base(base)
+    pipe = r.pipeline(transaction=False)
+    queue_replace_levels(pipe, symbol, levels)
+    pipe.execute()
+
+    for step, buckets in sorted(levels.items()):
+        log("pyramid", "💾", f"  {level_key(symbol, step)}: {len(buckets)} buckets")
+
+
 def build_compact_profile(bins: Dict[int, float], bucket_size: int = 1) -> Dict[str, Any]:
     """Convert bin dict to compact array format with normalized volumes (0-1000)."""
     if not bins:
@@ -870,9 +923,16 @@ def parse_args() -> argparse.Namespace:
     ap.add_argument(
         "--file",
         type=str,
-        required=True,
+        default=None,
         help="JSON file produced by vp_download_history.py",
     )
+    ap.add_argument(
+        "--archive-dir",
+        type=str,
+        default=None,
+        help="Columnar bar archive (vp_download_history.py --archive-dir); "
+             "used instead of --file",
+    )
     ap.add_argument(
         "--merge-file",
         type=str,
@@ -948,33 +1008,27 @@ def main() -> None:
     multiplier = INSTRUMENTS[ticker]["multiplier"]
 
     path = args.file
-    if not os.path.isfile(path):
+    if args.archive_dir:
+        if not os.path.isdir(args.archive_dir):
+            raise SystemExit(f"Archive directory not found: {args.archive_dir}")
+    elif not path:
+        raise SystemExit("Either --file or --archive-dir is required")
+    elif not os.path.isfile(path):
         raise SystemExit(f"Input file not found: {path}")
 
     log("config", "🔧", f"ticker={ticker}, synthetic={synthetic}, multiplier={multiplier}")
-    log("config", "🔧", f"file={path}, publish={args.publish}")
+    log("config", "🔧", f"source={args.archive_dir or path}, publish={args.publish}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        payload = json.load(f)
-
-    bars: List[Dict[str, Any]] = payload.get("bars") or []
-    log("input", "ℹ️", f"Loaded {len(bars)} bars from file.")
-
-    ohlc: List[Dict[str, Any]] = []
     bins_raw: Dict[int, float] = {}
     bins_tv: Dict[int, float] = {}
+    bar_count = 0
 
-    for b in bars:
-        t = b.get("t")
-        o = b.get("o")
-        h = b.get("h")
-        l = b.get("l")
-        c = b.get("c")
-        v = b.get("v")
-
-        ohlc.append({"t": t, "o": o, "h": h, "l": l, "c": c, "v": v})
-        accumulate_raw(bins_raw, c, v, multiplier)
-        accumulate_tv(bins_tv, l, h, v, multiplier)
+    t0 = time.perf_counter()
+    for cols in iter_source(ticker, path, args.archive_dir):
+        accumulate_raw(bins_raw, cols, multiplier)
+        accumulate_tv(bins_tv, cols, multiplier)
+        bar_count += len(cols["t"])
+    log("input", "ℹ️", f"Accumulated {bar_count:,} bars in {time.perf_counter() - t0:.2f}s")
 
     # --- Merge additional files (e.g., ES daily bars) ---
     for merge_spec in args.merge_file:
@@ -1003,24 +1057,13 @@ def main() -> None:
         if not os.path.isfile(merge_path):
             raise SystemExit(f"Merge file not found: {merge_path}")
 
-        with open(merge_path, "r", encoding="utf-8") as f:
-            merge_payload = json.load(f)
-
-        merge_bars = merge_payload.get("bars") or []
+        merge_cols = load_columns(merge_path)
         merge_mult = merge_info["multiplier"]
-        merge_vol_total = 0
-
-        for b in merge_bars:
-            c_m = b.get("c")
-            h_m = b.get("h")
-            l_m = b.get("l")
-            v_m = b.get("v")
-            accumulate_raw(bins_raw, c_m, v_m, merge_mult)
-            accumulate_tv(bins_tv, l_m, h_m, v_m, merge_mult)
-            if v_m:
-                merge_vol_total += v_m
-
-        log("merge", "🔗", f"Merged {len(merge_bars)} bars from {merge_ticker} "
+        accumulate_raw(bins_raw, merge_cols, merge_mult)
+        accumulate_tv(bins_tv, merge_cols, merge_mult)
+        merge_vol_total = float(np.nansum(merge_cols["v"]))
+
+        log("merge", "🔗", f"Merged {len(merge_cols['t'])} bars from {merge_ticker} "
             f"(mult={merge_mult}, volume={merge_vol_total:,.0f})")
 
     if bins_raw:
@@ -1132,7 +1175,6 @@ def main() -> None:
         "min_price": price_min,
         "max_price": price_max,
         "last_updated": datetime.now(UTC).isoformat(),
-        "ohlc": ohlc,
         "buckets_raw": bins_raw,
         "buckets_tv": bins_tv,
     }
@@ -1148,6 +1190,9 @@ def main() -> None:
     # --- Write Dealer Gravity artifact (same format as vp_quick_load.py) ---
     write_dealer_gravity_artifact(bins_tv, synthetic.lower())
 
+    # --- Re-roll the multi-resolution pyramid from the live base hash ---
+    write_pyramid_levels(synthetic)
+
     mode = args.publish
     if mode in ("raw", "both"):
         publish_to_market({"symbol": synthetic, "mode": "raw", "buckets": out["buckets_raw"]})
@@ -2,12 +2,17 @@
 """
 VP Download History - Download minute bar history from Polygon
 
-Downloads 1-minute bars for a ticker and saves to JSON file.
+Downloads 1-minute bars for a ticker and saves to JSON file, or appends
+them to the memory-mapped columnar archive (see bar_archive.py).
 Used by the VP Admin menu for bulk historical data acquisition.
 
+Archive mode is incremental: it resumes from the day after the newest
+archived bar, so re-running only fetches what is missing.
+
 Usage:
     python vp_download_history.py --ticker SPY --years 5 --out-dir ./data/vp
     python vp_download_history.py --ticker QQQ --years max --out-dir ./data/vp
+    python vp_download_history.py --ticker SPY --years 5 --archive-dir ./data/vp/archive
 """
 
 import argparse
@@ -17,23 +22,34 @@ import sys
 import urllib.request
 import urllib.error
 import time
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, timezone
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.massive.intel.volume_profile.bar_archive import BarArchive, columns_from_bars
+
 POLYGON_BASE = "https://api.polygon.io"
 
 # Polygon free tier started around 2010, 15 years is practical max
 MAX_YEARS = 15
 
+# Archive mode: days buffered before each append (each append rewrites the year file)
+ARCHIVE_FLUSH_DAYS = 50
+
 
 class VPHistoryDownloader:
-    def __init__(self, api_key: str, ticker: str, out_dir: Path):
+    def __init__(self, api_key: str, ticker: str, out_dir: Path, archive: BarArchive | None = None):
         self.api_key = api_key
         self.ticker = ticker.upper()
         self.out_dir = out_dir
+        self.archive = archive
         self.bars: list[dict] = []
         self.days_processed = 0
         self.total_volume = 0
+        self.rows_archived = 0
 
     def fetch_day(self, date_str: str) -> list[dict]:
         """Fetch minute bars for a single day."""
@@ -66,6 +82,13 @@ class VPHistoryDownloader:
         end_date = date.today()
         start_date = end_date - timedelta(days=years * 365)
 
+        if self.archive:
+            last_ts = self.archive.last_timestamp(self.ticker)
+            if last_ts is not None:
+                last_day = datetime.fromtimestamp(last_ts / 1000, tz=timezone.utc).date()
+                start_date = max(start_date, last_day + timedelta(days=1))
+                print(f"Archive has {self.ticker} through {last_day}, resuming")
+
         print(f"Downloading {self.ticker} data from {start_date} to {end_date}")
         print(f"Estimated trading days: ~{years * 252}")
 
@@ -92,18 +115,31 @@ class VPHistoryDownloader:
                     last_progress = self.days_processed
                     print(
                         f"  {self.days_processed} days ({current}): "
-                        f"{len(self.bars):,} bars, {self.total_volume:,.0f} volume"
+                        f"{len(self.bars) + self.rows_archived:,} bars, {self.total_volume:,.0f} volume"
                     )
 
+                if self.archive and self.days_processed % ARCHIVE_FLUSH_DAYS == 0:
+                    self.flush_archive()
+
             # Rate limit: 5 requests/sec for free tier
             time.sleep(0.25)
             current += timedelta(days=1)
 
+        if self.archive:
+            self.flush_archive()
+
         print(
             f"\nDownload complete: {self.days_processed} days, "
-            f"{len(self.bars):,} bars, {self.total_volume:,.0f} total volume"
+            f"{len(self.bars) + self.rows_archived:,} bars, {self.total_volume:,.0f} total volume"
         )
 
+    def flush_archive(self):
+        """Append buffered bars to the columnar archive."""
+        if not self.bars:
+            return
+        self.rows_archived += self.archive.append(self.ticker, columns_from_bars(self.bars))
+        self.bars = []
+
     def save(self) -> Path:
         """Save bars to JSON file."""
         self.out_dir.mkdir(parents=True, exist_ok=True)
@@ -142,7 +178,11 @@ def main():
         help="Years of history to download (number or 'max')",
     )
     parser.add_argument(
-        "--out-dir", required=True, help="Output directory for JSON file"
+        "--out-dir", help="Output directory for JSON file"
+    )
+    parser.add_argument(
+        "--archive-dir",
+        help="Append to the columnar bar archive here instead of writing JSON",
     )
     args = parser.parse_args()
 
@@ -164,11 +204,19 @@ def main():
             print(f"Invalid years value: {args.years}")
             sys.exit(1)
 
-    out_dir = Path(args.out_dir)
+    if not args.out_dir and not args.archive_dir:
+        print("Either --out-dir or --archive-dir is required")
+        sys.exit(1)
+
+    archive = BarArchive(Path(args.archive_dir)) if args.archive_dir else None
+    out_dir = Path(args.out_dir) if args.out_dir else None
 
-    downloader = VPHistoryDownloader(api_key, args.ticker, out_dir)
+    downloader = VPHistoryDownloader(api_key, args.ticker, out_dir, archive=archive)
     downloader.download(years)
-    downloader.save()
+    if archive:
+        print(f"\nArchived {downloader.rows_archived:,} new bars to {archive.root}")
+    else:
+        downloader.save()
 
 
 if __name__ == "__main__":
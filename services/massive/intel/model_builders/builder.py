@@ -203,13 +203,27 @@ class Builder:
             )
         return self._redis
 
+    # ============================================================
+    # Warm restart (see utils/warm_state.py)
+    # ============================================================
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        # Surfaces are replaced wholesale per build, never mutated in place
+        return {"previous_surfaces": dict(self.previous_surfaces)}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        for sym, surface in state.get("previous_surfaces", {}).items():
+            if sym in self.previous_surfaces:
+                self.previous_surfaces[sym] = surface
+
     # ============================================================
     # Entry point
     # ============================================================
 
-    async def receive_snapshot(self, snapshots: Dict[str, Dict[str, Any]]) -> None:
+    async def receive_snapshot(self, snapshots: Dict[str, Dict[str, Any]], trace=None) -> None:
         """
-        Receive a full geometry snapshot from SnapshotWorker.
+        Receive a full geometry snapshot from SnapshotWorker (or a merged
+        WS snapshot from WsConsumer, optionally with a latency EmitTrace).
         """
         t_start = time.monotonic()
         r = await self._redis_conn()
@@ -237,6 +251,8 @@ class Builder:
                 delta = self._diff_surfaces(
                     self.previous_surfaces[symbol], new_surface
                 )
+                if trace:
+                    trace.mark_built(symbol)
 
                 # Always publish to ModelPublisher, even if delta is empty
                 # This ensures timestamps are updated and SSE clients see activity
@@ -245,7 +261,7 @@ class Builder:
                     publish_delta = delta if delta else {"changed": {}, "removed": []}
                     # Include ATM IV metadata for risk graph consumption
                     publish_delta["atm_iv"] = atm_iv
-                    await self._model_publisher.receive_delta(symbol, publish_delta)
+                    await self._model_publisher.receive_delta(symbol, publish_delta, trace=trace)
 
                 if delta:
                     deltas_with_changes += 1
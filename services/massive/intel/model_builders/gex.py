@@ -6,10 +6,16 @@ import asyncio
 import json
 import re
 import time
+from datetime import date
 from typing import Dict, Any, List
 
+import numpy as np
 from redis.asyncio import Redis
 
+from .builder import _fractional_T
+from .greeks import greeks, implied_vol
+from ..utils import json_codec
+
 
 _TICKER_RE = re.compile(
     r"^O:(?P<root>[A-Z]+)(?P<yymmdd>\d{6,8})(?P<cp>[CP])(?P<strike>\d+)$"
@@ -23,6 +29,17 @@ class GexModelBuilder:
     Calculates gamma exposure per strike per expiration.
     GEX = Gamma × Open Interest × 100 (contract multiplier)
 
+    Gamma source (MASSIVE_GEX_GREEKS_SOURCE):
+    - local (default): IV solved from mids, gamma computed in-process;
+      vendor gamma is the fallback and a logged cross-check
+    - vendor: vendor greeks only (previous behaviour)
+
+    With local greeks the WS consumer also hands over hydrated snapshots,
+    so GEX tracks live quotes instead of the chain fetch cadence. IV is
+    solved against the live spot (massive:model:spot:{symbol}, published
+    by SpotWorker); the chain's underlying_asset.value is only refreshed
+    with the chain and is the fallback when no live spot is available.
+
     Publishes separate models for calls and puts to:
     - massive:gex:model:{symbol}:calls
     - massive:gex:model:{symbol}:puts
@@ -36,6 +53,9 @@ class GexModelBuilder:
         self.logger = logger
 
         self.interval_sec = int(config.get("MASSIVE_GEX_INTERVAL_SEC", 5))
+        self.live_interval_ms = int(config.get("MASSIVE_GEX_LIVE_INTERVAL_MS", 1000))
+        self.greeks_source = config.get("MASSIVE_GEX_GREEKS_SOURCE", "local").lower()
+        self._last_build = 0.0
 
         self.symbols = [
             s.strip()
@@ -50,7 +70,8 @@ class GexModelBuilder:
         self.contract_multiplier = 100
 
         self.logger.info(
-            f"[GEX BUILDER INIT] symbols={self.symbols} interval={self.interval_sec}s",
+            f"[GEX BUILDER INIT] symbols={self.symbols} interval={self.interval_sec}s "
+            f"greeks={self.greeks_source}",
             emoji="📊",
         )
 
@@ -97,6 +118,217 @@ class GexModelBuilder:
 
         return symbol, exp, strike, option_type
 
+    # ============================================================
+    # Gamma source
+    # ============================================================
+
+    @staticmethod
+    def _mid(payload: Dict[str, Any]) -> float | None:
+        """Bid/ask midpoint (WS-hydrated when available), else last trade."""
+        lq = payload.get("last_quote") or {}
+        mid = lq.get("midpoint") or lq.get("mid")
+        if mid is None:
+            bid, ask = lq.get("bid"), lq.get("ask")
+            if bid and ask and ask >= bid:
+                mid = (bid + ask) / 2
+        if mid is None or mid <= 0:
+            last = lq.get("last") or (payload.get("last_trade") or {}).get("price")
+            mid = last if last and last > 0 else None
+        return mid
+
+    async def _live_spots(self, r: Redis) -> Dict[str, float]:
+        """Latest SpotWorker value per chain symbol (missing/invalid omitted)."""
+        raws = await r.mget([f"massive:model:spot:{s}" for s in self.symbols])
+        spots: Dict[str, float] = {}
+        for symbol, raw in zip(self.symbols, raws):
+            if not raw:
+                continue
+            try:
+                value = json_codec.loads(raw).get("value")
+            except Exception:
+                continue
+            if value:
+                spots[symbol] = float(value)
+        return spots
+
+    def _local_gamma(
+        self,
+        rows: List[tuple],
+        payloads: List[Dict[str, Any]],
+        spots: Dict[str, float] | None = None,
+    ) -> tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve IV from mids for every row in one batch and return local gamma
+        (NaN where unsolvable) plus vendor cross-check stats. `spots` (live
+        spot per symbol) takes precedence over the chain's underlying value.
+        """
+        spots = spots or {}
+        n = len(rows)
+        S = np.full(n, np.nan)
+        K = np.empty(n)
+        T = np.empty(n)
+        is_call = np.empty(n, dtype=bool)
+        price = np.full(n, np.nan)
+        vendor = np.full(n, np.nan)
+
+        t_cache: Dict[str, float] = {}
+        for i, ((symbol, expiration, strike, option_type), payload) in enumerate(zip(rows, payloads)):
+            spot = spots.get(symbol) or (payload.get("underlying_asset") or {}).get("value")
+            if spot:
+                S[i] = spot
+            K[i] = strike
+            if expiration not in t_cache:
+                exp_date = date.fromisoformat(expiration)
+                t_cache[expiration] = _fractional_T(exp_date)
+            T[i] = t_cache[expiration]
+            is_call[i] = option_type == "call"
+            mid = self._mid(payload)
+            if mid is not None:
+                price[i] = mid
+            g = (payload.get("greeks") or {}).get("gamma")
+            if g is not None:
+                vendor[i] = g
+
+        iv = implied_vol(price, S, K, T, is_call)
+        gamma = greeks(S, K, T, iv, is_call)["gamma"]
+
+        both = np.isfinite(gamma) & np.isfinite(vendor) & (vendor > 0)
+        stats: Dict[str, Any] = {
+            "local_solved": int(np.isfinite(gamma).sum()),
+            "vendor_compared": int(both.sum()),
+        }
+        if both.any():
+            rel = np.abs(gamma[both] - vendor[both]) / vendor[both]
+            stats["vendor_rel_diff_median"] = round(float(np.median(rel)), 6)
+            stats["vendor_rel_diff_p95"] = round(float(np.percentile(rel, 95)), 6)
+        return gamma, stats
+
+    # ============================================================
+    # Build
+    # ============================================================
+
+    def _compute(
+        self,
+        contracts: Dict[str, Dict[str, Any]],
+        spots: Dict[str, float] | None = None,
+    ) -> tuple[Dict[str, Dict[str, Dict[str, float]]], Dict[str, Dict[str, Dict[str, float]]], Dict[str, Any]]:
+        # Structure: {symbol: {expiration: {strike: gex_value}}}
+        calls_by_symbol: Dict[str, Dict[str, Dict[str, float]]] = {s: {} for s in self.symbols}
+        puts_by_symbol: Dict[str, Dict[str, Dict[str, float]]] = {s: {} for s in self.symbols}
+
+        rows: List[tuple] = []
+        payloads: List[Dict[str, Any]] = []
+        skipped = 0
+
+        for ticker, payload in contracts.items():
+            parsed = self._parse_ticker(ticker)
+            if parsed is None or parsed[0] not in self.symbols:
+                skipped += 1
+                continue
+            if not payload.get("open_interest"):
+                skipped += 1
+                continue
+            rows.append(parsed)
+            payloads.append(payload)
+
+        stats: Dict[str, Any] = {}
+        if self.greeks_source == "local" and rows:
+            local, stats = self._local_gamma(rows, payloads, spots)
+        else:
+            local = None
+
+        processed = 0
+        local_used = 0
+        for i, ((symbol, expiration, strike, option_type), payload) in enumerate(zip(rows, payloads)):
+            gamma = None
+            if local is not None and np.isfinite(local[i]):
+                gamma = float(local[i])
+                local_used += 1
+            else:
+                # Vendor greeks (also the fallback when no mid is solvable)
+                gamma = (payload.get("greeks") or {}).get("gamma")
+
+            if gamma is None:
+                skipped += 1
+                continue
+
+            # Calculate GEX = gamma × OI × 100
+            # No rounding - preserve full precision
+            gex = gamma * payload["open_interest"] * self.contract_multiplier
+
+            strike_str = str(int(strike))
+
+            if option_type == "call":
+                calls_by_symbol[symbol].setdefault(expiration, {})[strike_str] = gex
+            else:
+                puts_by_symbol[symbol].setdefault(expiration, {})[strike_str] = gex
+
+            processed += 1
+
+        stats.update({"processed": processed, "skipped": skipped, "local_used": local_used})
+        return calls_by_symbol, puts_by_symbol, stats
+
+    async def _publish(
+        self,
+        r: Redis,
+        contracts: Dict[str, Dict[str, Any]],
+        t_start: float,
+        source: str,
+    ) -> None:
+        spots = await self._live_spots(r) if self.greeks_source == "local" else None
+        calls_by_symbol, puts_by_symbol, stats = self._compute(contracts, spots)
+
+        # Publish models per symbol
+        ts = time.time()
+        pipe = r.pipeline(transaction=False)
+        for symbol in self.symbols:
+            calls_exps = calls_by_symbol[symbol]
+            puts_exps = puts_by_symbol[symbol]
+
+            if calls_exps:
+                calls_model = {
+                    "ts": ts,
+                    "symbol": symbol,
+                    "expirations": dict(sorted(calls_exps.items())),
+                }
+                pipe.set(
+                    f"massive:gex:model:{symbol}:calls",
+                    json.dumps(calls_model),
+                    ex=86400,
+                )
+
+            if puts_exps:
+                puts_model = {
+                    "ts": ts,
+                    "symbol": symbol,
+                    "expirations": dict(sorted(puts_exps.items())),
+                }
+                pipe.set(
+                    f"massive:gex:model:{symbol}:puts",
+                    json.dumps(puts_model),
+                    ex=86400,
+                )
+
+        latency_ms = int((time.monotonic() - t_start) * 1000)
+
+        # Analytics
+        name = self.BUILDER_NAME
+        pipe.hincrby(self.ANALYTICS_KEY, f"{name}:runs", 1)
+        pipe.hincrby(self.ANALYTICS_KEY, f"{name}:runs_{source}", 1)
+        pipe.hset(self.ANALYTICS_KEY, mapping={
+            f"{name}:latency_last_ms": latency_ms,
+            f"{name}:contracts_processed": stats["processed"],
+            f"{name}:greeks_source": self.greeks_source,
+            **{f"{name}:{k}": v for k, v in stats.items() if k not in ("processed", "skipped")},
+        })
+        await pipe.execute()
+
+        self.logger.info(
+            f"[GEX MODEL] source={source} processed={stats['processed']} skipped={stats['skipped']} "
+            f"local={stats['local_used']} latency={latency_ms}ms",
+            emoji="📊",
+        )
+
     async def _build_once(self) -> None:
         r = await self._redis_conn()
         t_start = time.monotonic()
@@ -108,100 +340,46 @@ class GexModelBuilder:
                 self.logger.debug("[GEX] No chain data available")
                 return
 
-            chain = json.loads(raw)
+            chain = json_codec.loads(raw)
             contracts = chain.get("contracts", {})
             if not contracts:
                 self.logger.debug("[GEX] Empty chain")
                 return
 
-            # Structure: {symbol: {expiration: {strike: gex_value}}}
-            calls_by_symbol: Dict[str, Dict[str, Dict[str, float]]] = {s: {} for s in self.symbols}
-            puts_by_symbol: Dict[str, Dict[str, Dict[str, float]]] = {s: {} for s in self.symbols}
-
-            processed = 0
-            skipped = 0
-
-            for ticker, payload in contracts.items():
-                parsed = self._parse_ticker(ticker)
-                if parsed is None:
-                    skipped += 1
-                    continue
-
-                symbol, expiration, strike, option_type = parsed
-
-                if symbol not in self.symbols:
-                    skipped += 1
-                    continue
-
-                # Extract gamma and OI
-                greeks = payload.get("greeks") or {}
-                gamma = greeks.get("gamma")
-                oi = payload.get("open_interest") or 0
-
-                if gamma is None or oi == 0:
-                    skipped += 1
-                    continue
-
-                # Calculate GEX = gamma × OI × 100
-                # No rounding - preserve full precision
-                gex = gamma * oi * self.contract_multiplier
-
-                strike_str = str(int(strike))
-
-                if option_type == "call":
-                    calls_by_symbol[symbol].setdefault(expiration, {})[strike_str] = gex
-                else:
-                    puts_by_symbol[symbol].setdefault(expiration, {})[strike_str] = gex
-
-                processed += 1
-
-            # Publish models per symbol
-            ts = time.time()
-            for symbol in self.symbols:
-                calls_exps = calls_by_symbol[symbol]
-                puts_exps = puts_by_symbol[symbol]
-
-                if calls_exps:
-                    calls_model = {
-                        "ts": ts,
-                        "symbol": symbol,
-                        "expirations": dict(sorted(calls_exps.items())),
-                    }
-                    await r.set(
-                        f"massive:gex:model:{symbol}:calls",
-                        json.dumps(calls_model),
-                        ex=86400,
-                    )
-
-                if puts_exps:
-                    puts_model = {
-                        "ts": ts,
-                        "symbol": symbol,
-                        "expirations": dict(sorted(puts_exps.items())),
-                    }
-                    await r.set(
-                        f"massive:gex:model:{symbol}:puts",
-                        json.dumps(puts_model),
-                        ex=86400,
-                    )
-
-            latency_ms = int((time.monotonic() - t_start) * 1000)
-
-            # Analytics
-            await r.hincrby(self.ANALYTICS_KEY, f"{self.BUILDER_NAME}:runs", 1)
-            await r.hset(self.ANALYTICS_KEY, f"{self.BUILDER_NAME}:latency_last_ms", latency_ms)
-            await r.hset(self.ANALYTICS_KEY, f"{self.BUILDER_NAME}:contracts_processed", processed)
-
-            self.logger.info(
-                f"[GEX MODEL] processed={processed} skipped={skipped} latency={latency_ms}ms",
-                emoji="📊",
-            )
+            await self._publish(r, contracts, t_start, "chain")
+            self._last_build = time.monotonic()
 
         except Exception as e:
             self.logger.error(f"[GEX BUILDER ERROR] {e}", emoji="💥")
             await r.hincrby(self.ANALYTICS_KEY, f"{self.BUILDER_NAME}:errors", 1)
             raise
 
+    async def receive_snapshot(self, snapshots: Dict[str, Dict[str, Any]]) -> None:
+        """
+        WS path: rebuild from hydrated (chain + live quote) snapshots.
+
+        Only meaningful with local greeks — vendor gamma does not move
+        between chain fetches. Throttled to MASSIVE_GEX_LIVE_INTERVAL_MS.
+        """
+        if self.greeks_source != "local":
+            return
+        now = time.monotonic()
+        if (now - self._last_build) * 1000 < self.live_interval_ms:
+            return
+        self._last_build = now
+
+        r = await self._redis_conn()
+        try:
+            contracts: Dict[str, Dict[str, Any]] = {}
+            for symbol_contracts in snapshots.values():
+                contracts.update(symbol_contracts)
+            if contracts:
+                await self._publish(r, contracts, now, "ws")
+        except Exception as e:
+            # Never take down the WS consumer; the interval loop keeps running
+            self.logger.error(f"[GEX LIVE ERROR] {e}", emoji="💥")
+            await r.hincrby(self.ANALYTICS_KEY, f"{self.BUILDER_NAME}:errors", 1)
+
     async def run(self, stop_event: asyncio.Event) -> None:
         self.logger.info("[GEX BUILDER START] running", emoji="📊")
 
@@ -0,0 +1,178 @@
+# services/massive/intel/model_builders/greeks.py
+
+"""
+Vectorized Black-Scholes implied volatility + greeks.
+
+Solves IV for a whole chain in one batch (safeguarded Newton: Newton steps
+inside a shrinking [lo, hi] bracket, bisection when a step leaves it), then
+computes greeks from the solved vols. Every function takes equal-length
+NumPy arrays (scalars broadcast), so a 2000-contract chain is a handful of
+array passes instead of 2000 scalar root finds.
+
+Conventions match builder.py: European Black-Scholes, no dividend yield,
+r = 0.05, T in fractional years to the 4pm ET close.
+
+Contracts with no arbitrage-free solution (price at/below intrinsic, above
+the no-arbitrage bound, T <= 0) come back as NaN.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict
+
+import numpy as np
+
+RISK_FREE_RATE = 0.05
+
+IV_LOW = 1e-4
+IV_HIGH = 5.0
+
+_SQRT2 = math.sqrt(2.0)
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+# math.erf as a ufunc — exact (no approximation error on cheap wings),
+# ~0.2µs per element
+_erf = np.frompyfunc(math.erf, 1, 1)
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return 0.5 * (1.0 + np.asarray(_erf(x / _SQRT2), dtype=np.float64))
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def _d1_d2(S, K, T, sigma, r):
+    sqrtT = np.sqrt(T)
+    vol_t = sigma * sqrtT
+    d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / vol_t
+    return d1, d1 - vol_t, sqrtT
+
+
+def bs_price(
+    S: np.ndarray,
+    K: np.ndarray,
+    T: np.ndarray,
+    sigma: np.ndarray,
+    is_call: np.ndarray,
+    r: float = RISK_FREE_RATE,
+) -> np.ndarray:
+    """Black-Scholes price per contract (T > 0, sigma > 0)."""
+    d1, d2, _ = _d1_d2(S, K, T, sigma, r)
+    df = np.exp(-r * T)
+    # put = call - S + K·df (parity) — one pair of CDF evaluations for both sides
+    call = S * norm_cdf(d1) - K * df * norm_cdf(d2)
+    return np.where(is_call, call, call - S + K * df)
+
+
+def implied_vol(
+    price: np.ndarray,
+    S: np.ndarray,
+    K: np.ndarray,
+    T: np.ndarray,
+    is_call: np.ndarray,
+    r: float = RISK_FREE_RATE,
+    tol: float = 1e-6,
+    max_iter: int = 50,
+) -> np.ndarray:
+    """
+    Batch implied volatility. Returns NaN where no solution exists.
+
+    Only unconverged contracts are carried into each iteration, so the
+    cost tracks the hard cases (deep wings), not the chain size.
+    """
+    price, S, K, T, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64),
+        np.asarray(S, dtype=np.float64),
+        np.asarray(K, dtype=np.float64),
+        np.asarray(T, dtype=np.float64),
+        np.asarray(is_call, dtype=bool),
+    )
+    n = price.shape[0] if price.ndim else 1
+    out = np.full(n, np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        df = np.exp(-r * T)
+        intrinsic = np.where(is_call, np.maximum(S - K * df, 0.0), np.maximum(K * df - S, 0.0))
+        upper = np.where(is_call, S, K * df)
+        valid = (
+            np.isfinite(price) & (T > 0) & (S > 0) & (K > 0)
+            & (price > intrinsic) & (price < upper)
+        )
+
+    idx = np.flatnonzero(valid)
+    if not len(idx):
+        return out
+
+    p, s, k, t, c = price[idx], S[idx], K[idx], T[idx], is_call[idx]
+
+    # Seed at the vega inflection point sqrt(2|ln(F/K)|/T), where Newton
+    # converges monotonically; near the money fall back to Brenner–Subrahmanyam
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inflection = np.sqrt(2.0 * np.abs(np.log(s / k) + r * t) / t)
+    atm_seed = np.sqrt(2.0 * math.pi / t) * p / s
+    sigma = np.clip(np.maximum(inflection, atm_seed), 0.05, 3.0)
+    lo = np.full(len(idx), IV_LOW)
+    hi = np.full(len(idx), IV_HIGH)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(max_iter):
+            diff = bs_price(s, k, t, sigma, c, r) - p
+
+            done = (np.abs(diff) < tol) | (hi - lo < 1e-8)
+            if done.any():
+                out[idx[done]] = sigma[done]
+                keep = ~done
+                idx, p, s, k, t, c = idx[keep], p[keep], s[keep], k[keep], t[keep], c[keep]
+                sigma, lo, hi, diff = sigma[keep], lo[keep], hi[keep], diff[keep]
+                if not len(idx):
+                    break
+
+            # Price is increasing in sigma: tighten the bracket
+            over = diff > 0
+            hi = np.where(over, sigma, hi)
+            lo = np.where(over, lo, sigma)
+
+            d1, _, sqrtT = _d1_d2(s, k, t, sigma, r)
+            vega = s * norm_pdf(d1) * sqrtT
+            step = sigma - diff / vega
+            bad = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+            sigma = np.where(bad, 0.5 * (lo + hi), step)
+
+    return out
+
+
+def greeks(
+    S: np.ndarray,
+    K: np.ndarray,
+    T: np.ndarray,
+    sigma: np.ndarray,
+    is_call: np.ndarray,
+    r: float = RISK_FREE_RATE,
+) -> Dict[str, np.ndarray]:
+    """
+    delta / gamma / vega (per 1.00 vol) / theta (per year) per contract.
+    NaN sigma propagates to NaN greeks.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1, d2, sqrtT = _d1_d2(S, K, T, sigma, r)
+        pdf = norm_pdf(d1)
+        nd1 = norm_cdf(d1)
+        nd2 = norm_cdf(d2)
+        df = np.exp(-r * T)
+
+        gamma = pdf / (S * sigma * sqrtT)
+        vega = S * pdf * sqrtT
+        decay = -S * pdf * sigma / (2.0 * sqrtT)
+        theta_call = decay - r * K * df * nd2
+        theta_put = decay + r * K * df * (1.0 - nd2)
+
+    return {
+        "delta": np.where(is_call, nd1, nd1 - 1.0),
+        "gamma": gamma,
+        "vega": vega,
+        "theta": np.where(is_call, theta_call, theta_put),
+    }
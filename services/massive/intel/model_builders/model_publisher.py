@@ -3,10 +3,26 @@
 import asyncio
 import json
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 
 from redis.asyncio import Redis
 
+from shared import heatmap_slices
+
+
+def _tile_fragment(key: str, tile: Dict[str, Any]) -> str:
+    """One `"key": {...}` member of a tiles object."""
+    return f"{json.dumps(key)}: {json.dumps(tile)}"
+
+
+def _json_with_members(meta: Dict[str, Any], field: str, members: Iterable[str]) -> str:
+    """json.dumps({**meta, field: {...}}) with the field's members already encoded."""
+    body = "{" + ", ".join(members) + "}"
+    head = json.dumps(meta)
+    if head == "{}":
+        return f"{{{json.dumps(field)}: {body}}}"
+    return f"{head[:-1]}, {json.dumps(field)}: {body}}}"
+
 
 class ModelPublisher:
     """
@@ -15,6 +31,14 @@ class ModelPublisher:
     Applies deltas to current model state.
     Publishes live model to :latest key (short TTL).
     Appends deltas to replay stream (full-day TTL).
+    Maintains per-DTE and per-(DTE, strategy) slices with their own
+    versions so consumers fetch only what changed
+    (shared/heatmap_slices.py, MASSIVE_HEATMAP_SLICES).
+
+    Each tile is JSON-encoded once, when it changes. The live model, the
+    slices, the diff and the replay entry are assembled from those cached
+    fragments, so a delta costs one encode of its changed tiles plus string
+    joins, however many payloads carry them.
 
     Instrumentation:
     - Periodic throughput stats (every 30s)
@@ -44,9 +68,18 @@ class ModelPublisher:
 
         self.analytics_key = "massive:model:analytics"
 
+        self.slices = str(config.get("MASSIVE_HEATMAP_SLICES", "true")).lower() == "true"
+
         # Per-symbol current model state (tiles dict)
         self.current_models: Dict[str, Dict[str, Any]] = {sym: {} for sym in self.symbols}
 
+        # Per-symbol encoded tiles (tile key → `"key": {...}` fragment),
+        # kept in step with current_models
+        self._tile_json: Dict[str, Dict[str, str]] = {}
+
+        # Per-symbol slice membership: slice field → {tile key: None} (ordered set)
+        self._slice_keys: Dict[str, Dict[str, Dict[str, None]]] = {}
+
         # ─────────────────────────────────────────────────────────────
         # Throughput tracking (reset each stats interval)
         # ─────────────────────────────────────────────────────────────
@@ -88,7 +121,126 @@ class ModelPublisher:
             dte_counts[dte] = dte_counts.get(dte, 0) + 1
         return dte_counts
 
-    async def receive_delta(self, symbol: str, delta_patch: Dict[str, Any]) -> None:
+    # ─────────────────────────────────────────────────────────────
+    # Warm restart (see utils/warm_state.py)
+    # ─────────────────────────────────────────────────────────────
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        return {
+            "current_models": {sym: dict(tiles) for sym, tiles in self.current_models.items()},
+            "atm_iv": getattr(self, "_atm_iv", {}),
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        for sym, tiles in state.get("current_models", {}).items():
+            if sym in self.current_models:
+                self.current_models[sym] = tiles
+        if state.get("atm_iv"):
+            self._atm_iv = state["atm_iv"]
+        self._tile_json.clear()
+        self._slice_keys.clear()
+
+    def _tile_fragments(self, symbol: str, changed: Dict[str, Any], removed: list) -> Dict[str, str]:
+        """Apply the (already merged) delta to the fragment cache; return the changed fragments."""
+        fragments = self._tile_json.get(symbol)
+        if fragments is None:
+            # First publish (or after a warm restore): encode the whole model
+            fragments = {
+                key: _tile_fragment(key, tile)
+                for key, tile in self.current_models[symbol].items()
+            }
+            self._tile_json[symbol] = fragments
+            return {key: fragments[key] for key in changed if key in fragments}
+
+        changed_fragments = {key: _tile_fragment(key, tile) for key, tile in changed.items()}
+        fragments.update(changed_fragments)
+        for key in removed:
+            fragments.pop(key, None)
+        return changed_fragments
+
+    @staticmethod
+    def _tile_fields(key: str) -> tuple[str, str] | None:
+        """Slice fields ("dte:N", "dte:N:strategy") for a strategy:dte:width:strike key."""
+        parts = key.split(":")
+        if len(parts) != 4:
+            return None
+        dte_field = heatmap_slices.slice_field(int(parts[1]))
+        return dte_field, heatmap_slices.slice_field(int(parts[1]), parts[0])
+
+    def _dirty_slices(self, symbol: str, changed: Dict[str, Any], removed: list) -> set[str]:
+        """Apply the delta to slice membership; return the slice fields it touched."""
+        slices = self._slice_keys.get(symbol)
+        if slices is None:
+            # First publish (or after a warm restore): index the whole model
+            slices = {}
+            for key in self.current_models[symbol]:
+                for field in self._tile_fields(key) or ():
+                    slices.setdefault(field, {})[key] = None
+            self._slice_keys[symbol] = slices
+            return set(slices)
+
+        dirty: set[str] = set()
+        for key in changed:
+            for field in self._tile_fields(key) or ():
+                slices.setdefault(field, {})[key] = None
+                dirty.add(field)
+        for key in removed:
+            for field in self._tile_fields(key) or ():
+                members = slices.get(field)
+                if members is not None and key in members:
+                    del members[key]
+                    dirty.add(field)
+        return dirty
+
+    def _queue_slices(
+        self,
+        pipe,
+        symbol: str,
+        model_meta: Dict[str, Any],
+        changed: Dict[str, Any],
+        removed: list,
+    ) -> int:
+        """Queue writes for touched slices + the versions hash; returns slices written."""
+        version = model_meta["version"]
+        atm_iv = model_meta.get("atm_iv") or {}
+        versions_key = heatmap_slices.versions_key(symbol)
+        dirty = self._dirty_slices(symbol, changed, removed)
+        slices = self._slice_keys[symbol]
+        fragments = self._tile_json[symbol]
+        written = 0
+
+        for field in sorted(dirty):
+            key = heatmap_slices.slice_key(symbol, field)
+            members = slices.get(field)
+            if not members:
+                slices.pop(field, None)
+                pipe.delete(key)
+                pipe.hdel(versions_key, field)
+                continue
+
+            dte, strategy = heatmap_slices.parse_field(field)
+            meta: Dict[str, Any] = {
+                "ts": model_meta["ts"],
+                "symbol": symbol,
+                "epoch": model_meta["epoch"],
+                "version": version,
+                "dte": dte,
+            }
+            if strategy:
+                meta["strategy"] = strategy
+            iv = atm_iv.get(dte, atm_iv.get(str(dte)))
+            if iv is not None:
+                meta["atm_iv"] = {str(dte): iv}
+            payload = _json_with_members(meta, "tiles", (fragments[k] for k in members))
+            pipe.set(key, payload, ex=self.live_ttl_sec)
+            pipe.hset(versions_key, field, version)
+            written += 1
+
+        pipe.hset(versions_key, heatmap_slices.MODEL_FIELD, version)
+        pipe.expire(versions_key, self.live_ttl_sec)
+        return written
+
+    async def receive_delta(self, symbol: str, delta_patch: Dict[str, Any], trace=None) -> None:
         """Called by Builder with {changed: {...}, removed: [...]}."""
         if symbol not in self.symbols:
             self.logger.warning(f"[MODEL] Unknown symbol delta: {symbol}", emoji="⚠️")
@@ -124,6 +276,10 @@ class ModelPublisher:
         for key in removed:
             self.current_models[symbol].pop(key, None)
 
+        # Encode only the changed tiles; every payload below reuses them
+        changed_json = self._tile_fragments(symbol, changed, removed)
+        tiles_json = self._tile_json[symbol]
+
         # Compute DTE metadata for SSE Gateway
         dte_counts = self._extract_dtes(self.current_models[symbol])
         dtes_available = sorted(dte_counts.keys())
@@ -137,50 +293,57 @@ class ModelPublisher:
 
         # Publish live model (full current state with DTE metadata)
         live_key = f"massive:heatmap:model:{symbol}:latest"
-        model_data: Dict[str, Any] = {
+        model_meta: Dict[str, Any] = {
             "ts": ts_now,
             "symbol": symbol,
             "epoch": "current",
             "version": version,
             "dtes_available": dtes_available,
             "dte_tile_counts": dte_counts,
-            "tiles": self.current_models[symbol],
         }
         # Include ATM IV metadata (per-DTE from chain, for risk graph)
         sym_atm_iv = getattr(self, '_atm_iv', {}).get(symbol)
         if sym_atm_iv:
-            model_data["atm_iv"] = sym_atm_iv
-        live_payload = json.dumps(model_data)
+            model_meta["atm_iv"] = sym_atm_iv
+        live_payload = _json_with_members(model_meta, "tiles", tiles_json.values())
         r = await self._redis_conn()
         await r.set(live_key, live_payload, ex=self.live_ttl_sec)
 
+        # Per-DTE / per-strategy slices: only the ones this delta touched
+        if self.slices:
+            pipe = r.pipeline(transaction=False)
+            slices_written = self._queue_slices(pipe, symbol, model_meta, changed, removed)
+            pipe.hincrby(self.analytics_key, "slices_written", slices_written)
+            await pipe.execute()
+
         # Append delta to replay stream
         replay_stream = f"massive:heatmap:replay:{symbol}"
-        delta_payload = json.dumps({
-            "ts": ts_now,
-            "version": version,
-            "changed": changed,
-            "removed": removed,
-        })
+        delta_payload = _json_with_members(
+            {"ts": ts_now, "version": version, "removed": removed},
+            "changed",
+            changed_json.values(),
+        )
         await r.xadd(replay_stream, {"payload": delta_payload},
                      maxlen=50000, approximate=True)
         await r.expire(replay_stream, self.replay_ttl_sec)
 
         # Publish diff via pub/sub for real-time SSE streaming
         diff_channel = f"massive:heatmap:diff:{symbol}"
-        diff_data: Dict[str, Any] = {
+        diff_meta: Dict[str, Any] = {
             "ts": ts_now,
             "version": version,
             "symbol": symbol,
-            "changed": changed,
             "removed": removed,
             "dtes_available": dtes_available,
         }
         if sym_atm_iv:
-            diff_data["atm_iv"] = sym_atm_iv
-        diff_payload = json.dumps(diff_data)
+            diff_meta["atm_iv"] = sym_atm_iv
+        diff_payload = _json_with_members(diff_meta, "changed", changed_json.values())
         await r.publish(diff_channel, diff_payload)
 
+        if trace:
+            trace.mark_published(symbol)
+
         # ─────────────────────────────────────────────────────────────
         # Throughput tracking
         # ─────────────────────────────────────────────────────────────
@@ -42,6 +42,8 @@ from typing import Any, Dict, List, Optional, Tuple
 import aiohttp
 from redis.asyncio import Redis
 
+from shared.heatmap_slices import SliceCache, select, slice_key, versions_key
+
 # ML Feedback Loop integration
 try:
     import sys
@@ -269,6 +271,9 @@ class TradeSelectorModelBuilder:
         self.market_redis_url = config["buses"]["market-redis"]["url"]
         self._redis: Redis | None = None
 
+        # Butterfly heatmap slices, re-fetched only when their version moves
+        self._heatmap_slices = SliceCache()
+
         # ------------------------------------------------------------------
         # Trade Idea Tracking (P&L instrumentation)
         # ------------------------------------------------------------------
@@ -525,8 +530,28 @@ class TradeSelectorModelBuilder:
         return None
 
     async def _load_heatmap(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Load unified heatmap model for symbol."""
+        """
+        Load the butterfly tiles of the heatmap for symbol. Uses the per-DTE
+        butterfly slices (only those whose version moved are fetched); falls
+        back to the full model when no slices are published.
+        """
         r = await self._redis_conn()
+        versions = await r.hgetall(versions_key(symbol))
+        fields = select(versions, strategy="butterfly") if versions else []
+        if fields:
+            cache = self._heatmap_slices
+            stale = cache.stale(symbol, versions, fields)
+            if stale:
+                pipe = r.pipeline(transaction=False)
+                for field in stale:
+                    pipe.get(slice_key(symbol, field))
+                for field, raw in zip(stale, await pipe.execute()):
+                    try:
+                        cache.put(symbol, field, versions[field], json.loads(raw) if raw else None)
+                    except json.JSONDecodeError:
+                        cache.put(symbol, field, versions[field], None)
+            return cache.merged(symbol, fields)
+
         key = f"massive:heatmap:model:{symbol}:latest"
         raw = await r.get(key)
         if not raw:
@@ -3,6 +3,8 @@
 import asyncio
 from typing import Dict, Any
 
+from redis.asyncio import Redis
+
 from .workers.spot_worker import SpotWorker
 from .workers.chain_worker import ChainWorker
 from .workers.snapshot_worker import SnapshotWorker
@@ -16,6 +18,11 @@ from .model_builders.bias_lfi import BiasLfiModelBuilder
 from .model_builders.trade_selector import TradeSelectorModelBuilder
 from .volume_profile.vp_worker import VolumeProfileWorker
 from .workers.stock_ws_worker import StockWsWorker
+from .utils.latency_trace import LatencyTracer
+from .utils.loop_monitor import LoopMonitor
+from .utils.warm_state import WarmStateStore
+from .utils.chain_diff import load_library
+from ..supervisor.worker_supervisor import WorkerSupervisor
 
 
 async def run(config: Dict[str, Any], logger) -> None:
@@ -30,69 +37,100 @@ async def run(config: Dict[str, Any], logger) -> None:
     - ModelPublisher (publishes live + replay models)
     - GEX (calculates gamma exposure)
     - WsWorker (streams real-time 0-DTE ticks)
-    - WsConsumer (reads stream at 2-5 Hz → Hydrator → Builder)
+    - WsConsumer (reads stream at 2-5 Hz → Hydrator → Builder + GEX)
     """
     stop_event = asyncio.Event()
     tasks = []
 
+    # Loop-lag / per-worker step attribution (massive:loop:analytics)
+    monitor = None
+    if str(config.get("MASSIVE_LOOP_MONITOR", "true")).lower() == "true":
+        monitor = LoopMonitor(config, logger)
+        tasks.append(
+            asyncio.create_task(monitor.run(stop_event), name="massive-loop-monitor")
+        )
+
+    # Per-worker restarts with RestartPolicy backoff (escalates if a worker keeps failing)
+    workers = WorkerSupervisor(config, logger)
+
+    def spawn(run, name: str) -> asyncio.Task:
+        def attempt():
+            coro = run(stop_event)
+            return monitor.wrap(name, coro) if monitor else coro
+        return asyncio.create_task(workers.supervise(name, attempt, stop_event), name=name)
+
     logger.info(
         "orchestrator starting (spot + chain + snapshot + builder + model + gex + bias_lfi + trade_selector + ws + vp + stock_ws)",
         emoji="🚀",
     )
 
     try:
+        # 0. Redis Function library for server-side chain deltas (snapshot + hydrator)
+        if str(config.get("MASSIVE_CHAIN_SERVER_DIFF", "true")).lower() == "true":
+            r = Redis.from_url(config["buses"]["market-redis"]["url"], decode_responses=True)
+            try:
+                library = await load_library(r)
+                logger.info(f"loaded Redis function library {library}", emoji="📚")
+            except Exception as e:
+                logger.warning(
+                    f"chain diff library not loaded ({e}); consumers use full chain reads",
+                    emoji="⚠️",
+                )
+            finally:
+                await r.aclose()
+
         # 1. SpotWorker (provides spot prices for Chain range calculation)
         spot = SpotWorker(config, logger)
         tasks.append(
-            asyncio.create_task(spot.run(stop_event), name="massive-spot")
+            spawn(spot.run, "massive-spot")
         )
 
         # 2. ChainWorker (geometry authority, diff + trigger)
         chain = ChainWorker(config, logger)
         tasks.append(
-            asyncio.create_task(chain.run(stop_event), name="massive-chain")
+            spawn(chain.run, "massive-chain")
         )
 
         # 3. Snapshot Worker (chain-only snapshots)
         snapshot = SnapshotWorker(config, logger)
         tasks.append(
-            asyncio.create_task(snapshot.run(stop_event), name="massive-snapshot")
+            spawn(snapshot.run, "massive-snapshot")
         )
 
         # 4. Builder Worker (calculates tiles/deltas)
         builder = Builder(config, logger)
         tasks.append(
-            asyncio.create_task(builder.run(stop_event), name="massive-builder")
+            spawn(builder.run, "massive-builder")
         )
 
         # 5. ModelPublisher Worker (publishes live + replay models)
         model_pub = ModelPublisher(config, logger)
         tasks.append(
-            asyncio.create_task(model_pub.run(stop_event), name="massive-model")
+            spawn(model_pub.run, "massive-model")
         )
 
         # 6. GEX Model Builder (calculates gamma exposure per strike)
         gex = GexModelBuilder(config, logger)
         tasks.append(
-            asyncio.create_task(gex.run(stop_event), name="massive-gex")
+            spawn(gex.run, "massive-gex")
         )
 
         # 7. Bias/LFI Model Builder (calculates directional strength and LFI from GEX)
         bias_lfi = BiasLfiModelBuilder(config, logger)
         tasks.append(
-            asyncio.create_task(bias_lfi.run(stop_event), name="massive-bias-lfi")
+            spawn(bias_lfi.run, "massive-bias-lfi")
         )
 
         # 8. Trade Selector Model Builder (scores heatmap tiles for optimal entries)
         trade_selector = TradeSelectorModelBuilder(config, logger)
         tasks.append(
-            asyncio.create_task(trade_selector.run(stop_event), name="massive-trade-selector")
+            spawn(trade_selector.run, "massive-trade-selector")
         )
 
         # 9. WsWorker (streams real-time ticks to Redis stream)
         ws_worker = WsWorker(config, logger)
         tasks.append(
-            asyncio.create_task(ws_worker.run(stop_event), name="massive-ws")
+            spawn(ws_worker.run, "massive-ws")
         )
 
         # 10. WsHydrator (maintains in-memory price state from WS ticks)
@@ -101,19 +139,19 @@ async def run(config: Dict[str, Any], logger) -> None:
         # 11. WsConsumer (reads stream, drives hydrator, triggers builder at 2-5 Hz)
         ws_consumer = WsConsumer(config, logger)
         tasks.append(
-            asyncio.create_task(ws_consumer.run(stop_event), name="massive-ws-consumer")
+            spawn(ws_consumer.run, "massive-ws-consumer")
         )
 
         # 12. VolumeProfileWorker (real-time SPY volume → SPX profile)
         vp_worker = VolumeProfileWorker(config, logger)
         tasks.append(
-            asyncio.create_task(vp_worker.run(stop_event), name="massive-volume-profile")
+            spawn(vp_worker.run, "massive-volume-profile")
         )
 
         # 13. StockWsWorker (real-time spot prices for stocks/ETFs via Polygon WS)
         stock_ws = StockWsWorker(config, logger)
         tasks.append(
-            asyncio.create_task(stock_ws.run(stop_event), name="massive-stock-ws")
+            spawn(stock_ws.run, "massive-stock-ws")
         )
 
         # Wire direct injection: snapshot → builder → model_publisher
@@ -123,6 +161,29 @@ async def run(config: Dict[str, Any], logger) -> None:
         # Wire WS path: ws_consumer → hydrator → builder → model_publisher
         ws_consumer.set_hydrator(hydrator)
         ws_consumer.set_builder(builder)
+        ws_consumer.set_gex(gex)
+
+        # 14. LatencyTracer (tick-to-tile spans on the WS path)
+        if str(config.get("MASSIVE_LATENCY_TRACE", "true")).lower() == "true":
+            tracer = LatencyTracer(config, logger)
+            ws_consumer.set_tracer(tracer)
+            hydrator.set_tracer(tracer)
+            tasks.append(
+                asyncio.create_task(tracer.run(stop_event), name="massive-latency-trace")
+            )
+
+        # 15. WarmStateStore (checkpoint worker state, restore on warm restart).
+        # Restore runs before the first await, i.e. before any worker starts.
+        if str(config.get("MASSIVE_WARM_RESTART", "true")).lower() == "true":
+            warm = WarmStateStore(config, logger)
+            warm.register("chain", chain)
+            warm.register("hydrator", hydrator)
+            warm.register("builder", builder)
+            warm.register("model_publisher", model_pub)
+            warm.restore()
+            tasks.append(
+                asyncio.create_task(warm.run(stop_event), name="massive-warm-state")
+            )
 
         # Wait for any task to raise exception (or cancellation)
         done, pending = await asyncio.wait(
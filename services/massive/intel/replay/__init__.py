@@ -0,0 +1,2 @@
+# services/massive/intel/replay
+# Record/replay harness - capture live inputs, replay through the real pipeline
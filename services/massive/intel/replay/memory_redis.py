@@ -0,0 +1,622 @@
+# services/massive/intel/replay/memory_redis.py
+
+"""
+MemoryRedis — in-process stand-in for redis.asyncio.Redis.
+
+Covers the command subset the massive workers and model builders use
+(strings, hashes, lists, sets, sorted sets, streams, pipelines, publish)
+with decode_responses=True semantics: every value comes back as str.
+
+Workers connect lazily through `_redis_conn()`, so a replay or benchmark
+injects this by assigning `worker._redis = MemoryRedis()` before the first
+call. Not a full Redis: no Lua, no blocking list ops, no pub/sub delivery
+(publishes are counted so callers can assert on fan-out).
+
+Every command is counted in `calls`; `round_trips` counts what a real
+client would send (one per command, one per pipeline execute).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _enc(value: Any) -> str:
+    """Encode like redis-py: bytes decoded, floats via repr, everything else str().
+    Binary values (not UTF-8) are kept as bytes, as a raw client would read them."""
+    if isinstance(value, bytes):
+        try:
+            return value.decode()
+        except UnicodeDecodeError:
+            return value  # type: ignore[return-value]
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _score_bound(raw: Any) -> Tuple[float, bool]:
+    """Parse a ZRANGEBYSCORE bound → (value, exclusive)."""
+    s = _enc(raw)
+    exclusive = s.startswith("(")
+    if exclusive:
+        s = s[1:]
+    return float(s), exclusive
+
+
+def _stream_id(raw: str) -> Tuple[int, int]:
+    ms, _, seq = raw.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class MemoryPipeline:
+    """Queues MemoryRedis commands and runs them in order on execute()."""
+
+    def __init__(self, redis: "MemoryRedis"):
+        self._redis = redis
+        self._queue: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if not hasattr(self._redis, name):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs):
+            self._queue.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        queued, self._queue = self._queue, []
+        self._redis.round_trips += 1
+        results = []
+        for name, args, kwargs in queued:
+            try:
+                results.append(await getattr(self._redis, name)(*args, _piped=True, **kwargs))
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        return results
+
+    def reset(self) -> None:
+        self._queue = []
+
+    async def __aenter__(self) -> "MemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.reset()
+
+
+class MemoryRedis:
+    """Async in-memory Redis (decode_responses=True semantics)."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._stream_seq: Dict[str, Tuple[int, int]] = {}
+        self._stream_cond = asyncio.Condition()
+
+        self.calls: Counter = Counter()
+        self.round_trips = 0
+        self.published: Counter = Counter()
+
+    # Workers test `if not self._redis` — an empty store must stay truthy
+    def __bool__(self) -> bool:
+        return True
+
+    # ------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------
+
+    def _count(self, name: str, piped: bool) -> None:
+        self.calls[name] += 1
+        if not piped:
+            self.round_trips += 1
+
+    def _alive(self, key: str) -> bool:
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return False
+        return key in self._data
+
+    def _get(self, key: str, factory=None):
+        if self._alive(key):
+            return self._data[key]
+        if factory is None:
+            return None
+        value = self._data[key] = factory()
+        return value
+
+    def pipeline(self, transaction: bool = True) -> MemoryPipeline:
+        return MemoryPipeline(self)
+
+    async def ping(self, _piped: bool = False) -> bool:
+        self._count("ping", _piped)
+        return True
+
+    async def close(self) -> None:
+        return None
+
+    aclose = close
+
+    async def flushall(self, _piped: bool = False) -> bool:
+        self._count("flushall", _piped)
+        self._data.clear()
+        self._expires.clear()
+        self._stream_seq.clear()
+        return True
+
+    # ------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------
+
+    async def delete(self, *names: str, _piped: bool = False) -> int:
+        self._count("delete", _piped)
+        removed = 0
+        for name in names:
+            if self._alive(name):
+                removed += 1
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return removed
+
+    async def exists(self, *names: str, _piped: bool = False) -> int:
+        self._count("exists", _piped)
+        return sum(1 for n in names if self._alive(n))
+
+    async def expire(self, name: str, time_sec: int, _piped: bool = False) -> bool:
+        self._count("expire", _piped)
+        if not self._alive(name):
+            return False
+        self._expires[name] = time.monotonic() + float(time_sec)
+        return True
+
+    async def ttl(self, name: str, _piped: bool = False) -> int:
+        self._count("ttl", _piped)
+        if not self._alive(name):
+            return -2
+        deadline = self._expires.get(name)
+        if deadline is None:
+            return -1
+        return max(0, int(deadline - time.monotonic()))
+
+    async def keys(self, pattern: str = "*", _piped: bool = False) -> List[str]:
+        self._count("keys", _piped)
+        return [k for k in list(self._data) if self._alive(k) and fnmatch.fnmatchcase(k, pattern)]
+
+    async def scan_iter(self, match: str = "*", count: Optional[int] = None):
+        for key in await self.keys(match):
+            yield key
+
+    # ------------------------------------------------------------
+    # Strings
+    # ------------------------------------------------------------
+
+    async def get(self, name: str, _piped: bool = False) -> Optional[str]:
+        self._count("get", _piped)
+        return self._get(name)
+
+    async def mget(self, keys, *args: str, _piped: bool = False) -> List[Optional[str]]:
+        self._count("mget", _piped)
+        names = [keys] if isinstance(keys, str) else list(keys)
+        names.extend(args)
+        return [self._get(n) for n in names]
+
+    async def set(
+        self,
+        name: str,
+        value: Any,
+        ex: Optional[int] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False,
+        _piped: bool = False,
+    ) -> Optional[bool]:
+        self._count("set", _piped)
+        present = self._alive(name)
+        if (nx and present) or (xx and not present):
+            return None
+        self._data[name] = _enc(value)
+        self._expires.pop(name, None)
+        if ex is not None:
+            self._expires[name] = time.monotonic() + float(ex)
+        elif px is not None:
+            self._expires[name] = time.monotonic() + float(px) / 1000.0
+        return True
+
+    async def incrby(self, name: str, amount: int = 1, _piped: bool = False) -> int:
+        self._count("incrby", _piped)
+        value = int(self._get(name) or 0) + int(amount)
+        self._data[name] = str(value)
+        return value
+
+    async def incr(self, name: str, amount: int = 1, _piped: bool = False) -> int:
+        return await self.incrby(name, amount, _piped=_piped)
+
+    # ------------------------------------------------------------
+    # Hashes
+    # ------------------------------------------------------------
+
+    async def hset(
+        self,
+        name: str,
+        key: Any = None,
+        value: Any = None,
+        mapping: Optional[Dict[Any, Any]] = None,
+        items: Optional[list] = None,
+        _piped: bool = False,
+    ) -> int:
+        self._count("hset", _piped)
+        h = self._get(name, dict)
+        pairs: List[Tuple[Any, Any]] = []
+        if key is not None:
+            pairs.append((key, value))
+        if mapping:
+            pairs.extend(mapping.items())
+        if items:
+            pairs.extend(zip(items[::2], items[1::2]))
+        added = 0
+        for k, v in pairs:
+            k = _enc(k)
+            if k not in h:
+                added += 1
+            h[k] = _enc(v)
+        return added
+
+    async def hget(self, name: str, key: Any, _piped: bool = False) -> Optional[str]:
+        self._count("hget", _piped)
+        return (self._get(name) or {}).get(_enc(key))
+
+    async def hmget(self, name: str, keys, *args, _piped: bool = False) -> List[Optional[str]]:
+        self._count("hmget", _piped)
+        fields = [keys] if isinstance(keys, (str, int)) else list(keys)
+        fields.extend(args)
+        h = self._get(name) or {}
+        return [h.get(_enc(f)) for f in fields]
+
+    async def hgetall(self, name: str, _piped: bool = False) -> Dict[str, str]:
+        self._count("hgetall", _piped)
+        return dict(self._get(name) or {})
+
+    async def hkeys(self, name: str, _piped: bool = False) -> List[str]:
+        self._count("hkeys", _piped)
+        return list(self._get(name) or {})
+
+    async def hlen(self, name: str, _piped: bool = False) -> int:
+        self._count("hlen", _piped)
+        return len(self._get(name) or {})
+
+    async def hexists(self, name: str, key: Any, _piped: bool = False) -> bool:
+        self._count("hexists", _piped)
+        return _enc(key) in (self._get(name) or {})
+
+    async def hdel(self, name: str, *keys: Any, _piped: bool = False) -> int:
+        self._count("hdel", _piped)
+        h = self._get(name) or {}
+        return sum(1 for k in keys if h.pop(_enc(k), None) is not None)
+
+    async def hincrby(self, name: str, key: Any, amount: int = 1, _piped: bool = False) -> int:
+        self._count("hincrby", _piped)
+        h = self._get(name, dict)
+        k = _enc(key)
+        value = int(h.get(k, 0)) + int(amount)
+        h[k] = str(value)
+        return value
+
+    async def hincrbyfloat(self, name: str, key: Any, amount: float = 1.0, _piped: bool = False) -> float:
+        self._count("hincrbyfloat", _piped)
+        h = self._get(name, dict)
+        k = _enc(key)
+        value = float(h.get(k, 0)) + float(amount)
+        h[k] = repr(value)
+        return value
+
+    # ------------------------------------------------------------
+    # Lists
+    # ------------------------------------------------------------
+
+    async def lpush(self, name: str, *values: Any, _piped: bool = False) -> int:
+        self._count("lpush", _piped)
+        lst = self._get(name, list)
+        for v in values:
+            lst.insert(0, _enc(v))
+        return len(lst)
+
+    async def rpush(self, name: str, *values: Any, _piped: bool = False) -> int:
+        self._count("rpush", _piped)
+        lst = self._get(name, list)
+        lst.extend(_enc(v) for v in values)
+        return len(lst)
+
+    async def lpop(self, name: str, _piped: bool = False) -> Optional[str]:
+        self._count("lpop", _piped)
+        lst = self._get(name) or []
+        return lst.pop(0) if lst else None
+
+    async def rpop(self, name: str, _piped: bool = False) -> Optional[str]:
+        self._count("rpop", _piped)
+        lst = self._get(name) or []
+        return lst.pop() if lst else None
+
+    @staticmethod
+    def _slice(seq: list, start: int, end: int) -> list:
+        n = len(seq)
+        if start < 0:
+            start = max(0, n + start)
+        end = n + end if end < 0 else min(end, n - 1)
+        return seq[start:end + 1] if start <= end else []
+
+    async def lrange(self, name: str, start: int, end: int, _piped: bool = False) -> List[str]:
+        self._count("lrange", _piped)
+        return self._slice(self._get(name) or [], start, end)
+
+    async def ltrim(self, name: str, start: int, end: int, _piped: bool = False) -> bool:
+        self._count("ltrim", _piped)
+        if self._alive(name):
+            self._data[name] = self._slice(self._data[name], start, end)
+        return True
+
+    async def llen(self, name: str, _piped: bool = False) -> int:
+        self._count("llen", _piped)
+        return len(self._get(name) or [])
+
+    # ------------------------------------------------------------
+    # Sets
+    # ------------------------------------------------------------
+
+    async def sadd(self, name: str, *values: Any, _piped: bool = False) -> int:
+        self._count("sadd", _piped)
+        s = self._get(name, set)
+        before = len(s)
+        s.update(_enc(v) for v in values)
+        return len(s) - before
+
+    async def srem(self, name: str, *values: Any, _piped: bool = False) -> int:
+        self._count("srem", _piped)
+        s = self._get(name) or set()
+        before = len(s)
+        s.difference_update(_enc(v) for v in values)
+        return before - len(s)
+
+    async def smembers(self, name: str, _piped: bool = False) -> set:
+        self._count("smembers", _piped)
+        return set(self._get(name) or ())
+
+    async def sismember(self, name: str, value: Any, _piped: bool = False) -> bool:
+        self._count("sismember", _piped)
+        return _enc(value) in (self._get(name) or ())
+
+    async def scard(self, name: str, _piped: bool = False) -> int:
+        self._count("scard", _piped)
+        return len(self._get(name) or ())
+
+    # ------------------------------------------------------------
+    # Sorted sets
+    # ------------------------------------------------------------
+
+    def _zsorted(self, name: str) -> List[Tuple[str, float]]:
+        z = self._get(name) or {}
+        return sorted(z.items(), key=lambda kv: (kv[1], kv[0]))
+
+    async def zadd(self, name: str, mapping: Dict[Any, float], nx: bool = False, xx: bool = False, _piped: bool = False) -> int:
+        self._count("zadd", _piped)
+        z = self._get(name, dict)
+        added = 0
+        for member, score in mapping.items():
+            m = _enc(member)
+            present = m in z
+            if (nx and present) or (xx and not present):
+                continue
+            if not present:
+                added += 1
+            z[m] = float(score)
+        return added
+
+    async def zrem(self, name: str, *members: Any, _piped: bool = False) -> int:
+        self._count("zrem", _piped)
+        z = self._get(name) or {}
+        return sum(1 for m in members if z.pop(_enc(m), None) is not None)
+
+    async def zcard(self, name: str, _piped: bool = False) -> int:
+        self._count("zcard", _piped)
+        return len(self._get(name) or {})
+
+    async def zscore(self, name: str, member: Any, _piped: bool = False) -> Optional[float]:
+        self._count("zscore", _piped)
+        return (self._get(name) or {}).get(_enc(member))
+
+    @staticmethod
+    def _in_range(score: float, lo: Tuple[float, bool], hi: Tuple[float, bool]) -> bool:
+        (lv, lx), (hv, hx) = lo, hi
+        above = score > lv if lx else score >= lv
+        below = score < hv if hx else score <= hv
+        return above and below
+
+    async def zrangebyscore(
+        self,
+        name: str,
+        min: Any,
+        max: Any,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+        _piped: bool = False,
+    ) -> list:
+        self._count("zrangebyscore", _piped)
+        lo, hi = _score_bound(min), _score_bound(max)
+        rows = [(m, s) for m, s in self._zsorted(name) if self._in_range(s, lo, hi)]
+        if start is not None and num is not None:
+            rows = rows[start:start + num] if num >= 0 else rows[start:]
+        return rows if withscores else [m for m, _ in rows]
+
+    async def zrevrangebyscore(
+        self,
+        name: str,
+        max: Any,
+        min: Any,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+        _piped: bool = False,
+    ) -> list:
+        self._count("zrevrangebyscore", _piped)
+        lo, hi = _score_bound(min), _score_bound(max)
+        rows = [(m, s) for m, s in reversed(self._zsorted(name)) if self._in_range(s, lo, hi)]
+        if start is not None and num is not None:
+            rows = rows[start:start + num] if num >= 0 else rows[start:]
+        return rows if withscores else [m for m, _ in rows]
+
+    async def zrange(self, name: str, start: int, end: int, desc: bool = False, withscores: bool = False, _piped: bool = False) -> list:
+        self._count("zrange", _piped)
+        rows = self._zsorted(name)
+        if desc:
+            rows.reverse()
+        rows = self._slice(rows, start, end)
+        return rows if withscores else [m for m, _ in rows]
+
+    async def zrevrange(self, name: str, start: int, end: int, withscores: bool = False, _piped: bool = False) -> list:
+        return await self.zrange(name, start, end, desc=True, withscores=withscores, _piped=_piped)
+
+    async def zremrangebyscore(self, name: str, min: Any, max: Any, _piped: bool = False) -> int:
+        self._count("zremrangebyscore", _piped)
+        z = self._get(name) or {}
+        lo, hi = _score_bound(min), _score_bound(max)
+        doomed = [m for m, s in z.items() if self._in_range(s, lo, hi)]
+        for m in doomed:
+            del z[m]
+        return len(doomed)
+
+    async def zremrangebyrank(self, name: str, start: int, end: int, _piped: bool = False) -> int:
+        self._count("zremrangebyrank", _piped)
+        z = self._get(name) or {}
+        doomed = self._slice(self._zsorted(name), start, end)
+        for m, _ in doomed:
+            del z[m]
+        return len(doomed)
+
+    # ------------------------------------------------------------
+    # Streams
+    # ------------------------------------------------------------
+
+    def _next_id(self, name: str) -> str:
+        ms = int(time.time() * 1000)
+        last_ms, last_seq = self._stream_seq.get(name, (0, -1))
+        seq = last_seq + 1 if ms <= last_ms else 0
+        ms = max(ms, last_ms)
+        self._stream_seq[name] = (ms, seq)
+        return f"{ms}-{seq}"
+
+    async def xadd(
+        self,
+        name: str,
+        fields: Dict[Any, Any],
+        id: str = "*",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+        _piped: bool = False,
+    ) -> str:
+        self._count("xadd", _piped)
+        stream = self._get(name, list)
+        entry_id = self._next_id(name) if id == "*" else id
+        if id != "*":
+            self._stream_seq[name] = _stream_id(entry_id)
+        stream.append((entry_id, {_enc(k): _enc(v) for k, v in fields.items()}))
+        if maxlen is not None and len(stream) > maxlen:
+            del stream[:len(stream) - maxlen]
+        async with self._stream_cond:
+            self._stream_cond.notify_all()
+        return entry_id
+
+    async def xlen(self, name: str, _piped: bool = False) -> int:
+        self._count("xlen", _piped)
+        return len(self._get(name) or [])
+
+    async def xtrim(self, name: str, maxlen: int, approximate: bool = True, _piped: bool = False) -> int:
+        self._count("xtrim", _piped)
+        stream = self._get(name) or []
+        extra = max(0, len(stream) - maxlen)
+        del stream[:extra]
+        return extra
+
+    def _range(self, name: str, lo: str, hi: str) -> List[Tuple[str, Dict[str, str]]]:
+        lo_id = (0, 0) if lo == "-" else _stream_id(lo)
+        hi_id = None if hi == "+" else _stream_id(hi)
+        return [
+            (eid, dict(f)) for eid, f in (self._get(name) or [])
+            if _stream_id(eid) >= lo_id and (hi_id is None or _stream_id(eid) <= hi_id)
+        ]
+
+    async def xrange(self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None, _piped: bool = False) -> list:
+        self._count("xrange", _piped)
+        rows = self._range(name, min, max)
+        return rows[:count] if count else rows
+
+    async def xrevrange(self, name: str, max: str = "+", min: str = "-", count: Optional[int] = None, _piped: bool = False) -> list:
+        self._count("xrevrange", _piped)
+        rows = self._range(name, min, max)[::-1]
+        return rows[:count] if count else rows
+
+    def _read_after(self, streams: Dict[str, str], count: Optional[int]) -> list:
+        out = []
+        for name, last in streams.items():
+            entries = self._get(name) or []
+            if last == "$":
+                continue
+            last_id = _stream_id(last)
+            # Entries are append-ordered: scan back to the first newer one
+            i = len(entries)
+            while i > 0 and _stream_id(entries[i - 1][0]) > last_id:
+                i -= 1
+            batch = entries[i:i + count] if count else entries[i:]
+            if batch:
+                out.append([name, [(eid, dict(f)) for eid, f in batch]])
+        return out
+
+    async def xread(
+        self,
+        streams: Dict[str, str],
+        count: Optional[int] = None,
+        block: Optional[int] = None,
+        _piped: bool = False,
+    ) -> list:
+        self._count("xread", _piped)
+        # "$" means "only entries added after this call"
+        resolved = {}
+        for name, last in streams.items():
+            if last == "$":
+                entries = self._get(name) or []
+                last = entries[-1][0] if entries else "0-0"
+            resolved[name] = last
+
+        out = self._read_after(resolved, count)
+        if out or block is None:
+            return out
+
+        try:
+            async with self._stream_cond:
+                await asyncio.wait_for(
+                    self._stream_cond.wait_for(lambda: bool(self._read_after(resolved, count))),
+                    timeout=block / 1000.0 if block else None,
+                )
+        except asyncio.TimeoutError:
+            return []
+        return self._read_after(resolved, count)
+
+    # ------------------------------------------------------------
+    # Pub/Sub (publish side only)
+    # ------------------------------------------------------------
+
+    async def publish(self, channel: str, message: Any, _piped: bool = False) -> int:
+        self._count("publish", _piped)
+        self.published[channel] += 1
+        return 0
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# services/massive/intel/replay/recorder.py
+
+"""
+Session recorder — captures live massive inputs for offline replay.
+
+Records from market-redis (read-only):
+  - every massive:ws:stream entry
+  - massive:chain:latest on each massive:chain:geometry_updated event
+  - spot keys (massive:model:spot:{SYM}) and any extra keys, on change
+  - optionally the VP trade feed (Polygon T.SPY), which never touches Redis
+
+Usage:
+    python services/massive/intel/replay/recorder.py --out sessions/2026-01-27.jsonl.gz
+    python services/massive/intel/replay/recorder.py --out s.jsonl.gz --duration 3600 --vp
+
+Replay with replayer.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from redis.asyncio import Redis
+
+ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.massive.intel.replay.session import SessionWriter
+
+STREAM_KEY = "massive:ws:stream"
+CHAIN_KEY = "massive:chain:latest"
+GEOMETRY_CHANNEL = "massive:chain:geometry_updated"
+VP_WS_URL = "wss://socket.polygon.io/stocks"
+
+
+class SessionRecorder:
+    """Tails market-redis (and optionally the VP feed) into a SessionWriter."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        logger,
+        writer: SessionWriter,
+        spot_symbols: List[str],
+        extra_keys: List[str] | None = None,
+        poll_ms: int = 250,
+        record_vp: bool = False,
+    ):
+        self.config = config
+        self.logger = logger
+        self.writer = writer
+        self.spot_keys = [f"massive:model:spot:{s}" for s in spot_symbols]
+        self.extra_keys = extra_keys or []
+        self.poll_sec = poll_ms / 1000.0
+        self.record_vp = record_vp
+
+        self.market_redis_url = config["buses"]["market-redis"]["url"]
+        self._redis: Redis | None = None
+
+    async def _redis_conn(self) -> Redis:
+        if not self._redis:
+            self._redis = Redis.from_url(self.market_redis_url, decode_responses=True)
+        return self._redis
+
+    async def _record_chain(self, version: Any) -> None:
+        r = await self._redis_conn()
+        raw = await r.get(CHAIN_KEY)
+        if raw:
+            self.writer.write("chain", version=version, raw=raw)
+
+    async def _tail_stream(self, stop_event: asyncio.Event) -> None:
+        r = await self._redis_conn()
+        last_id = "$"
+        while not stop_event.is_set():
+            results = await r.xread({STREAM_KEY: last_id}, count=500, block=1000)
+            for _, entries in results or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    self.writer.write("ws", f=fields)
+
+    async def _tail_geometry(self, stop_event: asyncio.Event) -> None:
+        r = await self._redis_conn()
+
+        # Baseline: the chain in force when recording starts
+        raw = await r.get(CHAIN_KEY)
+        if raw:
+            self.writer.write("chain", version=json.loads(raw).get("version"), raw=raw)
+
+        pubsub = r.pubsub()
+        await pubsub.subscribe(GEOMETRY_CHANNEL)
+        try:
+            while not stop_event.is_set():
+                msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if msg and msg["type"] == "message":
+                    version = json.loads(msg["data"]).get("version")
+                    await self._record_chain(version)
+        finally:
+            await pubsub.unsubscribe(GEOMETRY_CHANNEL)
+
+    async def _poll_keys(self, stop_event: asyncio.Event) -> None:
+        r = await self._redis_conn()
+        keys = self.spot_keys + self.extra_keys
+        last: Dict[str, str | None] = {}
+        while not stop_event.is_set():
+            values = await r.mget(keys)
+            for key, raw in zip(keys, values):
+                if raw is not None and raw != last.get(key):
+                    last[key] = raw
+                    kind = "spot" if key in self.spot_keys else "key"
+                    self.writer.write(kind, key=key, raw=raw)
+            await asyncio.sleep(self.poll_sec)
+
+    async def _tail_vp_feed(self, stop_event: asyncio.Event) -> None:
+        import websockets
+
+        api_key = self.config.get("MASSIVE_API_KEY", "")
+        while not stop_event.is_set():
+            try:
+                async with websockets.connect(VP_WS_URL, open_timeout=30, ping_interval=20) as ws:
+                    await ws.send(json.dumps({"action": "auth", "params": api_key}))
+                    await ws.send(json.dumps({"action": "subscribe", "params": "T.SPY"}))
+                    async for msg in ws:
+                        self.writer.write("vp", msg=msg)
+                        if stop_event.is_set():
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"[RECORDER] VP feed error: {e}, reconnecting", emoji="🔁")
+                await asyncio.sleep(5)
+
+    async def _flush_loop(self, stop_event: asyncio.Event) -> None:
+        while not stop_event.is_set():
+            await asyncio.sleep(5)
+            self.writer.flush()
+            counts = " ".join(f"{k}={v}" for k, v in self.writer.counts.items() if v)
+            self.logger.info(f"[RECORDER] {counts or 'waiting for data'}", emoji="⏺️")
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        self.logger.info(f"[RECORDER START] → {self.writer.path}", emoji="⏺️")
+        tasks = [
+            asyncio.create_task(self._tail_stream(stop_event), name="rec-ws"),
+            asyncio.create_task(self._tail_geometry(stop_event), name="rec-chain"),
+            asyncio.create_task(self._poll_keys(stop_event), name="rec-keys"),
+            asyncio.create_task(self._flush_loop(stop_event), name="rec-flush"),
+        ]
+        if self.record_vp:
+            tasks.append(asyncio.create_task(self._tail_vp_feed(stop_event), name="rec-vp"))
+
+        try:
+            await stop_event.wait()
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.writer.close()
+            self.logger.ok(
+                f"[RECORDER STOP] {self.writer.path} {self.writer.counts}",
+                emoji="💾",
+            )
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Record a massive session for offline replay")
+    ap.add_argument("--out", required=True, help="Output file (.jsonl.gz)")
+    ap.add_argument("--market-redis", default=os.getenv("MARKET_REDIS_URL", "redis://127.0.0.1:6380"))
+    ap.add_argument("--spot-symbols", default="I:SPX,I:NDX,I:VIX")
+    ap.add_argument("--extra-keys", default="vexy_ai:signals:latest",
+                    help="Comma-separated extra keys to record on change")
+    ap.add_argument("--poll-ms", type=int, default=250, help="Spot/extra key poll interval")
+    ap.add_argument("--duration", type=float, default=0, help="Stop after N seconds (0 = until Ctrl-C)")
+    ap.add_argument("--vp", action="store_true", help="Also record the Polygon T.SPY feed (needs MASSIVE_API_KEY)")
+    return ap.parse_args()
+
+
+async def main() -> None:
+    from shared.logutil import LogUtil
+
+    args = parse_args()
+    logger = LogUtil("massive-recorder")
+
+    config = {
+        "buses": {"market-redis": {"url": args.market_redis}},
+        "MASSIVE_API_KEY": os.getenv("MASSIVE_API_KEY", ""),
+    }
+    spot_symbols = [s.strip() for s in args.spot_symbols.split(",") if s.strip()]
+    extra_keys = [k.strip() for k in args.extra_keys.split(",") if k.strip()]
+
+    writer = SessionWriter(Path(args.out), meta={
+        "spot_symbols": spot_symbols,
+        "extra_keys": extra_keys,
+        "vp": args.vp,
+    })
+    recorder = SessionRecorder(
+        config, logger, writer, spot_symbols,
+        extra_keys=extra_keys, poll_ms=args.poll_ms, record_vp=args.vp,
+    )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    if args.duration > 0:
+        loop.call_later(args.duration, stop_event.set)
+
+    await recorder.run(stop_event)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# services/massive/intel/replay/replayer.py
+
+"""
+Session replayer — drives the real massive pipeline from a recorded session.
+
+The recorded inputs are fed, in order, into a MemoryRedis that every stage
+is wired to:
+
+    ws     → XADD massive:ws:stream
+    chain  → SET massive:chain:latest, then SnapshotWorker._produce_snapshot
+    spot   → SET massive:model:spot:{SYM}
+    key    → SET {key}
+    vp     → VolumeProfileWorker.process_message
+
+Periodic stages fire on the *replay clock* (recorded timestamps), so the
+sequence of stage calls is the same at every speed:
+
+    ws emit     every MASSIVE_WS_SNAPSHOT_INTERVAL_MS: drain stream through
+                WsHydrator, then WsConsumer._emit_snapshot (→ Builder →
+                ModelPublisher, → GexModelBuilder live path)
+    gex         every MASSIVE_GEX_INTERVAL_SEC
+    selector    every MASSIVE_SELECTOR_INTERVAL_SEC
+
+Speed: 1 / 10 (× real time) or max (no pacing). Output is a per-stage
+throughput + latency percentile report (text, optionally JSON), plus the
+LatencyTracer tick-to-tile spans for the WS path.
+
+Stages still read the wall clock for time-to-expiry and session windows,
+so model values depend on when the replay runs; ordering does not.
+
+Usage:
+    python services/massive/intel/replay/replayer.py sessions/2026-01-27.jsonl.gz --speed max
+    python services/massive/intel/replay/replayer.py s.jsonl.gz --speed 10 --json report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.massive.intel.replay.memory_redis import MemoryRedis
+from services.massive.intel.replay.session import read_session
+from services.massive.intel.replay.stats import StageStats, format_table
+from services.massive.intel.utils.latency_trace import LatencyTracer, format_latency
+from services.massive.intel.workers.snapshot_worker import SnapshotWorker
+from services.massive.intel.workers.ws_consumer import WsConsumer
+from services.massive.intel.workers.ws_hydrator import WsHydrator
+from services.massive.intel.model_builders.builder import Builder
+from services.massive.intel.model_builders.model_publisher import ModelPublisher
+from services.massive.intel.model_builders.gex import GexModelBuilder
+from services.massive.intel.model_builders.trade_selector import TradeSelectorModelBuilder
+
+try:
+    from services.massive.intel.volume_profile.vp_worker import VolumeProfileWorker
+    VP_AVAILABLE = True
+except ImportError:
+    VP_AVAILABLE = False
+
+STREAM_KEY = WsConsumer.STREAM_KEY
+
+
+def parse_speed(raw: str) -> Optional[float]:
+    """'1', '10x', 'max' → multiplier (None = unpaced)."""
+    raw = raw.strip().lower()
+    if raw in ("max", "inf", "0"):
+        return None
+    speed = float(raw.removesuffix("x"))
+    if speed <= 0:
+        raise ValueError(f"speed must be positive: {raw}")
+    return speed
+
+
+def replay_config(symbols: str = "I:SPX,I:NDX", overrides: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Minimal config for offline stages (no tracking / ML / journal calls)."""
+    config: Dict[str, Any] = {
+        "buses": {"market-redis": {"url": "redis://replay.invalid:0"}},
+        "MASSIVE_CHAIN_SYMBOLS": symbols,
+        "MASSIVE_SELECTOR_TRACKING": "false",
+        "MASSIVE_SELECTOR_ML_ENABLED": "false",
+        # MemoryRedis has no Redis Functions: consumers do full chain reads
+        "MASSIVE_CHAIN_SERVER_DIFF": "false",
+        "env": {"MASSIVE_CHAIN_SYMBOLS": symbols},
+    }
+    config.update(overrides or {})
+    return config
+
+
+class SessionReplayer:
+    """Wires real stages to a MemoryRedis and replays session events."""
+
+    def __init__(self, config: Dict[str, Any], logger, speed: Optional[float] = None):
+        self.config = config
+        self.logger = logger
+        self.speed = speed
+
+        self.redis = MemoryRedis()
+        self.stats = StageStats()
+
+        self.hydrator = WsHydrator(config, logger)
+        self.consumer = WsConsumer(config, logger)
+        self.snapshot = SnapshotWorker(config, logger)
+        self.builder = Builder(config, logger)
+        self.publisher = ModelPublisher(config, logger)
+        self.gex = GexModelBuilder(config, logger)
+        self.selector = TradeSelectorModelBuilder(config, logger)
+        self.vp = VolumeProfileWorker(config, logger) if VP_AVAILABLE else None
+        self.tracer = LatencyTracer(config, logger)
+
+        stages = [self.hydrator, self.consumer, self.snapshot, self.builder,
+                  self.publisher, self.gex, self.selector, self.vp]
+        for stage in stages:
+            if stage is not None:
+                stage._redis = self.redis
+
+        # Same wiring as orchestrator.run
+        self.snapshot.set_builder(self.builder)
+        self.builder.set_model_publisher(self.publisher)
+        self.consumer.set_hydrator(self.hydrator)
+        self.consumer.set_builder(self.builder)
+        self.consumer.set_gex(self.gex)
+        self.consumer.set_tracer(self.tracer)
+        self.hydrator.set_tracer(self.tracer)
+
+        s = self.stats
+        s.instrument(self.hydrator, "hydrate_batch", "hydrate", items=lambda a, k, r: len(a[0]))
+        s.instrument(self.hydrator, "get_merged_snapshots", "merge")
+        s.instrument(self.builder, "receive_snapshot", "build")
+        s.instrument(self.publisher, "receive_delta", "publish")
+        s.instrument(self.consumer, "_emit_snapshot", "ws_emit")
+        s.instrument(self.snapshot, "_produce_snapshot", "chain_snapshot")
+        s.instrument(self.gex, "_build_once", "gex")
+        s.instrument(self.gex, "receive_snapshot", "gex_live")
+        s.instrument(self.selector, "_build_once", "selector")
+        if self.vp:
+            s.instrument(self.vp, "process_message", "vp")
+
+        self.periods = {
+            "ws_emit": self.consumer.snapshot_interval_ms / 1000.0,
+            "gex": float(self.gex.interval_sec),
+            "selector": float(self.selector.interval_sec),
+        }
+        self._next_due: Dict[str, float] = {}
+        self._pending_ws = 0
+        self.event_counts: Dict[str, int] = {}
+
+    # ------------------------------------------------------------
+    # Event application
+    # ------------------------------------------------------------
+
+    async def _apply(self, ev: Dict[str, Any]) -> None:
+        kind = ev["k"]
+        self.event_counts[kind] = self.event_counts.get(kind, 0) + 1
+
+        if kind == "ws":
+            await self.redis.xadd(STREAM_KEY, ev["f"])
+            self._pending_ws += 1
+        elif kind == "chain":
+            await self.redis.set("massive:chain:latest", ev["raw"])
+            await self.snapshot._produce_snapshot(ev.get("version"))
+        elif kind in ("spot", "key"):
+            await self.redis.set(ev["key"], ev["raw"])
+        elif kind == "vp" and self.vp:
+            await self.vp.process_message(ev["msg"])
+
+    async def _drain_stream(self) -> None:
+        # Only call into the consumer while entries are queued: an empty
+        # XREAD would block for the consumer's poll timeout
+        while self._pending_ws > 0:
+            consumed = await self.consumer._consume_stream()
+            if not consumed:
+                break
+            self._pending_ws -= consumed
+
+    async def _run_stage(self, name: str) -> None:
+        try:
+            if name == "ws_emit":
+                await self._drain_stream()
+                await self.consumer._emit_snapshot()
+            elif name == "gex":
+                await self.gex._build_once()
+            elif name == "selector":
+                await self.selector._build_once()
+        except Exception as e:
+            # Already counted by the instrumented method; keep replaying
+            self.logger.warning(f"[REPLAY] stage {name} failed: {e}", emoji="⚠️")
+
+    async def _advance(self, t: float) -> None:
+        """Fire every periodic stage due at or before replay time t, in time order."""
+        while True:
+            name, due = min(self._next_due.items(), key=lambda kv: kv[1])
+            if due > t:
+                return
+            await self._run_stage(name)
+            self._next_due[name] = due + self.periods[name]
+
+    # ------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------
+
+    async def replay(self, events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        wall_start = time.perf_counter()
+        t_first: Optional[float] = None
+        t_last = 0.0
+
+        for ev in events:
+            t = float(ev["t"])
+            if t_first is None:
+                t_first = t
+                self._next_due = {name: t + period for name, period in self.periods.items()}
+
+            if self.speed is not None:
+                delay = wall_start + (t - t_first) / self.speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await self._advance(t)
+            await self._apply(ev)
+            t_last = t
+
+        if t_first is not None:
+            # Flush the tail: one final emit for anything still queued
+            await self._advance(t_last)
+            await self._run_stage("ws_emit")
+
+        wall_sec = time.perf_counter() - wall_start
+        session_sec = (t_last - t_first) if t_first is not None else 0.0
+
+        return {
+            "speed": "max" if self.speed is None else self.speed,
+            "events": dict(self.event_counts),
+            "session_sec": round(session_sec, 3),
+            "wall_sec": round(wall_sec, 3),
+            "realtime_factor": round(session_sec / wall_sec, 2) if wall_sec > 0 else None,
+            "stages": self.stats.summary(wall_sec),
+            "latency": self.tracer.summary(),
+            "redis": {
+                "round_trips": self.redis.round_trips,
+                "calls": dict(self.redis.calls.most_common()),
+            },
+        }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    events = " ".join(f"{k}={v}" for k, v in sorted(report["events"].items()))
+    lines = [
+        f"speed={report['speed']} session={report['session_sec']}s wall={report['wall_sec']}s "
+        f"realtime×{report['realtime_factor']}",
+        f"events: {events or 'none'}",
+        f"redis round trips: {report['redis']['round_trips']}",
+        "",
+        format_table(report["stages"]),
+        "",
+        "WS path spans (wall clock; only meaningful at --speed 1):",
+        format_latency(report["latency"]),
+    ]
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Replay a recorded massive session")
+    ap.add_argument("session", help="Session file from recorder.py (.jsonl.gz)")
+    ap.add_argument("--speed", default="max", help="1, 10, or max (default: max)")
+    ap.add_argument("--symbols", default=None, help="Override chain symbols (default: I:SPX,I:NDX)")
+    ap.add_argument("--json", default=None, help="Also write the report as JSON here")
+    return ap.parse_args()
+
+
+async def main() -> None:
+    from shared.logutil import LogUtil
+
+    args = parse_args()
+    logger = LogUtil("massive-replay")
+
+    header, events = read_session(Path(args.session))
+    config = replay_config(args.symbols or "I:SPX,I:NDX")
+
+    replayer = SessionReplayer(config, logger, speed=parse_speed(args.speed))
+    logger.info(f"[REPLAY START] {args.session} speed={args.speed}", emoji="⏯️")
+    report = await replayer.replay(events)
+    report["session"] = str(args.session)
+    report["recorded_at"] = header.get("started")
+
+    print(format_report(report))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        logger.ok(f"[REPLAY] report written to {args.json}", emoji="💾")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+# services/massive/intel/replay/session.py
+
+"""
+Recorded session file format.
+
+gzip-compressed JSON lines:
+  line 1   header  {"format": "massive-session", "version": 1, "started": epoch, ...}
+  line 2+  events  {"t": seconds since start, "k": kind, ...}
+
+Event kinds:
+  ws     {"f": {...}}                   one massive:ws:stream entry (fields as stored)
+  chain  {"version": n, "raw": "..."}   massive:chain:latest after a geometry update
+  spot   {"key": "...", "raw": "..."}   spot key value on change
+  key    {"key": "...", "raw": "..."}   any other polled key on change
+  vp     {"msg": "..."}                 raw VP trade-feed frame (Polygon T.SPY)
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+FORMAT = "massive-session"
+VERSION = 1
+
+EVENT_KINDS = ("ws", "chain", "spot", "key", "vp")
+
+
+class SessionWriter:
+    """Append events to a gzip JSONL session file."""
+
+    def __init__(self, path: Path, meta: Dict[str, Any] | None = None, compresslevel: int = 6):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.started = time.time()
+        self._t0 = time.monotonic()
+        self._fh = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=compresslevel)
+        self.counts: Dict[str, int] = {k: 0 for k in EVENT_KINDS}
+
+        header = {"format": FORMAT, "version": VERSION, "started": self.started, **(meta or {})}
+        self._fh.write(json.dumps(header) + "\n")
+
+    def write(self, kind: str, **data: Any) -> None:
+        if kind not in self.counts:
+            raise ValueError(f"unknown event kind {kind!r}")
+        event = {"t": round(time.monotonic() - self._t0, 6), "k": kind, **data}
+        self._fh.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self.counts[kind] += 1
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def read_session(path: Path) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """Return (header, event iterator). Events come back in recorded order."""
+    fh = gzip.open(Path(path), "rt", encoding="utf-8")
+    header = json.loads(fh.readline())
+    if header.get("format") != FORMAT:
+        fh.close()
+        raise ValueError(f"{path}: not a {FORMAT} file")
+
+    def events() -> Iterator[Dict[str, Any]]:
+        with fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, events()
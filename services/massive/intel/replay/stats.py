@@ -0,0 +1,95 @@
+# services/massive/intel/replay/stats.py
+
+"""
+Per-stage timing for replays and benchmarks.
+
+StageStats keeps raw durations (ms) and item counts per stage; summaries
+report count, throughput and p50/p95/p99/max latency.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class StageStats:
+    """Raw latency samples per named stage."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+        self.items: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, stage: str, ms: float, items: int = 1) -> None:
+        self.samples.setdefault(stage, []).append(ms)
+        self.items[stage] = self.items.get(stage, 0) + items
+
+    def error(self, stage: str) -> None:
+        self.errors[stage] = self.errors.get(stage, 0) + 1
+
+    def summary(self, wall_sec: float) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for stage, values in self.samples.items():
+            a = np.asarray(values)
+            p50, p95, p99 = np.percentile(a, [50, 95, 99])
+            out[stage] = {
+                "calls": len(a),
+                "items": self.items.get(stage, 0),
+                "errors": self.errors.get(stage, 0),
+                "calls_per_sec": round(len(a) / wall_sec, 2) if wall_sec > 0 else 0.0,
+                "items_per_sec": round(self.items.get(stage, 0) / wall_sec, 2) if wall_sec > 0 else 0.0,
+                "mean_ms": round(float(a.mean()), 3),
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(a.max()), 3),
+                "total_ms": round(float(a.sum()), 3),
+            }
+        for stage, n in self.errors.items():
+            out.setdefault(stage, {"calls": 0, "errors": n})
+        return out
+
+    def instrument(self, obj: Any, method: str, stage: str, items=None) -> None:
+        """
+        Replace an async bound method on `obj` with a timed wrapper.
+
+        `items(args, kwargs, result)` → int, when a call carries a batch.
+        Exceptions are counted and re-raised.
+        """
+        fn = getattr(obj, method)
+
+        @functools.wraps(fn)
+        async def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception:
+                self.error(stage)
+                raise
+            n = items(args, kwargs, result) if items else 1
+            self.record(stage, (time.perf_counter() - t0) * 1000, n)
+            return result
+
+        setattr(obj, method, timed)
+
+
+def format_table(summary: Dict[str, Dict[str, Any]]) -> str:
+    """Fixed-width text table of a StageStats summary."""
+    header = f"{'stage':<18}{'calls':>8}{'items/s':>11}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'err':>6}"
+    lines = [header, "-" * len(header)]
+    for stage in sorted(summary):
+        s = summary[stage]
+        if not s.get("calls"):
+            lines.append(f"{stage:<18}{0:>8}{'-':>11}{'-':>9}{'-':>9}{'-':>9}{'-':>9}{s.get('errors', 0):>6}")
+            continue
+        lines.append(
+            f"{stage:<18}{s['calls']:>8}{s['items_per_sec']:>11.1f}"
+            f"{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}"
+            f"{s['errors']:>6}"
+        )
+    lines.append("(latencies in ms)")
+    return "\n".join(lines)
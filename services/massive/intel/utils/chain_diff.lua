@@ -0,0 +1,315 @@
+#!lua name=massive_chain
+
+-- chain_diff.lua — Redis Function library: server-side chain snapshot diffs
+--
+-- Loaded by massive at startup (utils/chain_diff.py, FUNCTION LOAD REPLACE).
+-- ChainWorker keeps each published chain as massive:chain:v:{version} (short
+-- TTL) next to massive:chain:latest and massive:chain:version, so a consumer
+-- that holds version N asks Redis for "what changed since N" instead of
+-- re-reading the whole ~1 MB blob.
+--
+-- Functions (both read-only, callable with FCALL_RO):
+--
+--   chain_diff  KEYS: old snapshot, new snapshot
+--               → delta JSON (format below), or an error reply if either
+--                 snapshot is missing
+--
+--   chain_delta KEYS: version key, base snapshot (v:{base}), latest snapshot
+--               ARGV: base version
+--               → {"version": v, "unchanged": true}   latest is still base
+--                 {"version": v, "missing": "base"}   base expired: full GET
+--                 {"version": v, "missing": "exact"}  delta not exactly
+--                                                     encodable: full GET
+--                 {"version": null, "missing": "version"}
+--                 delta JSON otherwise
+--
+-- Delta format (utils/chain_diff.py applies it and mirrors it in Python):
+--
+--   {"from": 41, "version": 42,
+--    "entered":    {ticker: record},            new tickers, full records
+--    "exited":     [ticker, ...],
+--    "changed":    {ticker: {field: value}},    top-level fields that differ
+--                                               (last_quote, greeks, ...);
+--                                               null for a removed field
+--    "underlying": {underlying ticker: value}}  every contract on that
+--                                               underlying now has this
+--                                               underlying_asset.value
+--
+-- "underlying" is only used when all contracts of an underlying agree on the
+-- new value; otherwise underlying_asset goes per contract in "changed".
+--
+-- Deltas are written by encode_delta, not cjson.encode: cjson keeps only 14
+-- significant digits and writes an empty array as {}, so a consumer applying
+-- its deltas would drift from chain:latest. Numbers go out with %.17g, which
+-- round-trips every double. What a delta still cannot reproduce exactly
+-- (integers beyond 2^53, which cjson.decode already rounded, e.g. nanosecond
+-- timestamps; empty tables, which may have been [] or {}) marks it inexact,
+-- and chain_delta sends the consumer to a full GET instead.
+
+-- Integral doubles at or beyond 2^53 did not survive cjson.decode exactly
+local MAX_SAFE = 9007199254740992
+
+-- Set by same() / encode_value() for the diff being built
+local inexact = false
+
+local function unsafe_number(v)
+  return v ~= v or v == math.huge or v == -math.huge
+    or (v == math.floor(v) and (v >= MAX_SAFE or v <= -MAX_SAFE))
+end
+
+local function same(a, b)
+  if a == b then
+    if type(a) == "number" and unsafe_number(a) then
+      inexact = true
+    end
+    return true
+  end
+  if type(a) ~= "table" or type(b) ~= "table" then
+    return false
+  end
+  for k, v in pairs(a) do
+    if not same(v, b[k]) then
+      return false
+    end
+  end
+  for k, _ in pairs(b) do
+    if a[k] == nil then
+      return false
+    end
+  end
+  return true
+end
+
+-- underlying_asset tables equal apart from .value
+local function same_but_value(a, b)
+  for k, v in pairs(a) do
+    if k ~= "value" and not same(v, b[k]) then
+      return false
+    end
+  end
+  for k, _ in pairs(b) do
+    if k ~= "value" and a[k] == nil then
+      return false
+    end
+  end
+  return true
+end
+
+local function underlying_of(record)
+  local ua = record.underlying_asset
+  if type(ua) == "table" and type(ua.ticker) == "string" then
+    return ua.ticker, ua.value
+  end
+  return nil, nil
+end
+
+local function diff(old_data, new_data)
+  inexact = false
+  local old_contracts = old_data.contracts or {}
+  local new_contracts = new_data.contracts or {}
+
+  -- Pass 1: one shared new underlying value per underlying ticker, if any
+  local und = {}
+  local conflict = {}
+  for _, c in pairs(new_contracts) do
+    local t, v = underlying_of(c)
+    if t then
+      if v == nil or v == cjson.null then
+        conflict[t] = true
+      elseif und[t] == nil then
+        und[t] = v
+      elseif und[t] ~= v then
+        conflict[t] = true
+      end
+    end
+  end
+  local underlying = {}
+  local n_underlying = 0
+  for t, v in pairs(und) do
+    if not conflict[t] then
+      underlying[t] = v
+      n_underlying = n_underlying + 1
+    end
+  end
+
+  -- Pass 2: ticker set + per-field changes
+  local entered, exited, changed = {}, {}, {}
+  for ticker, c in pairs(new_contracts) do
+    local prev = old_contracts[ticker]
+    if prev == nil then
+      entered[ticker] = c
+    else
+      local fields = nil
+      for k, v in pairs(c) do
+        local skip = false
+        if k == "underlying_asset" then
+          local t = underlying_of(c)
+          local pt = underlying_of(prev)
+          skip = t ~= nil and t == pt and underlying[t] ~= nil
+            and same_but_value(prev.underlying_asset, c.underlying_asset)
+        end
+        if not skip and not same(prev[k], v) then
+          fields = fields or {}
+          fields[k] = v
+        end
+      end
+      for k, _ in pairs(prev) do
+        if c[k] == nil then
+          fields = fields or {}
+          fields[k] = cjson.null
+        end
+      end
+      if fields then
+        changed[ticker] = fields
+      end
+    end
+  end
+  for ticker, _ in pairs(old_contracts) do
+    if new_contracts[ticker] == nil then
+      table.insert(exited, ticker)
+    end
+  end
+
+  -- Only report underlying values that actually moved
+  if n_underlying > 0 then
+    local moved = false
+    for ticker, c in pairs(old_contracts) do
+      local t, v = underlying_of(c)
+      if t and underlying[t] ~= nil and underlying[t] ~= v then
+        moved = true
+        break
+      end
+    end
+    if not moved then
+      underlying = {}
+    end
+  end
+
+  return {
+    from = old_data.version,
+    version = new_data.version,
+    entered = entered,
+    exited = exited,
+    changed = changed,
+    underlying = underlying,
+  }
+end
+
+local function encode_value(v, out)
+  local t = type(v)
+  if t == "table" then
+    local first_key = next(v)
+    if first_key == nil then
+      inexact = true
+      out[#out + 1] = "{}"
+    elseif type(first_key) == "number" then
+      out[#out + 1] = "["
+      for i = 1, #v do
+        if i > 1 then
+          out[#out + 1] = ","
+        end
+        encode_value(v[i], out)
+      end
+      out[#out + 1] = "]"
+    else
+      out[#out + 1] = "{"
+      local sep = ""
+      for k, x in pairs(v) do
+        out[#out + 1] = sep .. cjson.encode(k) .. ":"
+        encode_value(x, out)
+        sep = ","
+      end
+      out[#out + 1] = "}"
+    end
+  elseif t == "number" then
+    if unsafe_number(v) then
+      inexact = true
+    end
+    out[#out + 1] = string.format("%.17g", v)
+  else
+    -- strings, booleans, cjson.null
+    out[#out + 1] = cjson.encode(v)
+  end
+end
+
+local function encode_map(map, out)
+  out[#out + 1] = "{"
+  local sep = ""
+  for k, v in pairs(map) do
+    out[#out + 1] = sep .. cjson.encode(k) .. ":"
+    encode_value(v, out)
+    sep = ","
+  end
+  out[#out + 1] = "}"
+end
+
+local function encode_delta(delta)
+  local out = { '{"from":' }
+  encode_value(delta.from or cjson.null, out)
+  out[#out + 1] = ',"version":'
+  encode_value(delta.version or cjson.null, out)
+  out[#out + 1] = ',"entered":'
+  encode_map(delta.entered, out)
+  out[#out + 1] = ',"exited":['
+  for i, ticker in ipairs(delta.exited) do
+    out[#out + 1] = (i > 1 and "," or "") .. cjson.encode(ticker)
+  end
+  out[#out + 1] = '],"changed":'
+  encode_map(delta.changed, out)
+  out[#out + 1] = ',"underlying":'
+  encode_map(delta.underlying, out)
+  out[#out + 1] = "}"
+  return table.concat(out)
+end
+
+local function load_pair(old_key, new_key)
+  local old_json = redis.call("GET", old_key)
+  local new_json = redis.call("GET", new_key)
+  if not old_json or not new_json then
+    return nil, nil
+  end
+  return cjson.decode(old_json), cjson.decode(new_json)
+end
+
+local function chain_diff(keys, args)
+  local old_data, new_data = load_pair(keys[1], keys[2])
+  if not old_data then
+    return redis.error_reply("ERR chain_diff: missing snapshot")
+  end
+  local body = encode_delta(diff(old_data, new_data))
+  if inexact then
+    return redis.error_reply("ERR chain_diff: delta not exactly encodable")
+  end
+  return body
+end
+
+local function chain_delta(keys, args)
+  local version = redis.call("GET", keys[1])
+  if not version then
+    return cjson.encode({ version = cjson.null, missing = "version" })
+  end
+  if version == args[1] then
+    return cjson.encode({ version = tonumber(version), unchanged = true })
+  end
+  local old_data, new_data = load_pair(keys[2], keys[3])
+  if not old_data then
+    return cjson.encode({ version = tonumber(version), missing = "base" })
+  end
+  local body = encode_delta(diff(old_data, new_data))
+  if inexact then
+    return cjson.encode({ version = tonumber(version), missing = "exact" })
+  end
+  return body
+end
+
+redis.register_function{
+  function_name = "chain_diff",
+  callback = chain_diff,
+  flags = { "no-writes" },
+}
+
+redis.register_function{
+  function_name = "chain_delta",
+  callback = chain_delta,
+  flags = { "no-writes" },
+}
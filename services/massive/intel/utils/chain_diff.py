@@ -0,0 +1,208 @@
+# services/massive/intel/utils/chain_diff.py
+
+"""
+chain_diff.py — Server-side chain diffs (Redis Function library massive_chain)
+
+massive:chain:latest is ~1 MB. WsHydrator re-read it on every emit (2-5 Hz)
+and SnapshotWorker on every geometry event, although it only changes when
+ChainWorker publishes a new geometry version. With the massive_chain library
+(chain_diff.lua) loaded, a consumer holding version N asks Redis for the
+delta since N instead:
+
+    massive:chain:version       current version (string)
+    massive:chain:v:{version}   copy of each published chain, short TTL
+    FCALL_RO chain_delta 3 massive:chain:version massive:chain:v:{N} massive:chain:latest N
+
+and gets back a few bytes when nothing changed, or only the entered /
+exited tickers and changed fields otherwise (delta format documented in
+chain_diff.lua). Applying the deltas reproduces chain:latest exactly. Every
+failure mode (library not loaded, Redis < 7, base version expired, a delta
+Lua cannot encode exactly) falls back to a full GET.
+
+- load_library(r)     FUNCTION LOAD REPLACE, called once at massive startup
+- diff_chains(a, b)   Python reference of the Lua diff (tests, benchmarks)
+- apply_delta(c, d)   apply a delta to a {ticker: record} dict
+- ChainBaseline       per-consumer copy of the chain kept current via deltas
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from . import json_codec
+
+LIBRARY_NAME = "massive_chain"
+LIBRARY_PATH = Path(__file__).with_name("chain_diff.lua")
+
+LATEST_KEY = "massive:chain:latest"
+VERSION_KEY = "massive:chain:version"
+
+
+def version_key(version: int) -> str:
+    return f"massive:chain:v:{version}"
+
+
+async def load_library(r: Redis) -> str:
+    """Load (or replace) the massive_chain function library; returns its name."""
+    return await r.function_load(LIBRARY_PATH.read_text(), replace=True)
+
+
+# ============================================================
+# Reference diff / apply
+# ============================================================
+
+def _underlying(record: Dict[str, Any]) -> tuple[Optional[str], Any]:
+    ua = record.get("underlying_asset")
+    if isinstance(ua, dict) and isinstance(ua.get("ticker"), str):
+        return ua["ticker"], ua.get("value")
+    return None, None
+
+
+def _without_value(ua: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in ua.items() if k != "value"}
+
+
+def diff_chains(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Python twin of chain_diff.lua's diff() for two chain:latest payloads."""
+    old_contracts = old.get("contracts") or {}
+    new_contracts = new.get("contracts") or {}
+
+    shared: Dict[str, Any] = {}
+    conflict: set[str] = set()
+    for c in new_contracts.values():
+        t, v = _underlying(c)
+        if t is None:
+            continue
+        if v is None or (t in shared and shared[t] != v):
+            conflict.add(t)
+        else:
+            shared.setdefault(t, v)
+    underlying = {t: v for t, v in shared.items() if t not in conflict}
+
+    entered: Dict[str, Any] = {}
+    changed: Dict[str, Dict[str, Any]] = {}
+    for ticker, c in new_contracts.items():
+        prev = old_contracts.get(ticker)
+        if prev is None:
+            entered[ticker] = c
+            continue
+        fields: Dict[str, Any] = {}
+        for k, v in c.items():
+            if k == "underlying_asset":
+                t = _underlying(c)[0]
+                if (t is not None and t == _underlying(prev)[0] and t in underlying
+                        and _without_value(v) == _without_value(prev[k])):
+                    continue
+            if prev.get(k) != v:
+                fields[k] = v
+        for k in prev:
+            if k not in c:
+                fields[k] = None
+        if fields:
+            changed[ticker] = fields
+
+    exited = [t for t in old_contracts if t not in new_contracts]
+
+    moved = any(
+        t in underlying and underlying[t] != v
+        for t, v in (_underlying(c) for c in old_contracts.values())
+    )
+    return {
+        "from": old.get("version"),
+        "version": new.get("version"),
+        "entered": entered,
+        "exited": exited,
+        "changed": changed,
+        "underlying": underlying if moved else {},
+    }
+
+
+def apply_delta(contracts: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """
+    Apply a chain delta in place. Records are replaced, never mutated, so
+    snapshots already handed to Builder keep their values.
+    """
+    for ticker in delta.get("exited") or ():
+        contracts.pop(ticker, None)
+
+    for und, value in (delta.get("underlying") or {}).items():
+        for ticker, record in contracts.items():
+            ua = record.get("underlying_asset")
+            if isinstance(ua, dict) and ua.get("ticker") == und and ua.get("value") != value:
+                contracts[ticker] = {**record, "underlying_asset": {**ua, "value": value}}
+
+    for ticker, fields in (delta.get("changed") or {}).items():
+        record = contracts.get(ticker)
+        if record is not None:
+            contracts[ticker] = {**record, **fields}
+
+    contracts.update(delta.get("entered") or {})
+
+
+# ============================================================
+# Consumer side
+# ============================================================
+
+class ChainBaseline:
+    """
+    A consumer's copy of massive:chain:latest, refreshed with chain_delta
+    when possible and a full GET otherwise. contracts is replaced or patched
+    in place by refresh(); treat the records as read-only. After a failed
+    refresh, contracts still holds the last chain seen (loaded stays True).
+    """
+
+    def __init__(self, server_side: bool = True) -> None:
+        self.server_side = server_side
+        self.version: Optional[int] = None
+        self.contracts: Dict[str, Any] = {}
+        self.loaded = False
+
+        self.stats: Dict[str, int] = {
+            "full_fetches": 0,
+            "delta_fetches": 0,
+            "unchanged": 0,
+            "fallbacks": 0,
+            "bytes_total": 0,
+        }
+
+    async def refresh(self, r: Redis) -> bool:
+        """Bring the baseline up to date; False when Redis has no chain."""
+        if self.server_side and self.loaded and self.version is not None:
+            try:
+                reply = await r.fcall_ro(
+                    "chain_delta", 3,
+                    VERSION_KEY, version_key(self.version), LATEST_KEY,
+                    str(self.version),
+                )
+            except ResponseError:
+                # Library not loaded / Redis < 7: full GET this time
+                reply = None
+                self.stats["fallbacks"] += 1
+
+            if reply is not None:
+                self.stats["bytes_total"] += len(reply)
+                delta = json_codec.loads(reply)
+                if delta.get("unchanged"):
+                    self.stats["unchanged"] += 1
+                    return True
+                if not delta.get("missing") and delta.get("from") == self.version:
+                    apply_delta(self.contracts, delta)
+                    self.version = delta.get("version")
+                    self.stats["delta_fetches"] += 1
+                    return True
+                self.stats["fallbacks"] += 1
+
+        raw = await r.get(LATEST_KEY)
+        if not raw:
+            return False
+        self.stats["bytes_total"] += len(raw)
+        self.stats["full_fetches"] += 1
+        chain = json_codec.loads(raw)
+        self.version = chain.get("version")
+        self.contracts = chain.get("contracts") or {}
+        self.loaded = True
+        return True
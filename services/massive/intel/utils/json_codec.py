@@ -0,0 +1,36 @@
+# services/massive/intel/utils/json_codec.py
+
+"""
+json_codec.py — Fast JSON encode/decode for large massive payloads
+
+Uses orjson when it is installed (several times faster than the stdlib on
+chain-sized documents) and falls back to compact stdlib json otherwise.
+Both return / accept str, so callers and Redis clients with
+decode_responses=True see the same types either way.
+
+Differences from json.dumps worth knowing: orjson writes NaN/Infinity as
+null and rejects non-str dict keys, which vendor payloads never contain.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def dumps(obj: Any) -> str:
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def loads(data: str | bytes) -> Any:
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
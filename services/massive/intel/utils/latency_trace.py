@@ -0,0 +1,255 @@
+# services/massive/intel/utils/latency_trace.py
+
+"""
+latency_trace.py — Tick-to-tile latency tracing for the WS path
+
+Trace origin is the receive timestamp WsWorker already stamps on every
+massive:ws:stream entry ("ts"). From there each tick is followed through:
+
+  ws_to_stream      WsWorker receive → XADD (stream entry id time)
+  stream_to_hydrate XADD → WsHydrator.hydrate_batch
+  hydrate_to_emit   hydrated (ticker marked dirty) → WsConsumer emit
+  emit_to_build     emit start → Builder delta ready (per symbol)
+  build_to_publish  delta ready → ModelPublisher publish done (per symbol)
+  tick_to_tile      WsWorker receive → publish done (per dirty ticker)
+
+Per-ticker spans use the *first* unpublished tick for that ticker, i.e.
+the oldest quote a published tile had to wait for.
+
+Spans land in HDR-style log-linear histograms (≤1% bucket error, constant
+memory). Every export interval the window is written to
+massive:latency:analytics as {stage}:count / :p50_ms / :p95_ms / :p99_ms /
+:max_ms, logged as a text report, and reset.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+
+STAGES = (
+    "ws_to_stream",
+    "stream_to_hydrate",
+    "hydrate_to_emit",
+    "emit_to_build",
+    "build_to_publish",
+    "tick_to_tile",
+)
+
+# 64 linear sub-buckets per power of two → ≤ 1/64 relative error
+_SUB_BITS = 7
+_SUB_COUNT = 1 << _SUB_BITS
+_HALF = _SUB_COUNT >> 1
+
+
+def _bucket(us: int) -> int:
+    if us < _SUB_COUNT:
+        return us
+    shift = us.bit_length() - _SUB_BITS
+    return _SUB_COUNT + (shift - 1) * _HALF + ((us >> shift) - _HALF)
+
+
+def _bucket_floor(idx: int) -> int:
+    if idx < _SUB_COUNT:
+        return idx
+    shift, sub = divmod(idx - _SUB_COUNT, _HALF)
+    shift += 1
+    return (sub + _HALF) << shift
+
+
+def format_latency(summary: Dict[str, Dict[str, float]]) -> str:
+    """Text table of LatencyTracer.summary()."""
+    lines = [f"{'stage':<18}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)"]
+    for stage, s in summary.items():
+        lines.append(
+            f"{stage:<18}{s['count']:>8}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}"
+            f"{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+class LatencyHistogram:
+    """Sparse HDR-style histogram of microsecond values."""
+
+    __slots__ = ("counts", "total", "max_us")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.max_us = 0
+
+    def record_ms(self, ms: float) -> None:
+        us = int(ms * 1000) if ms > 0 else 0
+        idx = _bucket(us)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.total += 1
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile_ms(self, pct: float) -> float:
+        if not self.total:
+            return 0.0
+        rank = max(1, int(round(pct / 100.0 * self.total)))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(_bucket_floor(idx), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def reset(self) -> None:
+        self.counts.clear()
+        self.total = 0
+        self.max_us = 0
+
+
+class EmitTrace:
+    """Spans for one WsConsumer emit, carried Builder → ModelPublisher."""
+
+    __slots__ = ("tracer", "started", "pending", "built")
+
+    def __init__(self, tracer: "LatencyTracer", started: float):
+        self.tracer = tracer
+        self.started = started
+        # symbol → [(recv_ts, hydrate_ts)] for tickers dirty in this emit
+        self.pending: Dict[str, List[Tuple[float, float]]] = {}
+        self.built: Dict[str, float] = {}
+
+    def mark_built(self, symbol: str) -> None:
+        now = time.time()
+        self.built[symbol] = now
+        self.tracer.record("emit_to_build", (now - self.started) * 1000)
+
+    def mark_published(self, symbol: str) -> None:
+        now = time.time()
+        built = self.built.get(symbol)
+        if built is not None:
+            self.tracer.record("build_to_publish", (now - built) * 1000)
+        for recv_ts, _ in self.pending.get(symbol, ()):
+            self.tracer.record("tick_to_tile", (now - recv_ts) * 1000)
+
+
+class LatencyTracer:
+    """Collects per-stage histograms and exports them periodically."""
+
+    ANALYTICS_KEY = "massive:latency:analytics"
+
+    def __init__(self, config: Dict[str, Any], logger):
+        self.config = config
+        self.logger = logger
+
+        self.export_interval_sec = int(config.get("MASSIVE_LATENCY_EXPORT_SEC", 30))
+
+        self.market_redis_url = config["buses"]["market-redis"]["url"]
+        self._redis: Redis | None = None
+
+        self.histograms: Dict[str, LatencyHistogram] = {s: LatencyHistogram() for s in STAGES}
+        self._window_start = time.time()
+
+        # symbol → ticker → (recv_ts, hydrate_ts) of first unpublished tick
+        self._dirty_origin: Dict[str, Dict[str, Tuple[float, float]]] = {}
+
+        self.logger.info(
+            f"[LATENCY TRACE INIT] export={self.export_interval_sec}s → {self.ANALYTICS_KEY}",
+            emoji="⏱️",
+        )
+
+    async def _redis_conn(self) -> Redis:
+        if not self._redis:
+            self._redis = Redis.from_url(self.market_redis_url, decode_responses=True)
+        return self._redis
+
+    def record(self, stage: str, ms: float) -> None:
+        self.histograms[stage].record_ms(ms)
+
+    # ------------------------------------------------------------
+    # Hooks (called from the WS path)
+    # ------------------------------------------------------------
+
+    def record_stream_entry(self, entry_id: str, fields: Dict[str, Any], now: float) -> None:
+        """WsConsumer: one stream entry read."""
+        try:
+            recv_ts = float(fields["ts"])
+            stream_ts = int(entry_id.split("-", 1)[0]) / 1000.0
+        except (KeyError, TypeError, ValueError):
+            return
+        self.record("ws_to_stream", (stream_ts - recv_ts) * 1000)
+        self.record("stream_to_hydrate", (now - stream_ts) * 1000)
+
+    def mark_dirty(self, symbol: str, ticker: str, recv_ts: Optional[float], now: float) -> None:
+        """WsHydrator: ticker became dirty; keeps the first unpublished tick."""
+        if recv_ts is None:
+            return
+        self._dirty_origin.setdefault(symbol, {}).setdefault(ticker, (recv_ts, now))
+
+    def begin_emit(self) -> EmitTrace:
+        """WsConsumer: start of an emit; takes ownership of pending dirty origins."""
+        trace = EmitTrace(self, time.time())
+        for symbol, origins in self._dirty_origin.items():
+            if origins:
+                trace.pending[symbol] = list(origins.values())
+                for _, hydrate_ts in trace.pending[symbol]:
+                    self.record("hydrate_to_emit", (trace.started - hydrate_ts) * 1000)
+        self._dirty_origin = {}
+        return trace
+
+    # ------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for stage in STAGES:
+            h = self.histograms[stage]
+            out[stage] = {
+                "count": h.total,
+                "p50_ms": h.percentile_ms(50),
+                "p95_ms": h.percentile_ms(95),
+                "p99_ms": h.percentile_ms(99),
+                "max_ms": h.max_us / 1000.0,
+            }
+        return out
+
+    def report(self, summary: Dict[str, Dict[str, float]] | None = None) -> str:
+        return format_latency(summary or self.summary())
+
+    async def export(self) -> None:
+        now = time.time()
+        summary = self.summary()
+
+        mapping: Dict[str, Any] = {
+            "window_start": self._window_start,
+            "window_sec": round(now - self._window_start, 1),
+            "ts": now,
+        }
+        for stage, s in summary.items():
+            for k, v in s.items():
+                mapping[f"{stage}:{k}"] = round(v, 3) if isinstance(v, float) else v
+
+        r = await self._redis_conn()
+        await r.hset(self.ANALYTICS_KEY, mapping=mapping)
+
+        if summary["tick_to_tile"]["count"]:
+            self.logger.info(f"[LATENCY]\n{self.report(summary)}", emoji="⏱️")
+
+        for h in self.histograms.values():
+            h.reset()
+        self._window_start = now
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        self.logger.info("[LATENCY TRACE START] running", emoji="⏱️")
+        try:
+            while not stop_event.is_set():
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.export_interval_sec)
+                except asyncio.TimeoutError:
+                    pass
+                try:
+                    await self.export()
+                except Exception as e:
+                    self.logger.error(f"[LATENCY TRACE ERROR] {e}", emoji="💥")
+        finally:
+            self.logger.info("[LATENCY TRACE STOP] halted", emoji="🛑")
@@ -0,0 +1,286 @@
+# services/massive/intel/utils/loop_monitor.py
+
+"""
+loop_monitor.py — Event-loop lag + per-task hot-spot monitor
+
+All massive workers share one asyncio loop, so one blocking builder stalls
+every other worker. LoopMonitor makes that visible:
+
+  Loop lag      a sampler sleeps MASSIVE_LOOP_SAMPLE_MS and measures how late
+                it wakes up (scheduled vs actual callback time).
+
+  Task steps    LoopMonitor.wrap(name, worker.run(stop_event)) times every
+                step the coroutine runs on the loop (wall + thread CPU), so
+                busy time is attributed to the worker that held the loop.
+                Work a worker calls inline (e.g. WsConsumer → Builder) counts
+                toward that worker; tasks it spawns itself are not tracked.
+
+  Stall stacks  optional (MASSIVE_LOOP_PROFILER=true): a watchdog thread
+                samples the loop thread's stack while the loop has been
+                blocked longer than MASSIVE_LOOP_LAG_THRESHOLD_MS; the top
+                stacks are logged and exported.
+
+Every MASSIVE_LOOP_EXPORT_SEC the window is written to massive:loop:analytics:
+
+  lag:samples / lag:p50_ms / lag:p95_ms / lag:p99_ms / lag:max_ms / lag:stalls
+  task:{name}:busy_ms / :cpu_ms / :steps / :max_step_ms / :busy_pct
+  profile:stacks      JSON [{"count", "stack": [...]}] (profiler only)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Any, Coroutine, Dict, Tuple
+
+from redis.asyncio import Redis
+
+from .latency_trace import LatencyHistogram
+
+
+class TaskStats:
+    """Per-task step accounting for one export window."""
+
+    __slots__ = ("busy_sec", "cpu_sec", "steps", "max_step_sec")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def add(self, wall: float, cpu: float) -> None:
+        self.busy_sec += wall
+        self.cpu_sec += cpu
+        self.steps += 1
+        if wall > self.max_step_sec:
+            self.max_step_sec = wall
+
+    def reset(self) -> None:
+        self.busy_sec = 0.0
+        self.cpu_sec = 0.0
+        self.steps = 0
+        self.max_step_sec = 0.0
+
+
+class _TimedSteps:
+    """Drives a coroutine step by step, timing each send/throw."""
+
+    def __init__(self, coro: Coroutine, stats: TaskStats):
+        self._coro = coro
+        self._stats = stats
+
+    def __await__(self):
+        coro = self._coro
+        stats = self._stats
+        value: Any = None
+        error: BaseException | None = None
+
+        while True:
+            t0 = time.perf_counter()
+            c0 = time.thread_time()
+            try:
+                if error is not None:
+                    yielded = coro.throw(error)
+                else:
+                    yielded = coro.send(value)
+            except StopIteration as e:
+                return e.value
+            finally:
+                stats.add(time.perf_counter() - t0, time.thread_time() - c0)
+
+            try:
+                value = yield yielded
+                error = None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                value = None
+                error = e
+
+
+class LoopMonitor:
+    """Loop-lag sampler, per-task step attribution and stall profiler."""
+
+    ANALYTICS_KEY = "massive:loop:analytics"
+
+    def __init__(self, config: Dict[str, Any], logger):
+        self.config = config
+        self.logger = logger
+
+        self.sample_interval_sec = int(config.get("MASSIVE_LOOP_SAMPLE_MS", 100)) / 1000.0
+        self.export_interval_sec = int(config.get("MASSIVE_LOOP_EXPORT_SEC", 30))
+        self.lag_threshold_sec = int(config.get("MASSIVE_LOOP_LAG_THRESHOLD_MS", 250)) / 1000.0
+        self.profiler_enabled = str(config.get("MASSIVE_LOOP_PROFILER", "false")).lower() == "true"
+        self.profile_interval_sec = int(config.get("MASSIVE_LOOP_PROFILE_MS", 10)) / 1000.0
+        self.profile_top = int(config.get("MASSIVE_LOOP_PROFILE_TOP", 5))
+
+        self.market_redis_url = config["buses"]["market-redis"]["url"]
+        self._redis: Redis | None = None
+
+        self.lag = LatencyHistogram()
+        self.stalls = 0
+        self.tasks: Dict[str, TaskStats] = {}
+        self._window_start = time.perf_counter()
+
+        # Profiler state (shared with the watchdog thread): when the sampler
+        # is next due to wake; the loop is blocked once we are well past it
+        self._due = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._stacks: Counter[Tuple[str, ...]] = Counter()
+        self._stacks_lock = threading.Lock()
+
+        self.logger.info(
+            f"[LOOP MONITOR INIT] sample={self.sample_interval_sec * 1000:.0f}ms "
+            f"threshold={self.lag_threshold_sec * 1000:.0f}ms profiler={self.profiler_enabled} "
+            f"→ {self.ANALYTICS_KEY}",
+            emoji="🩺",
+        )
+
+    async def _redis_conn(self) -> Redis:
+        if not self._redis:
+            self._redis = Redis.from_url(self.market_redis_url, decode_responses=True)
+        return self._redis
+
+    # ------------------------------------------------------------
+    # Task attribution
+    # ------------------------------------------------------------
+
+    def wrap(self, name: str, coro: Coroutine) -> Coroutine:
+        """Wrap a worker coroutine so its loop time is attributed to `name`."""
+        stats = self.tasks.setdefault(name, TaskStats())
+        return self._run_timed(coro, stats)
+
+    @staticmethod
+    async def _run_timed(coro: Coroutine, stats: TaskStats) -> Any:
+        return await _TimedSteps(coro, stats)
+
+    # ------------------------------------------------------------
+    # Stall profiler (watchdog thread)
+    # ------------------------------------------------------------
+
+    def _watchdog(self, stop: threading.Event) -> None:
+        while not stop.wait(self.profile_interval_sec):
+            if time.monotonic() - self._due < self.lag_threshold_sec:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            frames = traceback.extract_stack(frame)
+            # Loop idle in select(): woke late but nothing was blocking
+            if frames and frames[-1].name == "select" and "selectors" in frames[-1].filename:
+                continue
+            # Keep only the frames under the loop's callback dispatch
+            for i in range(len(frames) - 1, -1, -1):
+                if frames[i].name == "_run" and frames[i].filename.endswith("events.py"):
+                    frames = frames[i + 1:]
+                    break
+            stack = tuple(
+                f"{fs.filename.rsplit('/', 1)[-1]}:{fs.lineno} {fs.name}"
+                for fs in frames
+                if fs.filename != __file__
+            )[-12:]
+            with self._stacks_lock:
+                self._stacks[stack] += 1
+
+    def _take_stacks(self) -> list[Dict[str, Any]]:
+        with self._stacks_lock:
+            top = self._stacks.most_common(self.profile_top)
+            self._stacks.clear()
+        return [{"count": n, "stack": list(stack)} for stack, n in top]
+
+    # ------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------
+
+    async def export(self) -> None:
+        now = time.perf_counter()
+        window = max(now - self._window_start, 1e-9)
+
+        mapping: Dict[str, Any] = {
+            "window_sec": round(window, 1),
+            "ts": time.time(),
+            "lag:samples": self.lag.total,
+            "lag:p50_ms": self.lag.percentile_ms(50),
+            "lag:p95_ms": self.lag.percentile_ms(95),
+            "lag:p99_ms": self.lag.percentile_ms(99),
+            "lag:max_ms": self.lag.max_us / 1000.0,
+            "lag:stalls": self.stalls,
+        }
+        for name, s in self.tasks.items():
+            mapping[f"task:{name}:busy_ms"] = round(s.busy_sec * 1000, 1)
+            mapping[f"task:{name}:cpu_ms"] = round(s.cpu_sec * 1000, 1)
+            mapping[f"task:{name}:steps"] = s.steps
+            mapping[f"task:{name}:max_step_ms"] = round(s.max_step_sec * 1000, 2)
+            mapping[f"task:{name}:busy_pct"] = round(100 * s.busy_sec / window, 2)
+
+        stacks = self._take_stacks() if self.profiler_enabled else []
+        if stacks:
+            mapping["profile:stacks"] = json.dumps(stacks)
+
+        r = await self._redis_conn()
+        await r.hset(self.ANALYTICS_KEY, mapping=mapping)
+
+        if self.stalls:
+            busiest = sorted(self.tasks.items(), key=lambda kv: kv[1].busy_sec, reverse=True)[:3]
+            top = ", ".join(
+                f"{name}={s.busy_sec * 1000:.0f}ms (max step {s.max_step_sec * 1000:.0f}ms)"
+                for name, s in busiest
+            )
+            self.logger.warning(
+                f"[LOOP LAG] {self.stalls} stall(s) > {self.lag_threshold_sec * 1000:.0f}ms, "
+                f"p99={mapping['lag:p99_ms']:.1f}ms max={mapping['lag:max_ms']:.1f}ms | busiest: {top}",
+                emoji="🐢",
+            )
+            for entry in stacks:
+                self.logger.warning(
+                    f"[LOOP LAG] {entry['count']} sample(s):\n    " + "\n    ".join(entry["stack"]),
+                    emoji="🔬",
+                )
+
+        self.lag.reset()
+        self.stalls = 0
+        for s in self.tasks.values():
+            s.reset()
+        self._window_start = now
+
+    # ------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        self.logger.info("[LOOP MONITOR START] running", emoji="🩺")
+
+        self._loop_thread_id = threading.get_ident()
+        watchdog_stop = threading.Event()
+        if self.profiler_enabled:
+            threading.Thread(
+                target=self._watchdog, args=(watchdog_stop,),
+                name="massive-loop-watchdog", daemon=True,
+            ).start()
+
+        next_export = time.monotonic() + self.export_interval_sec
+        try:
+            while not stop_event.is_set():
+                scheduled = time.monotonic() + self.sample_interval_sec
+                self._due = scheduled
+                await asyncio.sleep(self.sample_interval_sec)
+                now = time.monotonic()
+
+                lag = max(0.0, now - scheduled)
+                self.lag.record_ms(lag * 1000)
+                if lag >= self.lag_threshold_sec:
+                    self.stalls += 1
+
+                if now >= next_export:
+                    next_export = now + self.export_interval_sec
+                    try:
+                        await self.export()
+                    except Exception as e:
+                        self.logger.error(f"[LOOP MONITOR ERROR] {e}", emoji="💥")
+        finally:
+            watchdog_stop.set()
+            self.logger.info("[LOOP MONITOR STOP] halted", emoji="🛑")
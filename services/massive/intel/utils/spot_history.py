@@ -0,0 +1,217 @@
+# services/massive/intel/utils/spot_history.py
+
+"""
+spot_history.py — Spot history subsystem (pipelined trail + OHLC rollups)
+
+Per symbol:
+  - 1s / 1m / 5m OHLC bars rolled up as updates arrive
+  - SpotHistoryWriter: latest + trail + bars in ONE pipelined round trip
+
+Redis layout (market-redis):
+  massive:model:spot:{SYM}              latest JSON payload (unchanged)
+  massive:model:spot:{SYM}:trail        ZSET of JSON payloads (unchanged, legacy readers)
+  massive:model:spot:{SYM}:bars:{tf}    ZSET, score = bar start epoch,
+                                        member = "t,o,h,l,c" (compact)
+
+Library usage:
+    from ..utils.spot_history import SpotHistoryWriter
+
+    writer = SpotHistoryWriter(redis, trail_window_sec=86400, trail_ttl_sec=172800)
+    await writer.write(payload, now_epoch)
+    await writer.write(ws_aggregate_payload, now_epoch, range_sec=1)
+
+Bars are stamped with the payload's event time (ts_epoch_ms, else the ISO
+"ts"), falling back to now_epoch. They are built from the sampled price;
+a payload's high/low is folded in only when the caller passes range_sec,
+the span those fields cover (e.g. 1 for per-second WS aggregates). Snapshot
+payloads carry the session's day high/low, which must not stretch bars.
+Samples older than a symbol's latest sample only update latest/trail.
+
+Readers (copilot) ZRANGEBYSCORE the bars keys and split the members.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Timeframe label → seconds
+TIMEFRAMES: Dict[str, int] = {"1s": 1, "1m": 60, "5m": 300}
+
+# How long closed bars are kept per timeframe (seconds)
+DEFAULT_BAR_RETENTION: Dict[str, int] = {
+    "1s": 3600,
+    "1m": 86400,
+    "5m": 604800,
+}
+
+
+def bars_key(sym: str, tf: str) -> str:
+    return f"massive:model:spot:{sym}:bars:{tf}"
+
+
+def encode_bar(bar: List[float]) -> str:
+    """[t, o, h, l, c] → "t,o,h,l,c" (shortest float repr)."""
+    t, o, h, l, c = bar
+    return f"{int(t)},{o!r},{h!r},{l!r},{c!r}"
+
+
+def event_epoch(payload: Dict[str, Any], default: float) -> float:
+    """Event time of a spot payload (epoch seconds), else `default`."""
+    ms = payload.get("ts_epoch_ms")
+    if isinstance(ms, (int, float)) and ms > 0:
+        return ms / 1000.0
+    ts = payload.get("ts")
+    if isinstance(ts, str):
+        try:
+            return datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+# ============================================================
+# OHLC rollup
+# ============================================================
+
+class OhlcRollup:
+    """Tracks the open bar per timeframe for one symbol."""
+
+    def __init__(self, timeframes: Dict[str, int] = TIMEFRAMES):
+        self.timeframes = timeframes
+        self.current: Dict[str, List[float]] = {}
+
+    def update(
+        self,
+        ts: float,
+        price: float,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+    ) -> List[Tuple[str, List[float], bool]]:
+        """
+        Fold a sample into every timeframe.
+
+        high/low, when given, must describe only the sample's own interval
+        (never wider than the smallest timeframe); by default the bar range
+        comes from the sampled prices alone.
+
+        Returns (tf, bar, rolled) per timeframe; `rolled` is True when the
+        sample opened a new bar. A sample before a timeframe's open bar is
+        ignored for that timeframe.
+        """
+        hi = price if high is None else max(high, price)
+        lo = price if low is None else min(low, price)
+
+        out = []
+        for tf, sec in self.timeframes.items():
+            start = int(ts // sec) * sec
+            bar = self.current.get(tf)
+            if bar is not None and start < bar[0]:
+                continue
+            rolled = bar is None or bar[0] != start
+            if rolled:
+                bar = [start, price, hi, lo, price]
+                self.current[tf] = bar
+            else:
+                bar[2] = max(bar[2], hi)
+                bar[3] = min(bar[3], lo)
+                bar[4] = price
+            out.append((tf, bar, rolled))
+        return out
+
+
+# ============================================================
+# Pipelined writer
+# ============================================================
+
+class SpotHistoryWriter:
+    """
+    Writes latest + trail + OHLC bars for spot updates in one round trip.
+    """
+
+    def __init__(
+        self,
+        r,
+        trail_window_sec: int,
+        trail_ttl_sec: int,
+        bar_retention: Optional[Dict[str, int]] = None,
+    ):
+        self.r = r
+        self.trail_window_sec = trail_window_sec
+        self.trail_ttl_sec = trail_ttl_sec
+        self.bar_retention = {**DEFAULT_BAR_RETENTION, **(bar_retention or {})}
+
+        self.last_ts: Dict[str, float] = {}
+        self.rollups: Dict[str, OhlcRollup] = {}
+
+    @staticmethod
+    def _latest_key(sym: str) -> str:
+        return f"massive:model:spot:{sym}"
+
+    @staticmethod
+    def _trail_key(sym: str) -> str:
+        return f"massive:model:spot:{sym}:trail"
+
+    def _queue(
+        self,
+        pipe,
+        payload: Dict[str, Any],
+        now_epoch: float,
+        snap: str,
+        range_sec: Optional[int] = None,
+    ) -> None:
+        sym = payload["symbol"]
+        trail_key = self._trail_key(sym)
+
+        pipe.set(self._latest_key(sym), snap)
+        pipe.zadd(trail_key, {snap: now_epoch})
+        pipe.zremrangebyscore(trail_key, 0, now_epoch - self.trail_window_sec)
+        pipe.expire(trail_key, self.trail_ttl_sec)
+
+        price = payload.get("value")
+        if price is None:
+            return
+        price = float(price)
+
+        ts = event_epoch(payload, now_epoch)
+        last = self.last_ts.get(sym)
+        if last is not None and ts < last:
+            return
+        self.last_ts[sym] = ts
+
+        rollup = self.rollups.get(sym)
+        if rollup is None:
+            rollup = self.rollups[sym] = OhlcRollup()
+
+        high = low = None
+        if range_sec is not None and range_sec <= min(TIMEFRAMES.values()):
+            high, low = payload.get("high"), payload.get("low")
+
+        for tf, bar, rolled in rollup.update(ts, price, high, low):
+            key = bars_key(sym, tf)
+            start = bar[0]
+            if rolled:
+                retention = self.bar_retention[tf]
+                pipe.zremrangebyscore(key, 0, start - retention)
+                pipe.expire(key, retention + TIMEFRAMES[tf])
+            # Replace the open bar's previous member (same start score)
+            pipe.zremrangebyscore(key, start, start)
+            pipe.zadd(key, {encode_bar(bar): start})
+
+    async def write(
+        self,
+        payload: Dict[str, Any],
+        now_epoch: float,
+        range_sec: Optional[int] = None,
+    ) -> None:
+        """
+        Queue every write for this update and execute once.
+
+        range_sec: seconds covered by the payload's high/low (None: they
+        are not a per-interval range and are left out of the bars).
+        """
+        pipe = self.r.pipeline(transaction=False)
+        self._queue(pipe, payload, now_epoch, json.dumps(payload), range_sec)
+        await pipe.execute()
+
@@ -18,14 +18,18 @@ import asyncio
 import json
 import os
 import sys
-import urllib.request
-import urllib.error
-import time
 from datetime import datetime, timedelta, date
+from pathlib import Path
 
 from redis.asyncio import Redis
 
-POLYGON_BASE = "https://api.polygon.io"
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from shared.vendor_http import POLYGON_BASE, VendorHttpClient, VendorHttpError, iter_ordered
+
 REDIS_URL = os.environ.get("MARKET_REDIS_URL", "redis://127.0.0.1:6380")
 
 # Symbol mapping: Polygon ticker -> Redis key
@@ -40,35 +44,36 @@ class SpotHistoryLoader:
         self.api_key = api_key
         self.redis: Redis | None = None
         self.points_loaded = 0
+        # Pooled keep-alive client, paced to ~4 req/sec with 429 backoff
+        self.http = VendorHttpClient(
+            api_key, POLYGON_BASE,
+            timeout_sec=30, rate_per_sec=4, max_concurrency=4,
+            max_retries=6, backoff_base_sec=2.0, backoff_max_sec=60.0,
+        )
 
     async def connect(self):
         self.redis = Redis.from_url(REDIS_URL, decode_responses=True)
         print(f"Connected to Redis at {REDIS_URL}")
 
     async def close(self):
+        await self.http.close()
         if self.redis:
             await self.redis.aclose()
 
-    def fetch_day(self, ticker: str, date_str: str) -> list[dict]:
+    async def fetch_day(self, ticker: str, date_str: str) -> list[dict]:
         """Fetch minute bars for a single day."""
-        url = f"{POLYGON_BASE}/v2/aggs/ticker/{ticker}/range/1/minute/{date_str}/{date_str}?apiKey={self.api_key}&limit=50000&sort=asc"
-
         try:
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'MarketSwarm/1.0')
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                return data.get("results", [])
-
-        except urllib.error.HTTPError as e:
-            if e.code == 429:
-                print("  Rate limited, waiting 60s...")
-                time.sleep(60)
-                return self.fetch_day(ticker, date_str)
-            elif e.code == 404:
+            data = await self.http.get_json(
+                f"/v2/aggs/ticker/{ticker}/range/1/minute/{date_str}/{date_str}",
+                {"limit": 50000, "sort": "asc"},
+                endpoint="aggs_minute",
+            )
+            return data.get("results", [])
+
+        except VendorHttpError as e:
+            if e.status == 404:
                 return []  # No data for this day (holiday, etc.)
-            print(f"  HTTP error {e.code} for {date_str}")
+            print(f"  HTTP error {e.status} for {date_str}")
             return []
         except Exception as e:
             print(f"  Error fetching {date_str}: {e}")
@@ -95,21 +100,24 @@ class SpotHistoryLoader:
             await self.redis.delete(redis_key)
             print("Cleared existing trail data")
 
+        trading_days = []
         current = start_date
+        while current <= end_date:
+            # Skip weekends
+            if current.weekday() < 5:
+                trading_days.append(current)
+            current += timedelta(days=1)
+
         days_processed = 0
         points_added = 0
         batch = []
         batch_size = 1000
 
-        while current <= end_date:
-            # Skip weekends
-            if current.weekday() >= 5:
-                current += timedelta(days=1)
-                continue
-
-            date_str = current.strftime("%Y-%m-%d")
-            bars = self.fetch_day(polygon_ticker, date_str)
+        # Next few days are fetched (paced) while the current one is written
+        def day_fetch(day):
+            return lambda: self.fetch_day(polygon_ticker, day.strftime("%Y-%m-%d"))
 
+        async for bars in iter_ordered((day_fetch(d) for d in trading_days), window=4):
             if bars:
                 for bar in bars:
                     # bar: { t: timestamp_ms, o, h, l, c, v, vw, n }
@@ -145,10 +153,6 @@ class SpotHistoryLoader:
                 if days_processed % 5 == 0:
                     print(f"  {days_processed} days processed, {points_added:,} points")
 
-            # Rate limit: ~4 requests/second
-            time.sleep(0.25)
-            current += timedelta(days=1)
-
         # Final flush
         if batch:
             pipe = self.redis.pipeline()
@@ -21,6 +21,17 @@ from pathlib import Path
 
 from redis.asyncio import Redis
 
+ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.massive.intel.volume_profile.vp_pyramid import (
+    PYRAMID_STEPS,
+    level_key,
+    levels_from_base,
+    queue_replace_levels,
+)
+
 # Redis keys (matching production)
 SPOT_KEY = "massive:model:spot:SPX"
 VP_KEY = "massive:volume_profile:spx"
@@ -189,10 +200,19 @@ class VPDevInjector:
         """Clear all VP data."""
         await self.redis.delete(VP_KEY)
         await self.redis.delete(VP_META_KEY)
+        await self.redis.delete(*(level_key("spx", step) for step in PYRAMID_STEPS[1:]))
         print("Cleared all VP data")
 
+    async def rebuild_pyramid(self):
+        """Re-roll the $1/$5/$25 pyramid levels from the base hash."""
+        base = await self.redis.hgetall(VP_KEY)
+        pipe = self.redis.pipeline()
+        queue_replace_levels(pipe, "spx", levels_from_base(base))
+        await pipe.execute()
+
     async def update_meta(self):
-        """Update VP metadata."""
+        """Update VP metadata and the pyramid levels derived from the base."""
+        await self.rebuild_pyramid()
         summary = await self.get_vp_summary()
         if summary["count"] > 0:
             await self.redis.hset(VP_META_KEY, mapping={
@@ -15,6 +15,7 @@ Usage:
     python vp_quick_load.py --days 30              # Last 30 days
     python vp_quick_load.py --years 15             # 15 years of history
     python vp_quick_load.py --years 15 --bucket 20 # $20 buckets
+    python vp_quick_load.py --years 5 --archive-dir ./data/vp/archive  # Local mmap archive
 """
 
 import argparse
@@ -22,15 +23,26 @@ import asyncio
 import json
 import os
 import sys
-import urllib.request
-import urllib.error
 import time
 from datetime import datetime, timedelta, date, timezone
 from pathlib import Path
 
+import numpy as np
 from redis.asyncio import Redis
 
-POLYGON_BASE = "https://api.polygon.io"
+ROOT = Path(__file__).resolve().parents[4]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.massive.intel.volume_profile.bar_archive import (
+    BarArchive,
+    columns_from_bars,
+    histogram_raw,
+    histogram_tv,
+    merge_bins,
+)
+from shared.vendor_http import POLYGON_BASE, VendorHttpClient, iter_ordered
+
 REDIS_URL = os.environ.get("MARKET_REDIS_URL", "redis://127.0.0.1:6380")
 
 # Disk storage paths (authoritative)
@@ -69,6 +81,12 @@ class VPQuickLoader:
         self.mode = mode
         self.bucket_size = bucket_size
         self.redis: Redis | None = None
+        # Pooled keep-alive client, paced to ~4 req/sec with 429 backoff
+        self.http = VendorHttpClient(
+            api_key, POLYGON_BASE,
+            timeout_sec=30, rate_per_sec=4, max_concurrency=4,
+            max_retries=6, backoff_base_sec=2.0, backoff_max_sec=60.0,
+        )
 
         # Accumulate into dict: bucket_index -> volume
         self.profile_raw: dict[int, int] = {}
@@ -90,82 +108,73 @@ class VPQuickLoader:
         print(f"Connected to Redis at {REDIS_URL}")
 
     async def close(self):
+        await self.http.close()
         if self.redis:
             await self.redis.aclose()
 
-    def spy_to_bucket_index(self, spy_price: float) -> int:
-        """Convert SPY price to bucket index."""
-        spx_price = spy_price * 10  # SPY -> SPX
-        bucket_index = int(spx_price // self.bucket_size)
-        self.min_bucket = min(self.min_bucket, bucket_index)
-        self.max_bucket = max(self.max_bucket, bucket_index)
-        return bucket_index
-
-    def fetch_day(self, ticker: str, date_str: str) -> list[dict]:
+    async def fetch_day(self, ticker: str, date_str: str) -> list[dict]:
         """Fetch minute bars for a single day."""
-        url = f"{POLYGON_BASE}/v2/aggs/ticker/{ticker}/range/1/minute/{date_str}/{date_str}?apiKey={self.api_key}&limit=50000&sort=asc"
-
         try:
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'MarketSwarm/1.0')
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                return data.get("results", [])
-
-        except urllib.error.HTTPError as e:
-            if e.code == 429:
-                print("  Rate limited, waiting 60s...")
-                time.sleep(60)
-                return self.fetch_day(ticker, date_str)
-            return []
+            data = await self.http.get_json(
+                f"/v2/aggs/ticker/{ticker}/range/1/minute/{date_str}/{date_str}",
+                {"limit": 50000, "sort": "asc"},
+                endpoint="aggs_minute",
+            )
+            return data.get("results", [])
         except Exception:
             return []
 
-    def accumulate_raw(self, bar: dict):
-        """RAW mode: Volume at VWAP price."""
-        price = bar.get("vw") or ((bar.get("h", 0) + bar.get("l", 0)) / 2)
-        volume = bar.get("v", 0)
-        if volume <= 0 or price <= 0:
-            return
-
-        idx = self.spy_to_bucket_index(price)
-        self.profile_raw[idx] = self.profile_raw.get(idx, 0) + int(volume)
-
-    def accumulate_tv(self, bar: dict):
+    def _track_range(self, profile: dict[int, int]):
+        if profile:
+            self.min_bucket = min(self.min_bucket, min(profile))
+            self.max_bucket = max(self.max_bucket, max(profile))
+
+    def accumulate_raw(self, cols: dict[str, np.ndarray]):
+        """RAW mode: Volume at VWAP price (vectorized over a column chunk)."""
+        vw = cols["vw"]
+        mid = (np.nan_to_num(cols["h"]) + np.nan_to_num(cols["l"])) / 2
+        price = np.where(np.isfinite(vw) & (vw != 0), vw, mid)
+        volume = np.trunc(cols["v"])
+        ok = (volume > 0) & (price > 0)
+
+        hist = histogram_raw(price[ok], volume[ok], 10, self.bucket_size, floor=True)
+        for idx, vol in hist.items():
+            self.profile_raw[idx] = self.profile_raw.get(idx, 0) + int(vol)
+        self._track_range(hist)
+
+    def accumulate_tv(self, cols: dict[str, np.ndarray]):
         """TV mode: Volume distributed across bar's high-low range."""
-        low = bar.get("l")
-        high = bar.get("h")
-        volume = bar.get("v", 0)
-
-        if low is None or high is None or volume <= 0:
-            return
-        if high <= low:
-            idx = self.spy_to_bucket_index((high + low) / 2)
-            self.profile_tv[idx] = self.profile_tv.get(idx, 0) + int(volume)
-            return
-
-        step = (high - low) / TV_MICROBINS
-        vol_per_bin = volume / TV_MICROBINS
-
-        for i in range(TV_MICROBINS):
-            price = low + i * step
-            idx = self.spy_to_bucket_index(price)
-            self.profile_tv[idx] = self.profile_tv.get(idx, 0) + int(vol_per_bin)
+        low, high, volume = cols["l"], cols["h"], cols["v"]
+        ok = np.isfinite(low) & np.isfinite(high) & (volume > 0)
+        low, high, volume = low[ok], high[ok], volume[ok]
+
+        # Flat bars put the whole bar at the midpoint
+        flat = high <= low
+        hist = histogram_raw((high[flat] + low[flat]) / 2, np.trunc(volume[flat]),
+                             10, self.bucket_size, floor=True)
+
+        # Each microbin gets int(volume / TV_MICROBINS), as the per-bar loop did
+        per_bin = np.trunc(volume[~flat] / TV_MICROBINS)
+        merge_bins(hist, histogram_tv(low[~flat], high[~flat], per_bin * TV_MICROBINS, 10,
+                                      TV_MICROBINS, self.bucket_size, floor=True))
+
+        for idx, vol in hist.items():
+            self.profile_tv[idx] = self.profile_tv.get(idx, 0) + int(vol)
+        self._track_range(hist)
+
+    def process_columns(self, cols: dict[str, np.ndarray]):
+        """Accumulate a chunk of column arrays (JSON day or archive year)."""
+        if self.mode in ("raw", "both"):
+            self.accumulate_raw(cols)
+        if self.mode in ("tv", "both"):
+            self.accumulate_tv(cols)
+
+        volume = cols["v"]
+        self.total_volume += int(np.trunc(volume[volume > 0]).sum())
 
     def process_bars(self, bars: list[dict]):
         """Process bars and accumulate volume."""
-        for bar in bars:
-            volume = bar.get("v", 0)
-            if volume <= 0:
-                continue
-
-            if self.mode in ("raw", "both"):
-                self.accumulate_raw(bar)
-            if self.mode in ("tv", "both"):
-                self.accumulate_tv(bar)
-
-            self.total_volume += int(volume)
+        self.process_columns(columns_from_bars(bars))
 
     def build_compact_profile(self, profile: dict[int, int]) -> dict:
         """Convert bucket dict to compact array format with normalized volumes."""
@@ -401,8 +410,7 @@ class VPQuickLoader:
             await self.redis.publish("dealer_gravity_updated", json.dumps(event))
             print(f"  Published update event: {event['artifact_version']}")
 
-    async def load(self, days: int = None, years: int = None):
-        """Load VP data from Polygon."""
+    def _date_range(self, days: int = None, years: int = None) -> tuple[date, date]:
         end_date = date.today()
 
         if years:
@@ -412,18 +420,48 @@ class VPQuickLoader:
         else:
             start_date = end_date - timedelta(days=30)
 
+        return start_date, end_date
+
+    async def load_archive(self, archive_dir: Path, days: int = None, years: int = None):
+        """Load VP data from the local columnar bar archive (no network)."""
+        start_date, end_date = self._date_range(days, years)
+        start_ms = int(datetime(start_date.year, start_date.month, start_date.day,
+                                tzinfo=timezone.utc).timestamp() * 1000)
+
+        print(f"Loading SPY data from archive {archive_dir} since {start_date}")
+        print(f"Mode: {self.mode.upper()}, Bucket size: ${self.bucket_size}")
+
+        t0 = time.perf_counter()
+        for cols in BarArchive(archive_dir).iter_chunks("SPY", start_ms=start_ms):
+            self.process_columns(cols)
+            self.days_processed += len(np.unique(cols["t"] // 86_400_000))
+        print(f"  Accumulated in {time.perf_counter() - t0:.2f}s")
+
+        spot = await self.fetch_current_spot()
+        await self.save_to_redis(spot=spot)
+        print(f"\nDone: {self.days_processed} days, {self.total_volume:,.0f} total volume")
+
+    async def load(self, days: int = None, years: int = None):
+        """Load VP data from Polygon."""
+        start_date, end_date = self._date_range(days, years)
+
         print(f"Loading SPY data from {start_date} to {end_date}")
         print(f"Mode: {self.mode.upper()}, Bucket size: ${self.bucket_size}")
 
+        trading_days = []
         current = start_date
-
         while current <= end_date:
-            if current.weekday() >= 5:  # Skip weekends
-                current += timedelta(days=1)
-                continue
+            if current.weekday() < 5:  # Skip weekends
+                trading_days.append(current)
+            current += timedelta(days=1)
 
-            date_str = current.strftime("%Y-%m-%d")
-            bars = self.fetch_day("SPY", date_str)
+        # Next few days are fetched (paced) while the current one accumulates
+        def day_fetch(day):
+            return lambda: self.fetch_day("SPY", day.strftime("%Y-%m-%d"))
+
+        day_iter = iter(trading_days)
+        async for bars in iter_ordered((day_fetch(d) for d in trading_days), window=4):
+            current = next(day_iter)
 
             if bars:
                 self.process_bars(bars)
@@ -433,9 +471,6 @@ class VPQuickLoader:
                     levels = len(self.profile_tv) if self.mode in ("tv", "both") else len(self.profile_raw)
                     print(f"  {self.days_processed} days ({current}): {levels} levels")
 
-            time.sleep(0.25)  # Rate limit
-            current += timedelta(days=1)
-
         # Save final result (fetch current spot if available)
         spot = await self.fetch_current_spot()
         await self.save_to_redis(spot=spot)
@@ -460,10 +495,12 @@ async def main():
     parser.add_argument("--mode", choices=["raw", "tv", "both"], default="tv")
     parser.add_argument("--bucket", type=int, default=DEFAULT_BUCKET_SIZE,
                         help=f"Bucket size in SPX dollars (default: ${DEFAULT_BUCKET_SIZE})")
+    parser.add_argument("--archive-dir", type=str,
+                        help="Build from the local columnar bar archive instead of Polygon")
     args = parser.parse_args()
 
     api_key = os.environ.get("POLYGON_API_KEY") or os.environ.get("MASSIVE_API_KEY")
-    if not api_key:
+    if not api_key and not args.archive_dir:
         print("Error: POLYGON_API_KEY or MASSIVE_API_KEY required")
         sys.exit(1)
 
@@ -471,7 +508,10 @@ async def main():
     await loader.connect()
 
     try:
-        await loader.load(days=args.days, years=args.years)
+        if args.archive_dir:
+            await loader.load_archive(Path(args.archive_dir), days=args.days, years=args.years)
+        else:
+            await loader.load(days=args.days, years=args.years)
     finally:
         await loader.close()
 
@@ -0,0 +1,226 @@
+# services/massive/intel/utils/warm_state.py
+
+"""
+warm_state.py — Warm-restart checkpoints for massive workers
+
+Without this, every restart (supervisor restart, deploy) starts cold:
+WsHydrator has no chain_states, Builder has no previous_surfaces (so the
+first emit is a full-surface "delta" for every tile), ModelPublisher has no
+current_models and ChainWorker's geometry version resets to 0.
+
+WarmStateStore periodically writes one compact binary checkpoint of those
+states to local disk and restores it at startup when it is fresh:
+
+  - written on the same trading day (America/New_York), and
+  - younger than MASSIVE_WARM_MAX_AGE_SEC.
+
+Components opt in with two methods:
+
+    checkpoint_state() -> dict   called on the loop; must return a snapshot
+                                 that is safe to encode from a worker thread
+    restore_state(state: dict)   called once at startup, before run()
+
+File layout (little-endian):
+
+    magic     8s   b"MSVWARM1"
+    created   d    epoch seconds
+    crc32     I    of the compressed body
+    day       10s  trading day, ISO date
+    body           zlib(JSON {component name: state})
+
+Writes go to a temp file + os.replace, so a crash mid-write never leaves a
+torn checkpoint behind.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import struct
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Tuple
+from zoneinfo import ZoneInfo
+
+from redis.asyncio import Redis
+
+MAGIC = b"MSVWARM1"
+HEADER = struct.Struct("<8sdI10s")
+ET = ZoneInfo("America/New_York")
+
+
+def trading_day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, ET).date().isoformat()
+
+
+def encode_checkpoint(states: Dict[str, Any], created: float, level: int = 1) -> bytes:
+    body = zlib.compress(json.dumps(states, separators=(",", ":")).encode(), level)
+    header = HEADER.pack(MAGIC, created, zlib.crc32(body), trading_day(created).encode())
+    return header + body
+
+
+def decode_header(blob: bytes) -> Tuple[float, str]:
+    """(created, trading_day); raises ValueError on a foreign or torn file."""
+    if len(blob) < HEADER.size:
+        raise ValueError("truncated checkpoint")
+    magic, created, crc, day = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("not a massive warm-state checkpoint")
+    if zlib.crc32(blob[HEADER.size:]) != crc:
+        raise ValueError("checkpoint checksum mismatch")
+    return created, day.decode()
+
+
+def decode_checkpoint(blob: bytes) -> Tuple[float, str, Dict[str, Any]]:
+    created, day = decode_header(blob)
+    states = json.loads(zlib.decompress(blob[HEADER.size:]))
+    return created, day, states
+
+
+class WarmStateStore:
+    """Periodic checkpoint writer + startup restore for registered components."""
+
+    ANALYTICS_KEY = "massive:warm:analytics"
+
+    def __init__(self, config: Dict[str, Any], logger):
+        self.config = config
+        self.logger = logger
+
+        state_dir = config.get("MASSIVE_WARM_STATE_DIR") or os.path.join(
+            tempfile.gettempdir(), "massive-warm"
+        )
+        self.path = Path(state_dir) / "checkpoint.bin"
+        self.interval_sec = int(config.get("MASSIVE_WARM_CHECKPOINT_SEC", 15))
+        self.max_age_sec = int(config.get("MASSIVE_WARM_MAX_AGE_SEC", 300))
+        self.compress_level = int(config.get("MASSIVE_WARM_COMPRESS_LEVEL", 1))
+
+        self.market_redis_url = config["buses"]["market-redis"]["url"]
+        self._redis: Redis | None = None
+
+        self.components: Dict[str, Any] = {}
+
+        self.logger.info(
+            f"[WARM STATE INIT] {self.path} every {self.interval_sec}s, "
+            f"restore if < {self.max_age_sec}s old",
+            emoji="🔥",
+        )
+
+    async def _redis_conn(self) -> Redis:
+        if not self._redis:
+            self._redis = Redis.from_url(self.market_redis_url, decode_responses=True)
+        return self._redis
+
+    def register(self, name: str, component) -> None:
+        self.components[name] = component
+
+    # ------------------------------------------------------------
+    # Restore (startup)
+    # ------------------------------------------------------------
+
+    def restore(self, now: float | None = None) -> Dict[str, Any]:
+        """
+        Restore registered components from the checkpoint if it is fresh.
+        Returns a small report dict; never raises.
+        """
+        now = now or time.time()
+        report: Dict[str, Any] = {"restored": False}
+
+        try:
+            blob = self.path.read_bytes()
+        except FileNotFoundError:
+            report["reason"] = "no checkpoint"
+            self.logger.info("[WARM STATE] no checkpoint, starting cold", emoji="🧊")
+            return report
+        except OSError as e:
+            report["reason"] = f"read failed: {e}"
+            self.logger.warning(f"[WARM STATE] {report['reason']}, starting cold", emoji="🧊")
+            return report
+
+        try:
+            created, day = decode_header(blob)
+            age = now - created
+            report["age_sec"] = round(age, 1)
+            if day != trading_day(now):
+                report["reason"] = f"stale trading day {day}"
+            elif age < 0 or age > self.max_age_sec:
+                report["reason"] = f"too old ({age:.0f}s > {self.max_age_sec}s)"
+            if "reason" in report:
+                self.logger.info(f"[WARM STATE] {report['reason']}, starting cold", emoji="🧊")
+                return report
+
+            _, _, states = decode_checkpoint(blob)
+        except Exception as e:
+            report["reason"] = f"unreadable: {e}"
+            self.logger.warning(f"[WARM STATE] {report['reason']}, starting cold", emoji="🧊")
+            return report
+
+        restored = []
+        for name, component in self.components.items():
+            state = states.get(name)
+            if state is None:
+                continue
+            try:
+                component.restore_state(state)
+                restored.append(name)
+            except Exception as e:
+                self.logger.warning(f"[WARM STATE] restore {name} failed: {e}", emoji="⚠️")
+
+        report.update({"restored": bool(restored), "components": restored, "bytes": len(blob)})
+        self.logger.ok(
+            f"[WARM STATE] restored {', '.join(restored) or 'nothing'} "
+            f"from {report['age_sec']}s-old checkpoint ({len(blob) / 1024:.0f} KiB)",
+            emoji="🔥",
+        )
+        return report
+
+    # ------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------
+
+    def _write(self, states: Dict[str, Any], created: float) -> int:
+        blob = encode_checkpoint(states, created, self.compress_level)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, self.path)
+        return len(blob)
+
+    async def checkpoint(self) -> None:
+        t_start = time.monotonic()
+        created = time.time()
+
+        # Snapshot on the loop (consistent), encode + write off the loop
+        states = {name: c.checkpoint_state() for name, c in self.components.items()}
+        snapshot_ms = (time.monotonic() - t_start) * 1000
+
+        size = await asyncio.to_thread(self._write, states, created)
+        total_ms = (time.monotonic() - t_start) * 1000
+
+        r = await self._redis_conn()
+        await r.hset(self.ANALYTICS_KEY, mapping={
+            "last_checkpoint_ts": created,
+            "bytes": size,
+            "snapshot_ms": round(snapshot_ms, 2),
+            "write_ms": round(total_ms, 2),
+        })
+        await r.hincrby(self.ANALYTICS_KEY, "checkpoints", 1)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        self.logger.info("[WARM STATE START] running", emoji="🔥")
+        try:
+            while not stop_event.is_set():
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.interval_sec)
+                except asyncio.TimeoutError:
+                    pass
+                try:
+                    await self.checkpoint()
+                except Exception as e:
+                    self.logger.error(f"[WARM STATE ERROR] {e}", emoji="💥")
+        finally:
+            self.logger.info("[WARM STATE STOP] halted", emoji="🛑")
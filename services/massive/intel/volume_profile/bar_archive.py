@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Bar Archive - Memory-mapped columnar storage for minute bars
+
+One directory per symbol-year, one .npy file per column:
+
+  {root}/{TICKER}/{YEAR}/t.npy    int64   bar start (epoch ms, sorted)
+  {root}/{TICKER}/{YEAR}/o.npy    float64
+  {root}/{TICKER}/{YEAR}/h.npy    float64
+  {root}/{TICKER}/{YEAR}/l.npy    float64
+  {root}/{TICKER}/{YEAR}/c.npy    float64
+  {root}/{TICKER}/{YEAR}/v.npy    float64
+  {root}/{TICKER}/{YEAR}/vw.npy   float64 (NaN when the vendor omits VWAP)
+
+Columns are opened with mmap_mode="r", so a multi-year rebuild only pages
+in what it touches. Missing vendor fields are stored as NaN.
+
+Also provides the vectorized histogram helpers used by the volume profile
+builders (vp_build_profile, vp_quick_load) in place of per-bar loops.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+COLUMNS = ("t", "o", "h", "l", "c", "v", "vw")
+
+# Rows per TV microbin expansion (rows × microbins floats held at once)
+TV_CHUNK_ROWS = 200_000
+
+
+# ============================================================
+# Column conversion
+# ============================================================
+
+def columns_from_bars(bars: List[dict]) -> Dict[str, np.ndarray]:
+    """Convert Polygon-style bar dicts into column arrays (NaN for missing)."""
+    n = len(bars)
+    out: Dict[str, np.ndarray] = {
+        "t": np.fromiter((b.get("t") or 0 for b in bars), dtype=np.int64, count=n),
+    }
+    for col in COLUMNS[1:]:
+        out[col] = np.fromiter(
+            (np.nan if b.get(col) is None else b[col] for b in bars),
+            dtype=np.float64,
+            count=n,
+        )
+    return out
+
+
+def _year_of(t_ms: np.ndarray) -> np.ndarray:
+    return t_ms.astype("datetime64[ms]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+# ============================================================
+# Archive
+# ============================================================
+
+class BarArchive:
+    """Append-only columnar bar store, one directory per symbol-year."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _dir(self, ticker: str, year: int) -> Path:
+        return self.root / ticker.upper() / str(year)
+
+    def years(self, ticker: str) -> List[int]:
+        base = self.root / ticker.upper()
+        if not base.is_dir():
+            return []
+        return sorted(
+            int(p.name) for p in base.iterdir()
+            if p.is_dir() and p.name.isdigit() and (p / "t.npy").exists()
+        )
+
+    def open_year(self, ticker: str, year: int, mmap: bool = True) -> Dict[str, np.ndarray]:
+        """Open one symbol-year; columns are trimmed to a common length."""
+        d = self._dir(ticker, year)
+        mode = "r" if mmap else None
+        cols = {col: np.load(d / f"{col}.npy", mmap_mode=mode) for col in COLUMNS}
+        # A crash between column renames can leave ragged lengths
+        n = min(len(a) for a in cols.values())
+        return {col: a[:n] for col, a in cols.items()}
+
+    def last_timestamp(self, ticker: str) -> Optional[int]:
+        years = self.years(ticker)
+        if not years:
+            return None
+        t = self.open_year(ticker, years[-1])["t"]
+        return int(t[-1]) if len(t) else None
+
+    def append(self, ticker: str, cols: Dict[str, np.ndarray]) -> int:
+        """
+        Append bars newer than the archive's last timestamp.
+
+        Returns the number of rows written.
+        """
+        t = cols["t"]
+        if not len(t):
+            return 0
+
+        order = np.argsort(t, kind="stable")
+        cols = {col: np.asarray(cols[col])[order] for col in COLUMNS}
+
+        last = self.last_timestamp(ticker)
+        if last is not None:
+            keep = cols["t"] > last
+            cols = {col: a[keep] for col, a in cols.items()}
+            if not len(cols["t"]):
+                return 0
+
+        years = _year_of(cols["t"])
+        written = 0
+        for year in np.unique(years).tolist():
+            mask = years == year
+            chunk = {col: a[mask] for col, a in cols.items()}
+            self._write_year(ticker, year, chunk)
+            written += int(mask.sum())
+        return written
+
+    def _write_year(self, ticker: str, year: int, chunk: Dict[str, np.ndarray]) -> None:
+        d = self._dir(ticker, year)
+        d.mkdir(parents=True, exist_ok=True)
+
+        if (d / "t.npy").exists():
+            existing = self.open_year(ticker, year, mmap=False)
+            chunk = {col: np.concatenate([existing[col], chunk[col]]) for col in COLUMNS}
+
+        # Write every column first, then swap them in
+        for col in COLUMNS:
+            dtype = np.int64 if col == "t" else np.float64
+            with open(d / f"{col}.npy.tmp", "wb") as f:
+                np.save(f, np.ascontiguousarray(chunk[col], dtype=dtype))
+        for col in COLUMNS:
+            os.replace(d / f"{col}.npy.tmp", d / f"{col}.npy")
+
+    def iter_chunks(
+        self,
+        ticker: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield memory-mapped column views per year, clipped to [start_ms, end_ms]."""
+        for year in self.years(ticker):
+            cols = self.open_year(ticker, year)
+            t = cols["t"]
+            lo = 0 if start_ms is None else int(np.searchsorted(t, start_ms, "left"))
+            hi = len(t) if end_ms is None else int(np.searchsorted(t, end_ms, "right"))
+            if hi > lo:
+                yield {col: a[lo:hi] for col, a in cols.items()}
+
+
+# ============================================================
+# Vectorized histograms
+# ============================================================
+
+def bucket_index(
+    prices: np.ndarray,
+    multiplier: float,
+    bucket_size: float = 1,
+    floor: bool = False,
+) -> np.ndarray:
+    """
+    Map ETF prices to synthetic bucket indices.
+
+    floor=False rounds to the nearest bucket (half-to-even, like round()),
+    floor=True floors (exactly int(x // bucket_size), which floor(x / b)
+    is not for fractional bucket sizes).
+    """
+    synthetic = np.asarray(prices, dtype=np.float64) * multiplier
+    if floor:
+        idx = np.floor_divide(synthetic, bucket_size)
+    else:
+        idx = np.rint(synthetic / bucket_size)
+    return idx.astype(np.int64)
+
+
+def bincount_dict(idx: np.ndarray, weights: np.ndarray) -> Dict[int, float]:
+    """Sum weights per index; every index seen is kept (even at zero volume)."""
+    if not len(idx):
+        return {}
+    lo = int(idx.min())
+    shifted = idx - lo
+    sums = np.bincount(shifted, weights=weights)
+    seen = np.flatnonzero(np.bincount(shifted))
+    return dict(zip((seen + lo).tolist(), sums[seen].tolist()))
+
+
+def merge_bins(into: Dict[int, float], other: Dict[int, float]) -> None:
+    for k, v in other.items():
+        into[k] = into.get(k, 0.0) + v
+
+
+def histogram_raw(
+    price: np.ndarray,
+    volume: np.ndarray,
+    multiplier: float,
+    bucket_size: float = 1,
+    floor: bool = False,
+) -> Dict[int, float]:
+    """Volume at a single price per bar (close or VWAP)."""
+    price = np.asarray(price, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    ok = np.isfinite(price) & np.isfinite(volume)
+    idx = bucket_index(price[ok], multiplier, bucket_size, floor)
+    return bincount_dict(idx, volume[ok])
+
+
+def histogram_tv(
+    low: np.ndarray,
+    high: np.ndarray,
+    volume: np.ndarray,
+    multiplier: float,
+    microbins: int = 30,
+    bucket_size: float = 1,
+    floor: bool = False,
+) -> Dict[int, float]:
+    """
+    Volume spread evenly over `microbins` points from low toward high.
+
+    Bars with high <= low (or missing fields) are skipped; callers that
+    treat flat bars differently handle them separately.
+    """
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    ok = np.isfinite(low) & np.isfinite(high) & np.isfinite(volume) & (high > low)
+    low, high, volume = low[ok], high[ok], volume[ok]
+
+    offsets = np.arange(microbins, dtype=np.float64)
+    bins: Dict[int, float] = {}
+    for start in range(0, len(low), TV_CHUNK_ROWS):
+        lo = low[start:start + TV_CHUNK_ROWS]
+        step = (high[start:start + TV_CHUNK_ROWS] - lo) / microbins
+        prices = lo[:, None] + offsets[None, :] * step[:, None]
+        per_bin = np.repeat(volume[start:start + TV_CHUNK_ROWS] / microbins, microbins)
+        idx = bucket_index(prices.ravel(), multiplier, bucket_size, floor)
+        merge_bins(bins, bincount_dict(idx, per_bin))
+    return bins
@@ -10,12 +10,8 @@ SPY $0.01 → SPX $0.10 (approximate 10x scaling)
 """
 
 import asyncio
-import json
 import os
 import sys
-import urllib.request
-import urllib.error
-import time
 from datetime import datetime, timedelta, date
 from pathlib import Path
 
@@ -27,9 +23,14 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from shared.logutil import LogUtil
+from shared.vendor_http import POLYGON_BASE, VendorHttpClient, iter_ordered
+from services.massive.intel.volume_profile.vp_pyramid import (
+    PYRAMID_STEPS,
+    build_levels,
+    queue_replace_levels,
+)
 
 # Configuration
-POLYGON_BASE = "https://api.polygon.io"
 YEARS_OF_HISTORY = 15
 REDIS_KEY = "massive:volume_profile:spx"
 REDIS_URL = "redis://127.0.0.1:6380"
@@ -41,6 +42,14 @@ class VolumeProfileDownloader:
         self.logger = logger
         self.redis: Redis | None = None
 
+        # Pooled keep-alive client; pacing replaces the old per-day sleep and
+        # 429s back off (Retry-After aware) instead of a fixed 60s wait
+        self.http = VendorHttpClient(
+            api_key, POLYGON_BASE,
+            timeout_sec=30, rate_per_sec=4, max_concurrency=4,
+            max_retries=6, backoff_base_sec=2.0, backoff_max_sec=60.0,
+        )
+
         # Volume profile: price_cents -> volume
         # Price is SPY price in cents (e.g., 69750 = $697.50)
         self.profile: dict[int, int] = {}
@@ -50,6 +59,7 @@ class VolumeProfileDownloader:
         self.logger.info(f"Connected to Redis at {REDIS_URL}", emoji="🔗")
 
     async def close(self):
+        await self.http.close()
         if self.redis:
             await self.redis.close()
 
@@ -57,26 +67,15 @@ class VolumeProfileDownloader:
         """Convert SPY price in cents to SPX price in cents (10x scale)."""
         return spy_cents * 10
 
-    def fetch_day_bars(self, ticker: str, date_str: str) -> list[dict]:
-        """Fetch minute bars for a single day using urllib."""
-        url = f"{POLYGON_BASE}/v2/aggs/ticker/{ticker}/range/1/minute/{date_str}/{date_str}?apiKey={self.api_key}&limit=50000&sort=asc"
-
+    async def fetch_day_bars(self, ticker: str, date_str: str) -> list[dict]:
+        """Fetch minute bars for a single day."""
         try:
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'MarketSwarm/1.0')
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                return data.get("results", [])
-
-        except urllib.error.HTTPError as e:
-            if e.code == 429:
-                self.logger.warning("Rate limited, waiting 60s...", emoji="⏳")
-                time.sleep(60)
-                return self.fetch_day_bars(ticker, date_str)
-            else:
-                self.logger.warning(f"Failed to fetch {date_str}: HTTP {e.code}", emoji="⚠️")
-                return []
+            data = await self.http.get_json(
+                f"/v2/aggs/ticker/{ticker}/range/1/minute/{date_str}/{date_str}",
+                {"limit": 50000, "sort": "asc"},
+                endpoint="aggs_minute",
+            )
+            return data.get("results", [])
 
         except Exception as e:
             self.logger.warning(f"Failed to fetch {date_str}: {e}", emoji="⚠️")
@@ -110,18 +109,26 @@ class VolumeProfileDownloader:
         self.logger.info(f"Downloading SPY data from {start_date} to {end_date}", emoji="📥")
         self.logger.info(f"This will take a while...", emoji="⏳")
 
+        trading_days = []
         current = start_date
+        while current <= end_date:
+            # Skip weekends
+            if current.weekday() < 5:
+                trading_days.append(current)
+            current += timedelta(days=1)
+
         days_processed = 0
         total_volume = 0
 
-        while current <= end_date:
-            # Skip weekends
-            if current.weekday() >= 5:
-                current += timedelta(days=1)
-                continue
+        # Bounded look-ahead: the next few days are in flight (paced by the
+        # client) while the current day is bucketed
+        def day_fetch(day):
+            return lambda: self.fetch_day_bars("SPY", day.strftime("%Y-%m-%d"))
 
-            date_str = current.strftime("%Y-%m-%d")
-            bars = self.fetch_day_bars("SPY", date_str)
+        fetches = iter_ordered((day_fetch(d) for d in trading_days), window=4)
+        day_iter = iter(trading_days)
+        async for bars in fetches:
+            current = next(day_iter)
 
             if bars:
                 self.process_bars(bars)
@@ -136,10 +143,6 @@ class VolumeProfileDownloader:
                         emoji="📊"
                     )
 
-            # Rate limit: 5 requests per second for free tier
-            time.sleep(0.25)
-            current += timedelta(days=1)
-
         self.logger.ok(
             f"Download complete: {days_processed} days, {len(self.profile):,} price levels",
             emoji="✅"
@@ -167,6 +170,9 @@ class VolumeProfileDownloader:
         for price_cents, volume in spx_profile.items():
             pipe.hset(REDIS_KEY, str(price_cents), volume)
 
+        # Rebuild the coarse pyramid levels so they match the new base
+        queue_replace_levels(pipe, "spx", build_levels(spx_profile, steps=PYRAMID_STEPS[1:]))
+
         # Store metadata
         pipe.hset(f"{REDIS_KEY}:meta", mapping={
             "last_updated": datetime.now().isoformat(),
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Volume Profile Pyramid - Multi-resolution pre-aggregated levels
+
+The base level is the $0.10 SPX hash maintained by VolumeProfileWorker
+(field = SPX price in cents). Coarser levels are rolled up into sibling
+hashes so charts and analysis can read a $1 / $5 / $25 profile directly
+instead of reaggregating every $0.10 bucket on each request.
+
+Keys (field = bucket floor in SPX cents, value = volume):
+  massive:volume_profile:{symbol}                  → $0.10 (base)
+  massive:volume_profile:{symbol}:pyramid:{step}   → step in cents (100, 500, 2500)
+
+Every coarse level is a roll-up of the base hash and nothing else, so a
+range query returns the same totals whichever level it picks.
+
+Maintenance:
+  - VolumeProfileWorker increments every level on each flush
+  - vp_download rewrites the base and its roll-ups in one pipeline
+  - vp_build_profile (and vp_dev_injector) rebuild the coarse levels in
+    bulk from the current base hash (levels_from_base)
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Level steps in SPX cents: $0.10, $1, $5, $25
+PYRAMID_STEPS: Tuple[int, ...] = (10, 100, 500, 2500)
+BASE_STEP = PYRAMID_STEPS[0]
+
+# Guard against accidental full-range HMGETs on the finest levels
+MAX_QUERY_FIELDS = 20000
+
+
+def level_key(symbol: str, step: int) -> str:
+    """Redis key for a pyramid level (the base level keeps the legacy key)."""
+    base = f"massive:volume_profile:{symbol.lower()}"
+    if step == BASE_STEP:
+        return base
+    return f"{base}:pyramid:{step}"
+
+
+def bucket_floor(price_cents: int, step: int) -> int:
+    """Floor a price in cents to the start of its bucket at this step."""
+    return (price_cents // step) * step
+
+
+def rollup(bins: Dict[int, float], step: int) -> Dict[int, float]:
+    """Aggregate cents-keyed bins into buckets of `step` cents."""
+    out: Dict[int, float] = {}
+    for price_cents, volume in bins.items():
+        b = bucket_floor(price_cents, step)
+        out[b] = out.get(b, 0) + volume
+    return out
+
+
+def build_levels(
+    bins: Dict[int, float],
+    source_step: int = BASE_STEP,
+    steps: Iterable[int] = PYRAMID_STEPS,
+) -> Dict[int, Dict[int, float]]:
+    """
+    Build every level that can be derived from bins at `source_step`.
+
+    Levels finer than the source, or not an exact multiple of it, are
+    skipped (a $1 profile cannot produce the $0.10 level).
+    """
+    levels: Dict[int, Dict[int, float]] = {}
+    for step in steps:
+        if step < source_step or step % source_step:
+            continue
+        levels[step] = dict(bins) if step == source_step else rollup(bins, step)
+    return levels
+
+
+def levels_from_base(base: Dict[Any, Any]) -> Dict[int, Dict[int, float]]:
+    """Coarse levels rolled up from a base-level hash (HGETALL reply)."""
+    bins = {int(k): float(v) for k, v in base.items()}
+    return build_levels(bins, steps=PYRAMID_STEPS[1:])
+
+
+def select_level(resolution_cents: int, steps: Iterable[int] = PYRAMID_STEPS) -> int:
+    """
+    Return the coarsest level whose step does not exceed the requested
+    resolution. Requests finer than the base level get the base level.
+    """
+    ordered = sorted(steps)
+    chosen = ordered[0]
+    for step in ordered:
+        if step <= resolution_cents:
+            chosen = step
+    return chosen
+
+
+def range_fields(lo_cents: int, hi_cents: int, step: int) -> List[int]:
+    """Bucket fields covering [lo_cents, hi_cents] at this step."""
+    if hi_cents < lo_cents:
+        return []
+    start = bucket_floor(lo_cents, step)
+    return list(range(start, hi_cents + 1, step))
+
+
+def queue_increments(pipe, symbol: str, pending: Dict[int, int]) -> None:
+    """
+    Queue HINCRBYs for the coarse levels from base-level pending volume.
+
+    The base level itself is written by the caller; this only adds the
+    rolled-up buckets so every level stays in step with the base.
+    """
+    for step in PYRAMID_STEPS:
+        if step == BASE_STEP:
+            continue
+        key = level_key(symbol, step)
+        for b, volume in rollup(pending, step).items():
+            pipe.hincrby(key, str(b), int(volume))
+
+
+def queue_replace_levels(pipe, symbol: str, levels: Dict[int, Dict[int, float]]) -> None:
+    """Queue a full rewrite of each level hash (bulk rebuild)."""
+    for step, buckets in levels.items():
+        key = level_key(symbol, step)
+        pipe.delete(key)
+        if buckets:
+            pipe.hset(key, mapping={
+                str(b): int(round(v)) for b, v in buckets.items()
+            })
+
+
+async def query_range(
+    r,
+    symbol: str,
+    lo: float,
+    hi: float,
+    resolution: float,
+) -> Tuple[int, Dict[int, int]]:
+    """
+    Fetch volume for SPX prices [lo, hi] at the coarsest level that
+    satisfies `resolution` (all in SPX dollars).
+
+    Returns (step_cents, {bucket_cents: volume}) with empty buckets omitted.
+    """
+    lo_cents = int(round(lo * 100))
+    hi_cents = int(round(hi * 100))
+    step = select_level(int(round(resolution * 100)))
+
+    fields = range_fields(lo_cents, hi_cents, step)
+    if len(fields) > MAX_QUERY_FIELDS:
+        raise ValueError(
+            f"range {lo}-{hi} at step {step} spans {len(fields)} buckets "
+            f"(max {MAX_QUERY_FIELDS})"
+        )
+    if not fields:
+        return step, {}
+
+    values = await r.hmget(level_key(symbol, step), [str(f) for f in fields])
+    return step, {
+        f: int(v) for f, v in zip(fields, values) if v is not None
+    }
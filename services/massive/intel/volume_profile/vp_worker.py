@@ -5,6 +5,7 @@ Volume Profile Worker - Real-time Updates
 Subscribes to SPY trades via WebSocket.
 Updates volume profile every second.
 Scales SPY prices to SPX ($0.01 SPY → $0.10 SPX).
+Rolls each flush up into the coarser pyramid levels (see vp_pyramid).
 """
 
 import asyncio
@@ -17,6 +18,8 @@ import websockets
 from websockets.exceptions import ConnectionClosedError
 from redis.asyncio import Redis
 
+from .vp_pyramid import queue_increments
+
 
 class VolumeProfileWorker:
     """
@@ -27,6 +30,7 @@ class VolumeProfileWorker:
     """
 
     REDIS_KEY = "massive:volume_profile:spx"
+    SYMBOL = "spx"
     ANALYTICS_KEY = "massive:volume_profile:analytics"
     WS_URL = "wss://socket.polygon.io/stocks"
 
@@ -85,6 +89,9 @@ class VolumeProfileWorker:
         for bucket, volume in self.pending_volume.items():
             pipe.hincrby(self.REDIS_KEY, str(bucket), volume)
 
+        # Keep the coarse pyramid levels ($1/$5/$25) in step with the base
+        queue_increments(pipe, self.SYMBOL, self.pending_volume)
+
         # Update analytics
         pipe.hset(self.ANALYTICS_KEY, mapping={
             "last_flush": time.time(),
@@ -11,7 +11,10 @@ from datetime import date
 from typing import Any, Dict, List, Set
 
 from redis.asyncio import Redis
-from massive import RESTClient
+
+from shared.vendor_http import VendorHttpClient
+
+from ..utils import chain_diff, json_codec
 
 
 # ============================================================
@@ -36,6 +39,38 @@ def _is_on_strike_grid(strike: float, increment: int) -> bool:
     return strike % increment == 0
 
 
+# Fields downstream reads from massive:chain:latest (Builder, GEX,
+# normalizers, WsHydrator baseline). Everything else in the vendor snapshot
+# (day bar, fmv, break-even, exchange ids, timeframes...) is dropped, and so
+# are the nanosecond quote/trade timestamps: nothing reads them, and they do
+# not fit the doubles the massive_chain Lua deltas work in (chain_diff.lua).
+CONTRACT_FIELDS: Dict[str, tuple[str, ...]] = {
+    "details": ("ticker", "contract_type", "expiration_date", "strike_price"),
+    "last_quote": ("bid", "ask", "midpoint", "bid_size", "ask_size"),
+    "last_trade": ("price", "size"),
+    "greeks": ("delta", "gamma", "theta", "vega"),
+    "underlying_asset": ("ticker", "value"),
+}
+CONTRACT_SCALARS = ("implied_volatility", "open_interest")
+
+
+def _contract_record(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Trim one raw vendor snapshot to the fields downstream uses.
+    Keeps the vendor's nested shape, so readers are unchanged.
+    """
+    record: Dict[str, Any] = {}
+    for section, fields in CONTRACT_FIELDS.items():
+        src = raw.get(section)
+        if src:
+            record[section] = {f: src[f] for f in fields if f in src}
+    for f in CONTRACT_SCALARS:
+        v = raw.get(f)
+        if v is not None:
+            record[f] = v
+    return record
+
+
 # ============================================================
 # ChainWorker — Geometry Authority (RAW PAYLOAD MODE)
 # ============================================================
@@ -45,7 +80,8 @@ class ChainWorker:
     ChainWorker
     - Sole authority for option chain geometry
     - Uses ticker as identity
-    - Stores raw vendor payloads (opaque)
+    - Stores vendor payloads trimmed to downstream fields
+      (MASSIVE_CHAIN_SLIM=false keeps them whole)
     - Computes geometry diffs ONLY on ticker presence
     - Emits geometry events
     """
@@ -65,6 +101,10 @@ class ChainWorker:
         self.surface_ttl_sec = int(config.get("MASSIVE_SURFACE_TTL_MINUTES", 390)) * 60
 
         self.em_days = int(config.get("MASSIVE_CHAIN_EM_DAYS", "1"))
+        self.slim = str(config.get("MASSIVE_CHAIN_SLIM", "true")).lower() == "true"
+
+        # Versioned copies of chain:latest for server-side deltas (utils/chain_diff.py)
+        self.version_ttl_sec = int(config.get("MASSIVE_CHAIN_VERSION_TTL_SEC", "600"))
 
         # Per-symbol configuration - SPX and NDX are fundamentally different indexes
         # Each has its own: EM multiplier, strike increment, and strike grid filter
@@ -81,7 +121,8 @@ class ChainWorker:
             },
         }
 
-        self.client = RESTClient(config["MASSIVE_API_KEY"])
+        # Pooled keep-alive client; chain pages are prefetched while parsing
+        self.http = VendorHttpClient.from_config(config, config["MASSIVE_API_KEY"])
         self.market_redis_url = config["buses"]["market-redis"]["url"]
         self._redis: Redis | None = None
 
@@ -104,6 +145,19 @@ class ChainWorker:
             self._redis = Redis.from_url(self.market_redis_url, decode_responses=True)
         return self._redis
 
+    # Warm restart (see utils/warm_state.py): keep the geometry version
+    # monotonic across restarts and skip re-publishing an unchanged chain
+    def checkpoint_state(self) -> Dict[str, Any]:
+        return {
+            "geometry_version": self._geometry_version,
+            "last_geometry": sorted(self._last_geometry) if self._last_geometry is not None else None,
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        self._geometry_version = int(state.get("geometry_version", 0))
+        if state.get("last_geometry") is not None:
+            self._last_geometry = set(state["last_geometry"])
+
     async def _load_spot(self, sym: str) -> float | None:
         r = await self._redis_conn()
         raw = await r.get(f"massive:model:spot:{sym}")
@@ -136,26 +190,23 @@ class ChainWorker:
         )
         return computed_range
 
-    def _list_expirations_sync(self, underlying: str) -> List[str]:
-        """Synchronous helper - runs in thread pool."""
+    async def _list_expirations(self, underlying: str) -> List[str]:
         exps = set()
-        for opt in self.client.list_snapshot_options_chain(
-            underlying, params={"limit": 250}
+        async for opt in self.http.iter_results(
+            f"/v3/snapshot/options/{underlying}",
+            {"limit": 250},
+            endpoint="options_chain_expirations",
         ):
-            exp = getattr(opt.details, "expiration_date", None)
+            exp = (opt.get("details") or {}).get("expiration_date")
             if exp:
                 exps.add(exp)
         return sorted(exps)[:self.num_expirations]
 
-    async def _list_expirations(self, underlying: str) -> List[str]:
-        """Async wrapper - prevents blocking the event loop."""
-        return await asyncio.to_thread(self._list_expirations_sync, underlying)
-
-    def _fetch_chain_sync(
+    async def _fetch_chain(
         self, underlying: str, exp: str, atm: int, rng: int
     ) -> List[tuple[str, Dict[str, Any]]]:
         """
-        Synchronous chain fetch - runs in thread pool.
+        Fetch one expiration's strike window.
         Returns list of (ticker, raw_payload) tuples.
         """
         results = []
@@ -171,8 +222,9 @@ class ChainWorker:
         filter_strikes = sym_cfg.get("filter_strikes", False)
         increment = sym_cfg.get("strike_increment", 5)
 
-        for opt in self.client.list_snapshot_options_chain(underlying, params=params):
-            raw = json.loads(json.dumps(opt, default=lambda o: o.__dict__))
+        async for raw in self.http.iter_results(
+            f"/v3/snapshot/options/{underlying}", params, endpoint="options_chain"
+        ):
             details = raw.get("details") or {}
             ticker = details.get("ticker")
 
@@ -185,18 +237,10 @@ class ChainWorker:
                 if strike is not None and not _is_on_strike_grid(strike, increment):
                     continue
 
-            results.append((ticker, raw))
+            results.append((ticker, _contract_record(raw) if self.slim else raw))
 
         return results
 
-    async def _fetch_chain(
-        self, underlying: str, exp: str, atm: int, rng: int
-    ) -> List[tuple[str, Dict[str, Any]]]:
-        """Async wrapper - prevents blocking the event loop."""
-        return await asyncio.to_thread(
-            self._fetch_chain_sync, underlying, exp, atm, rng
-        )
-
     # ============================================================
     # WS Subscription Management
     # ============================================================
@@ -264,6 +308,7 @@ class ChainWorker:
                 expirations = await self._list_expirations(underlying.replace("I:", ""))
                 today = date.today()
 
+                fetches = []
                 for exp in expirations:
                     # Compute DTE for this expiration — range scales with √DTE
                     try:
@@ -279,8 +324,11 @@ class ChainWorker:
                         emoji="📡",
                     )
 
-                    # Fetch chain in thread pool to avoid blocking event loop
-                    contracts = await self._fetch_chain(underlying, exp, atm, rng)
+                    fetches.append(self._fetch_chain(underlying, exp, atm, rng))
+
+                # Expirations are fetched concurrently (bounded by the HTTP client);
+                # merged in expiration order so ticker precedence is unchanged
+                for contracts in await asyncio.gather(*fetches):
                     for ticker, raw in contracts:
                         all_contracts[ticker] = raw
 
@@ -307,16 +355,32 @@ class ChainWorker:
                     "exited": list(exited),
                 }
 
-                await r.set(
-                    "massive:chain:latest",
-                    json.dumps(
-                        {
-                            "version": self._geometry_version,
-                            "ts": ts,
-                            "contracts": all_contracts,
-                        }
-                    ),
+                t_encode = time.perf_counter()
+                chain_blob = json_codec.dumps(
+                    {
+                        "version": self._geometry_version,
+                        "ts": ts,
+                        "contracts": all_contracts,
+                    }
+                )
+                encode_ms = (time.perf_counter() - t_encode) * 1000
+
+                # Blob, versioned copy and version move together, so a
+                # chain_delta call never sees a version without its blob
+                pipe = r.pipeline(transaction=True)
+                pipe.set(chain_diff.LATEST_KEY, chain_blob)
+                pipe.copy(
+                    chain_diff.LATEST_KEY,
+                    chain_diff.version_key(self._geometry_version),
+                    replace=True,
                 )
+                pipe.expire(chain_diff.version_key(self._geometry_version), self.version_ttl_sec)
+                pipe.set(chain_diff.VERSION_KEY, self._geometry_version)
+                await pipe.execute()
+                await r.hset("massive:chain:analytics", mapping={
+                    "encode_ms_last": round(encode_ms, 2),
+                    "bytes_last": len(chain_blob),
+                })
 
                 await r.set(
                     "massive:chain:delta:latest",
@@ -345,6 +409,7 @@ class ChainWorker:
             latency_ms = int((time.monotonic() - start) * 1000)
             await r.hset("massive:chain:analytics", "latency_last_ms", latency_ms)
             await r.hincrby("massive:chain:analytics", "runs", 1)
+            await r.hset("massive:vendor:analytics", mapping=self.http.metrics_mapping())
 
             self.logger.info(
                 f"[CHAIN CYCLE COMPLETE] {latency_ms}ms",
@@ -363,4 +428,5 @@ class ChainWorker:
                 await self._run_once()
                 await asyncio.sleep(self.interval_sec)
         finally:
+            await self.http.close()
             self.logger.info("[CHAIN STOP] halted", emoji="🛑")
\ No newline at end of file
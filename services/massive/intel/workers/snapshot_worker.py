@@ -10,6 +10,8 @@ from typing import Dict, Any
 
 from redis.asyncio import Redis
 
+from ..utils.chain_diff import ChainBaseline
+
 
 # ============================================================
 # Ticker helpers (authoritative)
@@ -74,7 +76,11 @@ class SnapshotWorker:
         self._redis: Redis | None = None
 
         self.geometry_channel = "massive:chain:geometry_updated"
-        self.geometry_key = "massive:chain:latest"
+
+        # Chain kept current with server-side deltas (utils/chain_diff.py)
+        self._chain = ChainBaseline(
+            server_side=str(config.get("MASSIVE_CHAIN_SERVER_DIFF", "true")).lower() == "true"
+        )
 
         self.builder = None
         self.stop_event: asyncio.Event | None = None
@@ -131,13 +137,11 @@ class SnapshotWorker:
     async def _produce_snapshot(self, geometry_version: int) -> None:
         r = await self._redis_conn()
 
-        raw = await r.get(self.geometry_key)
-        if not raw:
+        if not await self._chain.refresh(r):
             self.logger.warning("[SNAPSHOT] No geometry found", emoji="⚠️")
             return
 
-        geometry = json.loads(raw)
-        contracts: Dict[str, Any] = geometry.get("contracts", {})
+        contracts: Dict[str, Any] = self._chain.contracts
         if not contracts:
             self.logger.warning("[SNAPSHOT] Geometry empty", emoji="⚠️")
             return
@@ -11,8 +11,10 @@ from typing import Any, Dict, Optional
 
 from redis.asyncio import Redis
 
+from shared.vendor_http import VendorHttpClient
+
 from ..utils.get_spot import MassiveSpotClient
-from massive import RESTClient  # for stock/ETF snapshot
+from ..utils.spot_history import SpotHistoryWriter
 
 
 # ============================================================
@@ -57,8 +59,9 @@ class SpotWorker:
         if not api_key:
             raise ValueError("SpotWorker requires MASSIVE_API_KEY")
 
-        self.index_client = MassiveSpotClient(api_key=api_key)
-        self.general_client = RESTClient(api_key)
+        # One pooled keep-alive client for index + stock snapshots
+        self.http = VendorHttpClient.from_config(config, api_key)
+        self.vendor_stats_interval_sec = int(config.get("MASSIVE_VENDOR_STATS_INTERVAL_SEC", 30))
 
         # ====================================================
         # Timing + timeouts (NEW)
@@ -76,6 +79,13 @@ class SpotWorker:
         market_url = config["buses"]["market-redis"]["url"]
         self.r: Redis = Redis.from_url(market_url, decode_responses=True)
 
+        # Latest + trail + 1s/1m/5m bars in one pipelined round trip
+        self.history = SpotHistoryWriter(
+            self.r,
+            trail_window_sec=self.trail_window_sec,
+            trail_ttl_sec=self.trail_ttl_sec,
+        )
+
         self.index_symbols = [
             s.strip() for s in config.get("MASSIVE_SPOT_SYMBOLS", "").split(",") if s.strip()
         ]
@@ -106,12 +116,6 @@ class SpotWorker:
     def _api_symbol(self, sym: str) -> str:
         return f"I:{sym}" if sym in self.indices_needing_prefix else sym
 
-    def _latest_key(self, sym: str) -> str:
-        return f"massive:model:spot:{sym}"
-
-    def _trail_key(self, sym: str) -> str:
-        return f"massive:model:spot:{sym}:trail"
-
     def _now_iso(self) -> str:
         return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
@@ -127,11 +131,18 @@ class SpotWorker:
     # ========================================================
 
     async def _fetch_index_spot(self, sym: str) -> Optional[float]:
+        api_sym = self._api_symbol(sym)
         try:
-            return await asyncio.wait_for(
-                asyncio.to_thread(self.index_client.get_spot, self._api_symbol(sym)),
+            data = await asyncio.wait_for(
+                self.http.get_json(
+                    "/v3/snapshot",
+                    {"ticker": api_sym, "order": "asc", "limit": 10, "sort": "ticker"},
+                    endpoint="index_snapshot",
+                    timeout=self.index_timeout,
+                ),
                 timeout=self.index_timeout,
             )
+            return MassiveSpotClient.extract_spot(data, api_sym)
         except asyncio.TimeoutError:
             await self.r.hincrby(self.analytics_key, "timeouts_index", 1)
         except Exception as e:
@@ -140,29 +151,32 @@ class SpotWorker:
 
     async def _fetch_stock_spot(self, sym: str) -> Optional[Dict]:
         try:
-            snapshot = await asyncio.wait_for(
-                asyncio.to_thread(
-                    self.general_client.get_snapshot_ticker, "stocks", sym
+            data = await asyncio.wait_for(
+                self.http.get_json(
+                    f"/v2/snapshot/locale/us/markets/stocks/tickers/{sym}",
+                    endpoint="stock_snapshot",
+                    timeout=self.stock_timeout,
                 ),
                 timeout=self.stock_timeout,
             )
 
-            day = snapshot.day
-            minute = snapshot.min
-            if not day or not minute or not day.volume:
+            snapshot = data.get("ticker") or {}
+            day = snapshot.get("day") or {}
+            minute = snapshot.get("min") or {}
+            if not day or not minute or not day.get("v"):
                 return None
 
             return {
                 "symbol": sym,
-                "value": day.close,
-                "open": day.open,
-                "high": day.high,
-                "low": day.low,
-                "close": day.close,
-                "volume": day.volume,
-                "ts_epoch_ms": minute.timestamp,
+                "value": day.get("c"),
+                "open": day.get("o"),
+                "high": day.get("h"),
+                "low": day.get("l"),
+                "close": day.get("c"),
+                "volume": day.get("v"),
+                "ts_epoch_ms": minute.get("t"),
                 "ts": datetime.fromtimestamp(
-                    minute.timestamp / 1000, tz=timezone.utc
+                    minute.get("t", 0) / 1000, tz=timezone.utc
                 ).isoformat(timespec="seconds"),
                 "source": "massive/spot",
                 "instrument_type": "ETF",
@@ -185,16 +199,8 @@ class SpotWorker:
             return
 
         self.last_payloads[sym] = payload
-        snap = json.dumps(payload)
 
-        await self._redis_safe(self.r.set(self._latest_key(sym), snap))
-        await self._redis_safe(self.r.zadd(self._trail_key(sym), {snap: now_epoch}))
-        await self._redis_safe(
-            self.r.zremrangebyscore(
-                self._trail_key(sym), 0, now_epoch - self.trail_window_sec
-            )
-        )
-        await self._redis_safe(self.r.expire(self._trail_key(sym), self.trail_ttl_sec))
+        await self._redis_safe(self.history.write(payload, now_epoch))
 
         if self.spot_capture:
             self.spot_capture.write(payload)
@@ -231,6 +237,7 @@ class SpotWorker:
                 await self._process_spot_update(payload, now_epoch)
 
     async def run(self, stop_event: asyncio.Event) -> None:
+        next_vendor_stats = time.monotonic() + self.vendor_stats_interval_sec
         try:
             while not stop_event.is_set():
                 try:
@@ -241,8 +248,15 @@ class SpotWorker:
                 except asyncio.TimeoutError:
                     await self.r.hincrby(self.analytics_key, "timeouts_tick", 1)
 
+                if time.monotonic() >= next_vendor_stats:
+                    next_vendor_stats = time.monotonic() + self.vendor_stats_interval_sec
+                    await self._redis_safe(
+                        self.r.hset("massive:vendor:analytics", mapping=self.http.metrics_mapping())
+                    )
+
                 await asyncio.sleep(self.interval_sec)
 
         finally:
+            await self.http.close()
             await self.r.close()
             self.logger.info("SpotWorker stopped", emoji="🛑")
\ No newline at end of file
@@ -18,6 +18,8 @@ import websockets
 from websockets.exceptions import ConnectionClosedError
 from redis.asyncio import Redis
 
+from ..utils.spot_history import SpotHistoryWriter
+
 
 class StockWsWorker:
     """
@@ -36,6 +38,7 @@ class StockWsWorker:
 
         self.redis_url = config["buses"]["market-redis"]["url"]
         self._redis: Redis | None = None
+        self._history: SpotHistoryWriter | None = None
 
         # Stock/ETF symbols from config
         raw_symbols = config.get("MASSIVE_STOCK_WS_SYMBOLS", "")
@@ -74,14 +77,17 @@ class StockWsWorker:
             self._redis = Redis.from_url(self.redis_url, decode_responses=True)
         return self._redis
 
-    def _latest_key(self, sym: str) -> str:
-        return f"massive:model:spot:{sym}"
-
-    def _trail_key(self, sym: str) -> str:
-        return f"massive:model:spot:{sym}:trail"
+    async def _history_writer(self) -> SpotHistoryWriter:
+        if not self._history:
+            self._history = SpotHistoryWriter(
+                await self._redis_conn(),
+                trail_window_sec=self.trail_window_sec,
+                trail_ttl_sec=self.trail_ttl_sec,
+            )
+        return self._history
 
     async def _write_spot(self, payload: Dict[str, Any]) -> None:
-        """Write spot update to Redis (latest key + trail ZSET)."""
+        """Write spot update to Redis (latest key + trail ZSET + OHLC bars)."""
         sym = payload["symbol"]
         value = payload.get("value")
 
@@ -91,27 +97,13 @@ class StockWsWorker:
         if value is not None:
             self._last_values[sym] = value
 
-        r = await self._redis_conn()
+        history = await self._history_writer()
         now_epoch = time.time()
-        snap = json.dumps(payload)
 
         try:
             await asyncio.wait_for(
-                r.set(self._latest_key(sym), snap),
-                timeout=self.redis_timeout,
-            )
-            await asyncio.wait_for(
-                r.zadd(self._trail_key(sym), {snap: now_epoch}),
-                timeout=self.redis_timeout,
-            )
-            await asyncio.wait_for(
-                r.zremrangebyscore(
-                    self._trail_key(sym), 0, now_epoch - self.trail_window_sec
-                ),
-                timeout=self.redis_timeout,
-            )
-            await asyncio.wait_for(
-                r.expire(self._trail_key(sym), self.trail_ttl_sec),
+                # Per-second aggregates: high/low cover one second
+                history.write(payload, now_epoch, range_sec=1),
                 timeout=self.redis_timeout,
             )
         except asyncio.TimeoutError:
@@ -18,6 +18,7 @@ class WsConsumer:
     - Batches messages to WsHydrator
     - Triggers snapshot emission at configurable Hz (2-5 Hz default)
     - Direct injection to Builder for minimal latency
+    - Optional injection to GexModelBuilder (live-quote GEX)
     """
 
     STREAM_KEY = "massive:ws:stream"
@@ -37,6 +38,8 @@ class WsConsumer:
         # Injected dependencies
         self._hydrator = None
         self._builder = None
+        self._gex = None
+        self._tracer = None
 
         # Stream position
         self._last_id = "0-0"
@@ -59,6 +62,14 @@ class WsConsumer:
         self._builder = builder
         self.logger.info("[WS CONSUMER] Builder injected", emoji="🔗")
 
+    def set_gex(self, gex) -> None:
+        self._gex = gex
+        self.logger.info("[WS CONSUMER] GEX builder injected", emoji="🔗")
+
+    def set_tracer(self, tracer) -> None:
+        self._tracer = tracer
+        self.logger.info("[WS CONSUMER] Latency tracer injected", emoji="🔗")
+
     async def _consume_stream(self) -> int:
         """
         Consume available messages from stream.
@@ -77,10 +88,13 @@ class WsConsumer:
             return 0
 
         messages = []
+        now = time.time()
         for stream_name, entries in results:
             for entry_id, fields in entries:
                 self._last_id = entry_id
                 messages.append(fields)
+                if self._tracer:
+                    self._tracer.record_stream_entry(entry_id, fields, now)
 
         if messages and self._hydrator:
             await self._hydrator.hydrate_batch(messages)
@@ -94,6 +108,9 @@ class WsConsumer:
         if not self._hydrator or not self._builder:
             return
 
+        # Claim the ticks this emit publishes before the hydrator clears dirty state
+        trace = self._tracer.begin_emit() if self._tracer else None
+
         # Get merged snapshot from hydrator (chain baseline + WS updates)
         snapshots = await self._hydrator.get_merged_snapshots()
 
@@ -102,7 +119,9 @@ class WsConsumer:
                 f"[WS EMIT] symbols={list(snapshots.keys())} contracts={sum(len(v) for v in snapshots.values())}",
                 emoji="📤",
             )
-            await self._builder.receive_snapshot(snapshots)
+            await self._builder.receive_snapshot(snapshots, trace=trace)
+            if self._gex:
+                await self._gex.receive_snapshot(snapshots)
 
     async def run(self, stop_event: asyncio.Event) -> None:
         self.logger.info("[WS CONSUMER START] running", emoji="📥")
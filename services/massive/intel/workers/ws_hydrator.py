@@ -6,6 +6,8 @@ from typing import Dict, Set, Any, List
 
 from redis.asyncio import Redis
 
+from ..utils.chain_diff import ChainBaseline
+
 
 class WsHydrator:
     """
@@ -39,13 +41,19 @@ class WsHydrator:
         self.tracked_symbols: Set[str] = set(s.strip() for s in chain_symbols.split(","))
 
         # Cached chain baseline - persists across snapshots so WS can work
-        # even when chain worker hasn't updated recently
-        self._cached_chain: Dict[str, Any] | None = None
+        # even when chain worker hasn't updated recently. Kept current with
+        # server-side deltas (utils/chain_diff.py) instead of a full GET per emit.
+        self._chain = ChainBaseline(
+            server_side=str(config.get("MASSIVE_CHAIN_SERVER_DIFF", "true")).lower() == "true"
+        )
         self._cached_chain_ts: float = 0
 
         self.market_redis_url = config["buses"]["market-redis"]["url"]
         self._redis: Redis | None = None
 
+        # Optional tick-to-tile tracer (see utils/latency_trace.py)
+        self._tracer = None
+
         self.logger.info(
             f"[WS HYDRATOR INIT] hydration + strike-level activity tracking for {self.tracked_symbols}",
             emoji="💧",
@@ -56,6 +64,28 @@ class WsHydrator:
             self._redis = Redis.from_url(self.market_redis_url, decode_responses=True)
         return self._redis
 
+    def set_tracer(self, tracer) -> None:
+        self._tracer = tracer
+
+    # -------------------------
+    # Warm restart (see utils/warm_state.py)
+    # -------------------------
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        # Contract dicts are updated in place by _process_message: copy them
+        return {
+            "chain_states": {
+                sym: {ticker: dict(c) for ticker, c in contracts.items()}
+                for sym, contracts in self.chain_states.items()
+            }
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        for sym, contracts in state.get("chain_states", {}).items():
+            self.chain_states[sym] = contracts
+            self.dirty.setdefault(sym, set())
+            self.ws_paused.setdefault(sym, False)
+
     # -------------------------
     # Symbol utilities
     # -------------------------
@@ -130,6 +160,13 @@ class WsHydrator:
             pipe.incr("massive:ws:hydrate:parse_fail")
             return
 
+        # WsWorker receive time — trace origin for every tick in this frame
+        try:
+            recv_ts = float(fields.get("ts"))
+        except (TypeError, ValueError):
+            recv_ts = None
+        now = time.time()
+
         for e in events:
             pipe.incr("massive:ws:hydrate:seen")
 
@@ -241,6 +278,8 @@ class WsHydrator:
                         f"dirty_flips_{norm_sym}",
                         1,
                     )
+                    if self._tracer:
+                        self._tracer.mark_dirty(norm_sym, ticker, recv_ts, now)
 
             pipe.incr("massive:ws:hydrate:hydrated")
             touched_symbols.add(norm_sym)
@@ -310,17 +349,12 @@ class WsHydrator:
         """
         redis = await self._redis_conn()
 
-        # Try to load fresh chain baseline
-        raw = await redis.get("massive:chain:latest")
-
-        if raw:
-            # Fresh chain data available - update cache
-            chain = json.loads(raw)
-            self._cached_chain = chain
+        # Bring chain baseline up to date (delta since our version, or full GET)
+        if await self._chain.refresh(redis):
+            # Fresh chain data available
             self._cached_chain_ts = time.time()
-        elif self._cached_chain:
+        elif self._chain.loaded:
             # No fresh data, but we have cache - use it
-            chain = self._cached_chain
             cache_age = time.time() - self._cached_chain_ts
             if cache_age > 60:  # Log warning if cache is stale
                 self.logger.warning(
@@ -335,7 +369,7 @@ class WsHydrator:
             )
             return {}
 
-        contracts = chain.get("contracts", {})
+        contracts = self._chain.contracts
 
         # Bucket by symbol and merge WS updates
         result: Dict[str, Dict[str, Any]] = {}
@@ -394,6 +428,9 @@ class WsHydrator:
         pipe.hincrby("massive:ws:hydrate:analytics", "diffs_total", diffs_this_emit)
         pipe.hincrby("massive:ws:hydrate:analytics", "emits_total", 1)
         pipe.hset("massive:ws:hydrate:analytics", "diffs_last_emit", diffs_this_emit)
+        pipe.hset("massive:ws:hydrate:analytics", mapping={
+            f"chain_{k}": v for k, v in self._chain.stats.items()
+        })
 
         # Time-series stream for window analysis (keep ~1 hour of data)
         pipe.xadd(
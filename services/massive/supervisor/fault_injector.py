@@ -1,6 +1,4 @@
-import os
-import threading
-import time
+import asyncio
 import signal
 
 
@@ -13,15 +11,17 @@ class FaultInjector:
         self.delay = int(config.get("MASSIVE_FAULT_DELAY_SEC", 10))
 
     def maybe_inject(self, proc):
+        """Schedule a SIGTERM to proc; returns the timer handle (or None)."""
         if not self.enabled:
-            return
+            return None
 
         def kill_later():
-            time.sleep(self.delay)
+            if proc.returncode is not None:
+                return
             self.logger.warning(
                 "[FAULT INJECTOR] simulating WS service restart",
                 emoji="🧪",
             )
             proc.send_signal(signal.SIGTERM)
 
-        threading.Thread(target=kill_later, daemon=True).start()
\ No newline at end of file
+        return asyncio.get_running_loop().call_later(self.delay, kill_later)
@@ -1,7 +1,5 @@
 import asyncio
-import subprocess
 import sys
-import time
 
 from .restart_policy import RestartPolicy
 from .fault_injector import FaultInjector
@@ -13,6 +11,7 @@ class MassiveSupervisor:
         self.config = config
         self.policy = RestartPolicy(config, logger)
         self.faults = FaultInjector(config, logger)
+        self.stop_timeout_sec = int(config.get("MASSIVE_STOP_TIMEOUT_SEC", 15))
 
     async def run(self):
         self.logger.info("[SUPERVISOR] starting", emoji="🧭")
@@ -36,18 +35,37 @@ class MassiveSupervisor:
 
         self.logger.info("[SUPERVISOR] launching Massive", emoji="🚀")
 
-        proc = subprocess.Popen(
-            cmd,
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
             stdout=sys.stdout,
             stderr=sys.stderr,
         )
 
-        self.faults.maybe_inject(proc)
+        fault = self.faults.maybe_inject(proc)
 
-        exit_code = proc.wait()
+        try:
+            exit_code = await proc.wait()
+        except asyncio.CancelledError:
+            await self._terminate(proc)
+            raise
+        finally:
+            if fault:
+                fault.cancel()
 
         if exit_code == 0:
             self.logger.info("[SUPERVISOR] Massive exited cleanly", emoji="✅")
             return
 
-        raise RuntimeError(f"Massive exited with code {exit_code}")
\ No newline at end of file
+        raise RuntimeError(f"Massive exited with code {exit_code}")
+
+    async def _terminate(self, proc):
+        if proc.returncode is not None:
+            return
+        self.logger.warning("[SUPERVISOR] stopping Massive", emoji="🛑")
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=self.stop_timeout_sec)
+        except asyncio.TimeoutError:
+            self.logger.warning("[SUPERVISOR] Massive did not stop, killing", emoji="💀")
+            proc.kill()
+            await proc.wait()
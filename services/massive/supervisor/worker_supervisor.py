@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from redis.asyncio import Redis
+
+from .restart_policy import RestartPolicy
+
+
+class WorkerSupervisor:
+    """
+    In-process supervision for orchestrator workers.
+
+    Each worker runs in its own supervised task: an exception restarts only
+    that worker (RestartPolicy backoff per worker), so e.g. a GEX failure
+    no longer takes down WS ingestion. A worker that keeps failing
+    (MASSIVE_WORKER_MAX_RESTARTS within MASSIVE_WORKER_RESTART_WINDOW_SEC)
+    is escalated: the exception propagates and the orchestrator shuts down
+    for the process-level MassiveSupervisor to restart.
+    """
+
+    ANALYTICS_KEY = "massive:supervisor:analytics"
+
+    def __init__(self, config: Dict[str, Any], logger):
+        self.config = config
+        self.logger = logger
+
+        self.enabled = str(config.get("MASSIVE_WORKER_RESTART", "true")).lower() == "true"
+        # A run this long counts as healthy and resets the backoff
+        self.healthy_sec = int(config.get("MASSIVE_WORKER_HEALTHY_SEC", 60))
+        self.max_restarts = int(config.get("MASSIVE_WORKER_MAX_RESTARTS", 10))
+        self.restart_window_sec = int(config.get("MASSIVE_WORKER_RESTART_WINDOW_SEC", 600))
+
+        self.market_redis_url = config["buses"]["market-redis"]["url"]
+        self._redis: Redis | None = None
+
+    async def _redis_conn(self) -> Redis:
+        if not self._redis:
+            self._redis = Redis.from_url(self.market_redis_url, decode_responses=True)
+        return self._redis
+
+    async def _record(self, name: str, error: BaseException, delay: float) -> None:
+        try:
+            r = await self._redis_conn()
+            pipe = r.pipeline(transaction=False)
+            pipe.hincrby(self.ANALYTICS_KEY, f"restarts:{name}", 1)
+            pipe.hset(self.ANALYTICS_KEY, mapping={
+                f"last_error:{name}": f"{type(error).__name__}: {error}"[:500],
+                f"last_restart_ts:{name}": time.time(),
+                f"next_delay_sec:{name}": round(delay, 2),
+            })
+            await pipe.execute()
+        except Exception:
+            pass
+
+    async def supervise(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[Any]],
+        stop_event: asyncio.Event,
+    ) -> None:
+        """Run factory() until stop_event; restart it with backoff when it raises."""
+        if not self.enabled:
+            await factory()
+            return
+
+        policy = RestartPolicy(self.config, self.logger)
+        failures: list[float] = []
+
+        while not stop_event.is_set():
+            started = time.monotonic()
+            try:
+                await factory()
+                if stop_event.is_set():
+                    return
+                # Workers only return on stop; an early return is a fault too
+                raise RuntimeError("worker returned before stop")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                now = time.monotonic()
+                if now - started >= self.healthy_sec:
+                    policy.reset()
+
+                failures = [t for t in failures if now - t < self.restart_window_sec]
+                failures.append(now)
+                if self.max_restarts and len(failures) > self.max_restarts:
+                    self.logger.error(
+                        f"[SUPERVISOR] {name} failed {len(failures)}× in "
+                        f"{self.restart_window_sec}s, escalating: {e}",
+                        emoji="💥",
+                    )
+                    raise
+
+                delay = policy.next_delay()
+                self.logger.error(
+                    f"[SUPERVISOR] {name} crashed: {e} — restarting in {delay:.1f}s",
+                    emoji="🔁",
+                )
+                await self._record(name, e, delay)
+
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
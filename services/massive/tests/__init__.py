@@ -0,0 +1 @@
+# Massive service tests
@@ -0,0 +1,228 @@
+"""
+Bar Archive Tests - vectorized histograms against the per-bar loops they
+replaced, and year-file append/flush behaviour.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from ..intel.admin import vp_build_profile
+from ..intel.admin.vp_download_history import VPHistoryDownloader
+from ..intel.utils.vp_quick_load import TV_MICROBINS, VPQuickLoader
+from ..intel.volume_profile.bar_archive import (
+    COLUMNS,
+    BarArchive,
+    bucket_index,
+    columns_from_bars,
+    histogram_raw,
+)
+
+DAY_MS = 86_400_000
+T_2024 = 1_704_067_200_000   # 2024-01-01T00:00:00Z
+
+
+# ============================================================
+# Reference loops (pre-vectorization vp_build_profile / vp_quick_load)
+# ============================================================
+
+def ref_build_raw(bins, price, vol, multiplier):
+    if price is None or vol is None:
+        return
+    spx = int(round(price * multiplier))
+    bins[spx] = bins.get(spx, 0.0) + float(vol)
+
+
+def ref_build_tv(bins, low, high, vol, multiplier, microbins=30):
+    if low is None or high is None or vol is None:
+        return
+    if high <= low:
+        return
+    step = (high - low) / microbins
+    vol_per = vol / microbins
+    for i in range(microbins):
+        spx = int(round((low + i * step) * multiplier))
+        bins[spx] = bins.get(spx, 0.0) + vol_per
+
+
+class RefQuickLoader:
+    def __init__(self, bucket_size):
+        self.bucket_size = bucket_size
+        self.profile_raw, self.profile_tv = {}, {}
+        self.total_volume = 0
+
+    def idx(self, spy_price):
+        return int(spy_price * 10 // self.bucket_size)
+
+    def accumulate_raw(self, bar):
+        price = bar.get("vw") or ((bar.get("h", 0) + bar.get("l", 0)) / 2)
+        volume = bar.get("v", 0)
+        if volume <= 0 or price <= 0:
+            return
+        i = self.idx(price)
+        self.profile_raw[i] = self.profile_raw.get(i, 0) + int(volume)
+
+    def accumulate_tv(self, bar):
+        low, high, volume = bar.get("l"), bar.get("h"), bar.get("v", 0)
+        if low is None or high is None or volume <= 0:
+            return
+        if high <= low:
+            i = self.idx((high + low) / 2)
+            self.profile_tv[i] = self.profile_tv.get(i, 0) + int(volume)
+            return
+        step = (high - low) / TV_MICROBINS
+        vol_per_bin = volume / TV_MICROBINS
+        for k in range(TV_MICROBINS):
+            i = self.idx(low + k * step)
+            self.profile_tv[i] = self.profile_tv.get(i, 0) + int(vol_per_bin)
+
+    def process(self, bars):
+        for bar in bars:
+            volume = bar.get("v", 0)
+            if volume <= 0:
+                continue
+            self.accumulate_raw(bar)
+            self.accumulate_tv(bar)
+            self.total_volume += int(volume)
+
+
+def random_bars(rng, n, t0=T_2024):
+    bars = []
+    for i in range(n):
+        c = round(rng.uniform(400, 700) * 4) / 4             # quarter dollars: ×10 lands on .5 ties
+        low = c - rng.choice([0, 0, 0.25, 0.35, 1.05, 2.5])
+        high = c + rng.choice([0, 0.25, 0.5, 1.15])
+        bar = {"t": t0 + 60_000 * i, "o": c, "h": high, "l": low, "c": c,
+               "v": rng.choice([0, 7, 29.9, 30, 59, 61.5, 1000, 123457]), "vw": rng.choice([None, 0, c + 0.05])}
+        if rng.random() < 0.05:
+            bar["c"] = None                                   # vendor gap
+        bars.append(bar)
+    return bars
+
+
+def assert_bins_equal(got, expected):
+    assert set(got) == set(expected)
+    for k, v in expected.items():
+        assert got[k] == pytest.approx(v, rel=1e-12, abs=1e-9), k
+
+
+# ============================================================
+# Histograms
+# ============================================================
+
+class TestBucketIndex:
+    def test_half_to_even_and_floor(self):
+        prices = np.array([590.25, 590.75, 590.05, 0.17])
+        assert bucket_index(prices, 10).tolist() == [round(p * 10) for p in prices]
+        assert bucket_index(prices, 10, floor=True).tolist() == [int(p * 10 // 1) for p in prices]
+        # floor(x / b) would give 17 here; x // b is 16
+        assert bucket_index(np.array([1.7]), 1, 0.1, floor=True).tolist() == [int(1.7 // 0.1)]
+        assert bucket_index(np.array([5.699999999999999]), 1, 0.3, floor=True).tolist() == [18]
+
+
+class TestBuildProfileParity:
+    """vp_build_profile.accumulate_* == the old per-bar loops (round half-to-even)."""
+
+    def test_raw_and_tv(self):
+        bars = random_bars(random.Random(7), 3000)
+        ref_raw, ref_tv = {}, {}
+        for b in bars:
+            ref_build_raw(ref_raw, b["c"], b["v"], 10)
+            ref_build_tv(ref_tv, b["l"], b["h"], b["v"], 10)
+
+        raw, tv = {}, {}
+        cols = columns_from_bars(bars)
+        half = len(bars) // 2                                 # chunked like the archive reader
+        for chunk in ({c: a[:half] for c, a in cols.items()}, {c: a[half:] for c, a in cols.items()}):
+            vp_build_profile.accumulate_raw(raw, chunk, 10)
+            vp_build_profile.accumulate_tv(tv, chunk, 10)
+
+        assert any(b["c"] is not None and (b["c"] * 10) % 1 == 0.5 for b in bars)
+        assert_bins_equal(raw, ref_raw)
+        assert_bins_equal(tv, ref_tv)
+
+    def test_empty_and_all_missing(self):
+        assert histogram_raw(np.array([]), np.array([]), 10) == {}
+        assert histogram_raw(np.array([np.nan]), np.array([5.0]), 10) == {}
+
+
+class TestQuickLoadParity:
+    """VPQuickLoader accumulation == the old loop (floor buckets, int() truncation)."""
+
+    @pytest.mark.parametrize("bucket_size", [1, 5])
+    def test_raw_and_tv(self, bucket_size):
+        bars = [b for b in random_bars(random.Random(11), 3000) if b["c"] is not None]
+        ref = RefQuickLoader(bucket_size)
+        ref.process(bars)
+
+        loader = object.__new__(VPQuickLoader)            # skip __init__ (HTTP client, data dirs)
+        loader.mode, loader.bucket_size = "both", bucket_size
+        loader.profile_raw, loader.profile_tv = {}, {}
+        loader.min_bucket, loader.max_bucket = float("inf"), float("-inf")
+        loader.total_volume = 0
+        loader.process_columns(columns_from_bars(bars))
+
+        # Truncation cases are present: fractional volumes and volume < microbins
+        assert any(0 < b["v"] < TV_MICROBINS for b in bars) and any(b["v"] % 1 for b in bars)
+        assert loader.profile_raw == ref.profile_raw
+        assert loader.profile_tv == ref.profile_tv
+        assert loader.total_volume == ref.total_volume
+        assert loader.min_bucket == min(ref.profile_raw.keys() | ref.profile_tv.keys())
+
+
+# ============================================================
+# Archive
+# ============================================================
+
+def bars_at(times, base=500.0):
+    return [{"t": t, "o": base, "h": base + 1, "l": base - 1, "c": base + i % 3, "v": 100 + i,
+             "vw": None if i % 4 == 0 else base} for i, t in enumerate(times)]
+
+
+class TestBarArchive:
+    def test_append_splits_years_and_skips_old_rows(self, tmp_path):
+        archive = BarArchive(tmp_path)
+        times = [T_2024 - 2 * 60_000, T_2024 - 60_000, T_2024, T_2024 + 60_000]
+        shuffled = [times[i] for i in (2, 0, 3, 1)]
+        assert archive.append("spy", columns_from_bars(bars_at(shuffled))) == 4
+        assert archive.years("SPY") == [2023, 2024]
+        assert archive.open_year("SPY", 2023)["t"].tolist() == times[:2]
+        assert archive.last_timestamp("SPY") == times[-1]
+
+        # Overlapping batch: only rows newer than the archive are written
+        later = [T_2024 + 60_000, T_2024 + 120_000, T_2024 + DAY_MS]
+        assert archive.append("SPY", columns_from_bars(bars_at(later))) == 2
+        assert archive.append("SPY", columns_from_bars(bars_at(later))) == 0
+        assert archive.append("SPY", columns_from_bars([])) == 0
+        year = archive.open_year("SPY", 2024)
+        assert year["t"].tolist() == [T_2024, T_2024 + 60_000, T_2024 + 120_000, T_2024 + DAY_MS]
+        assert np.isnan(year["vw"][0]) and year["vw"].dtype == np.float64
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_ragged_columns_are_trimmed(self, tmp_path):
+        archive = BarArchive(tmp_path)
+        archive.append("SPY", columns_from_bars(bars_at([T_2024, T_2024 + 60_000])))
+        d = tmp_path / "SPY" / "2024"
+        np.save(d / "c.npy", np.array([1.0]))                  # crash between renames
+        assert {len(a) for a in archive.open_year("SPY", 2024).values()} == {1}
+
+    def test_iter_chunks_clips(self, tmp_path):
+        archive = BarArchive(tmp_path)
+        times = [T_2024 - 60_000 * k for k in (3, 2, 1)] + [T_2024 + 60_000 * k for k in range(3)]
+        archive.append("SPY", columns_from_bars(bars_at(times)))
+        chunks = list(archive.iter_chunks("SPY", start_ms=T_2024 - 60_000, end_ms=T_2024 + 60_000))
+        assert [c["t"].tolist() for c in chunks] == [[T_2024 - 60_000], [T_2024, T_2024 + 60_000]]
+        assert set(chunks[0]) == set(COLUMNS)
+        assert list(archive.iter_chunks("QQQ")) == []
+
+    def test_downloader_flush(self, tmp_path):
+        downloader = object.__new__(VPHistoryDownloader)
+        downloader.ticker, downloader.archive = "SPY", BarArchive(tmp_path)
+        downloader.bars, downloader.rows_archived = bars_at([T_2024, T_2024 + 60_000]), 0
+        downloader.flush_archive()
+        downloader.flush_archive()                              # empty buffer: no-op
+        downloader.bars = bars_at([T_2024 + 60_000, T_2024 + 120_000])
+        downloader.flush_archive()
+        assert downloader.bars == [] and downloader.rows_archived == 3
+        assert downloader.archive.last_timestamp("SPY") == T_2024 + 120_000
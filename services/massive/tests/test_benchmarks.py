@@ -0,0 +1,103 @@
+"""
+Benchmark Tests - synthetic chains, regression comparison and a suite smoke run.
+"""
+
+import asyncio
+import json
+
+from ..benchmarks.run import QuietLogger, Suite, compare
+from ..benchmarks.synthetic_chain import (
+    ChainSpec,
+    by_symbol,
+    chain_blob,
+    generate_chain,
+    perturb,
+    tick_frames,
+)
+from ..intel.model_builders.gex import GexModelBuilder
+from ..intel.replay.replayer import replay_config
+
+SPEC = ChainSpec(symbols=["I:SPX", "I:NDX"], expirations=2, strike_range_pct=0.01, tick_rate=100)
+
+
+def _results(**medians):
+    return {"results": {name: {"median_ms": ms} for name, ms in medians.items()}}
+
+
+class TestSyntheticChain:
+    def test_deterministic(self):
+        # Prices and greeks follow the wall clock (time to expiry); the grid,
+        # smile, OI and sizes come from the seed
+        def seeded(contracts):
+            return {t: (p["implied_volatility"], p["open_interest"], p["last_quote"]["bid_size"])
+                    for t, p in contracts.items()}
+
+        assert seeded(generate_chain(SPEC)) == seeded(generate_chain(SPEC))
+
+    def test_contracts_parse_like_vendor_tickers(self):
+        contracts = generate_chain(SPEC)
+        gex = GexModelBuilder(replay_config("I:SPX,I:NDX"), QuietLogger())
+        for ticker, payload in contracts.items():
+            symbol, expiration, strike, option_type = gex._parse_ticker(ticker)
+            d = payload["details"]
+            assert (symbol, expiration, strike, option_type) == (
+                payload["underlying_asset"]["ticker"], d["expiration_date"],
+                d["strike_price"], d["contract_type"])
+            q = payload["last_quote"]
+            assert 0 <= q["bid"] < q["ask"] and q["bid"] <= q["midpoint"] <= q["ask"]
+            assert payload["open_interest"] >= 0
+
+    def test_grid_size(self):
+        grouped = by_symbol(generate_chain(SPEC))
+        # SPX: 5900 ± 59 at 5 → 5840..5960, 25 strikes; NDX: 21000 ± 210 at 10 → 43 strikes
+        assert len(grouped["I:SPX"]) == 25 * 2 * SPEC.expirations
+        assert len(grouped["I:NDX"]) == 43 * 2 * SPEC.expirations
+
+    def test_chain_blob(self):
+        contracts = generate_chain(SPEC)
+        doc = json.loads(chain_blob(contracts, version=3))
+        assert doc["version"] == 3 and doc["contracts"] == contracts
+
+    def test_tick_frames(self):
+        contracts = generate_chain(SPEC)
+        frames = tick_frames(contracts, SPEC, seconds=1.0)
+        events = [e for f in frames for e in json.loads(f["payload"])]
+        assert len(events) == SPEC.tick_rate
+        assert len(frames) == SPEC.tick_rate // SPEC.events_per_frame
+        for e in events:
+            assert e["ev"] == "Q" and e["sym"] in contracts and e["ap"] >= e["bp"]
+
+    def test_perturb(self):
+        contracts = generate_chain(SPEC)
+        before = json.dumps(contracts, sort_keys=True)
+        moved = perturb(contracts, frac=0.2, spot_move=2.0)
+        assert json.dumps(contracts, sort_keys=True) == before      # input untouched
+        assert all(moved[t]["underlying_asset"]["value"] == p["underlying_asset"]["value"] + 2.0
+                   for t, p in contracts.items())
+        requoted = sum(moved[t]["last_quote"] != p["last_quote"] for t, p in contracts.items())
+        assert 0.1 < requoted / len(contracts) < 0.3
+
+
+class TestCompare:
+    def test_flags_only_regressions_past_threshold(self):
+        baseline = _results(fast=10.0, steady=10.0, slow=10.0)
+        current = _results(fast=5.0, steady=10.5, slow=12.0, added=1.0)
+        regressions = compare(current, baseline, threshold=0.10)
+        assert len(regressions) == 1 and regressions[0].startswith("slow:")
+
+    def test_zero_baseline_is_not_a_regression(self):
+        assert compare(_results(a=3.0), _results(a=0.0), threshold=0.10) == []
+
+
+class TestSuite:
+    def test_every_benchmark_runs(self):
+        spec = ChainSpec(symbols=["I:SPX"], expirations=1, strike_range_pct=0.005, tick_rate=50)
+        results = asyncio.run(Suite(spec).run([], repeat=1, warmup=0))
+        assert set(results) == set(Suite.NAMES)
+        for stats in results.values():
+            assert stats["iterations"] == 1 and stats["median_ms"] >= 0
+
+    def test_only_filters_by_substring(self):
+        spec = ChainSpec(symbols=["I:SPX"], expirations=1, strike_range_pct=0.005, tick_rate=50)
+        results = asyncio.run(Suite(spec).run(["chain_encode"], repeat=1, warmup=0))
+        assert set(results) == {"chain_encode", "chain_encode_legacy"}
@@ -0,0 +1,371 @@
+"""
+Chain Diff Tests - massive_chain Redis Function library and its Python twin.
+
+The library itself runs twice: on Lua 5.1 through lupa (when installed),
+with stand-ins for redis.call and cjson, and against MASSIVE_TEST_REDIS_URL
+(default redis://127.0.0.1:6379/15, Redis >= 7), skipped when no server is
+reachable. The Redis tests flush that database.
+"""
+
+import asyncio
+import copy
+import json
+import os
+
+import pytest
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from ..benchmarks.synthetic_chain import ChainSpec, generate_chain, perturb, vendor_payload
+from ..intel.utils import json_codec
+from ..intel.utils.chain_diff import (
+    LATEST_KEY,
+    LIBRARY_PATH,
+    VERSION_KEY,
+    ChainBaseline,
+    apply_delta,
+    diff_chains,
+    load_library,
+    version_key,
+)
+from ..intel.workers.chain_worker import _contract_record
+
+REDIS_URL = os.environ.get("MASSIVE_TEST_REDIS_URL", "redis://127.0.0.1:6379/15")
+
+
+def _chains():
+    """(old, new) chain payloads: quotes + spot moved, 3 exited, 1 entered."""
+    spec = ChainSpec(symbols=["I:SPX", "I:NDX"], expirations=2, strike_range_pct=0.01)
+    raw = generate_chain(spec)
+    old = {t: _contract_record(vendor_payload(p)) for t, p in raw.items()}
+    new = {t: _contract_record(vendor_payload(p))
+           for t, p in perturb(raw, frac=0.2, spot_move=1.0).items()}
+
+    tickers = sorted(new)
+    for t in tickers[:3]:
+        del new[t]
+    entered = copy.deepcopy(new[tickers[-1]])
+    entered["details"]["ticker"] = "O:SPXW_ENTERED"
+    new["O:SPXW_ENTERED"] = entered
+    return {"version": 1, "contracts": old}, {"version": 2, "contracts": new}
+
+
+def _normalized(delta):
+    # Lua table order is arbitrary
+    return dict(delta, exited=sorted(delta["exited"]))
+
+
+def _versions(old, new):
+    """old, new, then a third version: more quotes and the spot moved again."""
+    third = {"version": 3, "contracts": perturb(new["contracts"], frac=0.3, spot_move=-2.5, seed=5)}
+    return [old, new, third]
+
+
+class LuaChainLibrary:
+    """
+    chain_diff.lua on Lua 5.1 (lupa). redis.call serves GET from a dict and
+    cjson is a stand-in with Redis's semantics where the library relies on
+    them: every number decodes to a double, null is a sentinel, and encode
+    keeps 14 significant digits.
+    """
+
+    def __init__(self):
+        lua51 = pytest.importorskip("lupa.lua51")
+        self.lua = lua51.LuaRuntime(unpack_returned_tuples=True)
+        self.store = {}
+        self.functions = {}
+
+        g = self.lua.globals()
+        g.cjson = self.lua.table(null=self.lua.eval("newproxy()"))
+        self.null = g.cjson.null
+        g.cjson.decode = lambda text: self._to_lua(json.loads(text))
+        g.cjson.encode = self._encode
+        g.redis = self.lua.table(
+            call=lambda cmd, key: self.store.get(key, False) if cmd == "GET" else None,
+            error_reply=lambda msg: self.lua.table(err=msg),
+            register_function=lambda spec: self.functions.__setitem__(spec.function_name, spec.callback),
+        )
+        source = LIBRARY_PATH.read_text().split("\n", 1)[1]       # drop the #!lua line
+        self.lua.execute(source)
+
+    def _to_lua(self, value):
+        if value is None:
+            return self.null
+        if isinstance(value, dict):
+            return self.lua.table_from({k: self._to_lua(v) for k, v in value.items()})
+        if isinstance(value, list):
+            return self.lua.table_from([self._to_lua(v) for v in value])
+        return value
+
+    def _encode(self, value):
+        if value == self.null:
+            return "null"
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return "%.14g" % value
+        if isinstance(value, (str, bool)):
+            return json.dumps(value)
+        return "{" + ",".join(f"{json.dumps(k)}:{self._encode(v)}" for k, v in value.items()) + "}"
+
+    def fcall(self, name, keys, args=()):
+        reply = self.functions[name](self.lua.table_from(list(keys)), self.lua.table_from(list(args)))
+        if not isinstance(reply, str):
+            raise ResponseError(reply.err)
+        return reply
+
+    def publish(self, chain):
+        blob = json_codec.dumps(chain)
+        self.store[LATEST_KEY] = blob
+        self.store[version_key(chain["version"])] = blob
+        self.store[VERSION_KEY] = str(chain["version"])
+
+
+class LuaRedis:
+    """The two calls ChainBaseline.refresh makes, served by LuaChainLibrary."""
+
+    def __init__(self, library):
+        self.library = library
+
+    async def get(self, key):
+        return self.library.store.get(key)
+
+    async def fcall_ro(self, name, numkeys, *keys_and_args):
+        return self.library.fcall(name, keys_and_args[:numkeys], keys_and_args[numkeys:])
+
+
+class TestReferenceDiff:
+    """Python twin of the Lua diff."""
+
+    def test_apply_reconstructs_new_chain(self):
+        old, new = _chains()
+        delta = diff_chains(old, new)
+        contracts = copy.deepcopy(old["contracts"])
+        apply_delta(contracts, delta)
+        assert contracts == new["contracts"]
+
+    def test_delta_shape(self):
+        old, new = _chains()
+        delta = diff_chains(old, new)
+        assert (delta["from"], delta["version"]) == (1, 2)
+        assert len(delta["exited"]) == 3
+        assert list(delta["entered"]) == ["O:SPXW_ENTERED"]
+        # Contract details never change between snapshots
+        assert all("details" not in fields for fields in delta["changed"].values())
+
+    def test_shared_underlying_sent_once(self):
+        old, new = _chains()
+        delta = diff_chains(old, new)
+        assert delta["underlying"] == {"I:SPX": 5901.0, "I:NDX": 21001.0}
+        assert all("underlying_asset" not in f for f in delta["changed"].values())
+
+    def test_conflicting_underlying_goes_per_contract(self):
+        old, new = _chains()
+        ticker = next(t for t in new["contracts"] if t in old["contracts"] and t.startswith("O:SPX"))
+        record = new["contracts"][ticker]
+        record["underlying_asset"] = dict(record["underlying_asset"], value=5902.0)
+
+        delta = diff_chains(old, new)
+        assert "I:SPX" not in delta["underlying"]
+        assert delta["changed"][ticker]["underlying_asset"]["value"] == 5902.0
+
+        contracts = copy.deepcopy(old["contracts"])
+        apply_delta(contracts, delta)
+        assert contracts == new["contracts"]
+
+    def test_identical_chains_empty_delta(self):
+        old, _ = _chains()
+        delta = diff_chains(old, dict(old, version=2))
+        assert not delta["entered"] and not delta["exited"]
+        assert not delta["changed"] and not delta["underlying"]
+
+    def test_apply_does_not_mutate_records(self):
+        old, new = _chains()
+        contracts = dict(old["contracts"])
+        before = copy.deepcopy(old["contracts"])
+        apply_delta(contracts, diff_chains(old, new))
+        assert old["contracts"] == before
+
+
+class TestLuaLibrary:
+    """massive_chain on Lua 5.1: deltas reproduce the published chain exactly."""
+
+    def test_chain_diff_matches_reference(self):
+        lib = LuaChainLibrary()
+        old, new = _chains()
+        lib.store.update({"t:old": json.dumps(old), "t:new": json.dumps(new)})
+        delta = json.loads(lib.fcall("chain_diff", ["t:old", "t:new"]))
+        expected = diff_chains(old, new)
+        assert _normalized(delta) == _normalized(expected)
+
+        contracts = copy.deepcopy(old["contracts"])
+        apply_delta(contracts, delta)
+        assert contracts == new["contracts"]
+
+    def test_baseline_matches_full_get(self):
+        lib = LuaChainLibrary()
+        old, new = _chains()
+        baseline = ChainBaseline()
+        r = LuaRedis(lib)
+
+        for chain in _versions(old, new):
+            lib.publish(chain)
+            assert asyncio.run(baseline.refresh(r))
+            latest = json.loads(lib.store[LATEST_KEY])
+            assert baseline.version == latest["version"]
+            assert baseline.contracts == latest["contracts"]
+        assert baseline.stats["full_fetches"] == 1 and baseline.stats["delta_fetches"] == 2
+
+    def test_empty_lists_stay_lists(self):
+        lib = LuaChainLibrary()
+        old, _ = _chains()
+        lib.store.update({"t:old": json.dumps(old), "t:new": json.dumps(dict(old, version=2))})
+        raw = lib.fcall("chain_diff", ["t:old", "t:new"])
+        assert '"exited":[]' in raw
+        assert json.loads(raw)["changed"] == {}
+
+    def test_other_underlying_fields_are_not_dropped(self):
+        lib = LuaChainLibrary()
+        old, new = _chains()
+        ticker = next(t for t in new["contracts"] if t in old["contracts"] and t.startswith("O:SPX"))
+        record = new["contracts"][ticker]
+        record["underlying_asset"] = dict(record["underlying_asset"], timeframe="DELAYED")
+        lib.store.update({"t:old": json.dumps(old), "t:new": json.dumps(new)})
+
+        delta = json.loads(lib.fcall("chain_diff", ["t:old", "t:new"]))
+        assert delta["changed"][ticker]["underlying_asset"]["timeframe"] == "DELAYED"
+        contracts = copy.deepcopy(old["contracts"])
+        apply_delta(contracts, delta)
+        assert contracts == new["contracts"]
+
+    @pytest.mark.parametrize("field, value", [
+        ("last_trade", {"price": 1.0, "sip_timestamp": 1729458372000000123}),   # > 2^53
+        ("conditions", []),                                                    # [] or {}?
+    ])
+    def test_inexact_delta_falls_back_to_full_get(self, field, value):
+        lib = LuaChainLibrary()
+        old, new = _chains()
+        ticker = next(t for t in new["contracts"] if t in old["contracts"])
+        new["contracts"][ticker][field] = value
+        baseline = ChainBaseline()
+        r = LuaRedis(lib)
+
+        lib.publish(old)
+        asyncio.run(baseline.refresh(r))
+        lib.publish(new)
+        reply = json.loads(lib.fcall("chain_delta", [VERSION_KEY, version_key(1), LATEST_KEY], ["1"]))
+        assert reply == {"version": 2, "missing": "exact"}
+
+        assert asyncio.run(baseline.refresh(r))
+        assert baseline.stats["full_fetches"] == 2 and baseline.stats["fallbacks"] == 1
+        assert baseline.contracts == json.loads(lib.store[LATEST_KEY])["contracts"]
+        with pytest.raises(ResponseError):
+            lib.fcall("chain_diff", [version_key(1), LATEST_KEY])
+
+
+class TestRedisFunctions:
+    """massive_chain library against a live Redis."""
+
+    @pytest.fixture
+    def redis_run(self):
+        async def connect():
+            r = Redis.from_url(REDIS_URL, decode_responses=True)
+            try:
+                info = await r.info("server")
+            except Exception:
+                await r.aclose()
+                return None
+            if int(info["redis_version"].split(".")[0]) < 7:
+                await r.aclose()
+                return None
+            await r.flushdb()
+            await load_library(r)
+            return r
+
+        loop = asyncio.new_event_loop()
+        r = loop.run_until_complete(connect())
+        if r is None:
+            loop.close()
+            pytest.skip(f"no Redis >= 7 at {REDIS_URL}")
+
+        def run(coro_fn):
+            return loop.run_until_complete(coro_fn(r))
+
+        yield run
+        loop.run_until_complete(r.flushdb())
+        loop.run_until_complete(r.aclose())
+        loop.close()
+
+    @staticmethod
+    async def _publish(r, chain):
+        blob = json.dumps(chain)
+        await r.set(LATEST_KEY, blob)
+        await r.set(version_key(chain["version"]), blob)
+        await r.set(VERSION_KEY, chain["version"])
+
+    def test_chain_diff_matches_reference(self, redis_run):
+        old, new = _chains()
+
+        async def body(r):
+            await r.set("t:old", json.dumps(old))
+            await r.set("t:new", json.dumps(new))
+            return json.loads(await r.fcall_ro("chain_diff", 2, "t:old", "t:new"))
+
+        delta = redis_run(body)
+        expected = diff_chains(old, new)
+        assert set(delta["changed"]) == set(expected["changed"])
+        assert _normalized(delta)["exited"] == _normalized(expected)["exited"]
+
+        contracts = copy.deepcopy(old["contracts"])
+        apply_delta(contracts, delta)
+        assert contracts == new["contracts"]
+
+    def test_chain_delta_states(self, redis_run):
+        old, new = _chains()
+
+        async def body(r):
+            await self._publish(r, old)
+            same = json.loads(await r.fcall_ro(
+                "chain_delta", 3, VERSION_KEY, version_key(1), LATEST_KEY, "1"))
+            missing = json.loads(await r.fcall_ro(
+                "chain_delta", 3, VERSION_KEY, version_key(0), LATEST_KEY, "0"))
+            return same, missing
+
+        same, missing = redis_run(body)
+        assert same == {"version": 1, "unchanged": True}
+        assert missing == {"version": 1, "missing": "base"}
+
+    def test_baseline_follows_versions_with_deltas(self, redis_run):
+        old, new = _chains()
+        baseline = ChainBaseline()
+
+        async def body(r):
+            await self._publish(r, old)
+            assert await baseline.refresh(r)
+            full_bytes = baseline.stats["bytes_total"]
+
+            assert await baseline.refresh(r)
+            await self._publish(r, new)
+            assert await baseline.refresh(r)
+            return full_bytes
+
+        full_bytes = redis_run(body)
+        assert baseline.version == 2
+        assert baseline.stats["full_fetches"] == 1
+        assert baseline.stats["unchanged"] == 1
+        assert baseline.stats["delta_fetches"] == 1
+        assert baseline.stats["bytes_total"] - full_bytes < full_bytes
+        assert set(baseline.contracts) == set(new["contracts"])
+
+    def test_baseline_matches_full_get(self, redis_run):
+        old, new = _chains()
+        baseline = ChainBaseline()
+
+        async def body(r):
+            for chain in _versions(old, new):
+                await self._publish(r, chain)
+                assert await baseline.refresh(r)
+                latest = json.loads(await r.get(LATEST_KEY))
+                assert baseline.version == latest["version"]
+                assert baseline.contracts == latest["contracts"]
+
+        redis_run(body)
+        assert baseline.stats["full_fetches"] == 1 and baseline.stats["delta_fetches"] == 2
@@ -0,0 +1,90 @@
+"""
+Chain Worker Tests - slim contract records keep every field downstream reads.
+"""
+
+import functools
+
+import pytest
+
+from ..benchmarks.synthetic_chain import ChainSpec, by_symbol, generate_chain, vendor_payload
+from ..intel.model_builders import builder as builder_mod
+from ..intel.model_builders import gex as gex_mod
+from ..intel.model_builders.builder import Builder
+from ..intel.model_builders.gex import GexModelBuilder
+from ..intel.replay.replayer import replay_config
+from ..intel.workers.chain_worker import CONTRACT_FIELDS, CONTRACT_SCALARS, _contract_record
+
+# (section, field) pairs read from chain:latest contracts by the model
+# builders, WsHydrator and chain_diff. Extend this when a reader starts
+# using a new field, and CONTRACT_FIELDS with it.
+READ_FIELDS = {
+    ("details", "ticker"), ("details", "expiration_date"), ("details", "strike_price"),
+    ("details", "contract_type"),
+    ("last_quote", "bid"), ("last_quote", "ask"), ("last_quote", "midpoint"),
+    ("last_trade", "price"),
+    ("greeks", "delta"), ("greeks", "gamma"), ("greeks", "theta"), ("greeks", "vega"),
+    ("underlying_asset", "value"),
+    (None, "implied_volatility"), (None, "open_interest"),
+}
+
+
+class QuietLogger:
+    def _drop(self, *args, **kwargs):
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+@pytest.fixture
+def frozen_T(monkeypatch):
+    """Same time-to-expiry for both builds (it is read from the wall clock)."""
+    frozen = functools.lru_cache(maxsize=None)(builder_mod._fractional_T)
+    monkeypatch.setattr(builder_mod, "_fractional_T", frozen)
+    monkeypatch.setattr(gex_mod, "_fractional_T", frozen)
+
+
+def _raw_and_slim():
+    spec = ChainSpec(symbols=["I:SPX", "I:NDX"], expirations=3, strike_range_pct=0.02)
+    raw = {t: vendor_payload(p) for t, p in generate_chain(spec).items()}
+    return raw, {t: _contract_record(p) for t, p in raw.items()}
+
+
+class TestContractRecord:
+    def test_fields_cover_readers(self):
+        for section, field in READ_FIELDS:
+            if section is None:
+                assert field in CONTRACT_SCALARS, field
+            else:
+                assert field in CONTRACT_FIELDS[section], (section, field)
+
+    def test_keeps_read_values_drops_vendor_extras(self):
+        raw, slim = _raw_and_slim()
+        for ticker, record in slim.items():
+            src = raw[ticker]
+            for section, field in READ_FIELDS:
+                if section is None:
+                    assert record[field] == src[field]
+                else:
+                    assert record[section][field] == src[section][field]
+            assert not {"day", "fmv", "break_even_price"} & record.keys()
+            assert "timeframe" not in record["last_quote"]
+
+    def test_missing_sections_are_omitted(self):
+        record = _contract_record({"details": {"ticker": "O:SPXW250101C05900000"},
+                                   "greeks": {}, "open_interest": 0})
+        assert record == {"details": {"ticker": "O:SPXW250101C05900000"}, "open_interest": 0}
+
+    def test_gex_identical_on_slim(self, frozen_T):
+        raw, slim = _raw_and_slim()
+        for source in ("vendor", "local"):
+            cfg = replay_config("I:SPX,I:NDX", {"MASSIVE_GEX_GREEKS_SOURCE": source})
+            gex = GexModelBuilder(cfg, QuietLogger())
+            assert gex._compute(slim)[:2] == gex._compute(raw)[:2], source
+
+    def test_surface_identical_on_slim(self, frozen_T):
+        raw, slim = _raw_and_slim()
+        builder = Builder(replay_config("I:SPX,I:NDX"), QuietLogger())
+        raw_by, slim_by = by_symbol(raw), by_symbol(slim)
+        for symbol in ("I:SPX", "I:NDX"):
+            assert (builder._build_surface(symbol, slim_by[symbol], vix=16.0)
+                    == builder._build_surface(symbol, raw_by[symbol], vix=16.0))
@@ -0,0 +1,231 @@
+"""
+Greeks Tests - vectorized IV solver and greeks against scalar Black-Scholes.
+"""
+
+import math
+from datetime import date
+
+import numpy as np
+import pytest
+
+from ..intel.model_builders.gex import GexModelBuilder
+from ..intel.model_builders.greeks import RISK_FREE_RATE as R, bs_price, greeks, implied_vol
+
+S0 = 5900.0
+HOUR = 1.0 / (365.0 * 24.0)
+
+
+def ref_cdf(x):
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+def ref_price(S, K, T, sigma, call, r=R):
+    """Textbook scalar Black-Scholes."""
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    if call:
+        return S * ref_cdf(d1) - K * math.exp(-r * T) * ref_cdf(d2)
+    return K * math.exp(-r * T) * ref_cdf(-d2) - S * ref_cdf(-d1)
+
+
+def ref_iv(price, S, K, T, call, r=R):
+    """Scalar bisection; None where the price has no solution in (1e-4, 5)."""
+    lo, hi = 1e-4, 5.0
+    if not (ref_price(S, K, T, lo, call, r) < price < ref_price(S, K, T, hi, call, r)):
+        return None
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        if ref_price(S, K, T, mid, call, r) > price:
+            hi = mid
+        else:
+            lo = mid
+    return 0.5 * (lo + hi)
+
+
+def chain():
+    """Deep ITM to deep OTM, one hour to a year, calls and puts."""
+    rows = []
+    for T in (HOUR, 1 / 365, 7 / 365, 30 / 365, 1.0):
+        for K in (4500.0, 5400.0, 5800.0, 5900.0, 5950.0, 6300.0, 7500.0):
+            for sigma in (0.08, 0.2, 0.6, 1.5):
+                for call in (True, False):
+                    rows.append((K, T, sigma, call))
+    K, T, sigma, call = (np.array(c) for c in zip(*rows))
+    return K, T, sigma, call.astype(bool)
+
+
+class TestPrice:
+    def test_bs_price_matches_scalar(self):
+        K, T, sigma, call = chain()
+        vec = bs_price(S0, K, T, sigma, call)
+        ref = [ref_price(S0, k, t, s, c) for k, t, s, c in zip(K, T, sigma, call)]
+        assert np.allclose(vec, ref, rtol=1e-10, atol=1e-9)
+
+
+class TestImpliedVol:
+    """Solved vols reprice the input and agree with a scalar root find."""
+
+    def test_recovers_vol_where_price_is_informative(self):
+        K, T, sigma, call = chain()
+        price = np.array([ref_price(S0, k, t, s, c) for k, t, s, c in zip(K, T, sigma, call)])
+        iv = implied_vol(price, S0, K, T, call)
+
+        df = np.exp(-R * T)
+        intrinsic = np.where(call, np.maximum(S0 - K * df, 0), np.maximum(K * df - S0, 0))
+        solvable = price - intrinsic > 1e-3      # wings priced at intrinsic carry no vol information
+        assert solvable.sum() > len(K) // 2
+        assert np.isfinite(iv[solvable]).all()
+        assert np.allclose(iv[solvable], sigma[solvable], atol=2e-4)
+
+        solved = np.isfinite(iv)
+        assert np.allclose(bs_price(S0, K[solved], T[solved], iv[solved], call[solved]),
+                           price[solved], atol=2e-6)
+
+    def test_matches_scalar_reference_on_quotes(self):
+        rng = np.random.default_rng(5)
+        n = 400
+        K = rng.uniform(4800, 7000, n).round()
+        T = rng.choice([HOUR, 2 / 365, 14 / 365, 0.5], n)
+        call = rng.random(n) < 0.5
+        sigma = rng.uniform(0.1, 0.9, n)
+        price = np.round([ref_price(S0, k, t, s, c) for k, t, s, c in zip(K, T, sigma, call)], 2)
+
+        iv = implied_vol(price, S0, K, T, call)
+        vega = greeks(S0, K, T, iv, call)["vega"]
+        for i in range(n):
+            expected = ref_iv(price[i], S0, K[i], T[i], call[i])
+            if expected is None:
+                assert np.isnan(iv[i]), i
+                continue
+            # Converged in price (tol 1e-6); in vol wherever vega makes that meaningful
+            assert ref_price(S0, K[i], T[i], iv[i], call[i]) == pytest.approx(price[i], abs=2e-6), i
+            if vega[i] > 0.05:
+                assert iv[i] == pytest.approx(expected, abs=1e-4), i
+
+    def test_deep_itm_and_otm(self):
+        T = np.array([30 / 365] * 4)
+        K = np.array([4000.0, 8000.0, 8000.0, 4000.0])
+        call = np.array([True, True, False, False])       # ITM call, OTM call, ITM put, OTM put
+        price = bs_price(S0, K, T, 0.7, call)
+        assert np.allclose(implied_vol(price, S0, K, T, call), 0.7, atol=1e-4)
+
+    def test_unsolvable_contracts_are_nan(self):
+        K = np.full(7, 5900.0)
+        T = np.array([0.0, -HOUR, 7 / 365, 7 / 365, 7 / 365, 7 / 365, 7 / 365])
+        price = np.array([
+            20.0,        # zero time to expiry
+            20.0,        # expired
+            np.nan,      # no bid / no mid (GexModelBuilder leaves NaN)
+            0.0,         # zero price
+            -1.0,
+            S0,          # call at the S bound
+            5.0,
+        ])
+        S = np.array([S0] * 6 + [0.0])   # missing spot
+        iv = implied_vol(price, S, K, T, np.ones(7, dtype=bool))
+        assert np.isnan(iv).all()
+
+        # At or below intrinsic: deep ITM put quoted under parity
+        intrinsic = 7000.0 * math.exp(-R * 7 / 365) - S0
+        iv = implied_vol(np.array([intrinsic, intrinsic - 1.0]), S0, 7000.0, 7 / 365, np.array([False, False]))
+        assert np.isnan(iv).all()
+
+    def test_scalar_inputs_broadcast(self):
+        price = bs_price(S0, np.array([5800.0, 6000.0]), 7 / 365, 0.25, True)
+        assert np.allclose(implied_vol(price, S0, np.array([5800.0, 6000.0]), 7 / 365, True), 0.25, atol=1e-5)
+        assert implied_vol(np.array([]), S0, np.array([]), 0.1, True).shape == (0,)
+
+
+class TestGreeks:
+    def test_against_finite_differences(self):
+        K, T, sigma, call = chain()
+        keep = T > HOUR
+        K, T, sigma, call = K[keep], T[keep], sigma[keep], call[keep]
+        g = greeks(S0, K, T, sigma, call)
+
+        h = 0.01
+        up, down = bs_price(S0 + h, K, T, sigma, call), bs_price(S0 - h, K, T, sigma, call)
+        mid = bs_price(S0, K, T, sigma, call)
+        assert np.allclose(g["delta"], (up - down) / (2 * h), atol=1e-6)
+        assert np.allclose(g["gamma"], (up - 2 * mid + down) / (h * h), atol=1e-4)
+
+        dv = 1e-5
+        vega = (bs_price(S0, K, T, sigma + dv, call) - bs_price(S0, K, T, sigma - dv, call)) / (2 * dv)
+        assert np.allclose(g["vega"], vega, rtol=1e-5, atol=1e-6)
+
+        dt = 1e-6
+        theta = -(bs_price(S0, K, T + dt, sigma, call) - bs_price(S0, K, T - dt, sigma, call)) / (2 * dt)
+        assert np.allclose(g["theta"], theta, rtol=1e-4, atol=1e-3)
+
+    def test_nan_sigma_propagates(self):
+        g = greeks(np.array([S0]), np.array([5900.0]), np.array([0.1]), np.array([np.nan]), np.array([True]))
+        assert all(np.isnan(v).all() for v in g.values())
+
+
+class TestMid:
+    """GexModelBuilder._mid feeds the solver; no usable quote → None (NaN price)."""
+
+    def test_quote_fallbacks(self):
+        assert GexModelBuilder._mid({"last_quote": {"midpoint": 4.2}}) == 4.2
+        assert GexModelBuilder._mid({"last_quote": {"bid": 4.0, "ask": 5.0}}) == 4.5
+        assert GexModelBuilder._mid({"last_quote": {"bid": 0, "ask": 0.05}, "last_trade": {"price": 0.03}}) == 0.03
+        assert GexModelBuilder._mid({"last_quote": {"bid": 0, "ask": 0.05}}) is None
+        assert GexModelBuilder._mid({}) is None
+
+
+class TestGexLiveSpot:
+    """WS rebuilds solve IV against the live spot, not the chain's stale underlying value."""
+
+    def test_spot_moves_chain_does_not(self):
+        import asyncio
+        import json
+
+        from ..benchmarks.synthetic_chain import ChainSpec, generate_chain
+        from ..intel.model_builders.builder import _fractional_T
+        from ..intel.replay.memory_redis import MemoryRedis
+        from ..intel.replay.replayer import replay_config
+
+        class QuietLogger:
+            def _drop(self, *args, **kwargs):
+                return None
+
+            info = warn = warning = error = debug = ok = _drop
+
+        live = 5950.0
+        contracts = generate_chain(ChainSpec(symbols=["I:SPX"], expirations=3, strike_range_pct=0.02))
+        expected = {}
+        for payload in contracts.values():
+            d = payload["details"]
+            assert payload["underlying_asset"]["value"] == S0          # chain still says 5900
+            T = _fractional_T(date.fromisoformat(d["expiration_date"]))
+            if T <= 0:
+                continue
+            is_call = d["contract_type"] == "call"
+            iv = payload["implied_volatility"]
+            mid = float(bs_price(live, d["strike_price"], T, iv, is_call))
+            payload["last_quote"] = {"midpoint": mid}                  # WS quote at the live spot
+            if mid > 0.05:
+                g = float(greeks(live, d["strike_price"], T, iv, is_call)["gamma"])
+                key = (d["contract_type"], d["expiration_date"], str(int(d["strike_price"])))
+                expected[key] = g * payload["open_interest"] * 100
+
+        r = MemoryRedis()
+        gex = GexModelBuilder(replay_config("I:SPX"), QuietLogger())
+        gex._redis = r
+
+        async def run():
+            await r.set("massive:model:spot:I:SPX", json.dumps({"symbol": "I:SPX", "value": live}))
+            await gex.receive_snapshot({"I:SPX": contracts})
+            return {side: json.loads(await r.get(f"massive:gex:model:I:SPX:{side}s"))["expirations"]
+                    for side in ("call", "put")}
+
+        published = asyncio.run(run())
+        assert len(expected) > 20
+        for (side, exp, strike), value in expected.items():
+            assert published[side][exp][strike] == pytest.approx(value, rel=1e-3), (side, exp, strike)
+
+        # Without a live spot the stale chain value is used, and gamma is off
+        stale = gex._compute(contracts)[0]["I:SPX"]
+        off = [abs(stale[exp][k] / v - 1) for (side, exp, k), v in expected.items()
+               if side == "call" and k in stale.get(exp, {})]
+        assert max(off) > 0.05
@@ -0,0 +1,50 @@
+"""
+JSON Codec Tests - orjson fast path and stdlib fallback agree with json.
+"""
+
+import json
+
+import pytest
+
+from ..benchmarks.synthetic_chain import ChainSpec, generate_chain
+from ..intel.utils import json_codec
+
+
+def _doc():
+    spec = ChainSpec(symbols=["I:SPX"], expirations=2, strike_range_pct=0.01)
+    return {"ts": 1718900000.123456, "symbol": "I:SPX", "unicode": "Δ γ",
+            "nested": {"empty": [], "none": None, "flag": True},
+            "contracts": generate_chain(spec)}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        if not json_codec.HAS_ORJSON:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(json_codec, "HAS_ORJSON", False)
+    return json_codec
+
+
+class TestJsonCodec:
+    def test_dumps_returns_str(self, codec):
+        out = codec.dumps({"a": 1, "b": [1.5, "x"]})
+        assert isinstance(out, str)
+        assert " " not in out                       # compact either way
+
+    def test_loads_accepts_str_and_bytes(self, codec):
+        text = json.dumps({"a": [1, 2.5, None], "b": "Δ"})
+        assert codec.loads(text) == codec.loads(text.encode()) == json.loads(text)
+
+    def test_round_trip_matches_stdlib(self, codec):
+        doc = _doc()
+        out = codec.dumps(doc)
+        assert codec.loads(out) == json.loads(json.dumps(doc)) == doc
+        assert json.loads(out) == doc               # stdlib readers see the same values
+
+    def test_fallback_is_stdlib_compact(self, monkeypatch):
+        monkeypatch.setattr(json_codec, "HAS_ORJSON", False)
+        doc = _doc()
+        assert json_codec.dumps(doc) == json.dumps(doc, separators=(",", ":"))
+
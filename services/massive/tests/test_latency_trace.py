@@ -0,0 +1,115 @@
+"""
+Latency Trace Tests - HDR histogram accuracy and the WS-path span hooks.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from ..intel.replay.memory_redis import MemoryRedis
+from ..intel.replay.replayer import replay_config
+from ..intel.utils.latency_trace import (
+    STAGES,
+    LatencyHistogram,
+    LatencyTracer,
+    _bucket,
+    _bucket_floor,
+    format_latency,
+)
+
+
+class QuietLogger:
+    def _drop(self, *args, **kwargs):
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+def _tracer():
+    tracer = LatencyTracer(replay_config("I:SPX"), QuietLogger())
+    tracer._redis = MemoryRedis()
+    return tracer
+
+
+class TestHistogram:
+    def test_bucket_floor_bounds_value(self):
+        for us in list(range(0, 300)) + [1_000, 65_537, 1_234_567, 98_999_000]:
+            floor = _bucket_floor(_bucket(us))
+            assert floor <= us
+            assert us - floor <= max(1, us / 64)
+
+    def test_buckets_are_monotonic(self):
+        idx = [_bucket(us) for us in range(0, 200_000, 7)]
+        assert idx == sorted(idx)
+
+    def test_percentiles_within_one_percent(self):
+        samples = np.random.default_rng(3).lognormal(2.0, 1.0, 20_000)  # ms
+        h = LatencyHistogram()
+        for ms in samples:
+            h.record_ms(float(ms))
+        assert h.total == len(samples)
+        for pct in (50, 95, 99):
+            exact = float(np.percentile(samples, pct))
+            assert h.percentile_ms(pct) == pytest.approx(exact, rel=0.02)
+        assert h.max_us == int(samples.max() * 1000)
+
+    def test_empty_and_negative(self):
+        h = LatencyHistogram()
+        assert h.percentile_ms(99) == 0.0
+        h.record_ms(-5.0)                      # clock skew clamps to 0
+        assert h.percentile_ms(50) == 0.0 and h.total == 1
+        h.reset()
+        assert h.total == 0 and not h.counts
+
+
+class TestTracer:
+    def test_stream_entry_spans(self):
+        tracer = _tracer()
+        tracer.record_stream_entry("1700000000100-0", {"ts": "1700000000.040"}, now=1700000000.250)
+        s = tracer.summary()
+        assert s["ws_to_stream"]["max_ms"] == pytest.approx(60.0, abs=0.01)
+        assert s["stream_to_hydrate"]["max_ms"] == pytest.approx(150.0, abs=0.01)
+
+    def test_stream_entry_without_ts_is_ignored(self):
+        tracer = _tracer()
+        tracer.record_stream_entry("1700000000100-0", {"payload": "[]"}, now=1700000000.2)
+        tracer.record_stream_entry("bogus", {"ts": "1.0"}, now=2.0)
+        assert all(s["count"] == 0 for s in tracer.summary().values())
+
+    def test_first_unpublished_tick_is_the_origin(self):
+        tracer = _tracer()
+        tracer.mark_dirty("I:SPX", "O:A", recv_ts=100.0, now=100.1)
+        tracer.mark_dirty("I:SPX", "O:A", recv_ts=105.0, now=105.1)   # same ticker, later tick
+        tracer.mark_dirty("I:SPX", "O:B", recv_ts=None, now=105.1)    # no receive stamp
+        tracer.mark_dirty("I:NDX", "O:C", recv_ts=104.0, now=104.1)
+
+        trace = tracer.begin_emit()
+        assert trace.pending == {"I:SPX": [(100.0, 100.1)], "I:NDX": [(104.0, 104.1)]}
+        assert tracer.summary()["hydrate_to_emit"]["count"] == 2
+        assert tracer.begin_emit().pending == {}                      # ownership moved to the trace
+
+        trace.mark_built("I:SPX")
+        trace.mark_published("I:SPX")
+        s = tracer.summary()
+        assert s["emit_to_build"]["count"] == 1 and s["build_to_publish"]["count"] == 1
+        assert s["tick_to_tile"]["count"] == 1                        # only I:SPX published
+
+    def test_export_writes_window_and_resets(self):
+        tracer = _tracer()
+        for ms in (1.0, 2.0, 3.0):
+            tracer.record("tick_to_tile", ms)
+        asyncio.run(tracer.export())
+
+        stored = asyncio.run(tracer._redis.hgetall(LatencyTracer.ANALYTICS_KEY))
+        assert int(stored["tick_to_tile:count"]) == 3
+        assert float(stored["tick_to_tile:max_ms"]) == 3.0
+        assert {f"{stage}:p99_ms" for stage in STAGES} <= set(stored)
+        assert tracer.summary()["tick_to_tile"]["count"] == 0
+
+    def test_format_latency(self):
+        tracer = _tracer()
+        tracer.record("emit_to_build", 12.5)
+        lines = format_latency(tracer.summary()).splitlines()
+        assert len(lines) == 1 + len(STAGES)
+        assert lines[STAGES.index("emit_to_build") + 1].split()[:2] == ["emit_to_build", "1"]
@@ -0,0 +1,146 @@
+"""
+Loop Monitor Tests - wrapped workers behave as before, and loop time, lag
+and stall stacks are attributed to the worker that blocked.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from ..intel.replay.memory_redis import MemoryRedis
+from ..intel.replay.replayer import replay_config
+from ..intel.utils.loop_monitor import LoopMonitor
+
+
+class QuietLogger:
+    def _drop(self, *args, **kwargs):
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+def _monitor(**overrides):
+    monitor = LoopMonitor(replay_config("I:SPX", overrides), QuietLogger())
+    monitor._redis = MemoryRedis()
+    return monitor
+
+
+def _block_loop(sec):
+    time.sleep(sec)
+
+
+async def _worker(steps, block_sec=0.0):
+    total = 0
+    for i in range(steps):
+        if block_sec:
+            _block_loop(block_sec)
+        await asyncio.sleep(0)
+        total += i
+    return total
+
+
+class TestWrap:
+    """A wrapped worker coroutine gives the same result as the bare one."""
+
+    def test_result_matches_unwrapped(self):
+        monitor = _monitor()
+        bare = asyncio.run(_worker(5))
+        wrapped = asyncio.run(monitor.wrap("w", _worker(5)))
+        assert wrapped == bare == 10
+        assert monitor.tasks["w"].steps == 6               # 5 yields + the final step
+
+    def test_exception_propagates(self):
+        async def boom():
+            await asyncio.sleep(0)
+            raise RuntimeError("worker failed")
+
+        with pytest.raises(RuntimeError, match="worker failed"):
+            asyncio.run(_monitor().wrap("w", boom()))
+
+    def test_exception_thrown_in_is_catchable(self):
+        async def handles():
+            try:
+                await asyncio.wait_for(asyncio.sleep(1), timeout=0.01)
+            except asyncio.TimeoutError:
+                return "recovered"
+
+        assert asyncio.run(_monitor().wrap("w", handles())) == "recovered"
+
+    def test_cancel_reaches_worker_finally(self):
+        cleaned = []
+
+        async def worker():
+            try:
+                await asyncio.sleep(10)
+            finally:
+                cleaned.append(True)
+
+        async def main():
+            task = asyncio.create_task(_monitor().wrap("w", worker()))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        assert cleaned == [True]
+
+
+class TestAttribution:
+    def test_busy_time_goes_to_the_blocking_worker(self):
+        monitor = _monitor()
+
+        async def main():
+            await asyncio.gather(
+                monitor.wrap("blocker", _worker(3, block_sec=0.03)),
+                monitor.wrap("idle", _worker(3)),
+            )
+
+        asyncio.run(main())
+        blocker, idle = monitor.tasks["blocker"], monitor.tasks["idle"]
+        assert blocker.busy_sec >= 0.09 and blocker.max_step_sec >= 0.03
+        assert idle.busy_sec < 0.01
+
+    def test_lag_stalls_and_export(self):
+        monitor = _monitor(MASSIVE_LOOP_SAMPLE_MS=10, MASSIVE_LOOP_LAG_THRESHOLD_MS=50,
+                           MASSIVE_LOOP_EXPORT_SEC=3600)
+
+        async def main():
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(monitor.run(stop))
+            await asyncio.sleep(0.05)
+            await monitor.wrap("blocker", _worker(1, block_sec=0.12))
+            await asyncio.sleep(0.05)
+            stop.set()
+            await sampler
+            await monitor.export()
+
+        asyncio.run(main())
+        stored = asyncio.run(monitor._redis.hgetall(LoopMonitor.ANALYTICS_KEY))
+        assert int(stored["lag:stalls"]) >= 1
+        assert float(stored["lag:max_ms"]) >= 60
+        assert int(stored["lag:samples"]) >= 3
+        assert float(stored["task:blocker:max_step_ms"]) >= 120
+        # Window reset after export
+        assert monitor.stalls == 0 and monitor.lag.total == 0 and monitor.tasks["blocker"].steps == 0
+
+    def test_profiler_samples_the_blocking_stack(self):
+        monitor = _monitor(MASSIVE_LOOP_PROFILER="true", MASSIVE_LOOP_SAMPLE_MS=10,
+                           MASSIVE_LOOP_LAG_THRESHOLD_MS=20, MASSIVE_LOOP_PROFILE_MS=5,
+                           MASSIVE_LOOP_EXPORT_SEC=3600)
+
+        async def main():
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(monitor.run(stop))
+            await asyncio.sleep(0.05)
+            await monitor.wrap("blocker", _worker(1, block_sec=0.2))
+            stop.set()
+            await sampler
+            await monitor.export()
+
+        asyncio.run(main())
+        stored = asyncio.run(monitor._redis.hgetall(LoopMonitor.ANALYTICS_KEY))
+        stacks = json.loads(stored["profile:stacks"])
+        assert stacks and any("_block_loop" in frame for entry in stacks for frame in entry["stack"])
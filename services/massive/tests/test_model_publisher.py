@@ -0,0 +1,120 @@
+"""
+Model Publisher Tests - slices and payloads assembled from cached tile JSON.
+
+Every payload is compared with the full-model state it must describe, over
+deltas that change, add and remove tiles across DTEs and strategies.
+"""
+
+import asyncio
+import json
+import random
+
+from shared import heatmap_slices
+
+from ..intel.model_builders.model_publisher import ModelPublisher, _json_with_members
+from ..intel.replay.memory_redis import MemoryRedis
+from ..intel.replay.replayer import replay_config
+
+SYM = "I:SPX"
+
+
+class QuietLogger:
+    def _drop(self, *args, **kwargs):
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+def tile(strategy, dte, width, strike, mid):
+    return {"symbol": SYM, "strategy": strategy, "dte": dte, "strike": strike, "width": width,
+            "call": {"mid": mid, "market_mid": round(mid, 2)}, "put": {"mid": mid / 2, "market_mid": None}}
+
+
+def random_delta(rng, model, n_changed=40, n_removed=8):
+    keys = list(model)
+    changed = {}
+    for _ in range(n_changed):
+        if keys and rng.random() < 0.7:
+            key = rng.choice(keys)
+            strategy, dte, width, strike = key.split(":")
+        else:
+            strategy = rng.choice(["single", "vertical", "butterfly"])
+            dte, width, strike = rng.randint(0, 3), rng.choice([0, 5, 10]), rng.randrange(5800, 6000, 5)
+            key = f"{strategy}:{dte}:{width}:{strike}"
+        changed[key] = tile(strategy, int(dte), int(width), float(strike), rng.uniform(0, 50))
+    removed = rng.sample(keys, min(n_removed, len(keys)))
+    return {"changed": changed, "removed": removed}
+
+
+def make_publisher(redis):
+    publisher = ModelPublisher(replay_config(SYM), QuietLogger())
+    publisher._redis = redis
+    return publisher
+
+
+async def published_slices(redis):
+    versions = await redis.hgetall(heatmap_slices.versions_key(SYM))
+    out = {}
+    for field in versions:
+        if field == heatmap_slices.MODEL_FIELD:
+            continue
+        out[field] = json.loads(await redis.get(heatmap_slices.slice_key(SYM, field)))
+    return versions, out
+
+
+def expected_slices(model):
+    out = {}
+    for key, t in model.items():
+        for field in (heatmap_slices.slice_field(t["dte"]), heatmap_slices.slice_field(t["dte"], t["strategy"])):
+            out.setdefault(field, {})[key] = t
+    return out
+
+
+class TestModelPublisher:
+    def test_payloads_track_model(self):
+        rng = random.Random(7)
+        redis = MemoryRedis()
+        publisher = make_publisher(redis)
+        model = {}
+
+        async def run():
+            for step in range(30):
+                delta = random_delta(rng, model)
+                if step == 15:
+                    # Warm restore mid-session: caches rebuilt from the model
+                    publisher.restore_state(publisher.checkpoint_state())
+                before, _ = await published_slices(redis)
+                await publisher.receive_delta(SYM, delta)
+
+                model.update(delta["changed"])
+                for key in delta["removed"]:
+                    model.pop(key, None)
+
+                live = json.loads(await redis.get(f"massive:heatmap:model:{SYM}:latest"))
+                assert live["tiles"] == model
+                assert live["dtes_available"] == sorted({t["dte"] for t in model.values()})
+
+                versions, slices = await published_slices(redis)
+                expected = expected_slices(model)
+                assert {f: s["tiles"] for f, s in slices.items()} == expected
+                for field, s in slices.items():
+                    dte, strategy = heatmap_slices.parse_field(field)
+                    assert s["dte"] == dte and s.get("strategy") == strategy
+                # Untouched slices keep their version
+                touched = {f for key in list(delta["changed"]) + delta["removed"]
+                           for f in publisher._tile_fields(key)}
+                if step != 15:
+                    for field in set(versions) - touched - {heatmap_slices.MODEL_FIELD}:
+                        assert versions[field] == before.get(field)
+
+                entry = (await redis.xrange(f"massive:heatmap:replay:{SYM}"))[-1]
+                replay = json.loads(entry[1]["payload"])
+                assert replay["changed"] == delta["changed"] and replay["removed"] == delta["removed"]
+
+        asyncio.run(run())
+
+    def test_json_with_members(self):
+        members = [f"{json.dumps(k)}: {json.dumps(v)}" for k, v in (("a", 1), ("b", {"c": [1.5, None]}))]
+        meta = {"ts": 1.25, "symbol": "I:SPX"}
+        assert _json_with_members(meta, "tiles", members) == json.dumps({**meta, "tiles": {"a": 1, "b": {"c": [1.5, None]}}})
+        assert _json_with_members({}, "tiles", []) == json.dumps({"tiles": {}})
@@ -0,0 +1,135 @@
+"""
+Replay Tests - record a session off MemoryRedis, then replay it through
+WsHydrator / WsConsumer / Builder / ModelPublisher.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from ..benchmarks.synthetic_chain import ChainSpec, chain_blob, generate_chain, tick_frames
+from ..intel.replay.memory_redis import MemoryRedis
+from ..intel.replay.recorder import CHAIN_KEY, STREAM_KEY, SessionRecorder
+from ..intel.replay.replayer import SessionReplayer, parse_speed, replay_config
+from ..intel.replay.session import SessionWriter, read_session
+
+SYM = "I:SPX"
+HEATMAP_KEY = f"massive:heatmap:model:{SYM}:latest"
+
+
+class QuietLogger:
+    def _drop(self, *args, **kwargs):
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+def small_chain():
+    spec = ChainSpec(symbols=[SYM], expirations=2, strike_range_pct=0.01, tick_rate=200)
+    contracts = generate_chain(spec)
+    return contracts, tick_frames(contracts, spec, seconds=0.5)
+
+
+async def record(path, contracts, frames):
+    """Run the recorder's stream tail and key poll against a MemoryRedis."""
+    r = MemoryRedis()
+    writer = SessionWriter(path, meta={"spot_symbols": [SYM, "I:VIX"]})
+    recorder = SessionRecorder(replay_config(SYM), QuietLogger(), writer, [SYM, "I:VIX"], poll_ms=5)
+    recorder._redis = r
+
+    await r.set(f"massive:model:spot:{SYM}", json.dumps({"symbol": SYM, "value": 5900.0}))
+    await r.set("massive:model:spot:I:VIX", json.dumps({"symbol": "I:VIX", "value": 16.0}))
+    await r.set(CHAIN_KEY, chain_blob(contracts, version=3))
+    await recorder._record_chain(3)
+
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(recorder._tail_stream(stop)), asyncio.create_task(recorder._poll_keys(stop))]
+    await asyncio.sleep(0.02)
+    for i in range(0, len(frames), 5):
+        for frame in frames[i:i + 5]:
+            await r.xadd(STREAM_KEY, frame)
+        await asyncio.sleep(0.005)
+    await r.set(f"massive:model:spot:{SYM}", json.dumps({"symbol": SYM, "value": 5901.0}))
+
+    for _ in range(200):
+        if writer.counts["ws"] == len(frames) and writer.counts["spot"] == 3:
+            break
+        await asyncio.sleep(0.01)
+    stop.set()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    writer.close()
+    return dict(writer.counts)
+
+
+class TestSession:
+    def test_writer_reader_round_trip(self, tmp_path):
+        writer = SessionWriter(tmp_path / "s.jsonl.gz", meta={"vp": False})
+        writer.write("spot", key="k", raw="1")
+        writer.write("ws", f={"ts": "1", "payload": "[]"})
+        with pytest.raises(ValueError):
+            writer.write("bogus")
+        writer.close()
+
+        header, events = read_session(tmp_path / "s.jsonl.gz")
+        events = list(events)
+        assert header["format"] == "massive-session" and header["vp"] is False
+        assert [e["k"] for e in events] == ["spot", "ws"] and events[0]["t"] <= events[1]["t"]
+
+    def test_parse_speed(self):
+        assert parse_speed("max") is None and parse_speed("10x") == 10.0
+        with pytest.raises(ValueError):
+            parse_speed("-1")
+
+
+class TestRecordReplay:
+    """Everything recorded is replayed and reaches the published heatmap."""
+
+    def test_round_trip(self, tmp_path):
+        contracts, frames = small_chain()
+        path = tmp_path / "session.jsonl.gz"
+        counts = asyncio.run(record(path, contracts, frames))
+        assert counts == {"ws": len(frames), "chain": 1, "spot": 3, "key": 0, "vp": 0}
+
+        header, events = read_session(path)
+        assert header["spot_symbols"] == [SYM, "I:VIX"]
+        replayer = SessionReplayer(replay_config(SYM), QuietLogger(), speed=None)
+        report = asyncio.run(replayer.replay(events))
+
+        assert report["events"] == {"chain": 1, "spot": 3, "ws": len(frames)}
+        stages = report["stages"]
+        assert stages["chain_snapshot"]["calls"] == 1 and stages["chain_snapshot"]["errors"] == 0
+        assert stages["hydrate"]["items"] == len(frames)          # every WS entry drained
+        assert stages["build"]["calls"] >= 2 and stages["publish"]["calls"] >= 2
+        assert all(s.get("errors", 0) == 0 for s in stages.values())
+        assert replayer._pending_ws == 0
+
+        # Every WS-path span was traced; one tick_to_tile per ticker dirty at an emit
+        latency = report["latency"]
+        assert all(latency[stage]["count"] > 0 for stage in latency)
+        assert latency["ws_to_stream"]["count"] == latency["stream_to_hydrate"]["count"] == len(frames)
+        assert latency["tick_to_tile"]["count"] == latency["hydrate_to_emit"]["count"]
+
+        # Last recorded spot value is what the stages saw
+        spot = asyncio.run(replayer.redis.get(f"massive:model:spot:{SYM}"))
+        assert json.loads(spot)["value"] == 5901.0
+
+        model = json.loads(asyncio.run(replayer.redis.get(HEATMAP_KEY)))
+        assert model["symbol"] == SYM and model["tiles"]
+        assert {t.split(":")[0] for t in model["tiles"]} >= {"single", "vertical", "butterfly"}
+
+    def test_replay_is_deterministic_in_stage_calls(self, tmp_path):
+        contracts, frames = small_chain()
+        path = tmp_path / "session.jsonl.gz"
+        asyncio.run(record(path, contracts, frames))
+
+        def run():
+            _, events = read_session(path)
+            replayer = SessionReplayer(replay_config(SYM), QuietLogger(), speed=None)
+            report = asyncio.run(replayer.replay(events))
+            tiles = json.loads(asyncio.run(replayer.redis.get(HEATMAP_KEY)))["tiles"]
+            return {k: v["calls"] for k, v in report["stages"].items()}, set(tiles)
+
+        assert run() == run()
@@ -0,0 +1,154 @@
+"""
+Spot History Tests - OhlcRollup and the bars SpotHistoryWriter queues.
+"""
+
+import asyncio
+import random
+
+from ..intel.utils.spot_history import (
+    OhlcRollup,
+    SpotHistoryWriter,
+    bars_key,
+    encode_bar,
+    event_epoch,
+)
+
+T0 = 1_772_460_000.0   # minute-aligned epoch
+
+
+def ref_bars(samples, sec):
+    """Plain-loop OHLC of (ts, price) samples."""
+    bars = {}
+    for ts, px in samples:
+        start = int(ts // sec) * sec
+        bar = bars.get(start)
+        if bar is None:
+            bars[start] = [start, px, px, px, px]
+        else:
+            bar[2], bar[3], bar[4] = max(bar[2], px), min(bar[3], px), px
+    return list(bars.values())
+
+
+def walk(rng, n, dt=0.35):
+    ts, px, out = T0, 5900.0, []
+    for _ in range(n):
+        ts += rng.uniform(0.05, dt * 2)
+        px += rng.gauss(0, 0.5)
+        out.append((ts, round(px, 2)))
+    return out
+
+
+class FakePipeline:
+    """Records zadd/zremrangebyscore on in-memory sorted sets."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def set(self, key, value):
+        self.store[key] = value
+
+    def zadd(self, key, mapping):
+        self.store.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, lo, hi):
+        zset = self.store.get(key, {})
+        for member in [m for m, s in zset.items() if lo <= s <= hi]:
+            del zset[member]
+
+    def expire(self, key, ttl):
+        pass
+
+    async def execute(self):
+        return []
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self.store)
+
+
+def decode_bar(member):
+    t, o, h, l, c = member.split(",")
+    return {"ts": int(t), "open": float(o), "high": float(h), "low": float(l), "close": float(c)}
+
+
+def stored_bars(r, sym, tf):
+    zset = r.store.get(bars_key(sym, tf), {})
+    return [decode_bar(m) for m, _ in sorted(zset.items(), key=lambda kv: kv[1])]
+
+
+class TestOhlcRollup:
+    """Open bars track the plain-loop OHLC and ignore late samples."""
+
+    def test_matches_reference(self):
+        rng = random.Random(2)
+        samples = walk(rng, 2000)
+        rollup = OhlcRollup()
+        closed = {tf: [] for tf in rollup.timeframes}
+        for ts, px in samples:
+            for tf, bar, rolled in rollup.update(ts, px):
+                if rolled:
+                    closed[tf].append(bar)
+        for tf, sec in rollup.timeframes.items():
+            assert closed[tf] == ref_bars(samples, sec)
+
+    def test_late_sample_and_range(self):
+        rollup = OhlcRollup({"1m": 60})
+        rollup.update(T0 + 61, 10.0)
+        assert rollup.update(T0 + 5, 99.0) == []             # earlier bar: ignored
+        (_, bar, rolled), = rollup.update(T0 + 62, 11.0, high=11.5, low=9.5)
+        assert not rolled and bar == [T0 + 60, 10.0, 11.5, 9.5, 11.0]
+
+    def test_bar_codec(self):
+        bar = [T0, 5900.25, 5901.0, 5899.5, 5900.75]
+        assert decode_bar(encode_bar(bar)) == {
+            "ts": int(T0), "open": 5900.25, "high": 5901.0, "low": 5899.5, "close": 5900.75}
+
+
+class TestSpotHistoryWriter:
+    """Bars come from sampled prices at event time."""
+
+    def test_snapshot_day_range_does_not_stretch_bars(self):
+        r = FakeRedis()
+        writer = SpotHistoryWriter(r, trail_window_sec=3600, trail_ttl_sec=7200)
+
+        async def run():
+            for i, px in enumerate((5900.0, 5901.5, 5899.0)):
+                await writer.write({
+                    "symbol": "SPY", "value": px, "high": 5950.0, "low": 5850.0,   # day range
+                    "ts_epoch_ms": int((T0 + 10 * i) * 1000),
+                }, now_epoch=T0 + 500)
+
+        asyncio.run(run())
+        assert stored_bars(r, "SPY", "1m") == [
+            {"ts": int(T0), "open": 5900.0, "high": 5901.5, "low": 5899.0, "close": 5899.0}]
+        assert [b["ts"] for b in stored_bars(r, "SPY", "1s")] == [int(T0), int(T0) + 10, int(T0) + 20]
+        assert writer.last_ts["SPY"] == T0 + 20
+
+    def test_aggregate_range_and_late_samples(self):
+        r = FakeRedis()
+        writer = SpotHistoryWriter(r, trail_window_sec=3600, trail_ttl_sec=7200)
+
+        def agg(second, close, high, low):
+            return {"symbol": "QQQ", "value": close, "high": high, "low": low,
+                    "ts": f"2026-03-02T14:{second // 60:02d}:{second % 60:02d}+00:00"}
+
+        async def run():
+            await writer.write(agg(0, 500.0, 500.4, 499.8), now_epoch=0, range_sec=1)
+            await writer.write(agg(1, 500.2, 500.3, 500.0), now_epoch=0, range_sec=1)
+            await writer.write(agg(0, 480.0, 480.0, 480.0), now_epoch=0, range_sec=1)   # late
+
+        asyncio.run(run())
+        minute = stored_bars(r, "QQQ", "1m")
+        assert minute == [{"ts": minute[0]["ts"], "open": 500.0, "high": 500.4, "low": 499.8, "close": 500.2}]
+        assert '"value": 480.0' in r.store["massive:model:spot:QQQ"]   # latest still written
+        assert len(stored_bars(r, "QQQ", "1s")) == 2
+
+    def test_event_epoch(self):
+        assert event_epoch({"ts_epoch_ms": 1500}, 9.0) == 1.5
+        assert event_epoch({"ts": "1970-01-01T00:00:02Z"}, 9.0) == 2.0
+        assert event_epoch({"ts": "garbage"}, 9.0) == 9.0
+        assert event_epoch({}, 9.0) == 9.0
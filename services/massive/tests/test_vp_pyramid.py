@@ -0,0 +1,118 @@
+"""
+Volume Profile Pyramid Tests - roll-ups, level selection and range queries
+returning the same totals at every level.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from ..intel.replay.memory_redis import MemoryRedis
+from ..intel.volume_profile.vp_pyramid import (
+    BASE_STEP,
+    PYRAMID_STEPS,
+    build_levels,
+    level_key,
+    levels_from_base,
+    query_range,
+    queue_increments,
+    queue_replace_levels,
+    range_fields,
+    rollup,
+    select_level,
+)
+
+SYM = "SPX"
+
+
+def random_bins(rng, n=400, lo=580000, hi=600000):
+    return {bucket: rng.randint(1, 500) for bucket in
+            (rng.randrange(lo, hi, BASE_STEP) for _ in range(n))}
+
+
+def level_totals(r, lo, hi):
+    async def run():
+        return {res: sum((await query_range(r, SYM, lo, hi, res))[1].values())
+                for res in (0.10, 1.0, 5.0, 25.0)}
+    return asyncio.run(run())
+
+
+class TestLevels:
+    """Pure roll-up helpers."""
+
+    def test_rollup_and_build_levels(self):
+        bins = {590010: 5, 590090: 7, 590100: 1, 592499: 2, 592500: 4}
+        assert rollup(bins, 100) == {590000: 12, 590100: 1, 592400: 2, 592500: 4}
+        levels = build_levels(bins)
+        assert list(levels) == list(PYRAMID_STEPS)
+        assert levels[BASE_STEP] == bins and levels[2500] == {590000: 15, 592500: 4}
+        assert all(sum(v.values()) == sum(bins.values()) for v in levels.values())
+
+        coarse = build_levels({590000: 3}, source_step=100)
+        assert sorted(coarse) == [100, 500, 2500]
+
+    def test_levels_from_base_hash_reply(self):
+        levels = levels_from_base({"590010": "5", "590090": "7", "590510": "2"})
+        assert sorted(levels) == [100, 500, 2500]
+        assert levels[100] == {590000: 12.0, 590500: 2.0}
+        assert levels[2500] == {590000: 14.0}
+
+    def test_select_level_and_fields(self):
+        assert select_level(1) == 10 and select_level(10) == 10
+        assert select_level(99) == 10 and select_level(100) == 100
+        assert select_level(2400) == 500 and select_level(100000) == 2500
+        assert range_fields(590050, 590310, 100) == [590000, 590100, 590200, 590300]
+        assert range_fields(590100, 590000, 100) == []
+
+    def test_level_key(self):
+        assert level_key(SYM, BASE_STEP) == "massive:volume_profile:spx"
+        assert level_key(SYM, 500) == "massive:volume_profile:spx:pyramid:500"
+
+
+class TestQueryRange:
+    """Every resolution reports the same volume once levels share the base."""
+
+    def test_increments_keep_levels_consistent(self):
+        rng = random.Random(3)
+        r = MemoryRedis()
+
+        async def run():
+            for _ in range(5):
+                pending = random_bins(rng, n=80)
+                pipe = r.pipeline(transaction=False)
+                for b, v in pending.items():
+                    pipe.hincrby(level_key(SYM, BASE_STEP), str(b), v)
+                queue_increments(pipe, SYM, pending)
+                await pipe.execute()
+
+        asyncio.run(run())
+        totals = level_totals(r, 5800.0, 5999.99)
+        assert len(set(totals.values())) == 1 and totals[0.10] > 0
+
+    def test_rebuild_from_base_replaces_drifted_levels(self):
+        rng = random.Random(4)
+        r = MemoryRedis()
+        base = random_bins(rng)
+
+        async def run():
+            await r.hset(level_key(SYM, BASE_STEP), mapping={str(k): v for k, v in base.items()})
+            await r.hset(level_key(SYM, 100), mapping={"100": 999})   # stale level from elsewhere
+            pipe = r.pipeline(transaction=False)
+            queue_replace_levels(pipe, SYM, levels_from_base(await r.hgetall(level_key(SYM, BASE_STEP))))
+            await pipe.execute()
+            return await r.hgetall(level_key(SYM, 100))
+
+        level = asyncio.run(run())
+        assert "100" not in level
+        totals = level_totals(r, 5800.0, 5999.99)
+        assert set(totals.values()) == {sum(base.values())}
+
+    def test_query_range_bounds(self):
+        r = MemoryRedis()
+        asyncio.run(r.hset(level_key(SYM, 500), mapping={"590000": 4, "590500": 6}))
+        step, buckets = asyncio.run(query_range(r, SYM, 5902.0, 5906.0, 5.0))
+        assert step == 500 and buckets == {590000: 4, 590500: 6}
+        assert asyncio.run(query_range(r, SYM, 5906.0, 5902.0, 5.0)) == (500, {})
+        with pytest.raises(ValueError):
+            asyncio.run(query_range(r, SYM, 1000.0, 9000.0, 0.10))
@@ -0,0 +1,140 @@
+"""
+Warm State Tests - checkpoint codec, torn-file rejection and the freshness
+checks WarmStateStore.restore applies at startup.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from ..intel.model_builders.model_publisher import ModelPublisher
+from ..intel.replay.memory_redis import MemoryRedis
+from ..intel.replay.replayer import replay_config
+from ..intel.utils.warm_state import (
+    ET,
+    HEADER,
+    WarmStateStore,
+    decode_checkpoint,
+    decode_header,
+    encode_checkpoint,
+    trading_day,
+)
+
+# 2026-03-02 15:00 ET (a Monday session)
+NOW = datetime(2026, 3, 2, 15, 0, tzinfo=ET).timestamp()
+STATES = {"builder": {"previous_surfaces": {"I:SPX": {"single:0:0:5900": {"dte": 0}}}}, "chain": {"version": 12}}
+
+
+class QuietLogger:
+    def _drop(self, *args, **kwargs):
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+class Component:
+    def __init__(self, state=None, fail=False):
+        self.state = state
+        self.fail = fail
+        self.restored = None
+
+    def checkpoint_state(self):
+        return self.state
+
+    def restore_state(self, state):
+        if self.fail:
+            raise RuntimeError("bad state")
+        self.restored = state
+
+
+def store(tmp_path, **config):
+    cfg = replay_config("I:SPX", {"MASSIVE_WARM_STATE_DIR": str(tmp_path), **config})
+    return WarmStateStore(cfg, QuietLogger())
+
+
+class TestCodec:
+    def test_round_trip(self):
+        blob = encode_checkpoint(STATES, NOW)
+        assert decode_header(blob) == (NOW, "2026-03-02")
+        assert decode_checkpoint(blob) == (NOW, "2026-03-02", STATES)
+
+    def test_trading_day_is_new_york(self):
+        late = datetime(2026, 3, 2, 23, 30, tzinfo=ET).timestamp()    # 04:30 UTC next day
+        assert trading_day(late) == "2026-03-02"
+
+    @pytest.mark.parametrize("mangle", [
+        lambda b: b[:HEADER.size - 1],                                  # truncated header
+        lambda b: b[:-3],                                               # torn body
+        lambda b: b[:HEADER.size] + bytes([b[HEADER.size] ^ 0xFF]) + b[HEADER.size + 1:],  # flipped byte
+        lambda b: b"NOTWARM!" + b[8:],                                  # foreign file
+    ])
+    def test_rejects_damaged_files(self, mangle):
+        with pytest.raises(ValueError):
+            decode_checkpoint(mangle(encode_checkpoint(STATES, NOW)))
+
+
+class TestRestore:
+    """Only a same-trading-day, young, intact checkpoint is restored."""
+
+    def write(self, s, created, states=STATES):
+        s._write(states, created)
+
+    def test_fresh_checkpoint_restores_components(self, tmp_path):
+        s = store(tmp_path)
+        builder, chain, idle = Component(), Component(fail=True), Component()
+        s.register("builder", builder)
+        s.register("chain", chain)
+        s.register("hydrator", idle)                    # nothing recorded for it
+        self.write(s, NOW - 30)
+
+        report = s.restore(now=NOW)
+        assert report["restored"] and report["components"] == ["builder"]
+        assert report["age_sec"] == 30.0
+        assert builder.restored == STATES["builder"] and idle.restored is None
+
+    @pytest.mark.parametrize("created, max_age, reason", [
+        (datetime(2026, 2, 27, 15, 59, tzinfo=ET).timestamp(), 10 ** 7, "stale trading day 2026-02-27"),
+        (datetime(2026, 3, 2, 0, 5, tzinfo=ET).timestamp() - 600, 10 ** 7, "stale trading day 2026-03-01"),
+        (NOW - 301, 300, "too old"),
+        (NOW + 5, 300, "too old"),                      # clock went backwards
+    ])
+    def test_stale_checkpoints_start_cold(self, tmp_path, created, max_age, reason):
+        s = store(tmp_path, MASSIVE_WARM_MAX_AGE_SEC=max_age)
+        component = Component()
+        s.register("builder", component)
+        self.write(s, created)
+
+        report = s.restore(now=NOW)
+        assert not report["restored"] and report["reason"].startswith(reason)
+        assert component.restored is None
+
+    def test_missing_and_torn_files_start_cold(self, tmp_path):
+        s = store(tmp_path)
+        s.register("builder", Component())
+        assert s.restore(now=NOW) == {"restored": False, "reason": "no checkpoint"}
+
+        self.write(s, NOW - 1)
+        s.path.write_bytes(s.path.read_bytes()[:-10])
+        report = s.restore(now=NOW)
+        assert not report["restored"] and report["reason"].startswith("unreadable")
+
+
+class TestCheckpoint:
+    def test_checkpoint_then_restore_model_publisher(self, tmp_path):
+        s = store(tmp_path)
+        s._redis = MemoryRedis()
+        live = ModelPublisher(replay_config("I:SPX"), QuietLogger())
+        live.current_models["I:SPX"] = {"single:0:0:5900": {"dte": 0, "strike": 5900}}
+        s.register("model_publisher", live)
+
+        asyncio.run(s.checkpoint())
+        assert not list(tmp_path.glob("*.tmp"))
+        analytics = asyncio.run(s._redis.hgetall(WarmStateStore.ANALYTICS_KEY))
+        assert analytics["checkpoints"] == "1" and int(analytics["bytes"]) == s.path.stat().st_size
+
+        restarted = store(tmp_path)
+        fresh = ModelPublisher(replay_config("I:SPX"), QuietLogger())
+        restarted.register("model_publisher", fresh)
+        assert restarted.restore()["restored"]
+        assert fresh.current_models["I:SPX"] == live.current_models["I:SPX"]
@@ -0,0 +1,158 @@
+"""
+Worker Supervisor Tests - restart backoff, healthy-run reset, escalation
+window and early-return faults.
+"""
+
+import asyncio
+
+import pytest
+
+from ..intel.replay.memory_redis import MemoryRedis
+from ..intel.replay.replayer import replay_config
+from ..supervisor import worker_supervisor
+from ..supervisor.restart_policy import RestartPolicy
+from ..supervisor.worker_supervisor import WorkerSupervisor
+
+
+class QuietLogger:
+    def _drop(self, *args, **kwargs):
+        return None
+
+    info = warn = warning = error = debug = ok = _drop
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return 1_772_460_000.0 + self.now
+
+
+class Worker:
+    """Scripted worker: each run is (seconds it lasts, outcome)."""
+
+    def __init__(self, clock, stop, runs):
+        self.clock, self.stop, self.runs = clock, stop, list(runs)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        lasts, outcome = self.runs.pop(0) if self.runs else (0, "stop")
+        self.clock.now += lasts
+        if outcome == "stop":
+            self.stop.set()
+        elif outcome == "raise":
+            raise ValueError(f"boom {self.calls}")
+        # "return": early return without stop
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """Fake clock + a policy that records attempts and never actually sleeps."""
+    clock = FakeClock()
+    attempts = []
+
+    class RecordingPolicy(RestartPolicy):
+        def next_delay(self):
+            super().next_delay()
+            attempts.append(self.attempts)
+            return 0.0
+
+    monkeypatch.setattr(worker_supervisor, "time", clock)
+    monkeypatch.setattr(worker_supervisor, "RestartPolicy", RecordingPolicy)
+    return clock, attempts
+
+
+def supervisor(**config):
+    s = WorkerSupervisor(replay_config("I:SPX", {k: str(v) for k, v in config.items()}), QuietLogger())
+    s._redis = MemoryRedis()
+    return s
+
+
+def run(s, clock, runs, name="gex"):
+    async def go():
+        stop = asyncio.Event()
+        worker = Worker(clock, stop, runs)
+        await s.supervise(name, worker, stop)
+        return worker
+    return asyncio.run(go())
+
+
+class TestRestarts:
+    def test_backoff_grows_then_resets_after_healthy_run(self, env):
+        clock, attempts = env
+        s = supervisor(MASSIVE_WORKER_HEALTHY_SEC=60)
+        worker = run(s, clock, [(1, "raise"), (1, "raise"), (1, "raise"), (120, "raise"), (1, "raise"), (0, "stop")])
+        assert worker.calls == 6
+        # Fourth run lasted past healthy_sec: backoff starts over
+        assert attempts == [1, 2, 3, 1, 2]
+
+    def test_early_return_is_a_fault(self, env):
+        clock, attempts = env
+        s = supervisor()
+        worker = run(s, clock, [(5, "return"), (0, "stop")])
+        assert worker.calls == 2 and attempts == [1]
+        analytics = asyncio.run(s._redis.hgetall(WorkerSupervisor.ANALYTICS_KEY))
+        assert analytics["restarts:gex"] == "1"
+        assert analytics["last_error:gex"] == "RuntimeError: worker returned before stop"
+
+    def test_return_on_stop_is_clean(self, env):
+        clock, attempts = env
+        worker = run(supervisor(), clock, [(5, "stop")])
+        assert worker.calls == 1 and attempts == []
+
+
+class TestEscalation:
+    def test_too_many_failures_in_window_escalate(self, env):
+        clock, attempts = env
+        s = supervisor(MASSIVE_WORKER_MAX_RESTARTS=3, MASSIVE_WORKER_RESTART_WINDOW_SEC=600)
+        with pytest.raises(ValueError, match="boom 4"):
+            run(s, clock, [(10, "raise")] * 10)
+        assert attempts == [1, 2, 3]
+
+    def test_failures_outside_the_window_do_not_count(self, env):
+        clock, attempts = env
+        s = supervisor(MASSIVE_WORKER_MAX_RESTARTS=3, MASSIVE_WORKER_RESTART_WINDOW_SEC=600,
+                       MASSIVE_WORKER_HEALTHY_SEC=10 ** 6)
+        # One failure every 250s: at most three inside any 600s window
+        worker = run(s, clock, [(250, "raise")] * 8 + [(0, "stop")])
+        assert worker.calls == 9 and attempts == list(range(1, 9))
+
+    def test_zero_max_restarts_never_escalates(self, env):
+        clock, attempts = env
+        worker = run(supervisor(MASSIVE_WORKER_MAX_RESTARTS=0), clock, [(0, "raise")] * 20 + [(0, "stop")])
+        assert worker.calls == 21
+
+
+class TestLifecycle:
+    def test_disabled_runs_once_and_propagates(self, env):
+        clock, attempts = env
+        s = supervisor(MASSIVE_WORKER_RESTART="false")
+        with pytest.raises(ValueError):
+            run(s, clock, [(0, "raise")])
+        assert attempts == []
+
+    def test_stop_during_backoff_and_cancel(self):
+        s = supervisor(MASSIVE_RESTART_BASE_SEC=60)
+
+        async def failing():
+            raise ValueError("down")
+
+        async def go():
+            stop = asyncio.Event()
+            task = asyncio.create_task(s.supervise("chain", failing, stop))
+            await asyncio.sleep(0.05)                  # now waiting out a ~60s backoff
+            stop.set()
+            await asyncio.wait_for(task, 1.0)
+
+            blocked = asyncio.create_task(s.supervise("ws", asyncio.Event().wait, asyncio.Event()))
+            await asyncio.sleep(0.01)
+            blocked.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await blocked
+
+        asyncio.run(go())
@@ -6,6 +6,7 @@ Reads from market-redis:
   - massive:model:spot:{symbol} — current spot prices
   - massive:gex:model:{symbol}:calls/puts — gamma exposure
   - massive:heatmap:model:{symbol}:latest — convexity heatmap
+    (per-DTE butterfly slices via massive:heatmap:versions:{symbol} when published)
 """
 
 from __future__ import annotations
@@ -15,6 +16,8 @@ from typing import Any, Dict, Optional
 
 import redis
 
+from shared.heatmap_slices import SliceCache, select, slice_key, versions_key
+
 
 class MarketReader:
     """
@@ -26,6 +29,7 @@ class MarketReader:
     def __init__(self, r_market: redis.Redis, logger):
         self.r = r_market
         self.logger = logger
+        self._heatmap_slices = SliceCache()
 
     def _safe_json(self, raw: Optional[str]) -> Optional[Dict]:
         if not raw:
@@ -51,7 +55,24 @@ class MarketReader:
         }
 
     def get_heatmap(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Get heatmap model for a symbol."""
+        """
+        Get heatmap model for a symbol. Only butterfly tiles are used, so read
+        the per-DTE butterfly slices (fetching only those whose version moved);
+        fall back to the full model when slices are not published.
+        """
+        versions = self.r.hgetall(versions_key(symbol))
+        fields = select(versions, strategy="butterfly") if versions else []
+        if fields:
+            cache = self._heatmap_slices
+            stale = cache.stale(symbol, versions, fields)
+            if stale:
+                pipe = self.r.pipeline(transaction=False)
+                for field in stale:
+                    pipe.get(slice_key(symbol, field))
+                for field, raw in zip(stale, pipe.execute()):
+                    cache.put(symbol, field, versions[field], self._safe_json(raw))
+            return cache.merged(symbol, fields)
+
         raw = self.r.get(f"massive:heatmap:model:{symbol}:latest")
         return self._safe_json(raw)
 
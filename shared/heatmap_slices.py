@@ -0,0 +1,134 @@
+# shared/heatmap_slices.py
+
+"""
+Heatmap Slices - per-DTE / per-strategy heatmap keys + consumer-side cache
+
+Besides the full model, massive's ModelPublisher maintains:
+
+    massive:heatmap:model:{symbol}:dte:{dte}              JSON, tiles of one DTE
+    massive:heatmap:model:{symbol}:dte:{dte}:{strategy}   JSON, one DTE + strategy
+    massive:heatmap:versions:{symbol}                     HASH field → version
+
+Version hash fields are "model" (the full model) and the slice fields
+"dte:{dte}" / "dte:{dte}:{strategy}". A slice's version only moves when
+one of its tiles changes, so a consumer can poll the hash (one HGETALL)
+and GET only the slices whose version moved. Slice payloads have the same
+shape as the full model (ts, symbol, version, tiles, ...) plus "dte" and
+"strategy".
+
+SliceCache holds the consumer side; it does no I/O, so the same logic works
+with sync and async Redis clients:
+
+    versions = await r.hgetall(versions_key(symbol))
+    fields = select(versions, strategy="butterfly")
+    for field in cache.stale(symbol, versions, fields):
+        cache.put(symbol, field, versions[field], json.loads(await r.get(slice_key(symbol, field))))
+    heatmap = cache.merged(symbol, fields)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MODEL_FIELD = "model"
+
+
+def versions_key(symbol: str) -> str:
+    return f"massive:heatmap:versions:{symbol}"
+
+
+def slice_field(dte: int, strategy: Optional[str] = None) -> str:
+    return f"dte:{dte}:{strategy}" if strategy else f"dte:{dte}"
+
+
+def slice_key(symbol: str, field: str) -> str:
+    """Redis key for a slice field ("dte:0", "dte:0:butterfly")."""
+    return f"massive:heatmap:model:{symbol}:{field}"
+
+
+def parse_field(field: str) -> Optional[Tuple[int, Optional[str]]]:
+    """(dte, strategy or None) for a slice field; None for "model" / unknown."""
+    parts = field.split(":")
+    if len(parts) not in (2, 3) or parts[0] != "dte":
+        return None
+    try:
+        dte = int(parts[1])
+    except ValueError:
+        return None
+    return dte, (parts[2] if len(parts) == 3 else None)
+
+
+def select(
+    versions: Dict[str, Any],
+    dte: Optional[int] = None,
+    strategy: Optional[str] = None,
+) -> List[str]:
+    """
+    Slice fields covering the request: one DTE and/or one strategy. With a
+    strategy, the (DTE, strategy) slices; otherwise the whole-DTE slices.
+    """
+    fields = []
+    for field in versions:
+        parsed = parse_field(field)
+        if parsed is None:
+            continue
+        f_dte, f_strategy = parsed
+        if dte is not None and f_dte != dte:
+            continue
+        if f_strategy != strategy:
+            continue
+        fields.append(field)
+    return sorted(fields, key=lambda f: parse_field(f)[0])
+
+
+class SliceCache:
+    """Last-seen version + payload per (symbol, slice field)."""
+
+    def __init__(self) -> None:
+        self._slices: Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]] = {}
+        self.fetches = 0
+        self.skips = 0
+
+    def stale(self, symbol: str, versions: Dict[str, Any], fields: Iterable[str]) -> List[str]:
+        """Fields whose published version differs from the cached one."""
+        # Forget slices that are no longer published (DTE rolled off)
+        for key in [k for k in self._slices if k[0] == symbol and k[1] not in versions]:
+            del self._slices[key]
+
+        out = []
+        for field in fields:
+            cached = self._slices.get((symbol, field))
+            if cached is not None and cached[0] == str(versions.get(field)):
+                self.skips += 1
+            else:
+                out.append(field)
+        return out
+
+    def put(self, symbol: str, field: str, version: Any, payload: Optional[Dict[str, Any]]) -> None:
+        self.fetches += 1
+        if payload is None:
+            self._slices.pop((symbol, field), None)
+        else:
+            self._slices[(symbol, field)] = (str(version), payload)
+
+    def get(self, symbol: str, field: str) -> Optional[Dict[str, Any]]:
+        cached = self._slices.get((symbol, field))
+        return cached[1] if cached else None
+
+    def merged(self, symbol: str, fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """
+        Union of the cached slices as one model-shaped dict (newest slice's
+        metadata, all tiles). None when none of the slices are cached.
+        """
+        payloads = [p for p in (self.get(symbol, f) for f in fields) if p is not None]
+        if not payloads:
+            return None
+        if len(payloads) == 1:
+            return payloads[0]
+
+        newest = max(payloads, key=lambda p: p.get("version") or 0)
+        tiles: Dict[str, Any] = {}
+        for p in payloads:
+            tiles.update(p.get("tiles") or {})
+        merged = {k: v for k, v in newest.items() if k not in ("tiles", "dte")}
+        merged["tiles"] = tiles
+        merged["dtes_available"] = sorted({p["dte"] for p in payloads if "dte" in p})
+        return merged
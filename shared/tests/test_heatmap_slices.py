@@ -0,0 +1,69 @@
+"""
+Heatmap Slices Tests - slice field helpers and the consumer-side SliceCache.
+"""
+
+from ..heatmap_slices import (
+    MODEL_FIELD,
+    SliceCache,
+    parse_field,
+    select,
+    slice_field,
+    slice_key,
+    versions_key,
+)
+
+
+def payload(dte, version, tiles, strategy=None):
+    p = {"ts": 1.0, "symbol": "I:SPX", "epoch": "current", "version": version, "dte": dte, "tiles": tiles}
+    if strategy:
+        p["strategy"] = strategy
+    return p
+
+
+class TestFields:
+    def test_round_trip_and_keys(self):
+        assert parse_field(slice_field(3)) == (3, None)
+        assert parse_field(slice_field(0, "butterfly")) == (0, "butterfly")
+        assert parse_field(MODEL_FIELD) is None
+        assert parse_field("dte:x") is None and parse_field("dte:1:a:b") is None
+        assert slice_key("I:SPX", "dte:2") == "massive:heatmap:model:I:SPX:dte:2"
+        assert versions_key("I:SPX") == "massive:heatmap:versions:I:SPX"
+
+    def test_select(self):
+        versions = {MODEL_FIELD: "9", "dte:10": "1", "dte:2": "1", "dte:2:single": "1", "dte:10:single": "1"}
+        assert select(versions) == ["dte:2", "dte:10"]
+        assert select(versions, strategy="single") == ["dte:2:single", "dte:10:single"]
+        assert select(versions, dte=10) == ["dte:10"]
+        assert select(versions, dte=10, strategy="vertical") == []
+
+
+class TestSliceCache:
+    def test_stale_put_and_forget(self):
+        cache = SliceCache()
+        versions = {MODEL_FIELD: "5", "dte:0": "5", "dte:1": "4"}
+        assert cache.stale("I:SPX", versions, ["dte:0", "dte:1"]) == ["dte:0", "dte:1"]
+        cache.put("I:SPX", "dte:0", 5, payload(0, 5, {"a": 1}))
+        cache.put("I:SPX", "dte:1", "4", payload(1, 4, {"b": 2}))
+
+        assert cache.stale("I:SPX", versions, ["dte:0", "dte:1"]) == []      # int vs str version
+        assert cache.skips == 2 and cache.fetches == 2
+
+        versions = {MODEL_FIELD: "6", "dte:1": "6"}                           # dte:0 rolled off
+        assert cache.stale("I:SPX", versions, ["dte:1"]) == ["dte:1"]
+        assert cache.get("I:SPX", "dte:0") is None
+        assert cache.get("I:NDX", "dte:1") is None
+
+        cache.put("I:SPX", "dte:1", "6", None)                               # key gone: forget
+        assert cache.get("I:SPX", "dte:1") is None
+
+    def test_merged(self):
+        cache = SliceCache()
+        assert cache.merged("I:SPX", ["dte:0"]) is None
+        cache.put("I:SPX", "dte:0", 5, payload(0, 5, {"a": 1}))
+        assert cache.merged("I:SPX", ["dte:0"]) == payload(0, 5, {"a": 1})
+
+        cache.put("I:SPX", "dte:2", 7, payload(2, 7, {"b": 2, "c": 3}))
+        merged = cache.merged("I:SPX", ["dte:0", "dte:1", "dte:2"])
+        assert merged["version"] == 7 and "dte" not in merged
+        assert merged["tiles"] == {"a": 1, "b": 2, "c": 3}
+        assert merged["dtes_available"] == [0, 2]
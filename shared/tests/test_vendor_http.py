@@ -0,0 +1,267 @@
+"""
+Vendor HTTP Tests - retries, Retry-After, cursor pagination and ordered
+look-ahead against a local stub aiohttp server.
+"""
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ..vendor_http import VendorHttpClient, VendorHttpError, iter_ordered
+
+
+class Stub:
+    """Scripted handlers on a loopback server; records every request."""
+
+    def __init__(self):
+        self.requests = []
+        self.scripts = {}
+        self.app = web.Application()
+        self.app.router.add_get("/{tail:.*}", self.handle)
+        self.server = None
+
+    def script(self, path, *responses):
+        """Responses are served in order; the last one repeats."""
+        self.scripts[path] = list(responses)
+
+    async def handle(self, request):
+        self.requests.append(request)
+        responses = self.scripts[request.path]
+        response = responses.pop(0) if len(responses) > 1 else responses[0]
+        if callable(response):
+            return await response(request)
+        status, body, headers = response
+        if status == 200:
+            return web.json_response(body, headers=headers)
+        return web.Response(status=status, text=body, headers=headers)
+
+    def hits(self, path):
+        return sum(1 for r in self.requests if r.path == path)
+
+    async def __aenter__(self):
+        self.server = TestServer(self.app)
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.server.close()
+
+    def url(self, path=""):
+        return str(self.server.make_url(path))
+
+    def client(self, **kwargs):
+        kwargs.setdefault("backoff_base_sec", 0.001)
+        kwargs.setdefault("backoff_max_sec", 0.01)
+        return VendorHttpClient("secret", self.url(), **kwargs)
+
+
+def ok(body, headers=None):
+    return 200, body, headers or {}
+
+
+def fail(status, headers=None):
+    return status, f"status {status}", headers or {}
+
+
+class TestGetJson:
+    """Transient statuses retry; client errors do not."""
+
+    def test_retries_429_and_5xx(self):
+        async def run():
+            async with Stub() as stub:
+                stub.script("/v3/a", fail(429, {"Retry-After": "0"}), fail(503), fail(502), ok({"n": 1}))
+                async with stub.client(max_retries=3) as client:
+                    data = await client.get_json("/v3/a", {"ticker": "I:SPX"}, endpoint="a")
+                    return data, stub, client.metrics()["a"]
+
+        data, stub, metrics = asyncio.run(run())
+        assert data == {"n": 1} and stub.hits("/v3/a") == 4
+        assert metrics["retries"] == 3 and metrics["errors"] == 0
+        first = stub.requests[0]
+        assert first.query["ticker"] == "I:SPX"
+        assert first.headers["Authorization"] == "Bearer secret"
+
+    def test_no_retry_on_4xx(self):
+        async def run():
+            async with Stub() as stub:
+                stub.script("/v3/missing", fail(404), ok({}))
+                async with stub.client(max_retries=3) as client:
+                    with pytest.raises(VendorHttpError) as err:
+                        await client.get_json("/v3/missing", endpoint="missing")
+                    return err.value, stub, client.metrics()["missing"]
+
+        err, stub, metrics = asyncio.run(run())
+        assert err.status == 404 and err.endpoint == "missing" and "status 404" in str(err)
+        assert stub.hits("/v3/missing") == 1
+        assert metrics["retries"] == 0 and metrics["errors"] == 1
+
+    def test_retries_exhausted(self):
+        async def run():
+            async with Stub() as stub:
+                stub.script("/v3/down", fail(500))
+                async with stub.client(max_retries=2) as client:
+                    with pytest.raises(VendorHttpError) as err:
+                        await client.get_json("/v3/down")
+                    return err.value, stub
+
+        err, stub = asyncio.run(run())
+        assert err.status == 500 and stub.hits("/v3/down") == 3
+
+    def test_backoff_honours_retry_after(self):
+        client = VendorHttpClient("k", backoff_base_sec=0.5, backoff_max_sec=10.0)
+        assert client._backoff(0, "2") == 2.0
+        assert client._backoff(0, "9999") == 60.0                 # capped at 6 × backoff_max
+        for attempt, base in ((0, 0.5), (2, 2.0), (10, 10.0)):
+            delay = client._backoff(attempt, "Wed, 21 Oct 2026 07:28:00 GMT")   # HTTP-date: ignored
+            assert base <= delay <= base * 1.2
+
+
+def paged(stub, pages):
+    """Script /v3/list as `pages` result lists chained by absolute next_url cursors."""
+    def page(i):
+        body = {"results": pages[i]}
+        if i + 1 < len(pages):
+            body["next_url"] = stub.url(f"/v3/list?cursor={i + 1}")
+        return body
+
+    async def handle(request):
+        return web.json_response(page(int(request.query.get("cursor", 0))))
+    stub.script("/v3/list", handle)
+
+
+class TestPagination:
+    def test_follows_cursors(self):
+        async def run():
+            async with Stub() as stub:
+                paged(stub, [[1, 2], [], [3], [4, 5]])
+                async with stub.client() as client:
+                    items = [x async for x in client.iter_results("/v3/list", {"limit": 2})]
+                    return items, stub
+
+        items, stub = asyncio.run(run())
+        assert items == [1, 2, 3, 4, 5]
+        # Original params on the first request only; cursors carry the rest
+        assert [dict(r.query) for r in stub.requests] == [
+            {"limit": "2"}, {"cursor": "1"}, {"cursor": "2"}, {"cursor": "3"}]
+
+    def test_prefetch_is_bounded(self):
+        async def run():
+            async with Stub() as stub:
+                paged(stub, [[i] for i in range(10)])
+                async with stub.client(prefetch_pages=1) as client:
+                    pages = client.iter_pages("/v3/list")
+                    async with aclosing(pages):
+                        await pages.__anext__()
+                        await asyncio.sleep(0.1)                # consumer stalls on page 0
+                        return stub.hits("/v3/list")
+
+        # page 0 consumed, page 1 queued, page 2 fetched and waiting on the full queue
+        assert asyncio.run(run()) == 3
+
+    def test_error_mid_stream_reaches_consumer(self):
+        async def run():
+            async with Stub() as stub:
+                async def handle(request):
+                    if request.query.get("cursor"):
+                        return web.Response(status=403, text="forbidden")
+                    return web.json_response({"results": [1], "next_url": stub.url("/v3/list?cursor=1")})
+                stub.script("/v3/list", handle)
+                async with stub.client() as client:
+                    seen = []
+                    with pytest.raises(VendorHttpError) as err:
+                        async for x in client.iter_results("/v3/list"):
+                            seen.append(x)
+                    return seen, err.value
+
+        seen, err = asyncio.run(run())
+        assert seen == [1] and err.status == 403
+
+    def test_consumer_exit_cancels_producer(self):
+        async def run():
+            async with Stub() as stub:
+                blocked, cancelled = asyncio.Event(), asyncio.Event()
+
+                async def handle(request):
+                    if not request.query.get("cursor"):
+                        return web.json_response({"results": [0], "next_url": stub.url("/v3/list?cursor=1")})
+                    blocked.set()
+                    try:
+                        await asyncio.sleep(30)
+                    except asyncio.CancelledError:
+                        cancelled.set()
+                        raise
+                stub.script("/v3/list", handle)
+
+                async with stub.client() as client:
+                    async with aclosing(client.iter_results("/v3/list")) as items:
+                        async for _ in items:
+                            await blocked.wait()
+                            break
+                    # The prefetching request is abandoned, not left running
+                    await asyncio.wait_for(cancelled.wait(), 2.0)
+                    return stub.hits("/v3/list")
+
+        assert asyncio.run(run()) == 2
+
+
+class TestIterOrdered:
+    def test_order_window_and_errors(self):
+        started, active, peak = [], [0], [0]
+
+        def job(i, delay, boom=False):
+            async def run():
+                started.append(i)
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                try:
+                    await asyncio.sleep(delay)
+                    if boom:
+                        raise ValueError(i)
+                    return i
+                finally:
+                    active[0] -= 1
+            return run
+
+        async def collect(factories, window):
+            out = []
+            try:
+                async for x in iter_ordered(factories, window):
+                    out.append(x)
+            except ValueError as e:
+                out.append(f"error {e}")
+            return out
+
+        delays = [0.03, 0.0, 0.02, 0.0, 0.01, 0.0]
+        assert asyncio.run(collect([job(i, d) for i, d in enumerate(delays)], 3)) == list(range(6))
+        assert peak[0] <= 3
+
+        jobs = [job(0, 0.0), job(1, 0.01, boom=True), job(2, 0.0)]
+        assert asyncio.run(collect(jobs, 2)) == [0, "error 1"]
+
+    def test_early_exit_cancels_lookahead(self):
+        started, cancelled = [], []
+
+        def job(i):
+            async def run():
+                started.append(i)
+                try:
+                    await asyncio.sleep(0 if i == 0 else 30)
+                    return i
+                except asyncio.CancelledError:
+                    cancelled.append(i)
+                    raise
+            return run
+
+        async def run():
+            async with aclosing(iter_ordered([job(i) for i in range(10)], 4)) as results:
+                async for first in results:
+                    break
+            others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            return first, others
+
+        first, others = asyncio.run(run())
+        assert first == 0 and others == []
+        assert len(started) <= 5 and sorted(cancelled) == sorted(set(started) - {0})
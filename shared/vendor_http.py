@@ -0,0 +1,351 @@
+# shared/vendor_http.py
+
+"""
+Vendor HTTP - pooled async client for Massive / Polygon REST endpoints
+
+One aiohttp session per client, so every call reuses pooled keep-alive
+connections instead of opening a socket (and TLS handshake) per request.
+
+- Connection pooling + HTTP keep-alive (TCPConnector)
+- Bounded concurrency: at most max_concurrency requests in flight,
+  optionally paced to rate_per_sec request starts
+- Retry with exponential backoff + jitter on 429 / 5xx / network errors
+  (honours Retry-After)
+- Cursor pagination with bounded prefetch: page N+1 is requested as soon
+  as page N arrives, while the caller is still processing page N
+- iter_ordered(): bounded look-ahead over independent requests (e.g. one
+  aggregates call per day), results yielded in order
+- Per-endpoint latency / error / retry metrics
+
+Auth goes in the Authorization header, so next_url cursors can be followed
+as-is and API keys never appear in logged URLs.
+
+Usage:
+    from shared.vendor_http import VendorHttpClient, VendorHttpError
+
+    client = VendorHttpClient(api_key, MASSIVE_BASE)
+    data = await client.get_json("/v3/snapshot", {"ticker": "I:SPX"}, endpoint="index_snapshot")
+
+    async for item in client.iter_results(f"/v3/snapshot/options/{sym}", params, endpoint="options_chain"):
+        ...
+
+    await client.close()
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional
+
+import aiohttp
+
+MASSIVE_BASE = "https://api.massive.com"
+POLYGON_BASE = "https://api.polygon.io"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class VendorHttpError(RuntimeError):
+    """Non-retryable HTTP error, or retries exhausted."""
+
+    def __init__(self, message: str, status: Optional[int] = None, endpoint: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.endpoint = endpoint
+
+
+class EndpointStats:
+    """Counters + a window of recent latencies for one endpoint label."""
+
+    WINDOW = 1024
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=self.WINDOW)
+
+    def summary(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies_ms)
+
+        def pct(p: float) -> float:
+            if not lat:
+                return 0.0
+            return round(lat[min(len(lat) - 1, int(p / 100.0 * len(lat)))], 2)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": round(lat[-1], 2) if lat else 0.0,
+        }
+
+
+_DONE = object()
+
+
+async def iter_ordered(
+    factories: Iterable[Callable[[], Awaitable[Any]]],
+    window: int,
+) -> AsyncIterator[Any]:
+    """
+    Run independent requests with at most `window` started ahead of the
+    consumer; results are yielded in input order. An exception is raised
+    at its position in the sequence.
+    """
+    pending: Deque[asyncio.Task] = deque()
+    it = iter(factories)
+    try:
+        for factory in it:
+            pending.append(asyncio.ensure_future(factory()))
+            if len(pending) >= window:
+                break
+        while pending:
+            result = await pending.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append(asyncio.ensure_future(nxt()))
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+class VendorHttpClient:
+    """Pooled, retrying async JSON client for one vendor base URL."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = MASSIVE_BASE,
+        *,
+        pool_size: int = 16,
+        keepalive_sec: float = 30.0,
+        timeout_sec: float = 10.0,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_base_sec: float = 0.5,
+        backoff_max_sec: float = 10.0,
+        prefetch_pages: int = 2,
+        rate_per_sec: float = 0.0,
+        user_agent: str = "MarketSwarm/1.0",
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.keepalive_sec = keepalive_sec
+        self.timeout_sec = timeout_sec
+        self.max_retries = max_retries
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        self.prefetch_pages = max(1, prefetch_pages)
+        self.user_agent = user_agent
+
+        # Request pacing (0 = unpaced)
+        self._min_interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next_start = 0.0
+        self._pace_lock = asyncio.Lock()
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats: Dict[str, EndpointStats] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], api_key: str, base_url: str = MASSIVE_BASE) -> "VendorHttpClient":
+        """Build from service config (MASSIVE_HTTP_* keys, all optional)."""
+        return cls(
+            api_key,
+            base_url,
+            pool_size=int(config.get("MASSIVE_HTTP_POOL_SIZE", 16)),
+            keepalive_sec=float(config.get("MASSIVE_HTTP_KEEPALIVE_SEC", 30)),
+            timeout_sec=float(config.get("MASSIVE_HTTP_TIMEOUT_SEC", 10)),
+            max_concurrency=int(config.get("MASSIVE_HTTP_MAX_CONCURRENCY", 8)),
+            max_retries=int(config.get("MASSIVE_HTTP_MAX_RETRIES", 3)),
+            backoff_base_sec=float(config.get("MASSIVE_HTTP_BACKOFF_BASE_SEC", 0.5)),
+            backoff_max_sec=float(config.get("MASSIVE_HTTP_BACKOFF_MAX_SEC", 10)),
+            prefetch_pages=int(config.get("MASSIVE_HTTP_PREFETCH_PAGES", 2)),
+            rate_per_sec=float(config.get("MASSIVE_HTTP_RATE_PER_SEC", 0)),
+        )
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=self.keepalive_sec,
+                ttl_dns_cache=300,
+            )
+            headers = {"User-Agent": self.user_agent}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._session = aiohttp.ClientSession(connector=connector, headers=headers)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "VendorHttpClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    # ------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------
+
+    def _url(self, path_or_url: str) -> str:
+        if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    async def _pace(self) -> None:
+        if not self._min_interval:
+            return
+        async with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._min_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max_sec * 6)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base_sec * (2 ** attempt), self.backoff_max_sec)
+        return delay + random.uniform(0.0, delay * 0.2)
+
+    async def get_json(
+        self,
+        path_or_url: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """GET and decode JSON, retrying transient failures."""
+        label = endpoint or path_or_url.split("?", 1)[0].rsplit("/", 1)[0] or "root"
+        stats = self.stats.setdefault(label, EndpointStats())
+        url = self._url(path_or_url)
+        client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout_sec)
+        session = await self._get_session()
+
+        attempt = 0
+        while True:
+            retry_after = None
+            error: str
+            status: Optional[int] = None
+
+            try:
+                async with self._semaphore:
+                    await self._pace()
+                    t0 = time.perf_counter()
+                    async with session.get(url, params=params, timeout=client_timeout) as resp:
+                        status = resp.status
+                        if status == 200:
+                            data = await resp.json(content_type=None)
+                            stats.requests += 1
+                            stats.latencies_ms.append((time.perf_counter() - t0) * 1000)
+                            return data
+                        retry_after = resp.headers.get("Retry-After")
+                        error = f"HTTP {status}: {(await resp.text())[:200]}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = f"{type(e).__name__}: {e}"
+
+            stats.requests += 1
+            retryable = status is None or status in RETRY_STATUSES
+            if not retryable or attempt >= self.max_retries:
+                stats.errors += 1
+                raise VendorHttpError(f"[{label}] {error}", status=status, endpoint=label)
+
+            stats.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    # ------------------------------------------------------------
+    # Pagination
+    # ------------------------------------------------------------
+
+    async def iter_pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        endpoint: Optional[str] = None,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Follow next_url cursors, yielding each page. Up to `prefetch` pages
+        are fetched ahead of the consumer.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=prefetch or self.prefetch_pages)
+
+        async def produce() -> None:
+            url: Optional[str] = path
+            page_params = params
+            try:
+                while url:
+                    page = await self.get_json(url, page_params, endpoint=endpoint)
+                    await queue.put(page)
+                    # Cursor URLs already carry the original query
+                    url = page.get("next_url")
+                    page_params = None
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(_DONE)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+
+    async def iter_results(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        endpoint: Optional[str] = None,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Flatten the "results" arrays of iter_pages()."""
+        async for page in self.iter_pages(path, params, endpoint=endpoint, prefetch=prefetch):
+            for item in page.get("results") or ():
+                yield item
+
+    # ------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {label: s.summary() for label, s in self.stats.items()}
+
+    def metrics_mapping(self) -> Dict[str, Any]:
+        """Flat {endpoint}:{field} mapping, ready for HSET."""
+        return {
+            f"{label}:{field}": value
+            for label, summary in self.metrics().items()
+            for field, value in summary.items()
+        }
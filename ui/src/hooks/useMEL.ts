@@ -47,6 +47,12 @@ export interface MELSnapshot {
   };
 }
 
+/** Top-level snapshot fields plus the model scores that changed since base_id. */
+interface MELDeltaMessage extends Omit<MELSnapshot, 'gamma' | 'volume_profile' | 'liquidity' | 'volatility' | 'session_structure'> {
+  base_id: string;
+  models: Partial<Pick<MELSnapshot, 'gamma' | 'volume_profile' | 'liquidity' | 'volatility' | 'session_structure'>>;
+}
+
 export interface UseMELResult {
   snapshot: MELSnapshot | null;
   connected: boolean;
@@ -64,6 +70,7 @@ export function useMEL(dte: number = 0): UseMELResult {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<number | null>(null);
   const currentDteRef = useRef<number>(dte);
+  const snapshotIdRef = useRef<string | null>(null);
 
   const connect = useCallback(() => {
     // Close existing connection if DTE changed
@@ -80,7 +87,7 @@ export function useMEL(dte: number = 0): UseMELResult {
     currentDteRef.current = dte;
 
     try {
-      const ws = new WebSocket(`${getWsBase()}?dte=${dte}`);
+      const ws = new WebSocket(`${getWsBase()}?dte=${dte}&delta=1`);
 
       ws.onopen = () => {
         setConnected(true);
@@ -92,7 +99,20 @@ export function useMEL(dte: number = 0): UseMELResult {
         try {
           const data = JSON.parse(event.data);
           if (data.type === 'mel_snapshot') {
+            snapshotIdRef.current = data.data.snapshot_id;
             setSnapshot(data.data);
+          } else if (data.type === 'mel_delta') {
+            const { base_id, models, ...fields } = data.data as MELDeltaMessage;
+            if (snapshotIdRef.current !== base_id) {
+              // Not the snapshot this delta builds on: reconnect, the server resends it
+              ws.onclose = null;
+              ws.close();
+              wsRef.current = null;
+              connect();
+              return;
+            }
+            snapshotIdRef.current = fields.snapshot_id;
+            setSnapshot((prev) => (prev ? { ...prev, ...fields, ...models } : prev));
           }
         } catch (e) {
           console.error('[MEL] Failed to parse message:', e);